@@ -6,7 +6,13 @@ block_cipher = None
 
 datas = [
     ('src/Database/database.db', '.'),
+    ('src/Database/database_setup.py', 'Database'),
+    ('src/Database/database_maintenance.py', 'Database'),
+    ('src/Database/shared_access.py', 'Database'),
     ('src/ArchiveManager/archive_manager.py', 'ArchiveManager'),
+    ('src/ArchiveManager/archive_snapshot.py', 'ArchiveManager'),
+    ('src/ApiServer/api_server.py', 'ApiServer'),
+    ('src/cli.py', '.'),
     ('src/GUIController/gui_controller.py', 'GUIController'),
     ('src/GUIController/archive_viewer.py', 'GUIController'),
     ('src/GUIController/drag_drop.py', 'GUIController'),
@@ -14,10 +20,29 @@ datas = [
     ('src/GUIController/login_window.py', 'GUIController'),
     ('src/GUIController/settings_window.py', 'GUIController'),
     ('src/GUIController/task_editor.py', 'GUIController'),
+    ('src/GUIController/priority_dialog.py', 'GUIController'),
+    ('src/GUIController/dependency_dialog.py', 'GUIController'),
+    ('src/GUIController/venn_geometry.py', 'GUIController'),
+    ('src/GUIController/venn_layout.py', 'GUIController'),
+    ('src/GUIController/view_transform.py', 'GUIController'),
+    ('src/GUIController/stats_window.py', 'GUIController'),
+    ('src/ImportExportManager/import_export_manager.py', 'ImportExportManager'),
     ('src/NotificationManager/notification_manager.py', 'NotificationManager'),
     ('src/SettingsManager/settings_manager.py', 'SettingsManager'),
+    ('src/StatisticsManager/statistics_manager.py', 'StatisticsManager'),
+    ('src/StatisticsManager/completion_analytics.py', 'StatisticsManager'),
     ('src/Task/task.py', 'Task'),
+    ('src/Task/recurrence.py', 'Task'),
+    ('src/Task/dependency_graph.py', 'Task'),
+    ('src/Task/TaskRepository/task_repository.py', 'Task/TaskRepository'),
+    ('src/Task/TaskRepository/task_cache.py', 'Task/TaskRepository'),
+    ('src/Task/TaskRepository/task_format.py', 'Task/TaskRepository'),
+    ('src/Task/TaskRepository/change_feed.py', 'Task/TaskRepository'),
+    ('src/Task/TaskRepository/write_behind_buffer.py', 'Task/TaskRepository'),
+    ('src/Task/TaskRepository/write_journal.py', 'Task/TaskRepository'),
     ('src/User/user.py', 'User'),
+    ('src/User/password_hasher.py', 'User'),
+    ('src/User/session.py', 'User'),
     ('src/User/UserRepository/user_repository.py', 'User/UserRepository'),
 ]
 
@@ -0,0 +1,384 @@
+import os
+import re
+import sys
+import json
+import asyncio
+import sqlite3
+import argparse
+import getpass
+import threading
+from datetime import date
+from urllib.parse import urlsplit, parse_qsl
+from concurrent.futures import ThreadPoolExecutor
+
+# Import paths for other modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../Task')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../Task/TaskRepository')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../Database')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../ArchiveManager')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../SettingsManager')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../StatisticsManager')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../User')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../User/UserRepository')))
+
+from task import Task, Status, validate_task_data
+from recurrence import make_rule
+from task_repository import TaskRepository
+from task_cache import TaskCache
+from task_format import task_to_dict, parse_filters
+from change_feed import ChangeFeed
+from database_setup import get_default_db_path
+from archive_manager import ArchiveManager
+from settings_manager import SettingsManager
+from statistics_manager import StatisticsManager
+from user_repository import UserRepository
+from session import Session
+
+DEFAULT_PAGE_SIZE = 100  # Items per page when a request does not pass limit
+MAX_PAGE_SIZE = 1000
+MAX_BODY_SIZE = 1024 * 1024  # Larger request bodies are rejected with 413
+WORKERS = 8  # Threads running database work, requests beyond this number wait for a free thread
+
+# Task fields a request body may set, all strings or null
+TASK_FIELDS = ('title', 'description', 'due_date', 'importance', 'urgency', 'fitness', 'status', 'recurrence')
+
+REASONS = {200: "OK", 201: "Created", 204: "No Content", 400: "Bad Request", 404: "Not Found",
+           405: "Method Not Allowed", 413: "Payload Too Large", 500: "Internal Server Error"}
+
+
+class ApiError(Exception):
+    """
+    An error answered with the given HTTP status and a JSON body {"error": message}.
+    """
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def check_task_fields(data):
+    """
+    Checks the types of the task fields of a request body before their values are validated.
+
+    :param data: The decoded JSON body.
+    :raises ApiError: With status 400 if a field is neither a string nor null.
+    """
+    for name in TASK_FIELDS:
+        if not isinstance(data.get(name), (str, type(None))):
+            raise ApiError(400, f"{name} must be a string or null.")
+
+
+def paginate(items, params):
+    """
+    Cuts one page out of a list.
+
+    :param items: All items, in a stable order.
+    :param params: Request parameters with optional "offset" and "limit".
+    :return: Dictionary with the "items" of the page, "total", "offset", "limit" and "next_offset", which is
+             None on the last page.
+    """
+    try:
+        offset = max(int(params.get("offset", 0)), 0)
+        limit = min(max(int(params.get("limit", DEFAULT_PAGE_SIZE)), 1), MAX_PAGE_SIZE)
+    except ValueError:
+        raise ApiError(400, "offset and limit must be integers.")
+    page = items[offset:offset + limit]
+    next_offset = offset + limit if offset + limit < len(items) else None
+    return {"items": page, "total": len(items), "offset": offset, "limit": limit, "next_offset": next_offset}
+
+
+class ApiServer:
+    """
+    Local HTTP/JSON API for the tasks, archive, settings and statistics of one user, so scripts can use the
+    data without the GUI. Requests are parsed with asyncio streams and handled concurrently, keep-alive
+    connections included. The database work runs on a small thread pool with the same repositories the GUI
+    uses: task reads are served from a TaskCache, which the change feed keeps up to date with writes of the
+    GUI and other instances.
+
+    Routes (filters are importance, urgency, fitness, search, status and due_date; lists take offset and limit):
+        GET    /tasks                 Page of the user's tasks matching the filters, ordered by ID
+        POST   /tasks                 Add a task, body {"title", "due_date", "importance", "urgency", "fitness",
+                                      "description", "recurrence"}
+        GET    /tasks/<id>            One task
+        PATCH  /tasks/<id>            Change fields of a task, including "status"; completing a recurring task
+                                      moves it to its next occurrence
+        DELETE /tasks/<id>            Delete a task
+        GET    /archive               Page of archived tasks matching the filters, partitions=1 includes old years
+        GET    /settings              The user's settings
+        GET    /stats                 The counts of the statistics window
+    """
+
+    def __init__(self, user, db_path=None, host="127.0.0.1", port=8765):
+        """
+        Initializes the server.
+
+        :param user: The User whose data is served, with id.
+        :param db_path: Path to the SQLite database file (defaults to the application database).
+        :param host: Interface to listen on, only the local machine by default.
+        :param port: Port to listen on, 0 picks a free port (see self.port after start()).
+        """
+        self.db_path = db_path or get_default_db_path()
+        self.host = host
+        self.port = port
+        self.task_repository = TaskRepository(self.db_path)
+        self.task_cache = TaskCache(self.task_repository)
+        self.archive_manager = ArchiveManager(self.db_path)
+        self.statistics_manager = StatisticsManager(self.db_path)
+        self.session = Session(user, SettingsManager(self.db_path), self.task_cache)
+        self.change_feed = ChangeFeed(self.task_cache)
+        self.change_feed.start()
+        # TaskCache, ChangeFeed and the block cache of ArchiveManager are not thread-safe, the pool threads
+        # use them one at a time
+        self._cache_lock = threading.Lock()
+        self._archive_lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=WORKERS, thread_name_prefix="api")
+        self._server = None
+        self._routes = [
+            ("GET", re.compile(r"/tasks"), self.list_tasks),
+            ("POST", re.compile(r"/tasks"), self.add_task),
+            ("GET", re.compile(r"/tasks/(\d+)"), self.get_task),
+            ("PATCH", re.compile(r"/tasks/(\d+)"), self.update_task),
+            ("DELETE", re.compile(r"/tasks/(\d+)"), self.delete_task),
+            ("GET", re.compile(r"/archive"), self.list_archive),
+            ("GET", re.compile(r"/settings"), self.get_settings),
+            ("GET", re.compile(r"/stats"), self.get_stats),
+        ]
+
+    async def start(self):
+        """
+        Starts listening. Requests are served while the event loop runs.
+        """
+        self._server = await asyncio.start_server(self.handle_connection, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self):
+        await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self):
+        """
+        Stops listening and waits for the database work still running.
+        """
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        self._executor.shutdown(wait=True)
+
+    async def handle_connection(self, reader, writer):
+        """
+        Serves the requests of one connection until the client closes it or asks for Connection: close.
+        """
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                try:
+                    method, target, version = request_line.decode("latin-1").split()
+                except ValueError:
+                    await self.write_response(writer, 400, {"error": "Malformed request line."}, False)
+                    break
+
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                keep_alive = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+                length = int(headers.get("content-length") or 0)
+                if length > MAX_BODY_SIZE:
+                    await self.write_response(writer, 413, {"error": "Request body too large."}, False)
+                    break
+                body = await reader.readexactly(length) if length else b""
+
+                status, payload = await self.dispatch(method, target, body)
+                await self.write_response(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError, ValueError):
+            pass  # Client went away or sent garbage, nothing left to answer
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def write_response(writer, status, payload, keep_alive):
+        body = json.dumps(payload).encode("utf-8") if payload is not None else b""
+        head = (f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+                f"Content-Type: application/json\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+        writer.write(head.encode("latin-1") + body)
+        await writer.drain()
+
+    async def dispatch(self, method, target, body):
+        """
+        Runs the handler of a request on the thread pool.
+
+        :return: Tuple (HTTP status, JSON-serializable payload or None).
+        """
+        url = urlsplit(target)
+        params = dict(parse_qsl(url.query))
+        matched_path = False
+        for route_method, pattern, handler in self._routes:
+            match = pattern.fullmatch(url.path.rstrip("/") or "/")
+            if not match:
+                continue
+            matched_path = True
+            if route_method != method:
+                continue
+            try:
+                data = json.loads(body) if body else {}
+                if not isinstance(data, dict):
+                    raise ApiError(400, "The request body must be a JSON object.")
+                loop = asyncio.get_running_loop()
+                return await loop.run_in_executor(self._executor, handler, params, data, *match.groups())
+            except ApiError as e:
+                return e.status, {"error": str(e)}
+            except (ValueError, TypeError) as e:
+                return 400, {"error": str(e)}
+            except sqlite3.Error as e:
+                return 500, {"error": f"Database error: {e}"}
+            except Exception as e:
+                # Any other failure of a handler is answered, so the connection stays usable
+                return 500, {"error": f"Internal error: {e}"}
+        if matched_path:
+            return 405, {"error": f"{method} is not allowed on {url.path}."}
+        return 404, {"error": f"No such resource: {url.path}"}
+
+    # Handlers, called on the thread pool with the query parameters, the decoded JSON body and the groups
+    # of the route pattern. They return (HTTP status, payload).
+
+    def _tasks(self, filters=None):
+        with self._cache_lock:
+            self.change_feed.poll(self.session.user_id)
+            return sorted(self.session.get_tasks(filters), key=lambda task: task.id)
+
+    def _task(self, task_id):
+        with self._cache_lock:
+            self.change_feed.poll(self.session.user_id)
+            task = self.session.get_task(int(task_id))
+        if task is None:
+            raise ApiError(404, f"Task {task_id} does not exist.")
+        return task
+
+    def list_tasks(self, params, data):
+        tasks = self._tasks(parse_filters(params))
+        page = paginate(tasks, params)
+        page["items"] = [task_to_dict(task) for task in page["items"]]
+        return 200, page
+
+    def get_task(self, params, data, task_id):
+        return 200, task_to_dict(self._task(task_id))
+
+    def add_task(self, params, data):
+        check_task_fields(data)
+        settings = self.session.settings
+        due_date, importance, urgency, fitness = validate_task_data(
+            data.get("title"), data.get("description", ""), data.get("due_date"),
+            data.get("importance") or settings.get("default_importance"),
+            data.get("urgency") or settings.get("default_urgency"),
+            data.get("fitness") or settings.get("default_fitness"))
+        task = Task(title=data["title"], due_date=due_date, importance=importance, urgency=urgency,
+                    fitness=fitness, description=data.get("description", ""),
+                    recurrence=make_rule(data.get("recurrence"), due_date))
+        self.task_repository.add_tasks([task], self.session.user_id)
+        with self._cache_lock:
+            task = self.session.put_task(task)
+        return 201, task_to_dict(task)
+
+    def update_task(self, params, data, task_id):
+        check_task_fields(data)
+        task = self._task(task_id)
+        values = task_to_dict(task)
+        values.update({name: data[name] for name in ("title", "description", "due_date", "importance",
+                                                     "urgency", "fitness") if name in data})
+        due_date, importance, urgency, fitness = validate_task_data(
+            values["title"], values["description"], values["due_date"], values["importance"],
+            values["urgency"], values["fitness"], allow_past_due_date=True)
+        recurrence = make_rule(data["recurrence"], due_date) if "recurrence" in data else task.recurrence
+        status = Status(data.get("status", task.status.value))
+        # A recurring task is completed like in the main window, together with its edited fields
+        rolls = recurrence and status == Status.COMPLETED and task.status != Status.COMPLETED
+        if rolls:
+            status = task.status
+
+        updated = Task(title=values["title"], due_date=due_date, importance=importance, urgency=urgency,
+                       fitness=fitness, description=values["description"], status=status,
+                       completed_date=task.completed_date, task_id=task.id, recurrence=recurrence)
+        if rolls:
+            # The edited fields and the roll forward are written in one transaction
+            self.task_repository.complete_tasks([updated], self.session.user_id, date.today().strftime("%Y-%m-%d"),
+                                                edited=True)
+        else:
+            self.task_repository.update_task(task.id, self.session.user_id, values["title"],
+                                             values["description"], due_date, importance, urgency, fitness, status,
+                                             recurrence)
+        with self._cache_lock:
+            updated = self.session.put_task(updated)
+        return 200, task_to_dict(updated)
+
+    def delete_task(self, params, data, task_id):
+        task = self._task(task_id)
+        self.task_repository.bulk_delete([task.id], self.session.user_id)
+        with self._cache_lock:
+            self.session.remove_task(task.id)
+        return 204, None
+
+    def list_archive(self, params, data):
+        filters = parse_filters(params)
+        with self._archive_lock:
+            rows = self.archive_manager.search_archive(self.session.user_id, filters,
+                                                       include_partitions=params.get("partitions") == "1")
+        page = paginate(rows, params)
+        page["items"] = [
+            {"year": year, "id": task_id, "title": title, "description": description, "due_date": due_date,
+             "importance": importance, "urgency": urgency, "fitness": fitness, "status": status}
+            for year, task_id, title, description, due_date, importance, urgency, fitness, status in page["items"]
+        ]
+        return 200, page
+
+    def get_settings(self, params, data):
+        self.session.reload_settings()  # May have been changed in the GUI
+        return 200, self.session.settings
+
+    def get_stats(self, params, data):
+        today = date.fromisoformat(params["today"]) if params.get("today") else None
+        return 200, self.statistics_manager.get_dashboard(self.session.user_id, today)
+
+
+def login(db_path, username, password):
+    """
+    Looks up a user and checks their password, like the login window.
+
+    :return: The User, or None if the username or password is wrong.
+    """
+    user = UserRepository(db_path).get_user_by_username(username)
+    if user is None or not user.check_password(password):
+        return None
+    return user
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve the tasks of a user as a local HTTP/JSON API.")
+    parser.add_argument("--user", required=True, help="Username whose data is served")
+    parser.add_argument("--db", help="Path to the database file")
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to listen on")
+    parser.add_argument("--port", type=int, default=8765, help="Port to listen on")
+    args = parser.parse_args()
+
+    db_path = args.db or get_default_db_path()
+    user = login(db_path, args.user, getpass.getpass(f"Password for {args.user}: "))
+    if user is None:
+        sys.exit("Invalid username or password.")
+
+    server = ApiServer(user, db_path, args.host, args.port)
+    print(f"Serving the tasks of {user.username} on http://{args.host}:{args.port}")
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
@@ -1,12 +1,49 @@
 import os
+import re
 import sys
+import json
+import zlib
+import shutil
 import sqlite3
+from collections import OrderedDict
 from datetime import date, timedelta
+from itertools import groupby
 
 # Import paths for other modules
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../Task')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../Database')))
 
 from task import Task, Status, Priority
+from database_setup import initialize_database, count_stats_rows
+from shared_access import connect, retry_on_busy
+
+# Columns of archived_tasks, the same in the main database and in the yearly partitions
+ARCHIVE_COLUMNS = ('id, title, description, due_date, importance, urgency, fitness, status, completed_date, user_id, '
+                   'cold_block, series_id')
+
+COLD_BLOCK_SIZE = 256  # Archived tasks whose text is compressed together into one block
+BLOCK_CACHE_SIZE = 16  # Decompressed blocks kept in memory by an ArchiveManager
+
+
+def pack_text_block(rows):
+    """
+    Compresses the titles and descriptions of archived tasks into one block.
+
+    :param rows: Iterable of (id, title, description).
+    :return: The compressed block.
+    """
+    texts = {str(task_id): [title, description] for task_id, title, description in rows}
+    return zlib.compress(json.dumps(texts, separators=(',', ':')).encode('utf-8'), 9)
+
+
+def unpack_text_block(data):
+    """
+    Decompresses a block created by pack_text_block.
+
+    :return: Dictionary mapping archived task IDs to (title, description).
+    """
+    texts = json.loads(zlib.decompress(data).decode('utf-8'))
+    return {int(task_id): tuple(text) for task_id, text in texts.items()}
 
 
 class ArchiveManager:
@@ -15,42 +52,28 @@ class ArchiveManager:
     This class handles completed tasks' storage and automatic deletion after a specified period.
     """
 
-    def __init__(self, db_path):
+    def __init__(self, db_path=None, partition_dir=None, snapshot=None):
         """
         Initializes the ArchiveManager with the path to the SQLite database.
 
-        :param db_path: Path to the SQLite database file.
+        :param db_path: Path to the SQLite database file (defaults to the application database).
+        :param partition_dir: Directory of the yearly archive files (defaults to "archive" next to the database).
+        :param snapshot: Optional ArchiveSnapshot of the database that archive reads use instead of the live file.
         """
-        # Dynamically determine the database path
-        if getattr(sys, 'frozen', False):  # Running as an executable
-            self.db_path = os.path.join(os.path.dirname(sys.executable), "database.db")
-        else:  # Running as a script
-            self.db_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '../Database/database.db'))
+        if db_path is None:
+            # Dynamically determine the database path
+            if getattr(sys, 'frozen', False):  # Running as an executable
+                self.db_path = os.path.join(os.path.dirname(sys.executable), "database.db")
+            else:  # Running as a script
+                self.db_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '../Database/database.db'))
+        else:
+            self.db_path = db_path
+        self.partition_dir = partition_dir or os.path.join(os.path.dirname(os.path.abspath(self.db_path)), "archive")
+        self.snapshot = snapshot
+        self._block_cache = OrderedDict()  # (database path, block ID) -> unpacked block, least recently used first
 
-        self._create_archived_tasks_table()
-
-    def _create_archived_tasks_table(self):
-        """
-        Creates the archived_tasks table in the database if it does not exist.
-        This table stores completed tasks that are moved from the main tasks list.
-        """
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS archived_tasks (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                title TEXT NOT NULL,
-                description TEXT,
-                due_date TEXT,
-                importance TEXT CHECK(importance IN ('Low', 'High')),
-                urgency TEXT CHECK(urgency IN ('Low', 'High')),
-                fitness TEXT CHECK(fitness IN ('Low', 'High')),
-                status TEXT CHECK(status IN ('Open', 'In Progress', 'Completed')),
-                completed_date TEXT
-            )
-        ''')
-        conn.commit()
-        conn.close()
+        # Make sure the schema exists, this is a no-op once the database has been bootstrapped
+        initialize_database(self.db_path)
 
     def archive_task(self, task):
         """
@@ -62,23 +85,31 @@ class ArchiveManager:
         if task.status != Status.COMPLETED:
             raise ValueError("Only completed tasks can be archived.")
 
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        cursor.execute('''
-            INSERT INTO archived_tasks (title, description, due_date, importance, urgency, fitness, status, completed_date)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (
-            task.title,
-            task.description,
-            task.due_date.isoformat() if task.due_date else None,
-            task.importance.value,
-            task.urgency.value,
-            task.fitness.value,
-            task.status.value,
-            task.completed_date.isoformat() if task.completed_date else None
-        ))
-        conn.commit()
-        conn.close()
+        def write():
+            conn = connect(self.db_path)
+            cursor = conn.cursor()
+            try:
+                cursor.execute('''
+                    INSERT INTO archived_tasks (title, description, due_date, importance, urgency, fitness, status,
+                                                completed_date)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ''', (
+                    task.title,
+                    task.description,
+                    task.due_date.isoformat() if task.due_date else None,
+                    task.importance.value,
+                    task.urgency.value,
+                    task.fitness.value,
+                    task.status.value,
+                    task.completed_date.isoformat() if task.completed_date else None
+                ))
+                conn.commit()
+            except sqlite3.Error:
+                conn.rollback()
+                raise
+            finally:
+                conn.close()
+        retry_on_busy(write)
 
     def auto_archive_task(self, task, days_until_archive):
         """
@@ -102,8 +133,443 @@ class ArchiveManager:
         if task.completed_date:
             days_archived = (date.today() - task.completed_date).days
             if days_archived >= days_until_delete:
-                conn = sqlite3.connect(self.db_path)
-                cursor = conn.cursor()
-                cursor.execute('DELETE FROM archived_tasks WHERE id = ?', (task.id,))
+                def write():
+                    conn = connect(self.db_path)
+                    try:
+                        conn.execute('DELETE FROM archived_tasks WHERE id = ?', (task.id,))
+                        conn.commit()
+                    except sqlite3.Error:
+                        conn.rollback()
+                        raise
+                    finally:
+                        conn.close()
+                retry_on_busy(write)
+
+    # Archive partitions: archived tasks of completed years can be moved from the main database into one
+    # database file per completion year. Recent archive queries then only read the main database, and old
+    # years can be compacted or moved away (detached) as whole files.
+
+    def partition_path(self, year):
+        """
+        :return: Path of the archive file of the given completion year.
+        """
+        return os.path.join(self.partition_dir, f"archive-{year}.db")
+
+    def get_partition_years(self):
+        """
+        :return: Completion years that have an archive file, newest first.
+        """
+        if not os.path.isdir(self.partition_dir):
+            return []
+        years = [int(match.group(1)) for match in
+                 (re.fullmatch(r"archive-(\d{4})\.db", name) for name in os.listdir(self.partition_dir)) if match]
+        return sorted(years, reverse=True)
+
+    def _attach_partition(self, cursor, year):
+        """
+        Attaches the archive file of a year as schema "archive_<year>", creating it if necessary.
+
+        :return: The schema name.
+        """
+        os.makedirs(self.partition_dir, exist_ok=True)
+        schema = f"archive_{year}"
+        cursor.execute(f"ATTACH DATABASE ? AS {schema}", (self.partition_path(year),))
+        cursor.execute(f'''
+            CREATE TABLE IF NOT EXISTS {schema}.archived_tasks (
+                id INTEGER PRIMARY KEY,
+                title TEXT NOT NULL,
+                description TEXT,
+                due_date TEXT,
+                importance TEXT,
+                urgency TEXT,
+                fitness TEXT,
+                status TEXT,
+                completed_date TEXT,
+                user_id INTEGER,
+                cold_block INTEGER,
+                series_id INTEGER
+            )
+        ''')
+        columns = {row[1] for row in cursor.execute(f"PRAGMA {schema}.table_info(archived_tasks)")}
+        # Partitions created before the cold tier or recurring tasks existed
+        for column in ('cold_block', 'series_id'):
+            if column not in columns:
+                cursor.execute(f"ALTER TABLE {schema}.archived_tasks ADD COLUMN {column} INTEGER")
+        cursor.execute(f'''
+            CREATE TABLE IF NOT EXISTS {schema}.archived_text_blocks (id INTEGER PRIMARY KEY, data BLOB NOT NULL)
+        ''')
+        cursor.execute(f'''
+            CREATE INDEX IF NOT EXISTS {schema}.idx_archived_tasks_completion
+            ON archived_tasks(user_id, completed_date, due_date, importance, urgency, fitness)
+        ''')
+        return schema
+
+    def partition_archive(self, keep_years=1, today=None):
+        """
+        Moves archived tasks completed before the hot years into their yearly archive files.
+        The moved tasks stay counted in the statistics, and each year is moved in one transaction.
+
+        :param keep_years: Number of most recent completion years kept in the main database.
+        :param today: Reference date, defaults to today.
+        :return: Dictionary mapping the moved years to the number of moved tasks.
+        """
+        first_hot_year = (today or date.today()).year - keep_years + 1
+        conn = connect(self.db_path)
+        try:
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT DISTINCT substr(completed_date, 1, 4) FROM archived_tasks
+                WHERE completed_date < ? AND completed_date GLOB '[0-9][0-9][0-9][0-9]-*'
+            ''', (f"{first_hot_year}-01-01",))
+            years = sorted(int(row[0]) for row in cursor.fetchall())
+
+            moved = {}
+            for year in years:
+                schema = self._attach_partition(cursor, year)
+                in_year = "completed_date BETWEEN ? AND ?"
+                bounds = (f"{year}-01-01", f"{year}-12-31")
+
+                def move_year():
+                    try:
+                        # OR IGNORE: in WAL mode a crash during the commit can leave the partition written and
+                        # the main database not, the next run then only deletes the tasks from the main database
+                        cursor.execute(f'''
+                            INSERT OR IGNORE INTO {schema}.archived_tasks ({ARCHIVE_COLUMNS})
+                            SELECT {ARCHIVE_COLUMNS} FROM main.archived_tasks WHERE {in_year}
+                        ''', bounds)
+                        # Compressed text moves along with its tasks, blocks never span completion years
+                        cursor.execute(f'''
+                            INSERT OR IGNORE INTO {schema}.archived_text_blocks (id, data)
+                            SELECT id, data FROM main.archived_text_blocks
+                            WHERE id IN (SELECT cold_block FROM main.archived_tasks WHERE {in_year})
+                        ''', bounds)
+                        # The delete trigger subtracts the moved tasks from the statistics, count them again
+                        count_stats_rows(cursor, "main.archived_tasks", "archived", in_year, bounds)
+                        cursor.execute(f"DELETE FROM main.archived_tasks WHERE {in_year}", bounds)
+                        count = cursor.rowcount
+                        self._delete_unused_blocks(cursor, "main")
+                        conn.commit()
+                        return count
+                    except sqlite3.Error:
+                        conn.rollback()
+                        raise
+                try:
+                    moved[year] = retry_on_busy(move_year)
+                finally:
+                    cursor.execute(f"DETACH DATABASE {schema}")
+            return moved
+        finally:
+            conn.close()
+
+    def attach_archive(self, conn, start=None, end=None):
+        """
+        Query router for archive reads: attaches the partitions that can contain tasks completed between
+        start and end to the connection and returns a subquery combining them with the main archive.
+        Without a range only the main database is read, which holds the recent years. SQLite attaches at
+        most 10 databases to a connection, which limits a range to 9 partitioned years.
+
+        :param conn: Open connection to the main database.
+        :param start: First completion date of interest, None for no lower bound.
+        :param end: Last completion date of interest, None for no upper bound.
+        :return: SQL of a subquery with the columns of archived_tasks, usable in FROM.
+        """
+        sources = [f"SELECT {ARCHIVE_COLUMNS} FROM main.archived_tasks"]
+        if start is None and end is None:
+            return f"({sources[0]})"
+        cursor = conn.cursor()
+        attached = {row[1] for row in cursor.execute("PRAGMA database_list")}
+        for year in self.get_partition_years():
+            if (start is not None and year < start.year) or (end is not None and year > end.year):
+                continue
+            schema = f"archive_{year}"
+            if schema not in attached:
+                self._attach_partition(cursor, year)
+            sources.append(f"SELECT {ARCHIVE_COLUMNS} FROM {schema}.archived_tasks")
+        return "(" + " UNION ALL ".join(sources) + ")"
+
+    def connect_archive(self):
+        """
+        Opens a connection for reading the archive: to the snapshot if the manager has one, otherwise to the
+        live database.
+        """
+        if self.snapshot is not None:
+            return self.snapshot.connect()
+        return connect(self.db_path)
+
+    def search_archive(self, user_id, filters=None, include_partitions=False):
+        """
+        Lists archived tasks of a user. The text of compressed tasks is decompressed transparently.
+
+        :param user_id: The ID of the user.
+        :param filters: Optional dictionary with "search", "importance", "urgency", "fitness", "due_date" and
+                        "series_id", the ID of a recurring task whose completed occurrences are listed.
+        :param include_partitions: Whether to read the yearly archive files as well as the main archive.
+        :return: List of (partition year or None, id, title, description, due_date, importance, urgency,
+                 fitness, status) rows, the main archive first and older years after it.
+        """
+        query = '''
+            SELECT id, title, description, due_date, importance, urgency, fitness, status, cold_block
+            FROM {table}
+            WHERE user_id = ?
+        '''
+        params = [user_id]
+        filters = filters or {}
+        search = filters.get('search')
+        if search:
+            # The titles of compressed tasks are only known after decompressing, they are matched below
+            query += ' AND (cold_block IS NOT NULL OR title LIKE ?)'
+            params.append(f"%{search}%")
+        for name in ('importance', 'urgency', 'fitness'):
+            if name in filters:
+                query += f' AND UPPER({name}) = ?'
+                params.append(filters[name].upper())
+        if 'due_date' in filters:
+            query += ' AND due_date <= ?'
+            params.append(filters['due_date'].strftime("%Y-%m-%d"))
+        if 'series_id' in filters:
+            query += ' AND series_id = ?'
+            params.append(filters['series_id'])
+
+        sources = [(None, self.db_path)]
+        if include_partitions:
+            sources += [(year, self.partition_path(year)) for year in self.get_partition_years()]
+
+        rows = []
+        for year, path in sources:
+            # Every partition is read on its own connection, so the number of years is not limited by ATTACH
+            conn = self.connect_archive() if year is None else connect(path)
+            try:
+                for row in conn.execute(query.format(table="archived_tasks"), params):
+                    task_id, title, description = row[:3]
+                    cold_block = row[-1]
+                    if cold_block is not None:
+                        texts = self._read_block(conn, path, cold_block)
+                        title, description = texts.get(task_id, (title, description))
+                        if search and search.lower() not in title.lower():
+                            continue
+                    rows.append((year, task_id, title, description) + row[3:-1])
+            finally:
+                conn.close()
+        return rows
+
+    def reactivate_archived_task(self, archived_id, user_id, year=None):
+        """
+        Moves an archived task back into the tasks table as an open task.
+
+        :param archived_id: ID of the archived task.
+        :param user_id: The ID of the user owning the task.
+        :param year: Partition year the task is stored in, None for the main archive.
+        :return: ID of the new task, or None if the archived task does not exist.
+        """
+        conn = connect(self.db_path)
+        try:
+            cursor = conn.cursor()
+            schema = "main" if year is None else self._attach_partition(cursor, year)
+            return retry_on_busy(self._reactivate, conn, schema, archived_id, user_id, year)
+        finally:
+            conn.close()
+
+    def _reactivate(self, conn, schema, archived_id, user_id, year):
+        """
+        Runs the transaction of reactivate_archived_task on a connection with the partition of the task
+        attached.
+        """
+        condition = "id = ? AND user_id = ?"
+        cursor = conn.cursor()
+        try:
+            cursor.execute(f'''
+                SELECT title, description, due_date, importance, urgency, fitness, cold_block
+                FROM {schema}.archived_tasks WHERE {condition}
+            ''', (archived_id, user_id))
+            row = cursor.fetchone()
+            if row is None:
+                return None
+            title, description, due_date, importance, urgency, fitness, cold_block = row
+            if cold_block is not None:
+                path = self.db_path if year is None else self.partition_path(year)
+                texts = self._read_block(conn, path, cold_block, schema)
+                title, description = texts.get(archived_id, (title, description))
+            cursor.execute('''
+                INSERT INTO main.tasks (title, description, due_date, importance, urgency, fitness, status, user_id)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ''', (title, description, due_date, importance, urgency, fitness, Status.OPEN.value, user_id))
+            task_id = cursor.lastrowid
+            if year is not None:
+                # Partition rows are not seen by the triggers of the main database
+                count_stats_rows(cursor, f"{schema}.archived_tasks", "archived", condition,
+                                 (archived_id, user_id), sign=-1)
+            cursor.execute(f"DELETE FROM {schema}.archived_tasks WHERE {condition}", (archived_id, user_id))
+            if cold_block is not None:
+                self._delete_unused_blocks(cursor, schema)
+            conn.commit()
+            if self.snapshot is not None:
+                self.snapshot.invalidate()
+            return task_id
+        except sqlite3.Error:
+            conn.rollback()
+            raise
+
+    def delete_archived_before(self, user_id, cutoff):
+        """
+        Deletes the archived tasks of a user completed before a date, in the main archive and in the yearly
+        archive files of the years up to the cutoff. Each database is cleaned up in its own transaction.
+
+        :param user_id: The ID of the user.
+        :param cutoff: Tasks completed before this date (YYYY-MM-DD) are deleted.
+        :return: Number of deleted tasks.
+        """
+        condition = "user_id = ? AND completed_date < ?"
+        params = (user_id, cutoff)
+        deleted = 0
+        conn = connect(self.db_path)
+        try:
+            cursor = conn.cursor()
+            years = [year for year in self.get_partition_years() if f"{year}-01-01" < cutoff]
+            for schema_year in [None] + years:
+                schema = "main" if schema_year is None else self._attach_partition(cursor, schema_year)
+
+                def delete():
+                    try:
+                        if schema_year is not None:
+                            # Partition rows are not seen by the triggers of the main database
+                            count_stats_rows(cursor, f"{schema}.archived_tasks", "archived", condition, params,
+                                             sign=-1)
+                        cursor.execute(f"DELETE FROM {schema}.archived_tasks WHERE {condition}", params)
+                        count = cursor.rowcount
+                        self._delete_unused_blocks(cursor, schema)
+                        conn.commit()
+                        return count
+                    except sqlite3.Error:
+                        conn.rollback()
+                        raise
+                try:
+                    deleted += retry_on_busy(delete)
+                finally:
+                    if schema_year is not None:
+                        cursor.execute(f"DETACH DATABASE {schema}")
+        finally:
+            conn.close()
+        if deleted and self.snapshot is not None:
+            self.snapshot.invalidate()
+        return deleted
+
+    # Cold tier: the titles and descriptions of tasks completed long ago are compressed in blocks of
+    # archived_text_blocks. Their archived_tasks rows keep the dates, priorities and status, so statistics
+    # and analytics read them as before, and refer to their block in cold_block. Blocks are named after
+    # the smallest task ID they contain, archived IDs are never reused, so a block ID stays unique across
+    # the main database and the yearly archive files.
+
+    def compress_archive(self, older_than_days=365, today=None, block_size=COLD_BLOCK_SIZE):
+        """
+        Compresses the text of archived tasks completed before a given age in the main archive.
+
+        :param older_than_days: Minimum number of days since completion.
+        :param today: Reference date, defaults to today.
+        :param block_size: Maximum number of tasks per block.
+        :return: Number of compressed tasks.
+        """
+        cutoff = ((today or date.today()) - timedelta(days=older_than_days)).isoformat()
+
+        def compress():
+            conn = connect(self.db_path)
+            cursor = conn.cursor()
+            try:
+                cursor.execute('''
+                    SELECT id, title, description, substr(completed_date, 1, 4) AS year FROM archived_tasks
+                    WHERE cold_block IS NULL AND completed_date < ?
+                    ORDER BY year, id
+                ''', (cutoff,))
+                rows = cursor.fetchall()
+                # Blocks do not span completion years, so partitioning moves whole blocks
+                for _, year_rows in groupby(rows, key=lambda row: row[3]):
+                    year_rows = list(year_rows)
+                    for start in range(0, len(year_rows), block_size):
+                        block = [row[:3] for row in year_rows[start:start + block_size]]
+                        block_id = block[0][0]
+                        cursor.execute('INSERT INTO archived_text_blocks (id, data) VALUES (?, ?)',
+                                       (block_id, pack_text_block(block)))
+                        cursor.executemany(
+                            "UPDATE archived_tasks SET title = '', description = NULL, cold_block = ? WHERE id = ?",
+                            [(block_id, row[0]) for row in block])
                 conn.commit()
-                conn.close()
\ No newline at end of file
+                return len(rows)
+            except sqlite3.Error:
+                conn.rollback()
+                raise
+            finally:
+                conn.close()
+        return retry_on_busy(compress)
+
+    def _read_block(self, conn, path, block_id, schema="main"):
+        """
+        Returns a decompressed block, from the cache if it has been read recently.
+
+        :param conn: Connection on which the block's database is open as schema.
+        :param path: Path of the database file holding the block, identifies it in the cache.
+        :return: Dictionary mapping archived task IDs to (title, description).
+        """
+        key = (path, block_id)
+        if key in self._block_cache:
+            self._block_cache.move_to_end(key)
+            return self._block_cache[key]
+        row = conn.execute(f"SELECT data FROM {schema}.archived_text_blocks WHERE id = ?", (block_id,)).fetchone()
+        texts = unpack_text_block(row[0]) if row else {}
+        self._block_cache[key] = texts
+        if len(self._block_cache) > BLOCK_CACHE_SIZE:
+            self._block_cache.popitem(last=False)
+        return texts
+
+    @staticmethod
+    def _delete_unused_blocks(cursor, schema):
+        """
+        Deletes the blocks of a schema whose tasks have all been moved or reactivated.
+        """
+        cursor.execute(f'''
+            DELETE FROM {schema}.archived_text_blocks WHERE id NOT IN
+                (SELECT cold_block FROM {schema}.archived_tasks WHERE cold_block IS NOT NULL)
+        ''')
+
+    def compact_partition(self, year):
+        """
+        Rebuilds the archive file of a year to its minimal size.
+        """
+        conn = connect(self.partition_path(year), isolation_level=None)
+        try:
+            retry_on_busy(conn.execute, "VACUUM")
+        finally:
+            conn.close()
+
+    def detach_partition(self, year, dest_path):
+        """
+        Moves the archive file of a year out of the archive, e.g. to offline storage, also on another
+        file system. Its tasks are no longer listed or counted.
+        The file is moved first and its tasks are subtracted from the statistics afterwards; if that fails,
+        the file is moved back, so the counts always match the partitions in place.
+
+        :param year: Completion year of the partition.
+        :param dest_path: New location of the file.
+        """
+        partition_path = self.partition_path(year)
+        shutil.move(partition_path, dest_path)
+        conn = connect(self.db_path)
+        try:
+            cursor = conn.cursor()
+            schema = f"archive_{year}"
+            cursor.execute(f"ATTACH DATABASE ? AS {schema}", (dest_path,))
+
+            def subtract():
+                try:
+                    count_stats_rows(cursor, f"{schema}.archived_tasks", "archived", sign=-1)
+                    conn.commit()
+                except sqlite3.Error:
+                    conn.rollback()
+                    raise
+            try:
+                retry_on_busy(subtract)
+            except sqlite3.Error:
+                cursor.execute(f"DETACH DATABASE {schema}")
+                shutil.move(dest_path, partition_path)
+                raise
+            cursor.execute(f"DETACH DATABASE {schema}")
+        finally:
+            conn.close()
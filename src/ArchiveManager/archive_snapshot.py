@@ -0,0 +1,76 @@
+import os
+import time
+import sqlite3
+from pathlib import Path
+
+
+class ArchiveSnapshot:
+    """
+    Read-only copy of the database for archive browsing and analytics.
+    The copy is written with the backup API in small steps and then swapped in as a whole, so refreshing it
+    never locks writers out for long. Reads open it as an immutable database with memory-mapped I/O: SQLite
+    takes no locks on it and reads pages straight from the mapping, so large scans neither wait for nor
+    block the connections writing to the live database.
+    The snapshot lags behind the live database until it is refreshed, which happens when it is older than
+    max_age seconds or has been invalidated.
+    """
+
+    PAGES_PER_STEP = 1024  # Pages copied before the backup releases the read lock on the live database
+    STEP_SLEEP = 0.005  # Seconds between backup steps, gives writers a chance to run
+
+    def __init__(self, db_path, snapshot_path=None, max_age=600, mmap_size=256 * 1024 * 1024):
+        """
+        Initializes the ArchiveSnapshot.
+
+        :param db_path: Path to the live SQLite database file.
+        :param snapshot_path: Path of the snapshot file (defaults to "<database>-snapshot.db").
+        :param max_age: Seconds after which reads refresh the snapshot first.
+        :param mmap_size: Bytes of the snapshot mapped into memory by each read connection.
+        """
+        self.db_path = db_path
+        self.snapshot_path = snapshot_path or os.path.splitext(db_path)[0] + "-snapshot.db"
+        self.max_age = max_age
+        self.mmap_size = mmap_size
+        self._stale = True  # Until it has been refreshed once, the file may be a leftover of an old session
+
+    def is_stale(self):
+        """
+        :return: True if the snapshot has to be refreshed before it is read.
+        """
+        if self._stale or not os.path.exists(self.snapshot_path):
+            return True
+        return time.time() - os.path.getmtime(self.snapshot_path) >= self.max_age
+
+    def invalidate(self):
+        """
+        Marks the snapshot as outdated, e.g. after the archive has been changed, so the next read refreshes it.
+        """
+        self._stale = True
+
+    def refresh(self):
+        """
+        Copies the live database into the snapshot file. Connections still reading the previous snapshot keep
+        reading it until they are closed.
+        """
+        temp_path = self.snapshot_path + ".tmp"
+        source = sqlite3.connect(self.db_path)
+        target = sqlite3.connect(temp_path)
+        try:
+            source.backup(target, pages=self.PAGES_PER_STEP, sleep=self.STEP_SLEEP)
+        finally:
+            target.close()
+            source.close()
+        os.replace(temp_path, self.snapshot_path)
+        self._stale = False
+
+    def connect(self):
+        """
+        Opens a read connection to the snapshot, refreshing it first if it is stale.
+
+        :return: A sqlite3 connection that cannot write to the snapshot.
+        """
+        if self.is_stale():
+            self.refresh()
+        conn = sqlite3.connect(Path(os.path.abspath(self.snapshot_path)).as_uri() + "?immutable=1", uri=True)
+        conn.execute(f"PRAGMA mmap_size = {int(self.mmap_size)}")
+        return conn
@@ -0,0 +1,279 @@
+import os
+import sys
+import time
+import sqlite3
+import argparse
+import threading
+from datetime import datetime
+
+from database_setup import get_default_db_path, initialize_database
+
+# Import paths for other modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../ArchiveManager')))
+
+from archive_manager import ArchiveManager
+
+
+class DatabaseMaintenance:
+    """
+    Keeps the application database healthy while the application is running.
+    Backups use the online backup API, so they copy a consistent snapshot in small steps without
+    locking writers out, and compaction reclaims the pages freed by archiving and auto-delete.
+    """
+
+    BACKUP_PAGES_PER_STEP = 256  # Pages copied before the backup releases the read lock again
+    BACKUP_STEP_SLEEP = 0.01  # Seconds between backup steps, gives writers a chance to run
+    KEEP_BACKUPS = 7  # Number of backups kept in the backup directory
+    VACUUM_PAGES_PER_RUN = 1000  # Free pages returned to the file system by one incremental_vacuum
+    ARCHIVE_HOT_YEARS = 1  # Completion years kept in the main archive, older ones move to yearly archive files
+    ARCHIVE_COLD_DAYS = 180  # Days after completion when the text of archived tasks is compressed
+    CHANGE_LOG_KEEP_DAYS = 7  # Days the entries of the change feed are kept, older ones are deleted
+
+    def __init__(self, db_path=None, backup_dir=None):
+        """
+        Initializes the DatabaseMaintenance.
+
+        :param db_path: Path to the SQLite database file (defaults to the application database).
+        :param backup_dir: Directory receiving the backups (defaults to "backups" next to the database).
+        """
+        self.db_path = db_path or get_default_db_path()
+        self.backup_dir = backup_dir or os.path.join(os.path.dirname(os.path.abspath(self.db_path)), "backups")
+        self.last_report = None
+        self._thread = None
+        self._after_id = None
+        initialize_database(self.db_path)
+
+    def is_running(self):
+        """
+        :return: True while a background maintenance run is in progress.
+        """
+        return self._thread is not None and self._thread.is_alive()
+
+    def list_backups(self):
+        """
+        :return: Paths of the existing backups, oldest first.
+        """
+        if not os.path.isdir(self.backup_dir):
+            return []
+        names = sorted(name for name in os.listdir(self.backup_dir)
+                       if name.startswith("database-") and name.endswith(".db"))
+        return [os.path.join(self.backup_dir, name) for name in names]
+
+    def is_due(self, interval_seconds):
+        """
+        Checks whether the newest backup is older than the given interval.
+
+        :param interval_seconds: Maximum age of the newest backup.
+        :return: True if no backup exists or the newest one is too old.
+        """
+        backups = self.list_backups()
+        return not backups or time.time() - os.path.getmtime(backups[-1]) >= interval_seconds
+
+    def backup(self, dest_path=None, progress=None):
+        """
+        Copies the database with the sqlite3 backup API while it stays usable by other connections.
+
+        :param dest_path: Target file, defaults to a timestamped file in the backup directory.
+        :param progress: Optional callback(status, remaining, total) called after every step.
+        :return: Path of the written backup.
+        """
+        if dest_path is None:
+            os.makedirs(self.backup_dir, exist_ok=True)
+            dest_path = os.path.join(self.backup_dir, f"database-{datetime.now().strftime('%Y%m%d-%H%M%S')}.db")
+
+        source = sqlite3.connect(self.db_path)
+        target = sqlite3.connect(dest_path)
+        try:
+            source.backup(target, pages=self.BACKUP_PAGES_PER_STEP, progress=progress,
+                          sleep=self.BACKUP_STEP_SLEEP)
+        finally:
+            target.close()
+            source.close()
+
+        self.prune_backups()
+        return dest_path
+
+    def prune_backups(self):
+        """
+        Deletes the oldest backups beyond KEEP_BACKUPS.
+        """
+        for path in self.list_backups()[:-self.KEEP_BACKUPS]:
+            os.remove(path)
+
+    def compact(self):
+        """
+        Returns free pages to the file system.
+        The first run switches the database to incremental auto_vacuum, which needs one full VACUUM;
+        later runs only release a bounded number of pages with incremental_vacuum.
+
+        :return: Number of pages freed.
+        """
+        conn = sqlite3.connect(self.db_path, isolation_level=None)
+        try:
+            cursor = conn.cursor()
+            cursor.execute('PRAGMA freelist_count')
+            free_pages = cursor.fetchone()[0]
+            cursor.execute('PRAGMA auto_vacuum')
+            if cursor.fetchone()[0] != 2:  # 2 = INCREMENTAL
+                cursor.execute('PRAGMA auto_vacuum = INCREMENTAL')
+                cursor.execute('VACUUM')
+            elif free_pages:
+                cursor.execute(f'PRAGMA incremental_vacuum({self.VACUUM_PAGES_PER_RUN})')
+                cursor.fetchall()  # incremental_vacuum runs step by step while its result is read
+            cursor.execute('PRAGMA freelist_count')
+            return free_pages - cursor.fetchone()[0]
+        finally:
+            conn.close()
+
+    def compress_archive(self):
+        """
+        Compresses the text of archived tasks completed more than ARCHIVE_COLD_DAYS ago, see
+        ArchiveManager.compress_archive.
+
+        :return: Number of compressed tasks.
+        """
+        return ArchiveManager(self.db_path).compress_archive(older_than_days=self.ARCHIVE_COLD_DAYS)
+
+    def partition_archive(self):
+        """
+        Moves archived tasks of old completion years out of the main database, see
+        ArchiveManager.partition_archive. Compacting afterwards returns the freed pages.
+
+        :return: Dictionary mapping the moved years to the number of moved tasks.
+        """
+        return ArchiveManager(self.db_path).partition_archive(keep_years=self.ARCHIVE_HOT_YEARS)
+
+    def prune_change_log(self):
+        """
+        Deletes change_log entries older than CHANGE_LOG_KEEP_DAYS. A running instance that has not read the
+        deleted entries yet notices the gap and reloads its tasks completely, see ChangeFeed.poll.
+
+        :return: Number of deleted entries.
+        """
+        conn = sqlite3.connect(self.db_path)
+        try:
+            cursor = conn.cursor()
+            cursor.execute("DELETE FROM change_log WHERE changed_at < datetime('now', ?)",
+                           (f'-{self.CHANGE_LOG_KEEP_DAYS} days',))
+            conn.commit()
+            return cursor.rowcount
+        finally:
+            conn.close()
+
+    def optimize(self):
+        """
+        Refreshes the query planner statistics with ANALYZE and PRAGMA optimize.
+        """
+        conn = sqlite3.connect(self.db_path, isolation_level=None)
+        try:
+            conn.execute('ANALYZE')
+            conn.execute('PRAGMA optimize')
+        finally:
+            conn.close()
+
+    def run(self, backup=True):
+        """
+        Runs all maintenance steps. A failing step is recorded and does not stop the following ones.
+
+        :param backup: Whether to write a backup before compacting.
+        :return: Dictionary with the backup path, the number of compressed archived tasks, the archived tasks
+                 moved per year, deleted change log entries, freed pages, duration and the errors per step.
+        """
+        start = time.perf_counter()
+        report = {"backup": None, "compressed": 0, "partitioned": {}, "pruned_changes": 0, "freed_pages": 0,
+                  "errors": {}}
+        steps = [("compress", self.compress_archive), ("partition", self.partition_archive),
+                 ("prune", self.prune_change_log), ("compact", self.compact), ("optimize", self.optimize)]
+        if backup:
+            steps.insert(0, ("backup", self.backup))
+
+        for name, step in steps:
+            try:
+                result = step()
+            except (sqlite3.Error, OSError) as e:
+                report["errors"][name] = str(e)
+                continue
+            if name == "backup":
+                report["backup"] = result
+            elif name == "compress":
+                report["compressed"] = result
+            elif name == "partition":
+                report["partitioned"] = result
+            elif name == "prune":
+                report["pruned_changes"] = result
+            elif name == "compact":
+                report["freed_pages"] = result
+
+        report["seconds"] = time.perf_counter() - start
+        self.last_report = report
+        return report
+
+    def run_in_background(self, backup=True):
+        """
+        Starts a maintenance run in a daemon thread.
+
+        :param backup: Whether to write a backup before compacting.
+        :return: The started thread, or None if a run is already in progress.
+        """
+        if self.is_running():
+            return None
+        self._thread = threading.Thread(target=self.run, args=(backup,), daemon=True)
+        self._thread.start()
+        return self._thread
+
+    def schedule(self, root, interval_ms=24 * 60 * 60 * 1000, check_ms=60 * 60 * 1000, delay_ms=60 * 1000):
+        """
+        Schedules background maintenance from the Tk event loop.
+        The loop itself only checks whether a run is due, all database work happens in the worker thread.
+
+        :param root: The Tk root window.
+        :param interval_ms: Minimum time between two maintenance runs.
+        :param check_ms: Time between two checks whether a run is due.
+        :param delay_ms: Time after startup before the first check, so maintenance does not slow down the login.
+        """
+        def check():
+            if not self.is_running() and self.is_due(interval_ms / 1000):
+                self.run_in_background()
+            self._after_id = root.after(check_ms, check)
+
+        self._after_id = root.after(delay_ms, check)
+
+    def cancel(self, root):
+        """
+        Stops scheduled maintenance.
+
+        :param root: The Tk root window passed to schedule.
+        """
+        if self._after_id is not None:
+            root.after_cancel(self._after_id)
+            self._after_id = None
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Back up, compact and optimize the task database.")
+    parser.add_argument("command", nargs="?", choices=["all", "backup", "compress", "partition", "prune",
+                                                        "compact", "optimize"], default="all")
+    parser.add_argument("--db", help="Path to the database file")
+    parser.add_argument("--dest", help="Backup file to write (backup only)")
+    args = parser.parse_args()
+
+    maintenance = DatabaseMaintenance(args.db)
+    if args.command == "backup":
+        print(f"Backup written to {maintenance.backup(args.dest)}")
+    elif args.command == "compress":
+        print(f"Compressed the text of {maintenance.compress_archive()} archived tasks")
+    elif args.command == "partition":
+        for year, count in maintenance.partition_archive().items():
+            print(f"Moved {count} archived tasks of {year} to {ArchiveManager(maintenance.db_path).partition_path(year)}")
+    elif args.command == "prune":
+        print(f"Deleted {maintenance.prune_change_log()} change log entries")
+    elif args.command == "compact":
+        print(f"Freed {maintenance.compact()} pages")
+    elif args.command == "optimize":
+        maintenance.optimize()
+        print("Statistics updated")
+    else:
+        result = maintenance.run()
+        print(f"Backup: {result['backup']}, freed {result['freed_pages']} pages in {result['seconds']:.2f} s")
+        for step, error in result["errors"].items():
+            print(f"{step} failed: {error}", file=sys.stderr)
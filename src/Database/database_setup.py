@@ -1,12 +1,46 @@
+import os
+import sys
 import sqlite3
+import threading
 
-def initialize_database():
+# Version of the schema created by this module, stored in PRAGMA user_version
+SCHEMA_VERSION = 10
+
+# Database files that have already been bootstrapped in this process
+_initialized_paths = set()
+_initialize_lock = threading.Lock()
+
+
+def get_default_db_path():
     """
-    Initializes the SQLite database.
+    Determines the path of the application database.
+
+    :return: Path next to the executable in frozen builds, otherwise the path inside src/Database.
+    """
+    if getattr(sys, 'frozen', False):  # Running as an executable
+        return os.path.join(os.path.dirname(sys.executable), "database.db")
+    return os.path.abspath(os.path.join(os.path.dirname(__file__), 'database.db'))
+
+
+def _add_missing_columns(cursor, table, columns):
     """
-    conn = sqlite3.connect('database.db')
-    cursor = conn.cursor()
+    Adds columns that are missing in an existing table created by an older version of the application.
 
+    :param cursor: Cursor of the open bootstrap transaction.
+    :param table: Name of the table to check.
+    :param columns: Dictionary mapping column names to their column definitions.
+    """
+    cursor.execute(f'PRAGMA table_info({table})')
+    existing = {row[1] for row in cursor.fetchall()}
+    for name, definition in columns.items():
+        if name not in existing:
+            cursor.execute(f'ALTER TABLE {table} ADD COLUMN {name} {definition}')
+
+
+def _migrate_to_v1(cursor):
+    """
+    Creates the base tables and brings tables of older databases to the common layout.
+    """
     # Create the tasks table if it does not exist, with a user_id column to link tasks to users
     cursor.execute('''
         CREATE TABLE IF NOT EXISTS tasks (
@@ -63,15 +97,384 @@ def initialize_database():
             default_importance TEXT DEFAULT 'None',
             default_urgency TEXT DEFAULT 'None',
             default_fitness TEXT DEFAULT 'None',
+            default_priorities TEXT DEFAULT '{"importance": "LOW", "urgency": "LOW", "fitness": "LOW"}',
             FOREIGN KEY(user_id) REFERENCES users(id)
         )
     ''')
 
+    # Tables created by older ArchiveManager/SettingsManager versions lack some columns
+    _add_missing_columns(cursor, 'tasks', {
+        'completed_date': 'TEXT',
+        'user_id': 'INTEGER',
+    })
+    _add_missing_columns(cursor, 'archived_tasks', {
+        'completed_date': 'TEXT',
+        'user_id': 'INTEGER',
+    })
+    _add_missing_columns(cursor, 'settings', {
+        'user_id': 'INTEGER',
+        'notification_interval': 'INTEGER DEFAULT 1',
+        'auto_archive': 'INTEGER DEFAULT 0',
+        'auto_delete': 'INTEGER DEFAULT 0',
+        'auto_delete_interval': 'INTEGER DEFAULT 30',
+        'notifications_enabled': 'INTEGER DEFAULT 1',
+        'default_importance': "TEXT DEFAULT 'None'",
+        'default_urgency': "TEXT DEFAULT 'None'",
+        'default_fitness': "TEXT DEFAULT 'None'",
+        'default_priorities': 'TEXT DEFAULT \'{"importance": "LOW", "urgency": "LOW", "fitness": "LOW"}\'',
+    })
+
+    # Every per-user query filters on user_id
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_tasks_user_id ON tasks(user_id)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_archived_tasks_user_id ON archived_tasks(user_id)')
+    cursor.execute('CREATE UNIQUE INDEX IF NOT EXISTS idx_settings_user_id ON settings(user_id)')
+
+
+def _migrate_to_v2(cursor):
+    """
+    Creates the checkpoint of the write-behind journal, the sequence number of the last journal entry
+    that has been applied. It is updated in the same transaction as the entries, so replaying the journal
+    after a crash never applies an entry twice.
+    """
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS write_journal (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            last_seq INTEGER NOT NULL DEFAULT 0
+        )
+    ''')
+    cursor.execute('INSERT OR IGNORE INTO write_journal (id, last_seq) VALUES (1, 0)')
+
+
+# Tables whose rows are counted in task_stats, with the source name stored in the stats rows
+STATS_SOURCES = {'tasks': 'tasks', 'archived_tasks': 'archived'}
+
+# Bucket expressions per dimension of task_stats; {row} is NEW or OLD inside the triggers and the table in the
+# backfill. Region codes match venn_geometry.REGIONS, weeks are named after their Monday ("2024-02-12"), so a
+# week spanning the new year stays one bucket.
+_REGION_SQL = (
+    "CASE (upper({row}.importance) = 'HIGH') * 4 + (upper({row}.urgency) = 'HIGH') * 2"
+    " + (upper({row}.fitness) = 'HIGH')"
+    " WHEN 7 THEN 'HHH' WHEN 6 THEN 'HH' WHEN 5 THEN 'HF' WHEN 3 THEN 'UF'"
+    " WHEN 4 THEN 'I' WHEN 2 THEN 'U' WHEN 1 THEN 'F' ELSE 'LOW' END"
+)
+_DUE_WEEK_SQL = "coalesce(date({row}.due_date, 'weekday 0', '-6 days'), 'none')"
+STATS_DIMENSIONS = {
+    'region': _REGION_SQL,
+    'status': "coalesce({row}.status, 'Open')",
+    'due_week': _DUE_WEEK_SQL,
+    'region_due_week': _REGION_SQL + " || ' ' || " + _DUE_WEEK_SQL,
+}
+
+
+def _stats_delta_sql(source, row, delta):
+    """
+    :return: Statements adding delta to the task_stats buckets of the given trigger row.
+    """
+    return ''.join(f'''
+            INSERT INTO task_stats (user_id, source, dimension, bucket, count)
+            SELECT {row}.user_id, '{source}', '{dimension}', {expression.format(row=row)}, {delta}
+            WHERE {row}.user_id IS NOT NULL
+            ON CONFLICT (user_id, source, dimension, bucket) DO UPDATE SET count = count + ({delta});'''
+                   for dimension, expression in STATS_DIMENSIONS.items())
+
+
+def _create_stats_triggers(cursor, table, source):
+    """
+    Creates the triggers keeping the task_stats counts of a table current.
+    """
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS {table}_stats_insert AFTER INSERT ON {table}
+        BEGIN{_stats_delta_sql(source, 'NEW', 1)}
+        END
+    ''')
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS {table}_stats_delete AFTER DELETE ON {table}
+        BEGIN{_stats_delta_sql(source, 'OLD', -1)}
+        END
+    ''')
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS {table}_stats_update
+        AFTER UPDATE OF importance, urgency, fitness, status, due_date, user_id ON {table}
+        BEGIN{_stats_delta_sql(source, 'OLD', -1)}{_stats_delta_sql(source, 'NEW', 1)}
+        END
+    ''')
+
+
+def count_stats_rows(cursor, table, source, where='true', params=(), sign=1):
+    """
+    Adds the rows of a table to task_stats, or subtracts them with sign=-1.
+    Used for rows the triggers do not see, e.g. rows that existed before the triggers or rows moved
+    to another database file.
+
+    :param cursor: Cursor of an open transaction.
+    :param table: Table to count, may be qualified with the schema name of an attached database.
+    :param source: Source name stored in the stats rows ("tasks" or "archived").
+    :param where: Condition selecting the rows to count.
+    :param params: Parameters of the condition.
+    :param sign: 1 to add the counts, -1 to subtract them.
+    """
+    for dimension, expression in STATS_DIMENSIONS.items():
+        bucket = expression.format(row=table)
+        cursor.execute(f'''
+            INSERT INTO main.task_stats (user_id, source, dimension, bucket, count)
+            SELECT user_id, '{source}', '{dimension}', {bucket}, {sign} * COUNT(*) FROM {table}
+            WHERE user_id IS NOT NULL AND ({where})
+            GROUP BY user_id, {bucket}
+            ON CONFLICT (user_id, source, dimension, bucket) DO UPDATE SET count = count + excluded.count
+        ''', params)
+
+
+def _migrate_to_v3(cursor):
+    """
+    Creates task_stats, the per-user counts of tasks and archived tasks by region, status and due week.
+    Triggers keep the counts current on every insert, update and delete, so dashboards read a few rows
+    instead of scanning the task history.
+    """
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS task_stats (
+            user_id INTEGER,
+            source TEXT NOT NULL,
+            dimension TEXT NOT NULL,
+            bucket TEXT NOT NULL,
+            count INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (user_id, source, dimension, bucket)
+        ) WITHOUT ROWID
+    ''')
+
+    for table, source in STATS_SOURCES.items():
+        # Very old archives lack the columns the buckets are computed from
+        _add_missing_columns(cursor, table, {name: 'TEXT' for name in
+                                             ('due_date', 'importance', 'urgency', 'fitness', 'status')})
+        _create_stats_triggers(cursor, table, source)
+
+        # Count the rows that existed before the triggers
+        count_stats_rows(cursor, table, source)
+
+
+def _migrate_to_v4(cursor):
+    """
+    Adds covering indexes for the completion analytics. Each holds only the columns the analytics read,
+    in date order per user, so a date range is answered by scanning a compact slice of the index
+    instead of the full archive rows with their titles and descriptions.
+    """
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_archived_tasks_completion
+        ON archived_tasks(user_id, completed_date, due_date, importance, urgency, fitness)
+    ''')
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_archived_tasks_due
+        ON archived_tasks(user_id, due_date, importance, urgency, fitness)
+    ''')
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_tasks_due
+        ON tasks(user_id, due_date, importance, urgency, fitness, status)
+    ''')
+
+
+def _migrate_to_v5(cursor):
+    """
+    Adds the cold tier of the archive: titles and descriptions of old archived tasks are packed into
+    zlib-compressed blocks, and the archived_tasks row keeps the dates and priorities and refers to its block.
+    """
+    _add_missing_columns(cursor, 'archived_tasks', {'cold_block': 'INTEGER'})
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS archived_text_blocks (
+            id INTEGER PRIMARY KEY,
+            data BLOB NOT NULL
+        )
+    ''')
+
+
+def _migrate_to_v6(cursor):
+    """
+    Creates change_log, a feed of the task mutations in commit order. Triggers append the ID of every
+    inserted, updated or deleted task, so an instance can apply the changes of other instances by reading
+    the entries after the last sequence number it has seen instead of reloading all tasks.
+    """
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS change_log (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            task_id INTEGER NOT NULL,
+            user_id INTEGER,
+            operation TEXT NOT NULL,
+            changed_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_change_log_user ON change_log(user_id, seq)')
+    for operation, row in (('insert', 'NEW'), ('update', 'NEW'), ('delete', 'OLD')):
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS tasks_change_log_{operation} AFTER {operation.upper()} ON tasks
+            BEGIN
+                INSERT INTO change_log (task_id, user_id, operation) VALUES ({row}.id, {row}.user_id, '{operation}');
+            END
+        ''')
+    # A task moved to another user disappears for the previous one
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS tasks_change_log_owner AFTER UPDATE OF user_id ON tasks
+        WHEN OLD.user_id IS NOT NEW.user_id
+        BEGIN
+            INSERT INTO change_log (task_id, user_id, operation) VALUES (OLD.id, OLD.user_id, 'delete');
+        END
+    ''')
+
+
+def _migrate_to_v7(cursor):
+    """
+    Adds recurring tasks. A series is stored as a single task holding its next occurrence and the
+    repetition rule; completing it archives the occurrence with series_id set to the task's ID and moves
+    the task to the following occurrence, so a series never has more than one row in tasks.
+    """
+    _add_missing_columns(cursor, 'tasks', {'recurrence': 'TEXT'})
+    _add_missing_columns(cursor, 'archived_tasks', {'series_id': 'INTEGER'})
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_archived_tasks_series ON archived_tasks(user_id, series_id)
+        WHERE series_id IS NOT NULL
+    ''')
+
+
+def _migrate_to_v8(cursor):
+    """
+    Creates task_dependencies, the adjacency table of subtasks and blocking tasks. Each row makes task_id
+    depend on depends_on_id: kind 'subtask' makes it the parent of depends_on_id, kind 'blocks' means
+    depends_on_id has to be completed first. A subtask has at most one parent, and the dependencies of a
+    task are dropped when it is deleted or archived.
+    """
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS task_dependencies (
+            task_id INTEGER NOT NULL,
+            depends_on_id INTEGER NOT NULL,
+            kind TEXT NOT NULL CHECK (kind IN ('subtask', 'blocks')),
+            user_id INTEGER NOT NULL,
+            PRIMARY KEY (task_id, depends_on_id)
+        )
+    ''')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_task_dependencies_user ON task_dependencies(user_id)')
+    cursor.execute('''
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_task_dependencies_parent ON task_dependencies(depends_on_id)
+        WHERE kind = 'subtask'
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS tasks_dependencies_delete AFTER DELETE ON tasks
+        BEGIN
+            DELETE FROM task_dependencies WHERE task_id = OLD.id OR depends_on_id = OLD.id;
+        END
+    ''')
+
+
+def _migrate_to_v9(cursor):
+    """
+    Keys the checkpoint of the write-behind journal by journal. Every application instance writes its own
+    log with its own sequence numbers, so instances sharing the database must not share a checkpoint.
+    The checkpoint of the single journal of earlier versions is kept under the empty journal ID.
+    """
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS write_journals (
+            journal_id TEXT PRIMARY KEY,
+            last_seq INTEGER NOT NULL DEFAULT 0
+        )
+    ''')
+    cursor.execute("INSERT OR IGNORE INTO write_journals (journal_id, last_seq) SELECT '', last_seq FROM write_journal")
+    cursor.execute('DROP TABLE write_journal')
+    cursor.execute('ALTER TABLE write_journals RENAME TO write_journal')
+
+
+def _migrate_to_v10(cursor):
+    """
+    Names the due week buckets of task_stats after the Monday of the week instead of "%Y-W%W", which split the
+    week containing the new year into two buckets. The old buckets are converted from their names rather than
+    counted again, so the counts of tasks in archive partitions and detached archives are converted as well.
+    """
+    for table in STATS_SOURCES:
+        for operation in ('insert', 'delete', 'update'):
+            cursor.execute(f'DROP TRIGGER IF EXISTS {table}_stats_{operation}')
+        _create_stats_triggers(cursor, table, STATS_SOURCES[table])
+
+    # Week n of a year starts n - 1 weeks after the first Monday; week 0 holds the days before it
+    week = "substr(bucket, -8)"
+    monday = f"date(substr({week}, 1, 4) || '-01-01', 'weekday 1', ((substr({week}, 7) - 1) * 7) || ' days')"
+    cursor.execute(f'''
+        CREATE TEMP TABLE converted_stats AS
+        SELECT user_id, source, dimension, substr(bucket, 1, length(bucket) - 8) || {monday} AS bucket,
+               SUM(count) AS count
+        FROM task_stats
+        WHERE dimension IN ('due_week', 'region_due_week') AND bucket GLOB '*[0-9][0-9][0-9][0-9]-W[0-9][0-9]'
+        GROUP BY 1, 2, 3, 4
+    ''')
+    cursor.execute('''
+        DELETE FROM task_stats
+        WHERE dimension IN ('due_week', 'region_due_week') AND bucket GLOB '*[0-9][0-9][0-9][0-9]-W[0-9][0-9]'
+    ''')
+    cursor.execute('''
+        INSERT INTO task_stats (user_id, source, dimension, bucket, count)
+        SELECT user_id, source, dimension, bucket, count FROM converted_stats WHERE true
+        ON CONFLICT (user_id, source, dimension, bucket) DO UPDATE SET count = count + excluded.count
+    ''')
+    cursor.execute('DROP TABLE converted_stats')
+
+
+# Ordered list of (target version, migration function)
+_MIGRATIONS = [
+    (1, _migrate_to_v1),
+    (2, _migrate_to_v2),
+    (3, _migrate_to_v3),
+    (4, _migrate_to_v4),
+    (5, _migrate_to_v5),
+    (6, _migrate_to_v6),
+    (7, _migrate_to_v7),
+    (8, _migrate_to_v8),
+    (9, _migrate_to_v9),
+    (10, _migrate_to_v10),
+]
+
+
+def initialize_database(db_path=None):
+    """
+    Initializes the SQLite database.
+    The schema is only touched if PRAGMA user_version is older than SCHEMA_VERSION, and each
+    database file is checked at most once per process.
+
+    :param db_path: Path to the SQLite database file (defaults to the application database).
+    :return: True if migrations were applied, False if the schema was already current.
+    """
+    if db_path is None:
+        db_path = get_default_db_path()
+    if db_path == ":memory:":
+        return False  # Every connection to :memory: is a new, empty database
+
+    key = os.path.abspath(db_path)
+    with _initialize_lock:
+        # The file may have been removed and recreated since the last check
+        if key in _initialized_paths and os.path.exists(db_path):
+            return False
+
+        conn = sqlite3.connect(db_path, isolation_level=None)
+        try:
+            cursor = conn.cursor()
+            cursor.execute('PRAGMA user_version')
+            if cursor.fetchone()[0] >= SCHEMA_VERSION:
+                _initialized_paths.add(key)
+                return False
+
+            # Take the write lock and read the version again, another process may have migrated meanwhile
+            cursor.execute('BEGIN IMMEDIATE')
+            try:
+                cursor.execute('PRAGMA user_version')
+                version = cursor.fetchone()[0]
+                for target_version, migration in _MIGRATIONS:
+                    if target_version > version:
+                        migration(cursor)
+                cursor.execute(f'PRAGMA user_version = {SCHEMA_VERSION}')
+                cursor.execute('COMMIT')
+            except sqlite3.Error:
+                cursor.execute('ROLLBACK')
+                raise
+        finally:
+            conn.close()
+
+        _initialized_paths.add(key)
+        return True
 
-    # Commit changes and close the connection
-    conn.commit()
-    conn.close()
-    print("Database and tables initialized successfully.")
 
 if __name__ == "__main__":
-    initialize_database()
+    initialize_database(sys.argv[1] if len(sys.argv) > 1 else None)
+    print("Database and tables initialized successfully.")
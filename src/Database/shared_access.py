@@ -0,0 +1,169 @@
+import time
+import random
+import sqlite3
+import threading
+
+BUSY_TIMEOUT = 10.0  # Seconds a connection waits for a lock held by another connection before failing
+RETRY_ATTEMPTS = 5  # Attempts of a write transaction that keeps failing with "database is locked"
+RETRY_DELAY = 0.05  # Seconds before the first retry, doubled for every further attempt
+RETRY_MAX_DELAY = 1.0
+
+_local_commits = 0  # Commits of connections opened with connect() in this process
+_local_commits_lock = threading.Lock()
+
+
+class _CountingConnection(sqlite3.Connection):
+    """
+    Connection that counts its commits, so the DataVersionWatcher can tell the commits of this instance
+    from those of other instances.
+    """
+
+    def commit(self):
+        global _local_commits
+        in_transaction = self.in_transaction
+        super().commit()
+        if in_transaction:
+            with _local_commits_lock:
+                _local_commits += 1
+
+
+def local_commit_count():
+    """
+    :return: Number of transactions committed so far by connections opened with connect() in this process.
+    """
+    return _local_commits
+
+
+def connect(db_path, **kwargs):
+    """
+    Opens a connection that waits up to BUSY_TIMEOUT seconds for locks of other connections and processes.
+
+    :param db_path: Path to the SQLite database file.
+    :param kwargs: Further arguments of sqlite3.connect.
+    """
+    kwargs.setdefault("factory", _CountingConnection)
+    return sqlite3.connect(db_path, timeout=BUSY_TIMEOUT, **kwargs)
+
+
+def enable_shared_mode(db_path):
+    """
+    Switches the database file to write-ahead logging, so several application instances can use it at the
+    same time: readers no longer block the writer and the writer no longer blocks readers. The journal mode
+    is stored in the file and stays in effect for all later connections.
+
+    :param db_path: Path to the SQLite database file.
+    :return: The journal mode now in effect, "wal" on success.
+    """
+    conn = connect(db_path, isolation_level=None)
+    try:
+        return conn.execute('PRAGMA journal_mode = WAL').fetchone()[0]
+    finally:
+        conn.close()
+
+
+def is_busy_error(error):
+    """
+    :return: True if the error is caused by a lock of another connection, i.e. retrying may succeed.
+    """
+    message = str(error).lower()
+    return isinstance(error, sqlite3.OperationalError) and ("locked" in message or "busy" in message)
+
+
+def retry_on_busy(function, *args, attempts=RETRY_ATTEMPTS, **kwargs):
+    """
+    Calls a function running one write transaction and calls it again with exponential backoff if it fails
+    because the database is locked. The function must roll back its transaction before raising.
+
+    :param function: The function to call.
+    :param attempts: Maximum number of calls.
+    :return: The result of the function.
+    :raises sqlite3.OperationalError: If the last attempt is still locked out, or on any other error.
+    """
+    for attempt in range(attempts):
+        try:
+            return function(*args, **kwargs)
+        except sqlite3.OperationalError as e:
+            if not is_busy_error(e) or attempt == attempts - 1:
+                raise
+            # Random jitter keeps instances that collided from retrying in lockstep
+            time.sleep(min(RETRY_DELAY * 2 ** attempt, RETRY_MAX_DELAY) * random.uniform(0.5, 1.0))
+
+
+class DataVersionWatcher:
+    """
+    Detects commits of other connections to a database with PRAGMA data_version, which changes whenever
+    another connection, in this or another process, has committed since the last check. The check is a
+    single cheap pragma on a dedicated connection, so it can be polled from the Tk loop.
+
+    A change in an interval in which this process committed through connect() is taken for its own commit
+    and not reported. The pragma cannot tell which connection committed, so a commit of another instance in
+    the same interval is reported with the next change, at the latest after UNCONFIRMED_LIMIT such intervals
+    in a row.
+    """
+
+    UNCONFIRMED_LIMIT = 5
+
+    def __init__(self, db_path, on_change, interval_ms=2000):
+        """
+        Initializes the watcher.
+
+        :param db_path: Path to the SQLite database file.
+        :param on_change: Callback without arguments, called after a change has been detected.
+        :param interval_ms: Polling interval when scheduled on a Tk root.
+        """
+        self.db_path = db_path
+        self.on_change = on_change
+        self.interval_ms = interval_ms
+        self._conn = None
+        self._version = None
+        self._local_commits = None
+        self._unconfirmed = 0  # Changes in a row that were taken for own commits
+        self._after_id = None
+
+    def check(self):
+        """
+        Checks for commits since the previous check and calls on_change if there were any.
+
+        :return: True if a change was detected.
+        """
+        if self._conn is None:
+            self._conn = connect(self.db_path, isolation_level=None)
+        version = self._conn.execute('PRAGMA data_version').fetchone()[0]
+        local_commits = local_commit_count()
+        changed = self._version is not None and version != self._version
+        if not changed:
+            self._unconfirmed = 0
+        elif local_commits != self._local_commits:
+            self._unconfirmed += 1
+            changed = self._unconfirmed >= self.UNCONFIRMED_LIMIT
+        self._version = version
+        self._local_commits = local_commits
+        if changed:
+            self._unconfirmed = 0
+            self.on_change()
+        return changed
+
+    def schedule(self, root):
+        """
+        Polls for changes every interval_ms milliseconds in the Tk loop of root.
+        """
+        def poll():
+            try:
+                self.check()
+            except sqlite3.Error:
+                pass  # A locked or busy database is checked again on the next poll
+            self._after_id = root.after(self.interval_ms, poll)
+
+        self.check()  # Remember the current version, later changes are reported
+        self._after_id = root.after(self.interval_ms, poll)
+
+    def cancel(self, root):
+        """
+        Stops polling and closes the connection.
+        """
+        if self._after_id is not None:
+            root.after_cancel(self._after_id)
+            self._after_id = None
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
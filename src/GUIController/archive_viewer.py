@@ -63,6 +63,11 @@ class ArchiveViewer(tk.Toplevel):
         self.due_date_entry = tk.Entry(filter_frame, width=15)
         self.due_date_entry.pack(side="left", padx=5)
 
+        # Older years are stored in separate archive files and only read on request
+        self.all_years_var = tk.BooleanVar(value=False)
+        tk.Checkbutton(filter_frame, text="All years", variable=self.all_years_var,
+                       command=self.load_archived_tasks).pack(side="left", padx=5)
+
         # Apply and Reset Buttons
         tk.Button(filter_frame, text="Apply Filters", command=self.apply_filters).pack(side="left", padx=5)
         tk.Button(filter_frame, text="Reset Filters", command=self.reset_filters).pack(side="left", padx=5)
@@ -80,42 +85,14 @@ class ArchiveViewer(tk.Toplevel):
         Loads archived tasks from the database based on the current filters.
         """
         self.archived_listbox.delete(0, tk.END)
-        conn = sqlite3.connect(self.controller.db_path)
-        cursor = conn.cursor()
-
-        # Base query
-        query = '''
-            SELECT title, description, due_date, importance, urgency, fitness, status 
-            FROM archived_tasks 
-            WHERE user_id = ?
-        '''
-        params = [self.controller.current_user_id]
-
-        # Apply filters
-        if self.filters:
-            if 'search' in self.filters:
-                query += ' AND title LIKE ?'
-                params.append(f"%{self.filters['search']}%")
-            if 'importance' in self.filters:
-                query += ' AND UPPER(importance) = ?'
-                params.append(self.filters['importance'].upper())
-            if 'urgency' in self.filters:
-                query += ' AND UPPER(urgency) = ?'
-                params.append(self.filters['urgency'].upper())
-            if 'fitness' in self.filters:
-                query += ' AND UPPER(fitness) = ?'
-                params.append(self.filters['fitness'].upper())
-            if 'due_date' in self.filters:
-                query += ' AND due_date <= ?'
-                params.append(self.filters['due_date'].strftime("%Y-%m-%d"))
-
-        cursor.execute(query, params)
-        rows = cursor.fetchall()
-        conn.close()
+        rows = self.controller.archive_manager.search_archive(self.controller.current_user_id, self.filters,
+                                                              include_partitions=self.all_years_var.get())
 
         self.archived_tasks = []  # Store the loaded tasks
+        self.archived_locations = []  # Partition year and archive ID of each loaded task
         for row in rows:
-            title, description, due_date_str, importance_str, urgency_str, fitness_str, status_str = row
+            year, archived_id, title, description, due_date_str, importance_str, urgency_str, fitness_str, \
+                status_str = row
             due_date = datetime.strptime(due_date_str, '%Y-%m-%d').date() if due_date_str else None
             importance = Priority[importance_str.upper()]
             urgency = Priority[urgency_str.upper()]
@@ -132,6 +109,7 @@ class ArchiveViewer(tk.Toplevel):
                 status=status
             )
             self.archived_tasks.append(task)
+            self.archived_locations.append((year, archived_id))
             self.archived_listbox.insert(tk.END, f"{title} - {due_date_str} - {importance_str}, {urgency_str}, {fitness_str}")
 
     def apply_filters(self):
@@ -194,34 +172,19 @@ class ArchiveViewer(tk.Toplevel):
             return
 
         selected_task = self.archived_tasks[selected_index[0]]
+        year, archived_id = self.archived_locations[selected_index[0]]
         try:
-            conn = sqlite3.connect(self.controller.db_path)
-            cursor = conn.cursor()
-
-            # Insert the task back into the tasks table
-            cursor.execute('''
-                INSERT INTO tasks (title, description, due_date, importance, urgency, fitness, status, user_id)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                selected_task.title,
-                selected_task.description,
-                selected_task.due_date.strftime("%Y-%m-%d") if selected_task.due_date else None,
-                selected_task.importance.value,
-                selected_task.urgency.value,
-                selected_task.fitness.value,
-                Status.OPEN.value,
-                self.controller.current_user_id
-            ))
-
-            # Remove the task from the archived_tasks table
-            cursor.execute('DELETE FROM archived_tasks WHERE title = ? AND user_id = ?',
-                           (selected_task.title, self.controller.current_user_id))
-
-            conn.commit()
-            conn.close()
+            # Move the task back into the tasks table, from the main archive or its yearly archive file
+            reactivated_id = self.controller.archive_manager.reactivate_archived_task(
+                archived_id, self.controller.current_user_id, year)
+            if reactivated_id is None:
+                messagebox.showerror("Error", f"Task '{selected_task.title}' is no longer in the archive.")
+                self.load_archived_tasks()
+                return
 
             # Remove the task from the archived tasks list and UI
             self.archived_tasks.pop(selected_index[0])
+            self.archived_locations.pop(selected_index[0])
             self.archived_listbox.delete(selected_index)
 
             # Open the reactivated task in the TaskEditor
@@ -232,11 +195,12 @@ class ArchiveViewer(tk.Toplevel):
                 importance=selected_task.importance,
                 urgency=selected_task.urgency,
                 fitness=selected_task.fitness,
-                status=Status.OPEN
+                status=Status.OPEN,
+                task_id=reactivated_id
             )
+            # Add the task to the cached task list instead of reloading it
+            reactivated_task = self.controller.session.put_task(reactivated_task)
             messagebox.showinfo("Success", f"Task '{reactivated_task.title}' has been reactivated.")
             TaskEditor(self.controller, "Edit Task", task=reactivated_task)
-
-            self.controller.load_tasks()  # Refresh the main task list
         except sqlite3.Error as e:
             messagebox.showerror("Database Error", f"Error reactivating task: {e}")
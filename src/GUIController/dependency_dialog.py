@@ -0,0 +1,77 @@
+import os
+import sys
+import tkinter as tk
+from tkinter import ttk, messagebox
+
+# Import paths for other modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../Task')))
+
+from dependency_graph import SUBTASK, BLOCKS
+
+# Relations offered by the dialog: label -> (kind, whether the selected tasks are the prerequisites)
+RELATIONS = {
+    "are subtasks of": (SUBTASK, True),
+    "are blocked by": (BLOCKS, False),
+    "block": (BLOCKS, True),
+}
+
+
+class DependencyDialog(tk.Toplevel):
+    """
+    A small window for linking the selected tasks to another task, as its subtasks or as blocked or blocking
+    tasks, or for removing their links.
+    """
+
+    def __init__(self, controller, tasks, candidates, on_link, on_unlink):
+        """
+        Initializes the dialog.
+
+        :param controller: Reference to the GUIController instance.
+        :param tasks: The selected Task objects.
+        :param candidates: Tasks the selected tasks can be linked to.
+        :param on_link: Callback receiving a list of (task_id, depends_on_id, kind) dependencies.
+        :param on_unlink: Callback called without arguments to remove the links of the selected tasks.
+        """
+        super().__init__(controller.root)
+        self.controller = controller
+        self.tasks = tasks
+        self.candidates = candidates
+        self.on_link = on_link
+        self.on_unlink = on_unlink
+        self.title("Link Tasks")
+        self.geometry("300x250")
+
+        tk.Label(self, text=f"The {len(tasks)} selected task(s):").pack(pady=5)
+        self.relation_combo = ttk.Combobox(self, values=list(RELATIONS), state="readonly")
+        self.relation_combo.set("are subtasks of")
+        self.relation_combo.pack(pady=5)
+
+        tk.Label(self, text="Task:").pack(pady=5)
+        self.target_combo = ttk.Combobox(self, values=[f"{task.title} (#{task.id})" for task in candidates],
+                                         state="readonly", width=40)
+        self.target_combo.pack(pady=5)
+
+        tk.Button(self, text="Link", command=self.link).pack(pady=5)
+        tk.Button(self, text="Remove Links", command=self.unlink).pack(pady=5)
+
+    def link(self):
+        """
+        Passes the dependencies for the chosen relation to the callback and closes the dialog.
+        """
+        index = self.target_combo.current()
+        if index < 0:
+            messagebox.showwarning("No Task", "Please choose the task to link to.")
+            return
+        target = self.candidates[index]
+        kind, prerequisites = RELATIONS[self.relation_combo.get()]
+        dependencies = [(target.id, task.id, kind) if prerequisites else (task.id, target.id, kind)
+                        for task in self.tasks]
+        self.destroy()
+        self.on_link(dependencies)
+
+    def unlink(self):
+        """
+        Removes the links of the selected tasks and closes the dialog.
+        """
+        self.destroy()
+        self.on_unlink()
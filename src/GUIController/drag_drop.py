@@ -1,8 +1,9 @@
 import os
 import sys
 import math
-import sqlite3
+from tkinter import messagebox
 
+# Import paths for other modules
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../Task')))
 
 from task import Priority
@@ -13,34 +14,31 @@ class DragDropHandler:
     Handles drag-and-drop functionality for tasks within the Venn diagram.
     """
 
-    def __init__(self, canvas, task_elements, gui_controller, db_path):
+    def __init__(self, canvas, task_elements, gui_controller):
         """
         Initializes the DragDropHandler.
 
         :param canvas: The canvas where tasks are displayed.
         :param task_elements: A dictionary mapping task IDs to their canvas text IDs.
         :param gui_controller: Reference to the GUIController instance.
-        :param db_path: Path to the SQLite database.
         """
         self.canvas = canvas
         self.task_elements = task_elements
         self.gui_controller = gui_controller
 
-        # Dynamically determine the database path if not provided
-        if db_path is None:
-            if getattr(sys, 'frozen', False):  # Running as an executable
-                self.db_path = os.path.join(os.path.dirname(sys.executable), "database.db")
-            else:  # Running as a script
-                self.db_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '../Database/database.db'))
-        else:
-            self.db_path = db_path
-
         self.dragging_task_id = None
         self.start_x = None
         self.start_y = None
         self.is_dragging = False
         self.drag_threshold = 50  # Minimum distance to start dragging
 
+        self.frame_interval = 16  # Milliseconds between two proxy updates, about the display frame rate
+        self.frame_id = None  # Pending after() callback applying the latest pointer position
+        self.pointer = None  # Latest pointer position reported by a motion event
+        self.proxy_id = None  # Canvas item moved in place of the dragged task label
+        self.label_origin = None  # Position of the dragged label when the drag started
+        self.label_fill = None  # Color of the dragged label, restored when the drag ends
+
     def start_drag(self, event, task_id):
         """
         Prepares for dragging of a task.
@@ -48,6 +46,7 @@ class DragDropHandler:
         :param event: The mouse event.
         :param task_id: The ID of the task being dragged.
         """
+        self.end_drag()
         self.is_dragging = False  # Reset dragging flag
         self.dragging_task_id = task_id
         self.start_x = event.x
@@ -56,107 +55,123 @@ class DragDropHandler:
     def drag_task(self, event, task_id):
         """
         Handles the movement of a task during dragging.
+        Motion events only record the pointer position; the drag proxy is moved at most once per frame.
         """
         if self.dragging_task_id != task_id:
             return  # Ignore if it's not the task currently being dragged
 
-        # Calculate movement
-        dx = event.x - self.start_x
-        dy = event.y - self.start_y
-        self.canvas.move(self.task_elements[task_id], dx, dy)
+        self.pointer = (event.x, event.y)
+        if not self.is_dragging:
+            if math.hypot(event.x - self.start_x, event.y - self.start_y) < self.drag_threshold:
+                return  # Still a click
+            self.begin_proxy(task_id)
 
-        # Update starting position for the next motion event
-        self.start_x = event.x
-        self.start_y = event.y
+        if self.frame_id is None:
+            self.frame_id = self.canvas.after(self.frame_interval, self.apply_motion)
 
-    def drop_task(self, event, task_id):
+    def begin_proxy(self, task_id):
         """
-        Finalizes the task's position after dropping and updates its priority in the database.
+        Turns the press into a drag: dims the task label and creates a lightweight copy that follows the pointer,
+        so the real item, its index entry and its neighbours stay untouched until the drop.
         """
-        if self.dragging_task_id != task_id:
-            return  # Ignore if it's not the task currently being dragged
+        self.is_dragging = True
+        text_id = self.task_elements[task_id]
+        self.label_origin = tuple(self.canvas.coords(text_id)[:2])
+        self.label_fill = self.canvas.itemcget(text_id, "fill")
+        self.canvas.itemconfig(text_id, fill="gray70")
+        self.proxy_id = self.canvas.create_text(*self.label_origin, text=self.canvas.itemcget(text_id, "text"),
+                                                fill="gray30", tags="drag_proxy")
+
+    def apply_motion(self):
+        """
+        Moves the drag proxy to the latest pointer position, keeping its offset from the pointer.
+        """
+        self.frame_id = None
+        if self.proxy_id is None or self.pointer is None:
+            return
+        self.canvas.coords(self.proxy_id, self.label_origin[0] + self.pointer[0] - self.start_x,
+                           self.label_origin[1] + self.pointer[1] - self.start_y)
 
-        # Stop dragging
+    def end_drag(self):
+        """
+        Removes the drag proxy and cancels a pending frame, restoring the task label.
+        """
+        if self.frame_id is not None:
+            self.canvas.after_cancel(self.frame_id)
+            self.frame_id = None
+        if self.proxy_id is not None:
+            self.canvas.delete(self.proxy_id)
+            self.proxy_id = None
+            text_id = self.task_elements.get(self.dragging_task_id)
+            if text_id is not None:
+                self.canvas.itemconfig(text_id, fill=self.label_fill)
+        self.pointer = None
+
+    def cancel_drag(self):
+        """
+        Ends tracking the pressed task without changing it, e.g. when the press turned out to be a click.
+        """
+        self.end_drag()
         self.is_dragging = False
         self.dragging_task_id = None
 
-        x, y = event.x, event.y
-        new_priority_area = self.get_priority_from_position(x, y)
-
-        # Update the task's priority in the database
-        try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-
-            # Update the task's priority in the database
-            cursor.execute('''
-                UPDATE tasks
-                SET importance = ?, urgency = ?, fitness = ?
-                WHERE id = ?
-            ''', (new_priority_area[0].name, new_priority_area[1].name, new_priority_area[2].name, task_id))
+    def drop_task(self, event, task_id):
+        """
+        Finalizes the task's position after dropping.
+        The task and its label are updated at once; the new priorities are queued in the write-behind buffer,
+        which writes them together with other drops and rolls the task back if the write fails.
 
-            conn.commit()
-            conn.close()
+        The label is shown in the region of the task's effective priorities (see DependencyGraph), so the drop
+        is compared with that region and only the priorities that differ from it are written. A task cannot be
+        dropped below the importance or urgency it inherits from the tasks depending on it.
+        """
+        if self.dragging_task_id != task_id:
+            return  # Ignore if it's not the task currently being dragged
 
-            # Update the task in memory
-            task = next((task for task in self.gui_controller.tasks if task.id == task_id), None)
-            if task:
-                task.importance, task.urgency, task.fitness = new_priority_area
+        # Stop dragging
+        self.cancel_drag()
 
-            # Refresh the Venn diagram
-            self.gui_controller.update_task_venn_diagram()
+        # The drop position is in canvas coordinates, the circles are defined in diagram coordinates
+        x, y = self.gui_controller.view_transform.to_world(event.x, event.y)
+        new_priority_area = self.get_priority_from_position(x, y)
 
-        except sqlite3.Error as e:
-            print(f"Error updating database for task ID {task_id}: {e}")
+        task = next((task for task in self.gui_controller.tasks if task.id == task_id), None)
+        if task is None:
+            return
+        previous = (task.importance, task.urgency, task.fitness)
+        graph = self.gui_controller.dependency_graph
+        effective = graph.effective(task_id)
+        shown = (effective[0], effective[1], task.fitness) if effective else previous
+        if shown == new_priority_area:
+            return  # Dropped into the region it came from
+
+        inherited = graph.inherited(task_id)
+        kept = [name for name, value, floor in (("importance", new_priority_area[0], inherited[0]),
+                                                ("urgency", new_priority_area[1], inherited[1]))
+                if floor == Priority.HIGH and value != Priority.HIGH]
+        if kept:
+            messagebox.showinfo("Inherited Priority",
+                                f"This task inherits high {' and '.join(kept)} from the tasks depending on it. "
+                                "Lower their priorities or remove the links first.")
+            return
+
+        current = tuple(own if new == old else new for own, old, new in zip(previous, shown, new_priority_area))
+        if current == previous:
+            return
+
+        # Update the task in memory, the task cache moves its label on the Venn diagram
+        task.importance, task.urgency, task.fitness = current
+        session = self.gui_controller.session
+        session.put_task(task)
+        self.gui_controller.write_buffer.queue_priorities(session.user_id, task_id, previous, current)
 
     def get_priority_from_position(self, x, y):
         """
         Determines the task priority based on the drop position.
 
-        :param x: The x-coordinate of the drop position.
-        :param y: The y-coordinate of the drop position.
-        :return: A tuple representing the new priority (Priority.IMPORTANCE, Priority.URGENCY, Priority.FITNESS).
+        :param x: The x-coordinate of the drop position in diagram coordinates.
+        :param y: The y-coordinate of the drop position in diagram coordinates.
+        :return: A tuple representing the new priority (importance, urgency, fitness) as Priority values.
         """
-        # Center of the Venn diagram
-        venn_center_x, venn_center_y = 512, 512
-        medium_radius = 375
-        hhh_radius = 75
-
-        # Define centers for each circle
-        importance_center = (venn_center_x - medium_radius, venn_center_y)
-        urgency_center = (venn_center_x, venn_center_y + medium_radius)
-        fitness_center = (venn_center_x + medium_radius, venn_center_y)
-
-        # Threshold for determining proximity to the center of a circle
-        threshold = medium_radius
-
-        # Distance calculations
-        distance_to_importance = math.sqrt((x - importance_center[0]) ** 2 + (y - importance_center[1]) ** 2)
-        distance_to_urgency = math.sqrt((x - urgency_center[0]) ** 2 + (y - urgency_center[1]) ** 2)
-        distance_to_fitness = math.sqrt((x - fitness_center[0]) ** 2 + (y - fitness_center[1]) ** 2)
-
-        # Initialize priorities
-        importance = Priority.LOW
-        urgency = Priority.LOW
-        fitness = Priority.LOW
-
-        # Determine proximity for "Do Now" (HHH)
-        if (
-                math.sqrt((x - venn_center_x) ** 2 + (y - venn_center_y - 75) ** 2) <= hhh_radius
-        ):
-            return Priority.HIGH, Priority.HIGH, Priority.HIGH
-
-        # Determine other priorities
-        if distance_to_importance < threshold:
-            importance = Priority.HIGH
-        if distance_to_urgency < threshold:
-            urgency = Priority.HIGH
-        if distance_to_fitness < threshold:
-            fitness = Priority.HIGH
-
-        # Return the determined priorities
-        return importance, urgency, fitness
-
-
-
-
+        # Precomputed lookup of the circles the diagram is drawn with
+        return self.gui_controller.region_raster.priorities_at(x, y)
@@ -1,10 +1,9 @@
 import os
 import sys
-import math
 import sqlite3
 import tkinter as tk
-from tkinter import messagebox, Canvas
-from datetime import datetime
+from tkinter import messagebox, Canvas, font as tkfont
+from datetime import date, datetime
 
 
 # Import paths for other modules
@@ -13,19 +12,52 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../A
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../NotificationManager')))
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../SettingsManager')))
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../FilterController')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../Database')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../Task/TaskRepository')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../User')))
 
 
-from task import Task, Priority, Status
+from task import Priority, Status
+from dependency_graph import DependencyGraph
 from archive_manager import ArchiveManager
+from archive_snapshot import ArchiveSnapshot
+from session import Session
 from notification_manager import NotificationManager
 from settings_manager import SettingsManager
 from task_editor import TaskEditor
 from settings_window import SettingsWindow
 from archive_viewer import ArchiveViewer
+from stats_window import StatsWindow
 from login_window import LoginWindow
 from filter_controller import FilterController
 from drag_drop import DragDropHandler
-
+from priority_dialog import PriorityDialog
+from dependency_dialog import DependencyDialog
+from venn_geometry import VennGeometry, RegionRaster, REGIONS
+from venn_layout import VennLayout, SpatialGrid
+from view_transform import ViewTransform
+from database_setup import initialize_database
+from database_maintenance import DatabaseMaintenance
+from shared_access import connect, enable_shared_mode, DataVersionWatcher
+from task_repository import TaskRepository
+from task_cache import TaskCache, task_matches_filters
+from write_behind_buffer import WriteBehindBuffer
+from change_feed import ChangeFeed
+from write_journal import WriteJournal
+
+# Regions holding more tasks than this are collapsed into a badge until the badge is clicked
+CLUSTER_THRESHOLD = 30
+# Tasks still shown in a collapsed region, earliest due date first
+CLUSTER_TOP_N = 5
+
+# Height of a task label on the canvas, in pixels
+LABEL_HEIGHT = 15
+# Scale factor of one mouse wheel step
+ZOOM_STEP = 1.25
+
+# Modifier bits of Tk event.state
+SHIFT_MASK = 0x0001
+CONTROL_MASK = 0x0004
 
 
 class GUIController:
@@ -33,11 +65,21 @@ class GUIController:
     Controls the interaction between the GUI and the backend components.
     """
 
-    def __init__(self, root):
+    def __init__(self, root, write_behind=False, archive_snapshot=False, shared=False):
+        """
+        Initializes the GUIController.
+
+        :param root: The Tk root window.
+        :param write_behind: If True, task edits are queued in a journal and written by a background thread.
+        :param archive_snapshot: If True, the archive viewer and statistics read a periodically refreshed
+                                 read-only copy of the database instead of the live database.
+        :param shared: If True, the database file is opened for use by several instances at the same time
+                       with write-ahead logging.
+        """
         self.root = root
         self.root.title("Sung Task Manager")
 
-        self.current_user = None  # Stores the logged-in user's name
+        self.session = None  # Session of the logged-in user, started by the LoginWindow
 
         if getattr(sys, 'frozen', False):  # Executable mode
             db_path = os.path.join(os.path.dirname(sys.executable), "database.db")
@@ -46,20 +88,76 @@ class GUIController:
 
         self.db_path = db_path
 
+        # Bootstrap the schema once for the whole process before any component touches the database
+        initialize_database(self.db_path)
+        if shared:
+            try:
+                enable_shared_mode(self.db_path)
+            except sqlite3.Error as e:
+                messagebox.showerror("Database Error", f"Error enabling write-ahead logging: {e}")
+
+        # Edits of previous sessions that were journaled but not written before they ended are replayed first.
+        # Journals of other running instances are locked and left to them.
+        self.write_journal = WriteJournal(self.db_path)
+        try:
+            WriteJournal.recover_abandoned(self.db_path)
+        except sqlite3.Error as e:
+            messagebox.showerror("Database Error", f"Error replaying the write journal: {e}")
+        self.journal_rejected = False  # Whether the cache holds edits the journal could not apply
+        if write_behind:
+            self.write_journal.start()
+            self.root.after(1000, self.check_write_journal)
+
+        # Decoded tasks are cached and kept up to date by the components that write them
+        self.task_repository = TaskRepository(self.db_path, journal=self.write_journal)
+        self.task_cache = TaskCache(self.task_repository)
+        self.task_cache.subscribe(self.on_task_changed)
+        # Subtasks and blocking tasks inherit the priorities and due dates of the tasks depending on them
+        self.dependency_graph = DependencyGraph()
+
+        # Drops are shown at once and written in batches; a failed batch puts the tasks back where they were
+        self.write_buffer = WriteBehindBuffer(self.task_repository, self.root.after, on_error=self.on_write_failed)
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+
         self.login_window = LoginWindow(self)
 
         # Initialize the task list and canvas mappings
         self.tasks = []  # Holds all tasks
-        self.task_elements = {}  # Maps task titles to their canvas elements for drag-and-drop
+        self.task_filters = None  # Filters applied to self.tasks
+        self.task_elements = {}  # Maps task IDs to their canvas elements for drag-and-drop
+        self.task_regions = {}  # Maps task IDs to the Venn region they are displayed in
 
         self.settings_manager = SettingsManager(db_path=self.db_path)
-        self.archive_manager = ArchiveManager(db_path=self.db_path)
+        self.archive_snapshot = ArchiveSnapshot(self.db_path) if archive_snapshot else None
+        self.archive_manager = ArchiveManager(db_path=self.db_path, snapshot=self.archive_snapshot)
         self.notification_manager = NotificationManager(self.settings_manager)
 
         self.drag_drop_handler = None  # Drag-and-drop handler, initialized later
 
         self.selected_task = None  # Tracks selected task for editing
         self.selected_task_index = None  # index of selected task
+        self.selected_task_ids = set()  # IDs of all tasks selected on the Venn diagram
+        self.low_task_ids = []  # Task IDs in the order of the "LOW Priority Tasks" listbox entries
+        self.rubber_band = None  # Start point and canvas item of the selection rectangle
+        self.deferred_refresh = False  # Set while bulk operations report many changes to the task cache
+
+        self.expanded_regions = set()  # Crowded regions the user expanded by clicking their badge
+        self.collapsed_regions = set()  # Crowded regions currently shown as a badge
+
+        # Circle geometry shared by drawing, task layout and drop hit-testing, and the zoom/pan transform
+        # mapping it onto the canvas
+        self.venn_geometry = VennGeometry()
+        self.view_transform = ViewTransform()
+        self.label_font = tkfont.nametofont("TkDefaultFont")
+        self.venn_layouts = {}  # Layout engines per zoom scale, each caches its candidate positions
+        self.venn_layout_result = None  # Positions computed by the last layout, rendered by render_tasks
+        self.pan_start = None  # Last mouse position while the diagram is panned
+
+        # Constant-time lookups for pointer events: the region under a diagram point, and the task label or
+        # badge under a canvas point (rebuilt whenever the labels are rendered)
+        self.region_raster = RegionRaster(self.venn_geometry)
+        self.label_index = SpatialGrid(cell_size=64)
+        self.pressed_task_id = None  # Task the left mouse button was pressed on
 
         self.create_widgets()
 
@@ -69,6 +167,18 @@ class GUIController:
         self.schedule_notifications()
         self.filter_controller = FilterController(self)
 
+        # Backups and compaction run in a worker thread, the Tk loop only checks when they are due
+        self.database_maintenance = DatabaseMaintenance(self.db_path)
+        self.database_maintenance.schedule(self.root)
+
+        # In shared mode commits of other instances are detected by polling, the change feed then updates
+        # only the tasks they changed
+        self.change_feed = ChangeFeed(self.task_cache)
+        self.data_version_watcher = None
+        if shared:
+            self.data_version_watcher = DataVersionWatcher(self.db_path, self.on_database_changed)
+            self.data_version_watcher.schedule(self.root)
+
     def create_widgets(self):
 
         # Main canvas for the Venn Diagram
@@ -78,16 +188,34 @@ class GUIController:
         # Draw Venn diagram areas with overlapping regions
         self.draw_venn_diagram()
 
+        # Left button events are dispatched to task dragging, badges or rubber-band selection
+        self.venn_canvas.bind("<ButtonPress-1>", self.canvas_press)
+        self.venn_canvas.bind("<B1-Motion>", self.canvas_motion)
+        self.venn_canvas.bind("<ButtonRelease-1>", self.canvas_release)
+
+        # Zoom with the mouse wheel (MouseWheel on Windows/macOS, Button-4/5 on X11), pan with the middle
+        # or right mouse button, Control-0 resets the view
+        self.venn_canvas.bind("<MouseWheel>", self.zoom_venn_diagram)
+        self.venn_canvas.bind("<Button-4>", self.zoom_venn_diagram)
+        self.venn_canvas.bind("<Button-5>", self.zoom_venn_diagram)
+        for button in (2, 3):
+            self.venn_canvas.bind(f"<ButtonPress-{button}>", self.start_pan)
+            self.venn_canvas.bind(f"<B{button}-Motion>", self.pan_venn_diagram)
+            self.venn_canvas.bind(f"<ButtonRelease-{button}>", self.end_pan)
+        self.root.bind("<Control-0>", self.reset_view)
+
         # Create "LOW Priority Tasks" listbox on the right side
         self.low_listbox_label = tk.Label(self.root, text="LOW Priority Tasks", font=("Helvetica", 12, "bold"))
         self.low_listbox_label.place(relx=1.0, rely=0.05, anchor="ne")  # Align to the top-right corner of the window
 
         # Adjust the size and position of the listbox
-        self.low_listbox = tk.Listbox(self.root, selectmode=tk.SINGLE, width=25, height=10)  # Reduced height
+        self.low_listbox = tk.Listbox(self.root, selectmode=tk.EXTENDED, exportselection=False, width=25,
+                                      height=10)  # Reduced height
         self.low_listbox.place(relx=1.0, rely=0.1, anchor="ne")  # Align below the label
 
         # Bind selection event for low_listbox to update selected task index
         self.low_listbox.bind("<<ListboxSelect>>", self.low_listbox_select)
+        self.low_listbox.bind("<ButtonPress-1>", self.low_listbox_press)
 
         # Buttons for task actions at the top of the window
         btn_frame = tk.Frame(self.root)
@@ -100,8 +228,12 @@ class GUIController:
         tk.Button(btn_frame, text="Mark as Completed", command=self.mark_task_completed).grid(row=0, column=3, padx=5)
         tk.Button(btn_frame, text="Mark as Open", command=self.mark_task_open).grid(row=0, column=4, padx=5)
         tk.Button(btn_frame, text="Archive Task", command=self.archive_selected_task).grid(row=0, column=5, padx=5)
-        tk.Button(btn_frame, text="Show Archive", command=self.show_archive).grid(row=0, column=6, padx=5)
-        tk.Button(btn_frame, text="Settings", command=self.show_settings).grid(row=0, column=7, padx=5)
+        tk.Button(btn_frame, text="Set Priority", command=self.reprioritize_selected_tasks).grid(row=0, column=6,
+                                                                                                 padx=5)
+        tk.Button(btn_frame, text="Link Tasks", command=self.link_selected_tasks).grid(row=0, column=7, padx=5)
+        tk.Button(btn_frame, text="Show Archive", command=self.show_archive).grid(row=0, column=8, padx=5)
+        tk.Button(btn_frame, text="Settings", command=self.show_settings).grid(row=0, column=9, padx=5)
+        tk.Button(btn_frame, text="Statistics", command=self.show_statistics).grid(row=0, column=10, padx=5)
 
     def draw_venn_diagram(self):
         """
@@ -109,9 +241,13 @@ class GUIController:
         Enlarges the circles to fill more space, with overlapping transparency effects.
         """
 
-        # Center of the canvas
-        center_x, center_y = 512, 512
-        medium_radius = 275  # Adjusted radius for each circle to avoid overlap with "LOW Priority Tasks"
+        self.venn_canvas.delete("venn_background")
+        geometry = self.venn_geometry
+        transform = self.view_transform
+
+        # Captions keep their size and distance from the circles at every zoom level
+        top_y = transform.to_screen(0, geometry.center_y - geometry.radius)[1]
+        bottom_y = transform.to_screen(0, geometry.urgency_center[1] + geometry.radius)[1]
 
         # Colors with transparency
         importance_color = "#add8e6"  # Light blue for Importance
@@ -119,28 +255,31 @@ class GUIController:
         urgency_color = "#ffd700"  # Light yellow for Urgency
 
         # Draw circles for Importance, Urgency, and Fitness
-        self.venn_canvas.create_oval(center_x - medium_radius - 150, center_y - medium_radius,
-                                     center_x + medium_radius - 150, center_y + medium_radius,
-                                     fill=importance_color, outline="", tags="importance_area")
-        self.venn_canvas.create_text(center_x - 150, center_y - medium_radius - 20, text="IMPORTANT: Plan", fill="blue",
-                                     font=("Helvetica", 14, "bold"))
-
-        self.venn_canvas.create_oval(center_x - medium_radius + 150, center_y - medium_radius,
-                                     center_x + medium_radius + 150, center_y + medium_radius,
-                                     fill=fitness_color, outline="", tags="fitness_area")
-        self.venn_canvas.create_text(center_x + 150, center_y - medium_radius - 20, text="FITNESS: Make Time",
-                                     fill="green",
-                                     font=("Helvetica", 14, "bold"))
-
-        self.venn_canvas.create_oval(center_x - medium_radius, center_y - medium_radius + 150,
-                                     center_x + medium_radius, center_y + medium_radius + 150,
-                                     fill=urgency_color, outline="", tags="urgency_area")
-        self.venn_canvas.create_text(center_x, center_y + medium_radius + 30, text="URGENT: Delegate Next", fill="red",
-                                     font=("Helvetica", 14, "bold"))
-
-        # Text labels for Do Now section, adjusted to match new circle positions
-        self.venn_canvas.create_text(center_x, center_y + 100, text="Do Now", fill="black",
-                                     font=("Helvetica", 16, "bold"))
+        self.venn_canvas.create_oval(*transform.bbox_to_screen(geometry.circle_bbox(geometry.importance_center)),
+                                     fill=importance_color, outline="", tags=("importance_area", "venn_background"))
+        self.venn_canvas.create_text(transform.to_screen(*geometry.importance_center)[0], top_y - 20,
+                                     text="IMPORTANT: Plan", fill="blue",
+                                     font=("Helvetica", 14, "bold"), tags="venn_background")
+
+        self.venn_canvas.create_oval(*transform.bbox_to_screen(geometry.circle_bbox(geometry.fitness_center)),
+                                     fill=fitness_color, outline="", tags=("fitness_area", "venn_background"))
+        self.venn_canvas.create_text(transform.to_screen(*geometry.fitness_center)[0], top_y - 20,
+                                     text="FITNESS: Make Time", fill="green",
+                                     font=("Helvetica", 14, "bold"), tags="venn_background")
+
+        self.venn_canvas.create_oval(*transform.bbox_to_screen(geometry.circle_bbox(geometry.urgency_center)),
+                                     fill=urgency_color, outline="", tags=("urgency_area", "venn_background"))
+        self.venn_canvas.create_text(transform.to_screen(*geometry.urgency_center)[0], bottom_y + 30,
+                                     text="URGENT: Delegate Next", fill="red",
+                                     font=("Helvetica", 14, "bold"), tags="venn_background")
+
+        # Text label for the Do Now section, task labels are laid out around it
+        self.do_now_label = self.venn_canvas.create_text(*transform.to_screen(*geometry.do_now_position),
+                                                         text="Do Now", fill="black",
+                                                         font=("Helvetica", 16, "bold"), tags="venn_background")
+
+        # Keep the background below any task labels that are already shown
+        self.venn_canvas.tag_lower("venn_background")
 
     def update_task_venn_diagram(self):
         """
@@ -149,174 +288,446 @@ class GUIController:
         """
         self.venn_canvas.delete("task_text")
         self.low_listbox.delete(0, tk.END)
+        self.low_task_ids.clear()
         self.task_elements.clear()  # Reset task mapping
 
         # Initialize DragDropHandler if not already initialized
-        # Initialize DragDropHandler
-        self.drag_drop_handler = DragDropHandler(
-            self.venn_canvas,
-            self.task_elements,
-            self,
-            db_path=self.db_path
-        )
+        if self.drag_drop_handler is None:
+            self.drag_drop_handler = DragDropHandler(self.venn_canvas, self.task_elements, self)
 
-        # Define the center of the Venn Diagram
-        venn_center_x, venn_center_y = 512, 512
-        medium_radius = 375
-        hhh_radius = 75  # Radius for "Do Now" circular placement
-        hhh_angle_step = 30  # Angle step for placing tasks in "HHH"
-
-        # Centers for priority areas
-        importance_center = (venn_center_x - medium_radius, venn_center_y)
-        urgency_center = (venn_center_x, venn_center_y + medium_radius)
-        fitness_center = (venn_center_x + medium_radius, venn_center_y)
-
-        # Offset for spreading tasks within the same priority region
-        offset_step = 15
-        placement_offsets = {
-            "HHH": 0,  # Angle counter for circular placement
-            "HH": 0,
-            "HF": 0,
-            "UF": 0,
-            "I": 0,
-            "U": 0,
-            "F": 0
-        }
+        self.task_regions.clear()
 
+        # Group the tasks by region, LOW priority tasks go into the listbox
+        tasks_by_region = {}
         for task in self.tasks:
-            # Determine task placement based on priorities
-            if task.importance == Priority.HIGH and task.urgency == Priority.HIGH and task.fitness == Priority.HIGH:
-                # "Do Now" central placement in a circular layout
-                angle_rad = math.radians(hhh_angle_step * placement_offsets["HHH"])
-                x = venn_center_x + hhh_radius * math.cos(angle_rad)
-                y = venn_center_y + hhh_radius * math.sin(angle_rad) + 75
-                placement_offsets["HHH"] += 1.5
-            elif task.importance == Priority.HIGH and task.urgency == Priority.HIGH:
-                # Overlap region between Importance and Urgency
-                x = (importance_center[0] + urgency_center[0]) / 2
-                y = (importance_center[1] + urgency_center[1]) / 2 + placement_offsets["HH"]
-                placement_offsets["HH"] += offset_step
-            elif task.importance == Priority.HIGH and task.fitness == Priority.HIGH:
-                # Overlap region between Importance and Fitness
-                x = (importance_center[0] + fitness_center[0]) / 2
-                y = (importance_center[1] + fitness_center[1]) / 2 + placement_offsets["HF"]
-                placement_offsets["HF"] += offset_step
-            elif task.urgency == Priority.HIGH and task.fitness == Priority.HIGH:
-                # Overlap region between Urgency and Fitness
-                x = (urgency_center[0] + fitness_center[0]) / 2
-                y = (urgency_center[1] + fitness_center[1]) / 2 + placement_offsets["UF"]
-                placement_offsets["UF"] += offset_step
-            elif task.importance == Priority.HIGH:
-                # Importance circle
-                x = importance_center[0]
-                y = importance_center[1] + placement_offsets["I"]
-                placement_offsets["I"] += offset_step
-            elif task.urgency == Priority.HIGH:
-                # Urgency circle
-                x = urgency_center[0]
-                y = urgency_center[1] + placement_offsets["U"]
-                placement_offsets["U"] += offset_step
-            elif task.fitness == Priority.HIGH:
-                # Fitness circle
-                x = fitness_center[0]
-                y = fitness_center[1] + placement_offsets["F"]
-                placement_offsets["F"] += offset_step
+            region = self.get_task_region(task)
+            self.task_regions[task.id] = region
+            if region == "LOW":
+                self.low_listbox.insert(tk.END, task.title)
+                self.low_task_ids.append(task.id)
             else:
-                # LOW priority tasks go into the listbox
-                if task.title not in self.low_listbox.get(0, tk.END):
-                    self.low_listbox.insert(tk.END, task.title)
+                tasks_by_region.setdefault(region, []).append(task)
+
+        # Crowded regions only show their most urgent tasks next to a badge with the total count,
+        # so the number of canvas items stays bounded however many tasks there are. Zooming in makes
+        # room for more labels, so the threshold grows with the zoomed area.
+        threshold = CLUSTER_THRESHOLD * self.view_transform.scale ** 2
+        self.collapsed_regions = {region for region, tasks in tasks_by_region.items()
+                                  if len(tasks) > threshold and region not in self.expanded_regions}
+        for region in self.collapsed_regions:
+            tasks_by_region[region].sort(key=lambda task: (self.get_due_date(task) is None,
+                                                           self.get_due_date(task) or date.max))
+        items_by_region = {region: [(task.id, task.title) for task in tasks]
+                           for region, tasks in tasks_by_region.items()}
+        totals = {region: len(tasks) for region, tasks in tasks_by_region.items()}
+
+        # The layout works in diagram coordinates, the "Do Now" caption is kept free at every zoom level
+        layout = self.get_venn_layout()
+        placements, overflow, badges = layout.layout(
+            items_by_region, reserved=[self.view_transform.bbox_to_world(self.venn_canvas.bbox(self.do_now_label))],
+            limits={region: CLUSTER_TOP_N for region in self.collapsed_regions},
+            badge_text=lambda region, count: self.get_badge_text(region, totals[region], count))
+        self.venn_layout_result = (layout, placements, overflow, badges, totals)
+
+        self.render_tasks()
+
+    def get_venn_layout(self):
+        """
+        Returns the layout engine for the current zoom scale.
+        Labels keep their size on screen, so in diagram units they shrink as the diagram is zoomed in.
+        """
+        scale = self.view_transform.scale
+        if scale not in self.venn_layouts:
+            self.venn_layouts[scale] = VennLayout(self.venn_geometry, line_height=LABEL_HEIGHT / scale,
+                                                  measure=lambda text: self.label_font.measure(text) / scale,
+                                                  padding=3 / scale)
+        return self.venn_layouts[scale]
+
+    def get_visible_bbox(self):
+        """
+        Returns the part of the diagram shown on the canvas, in diagram coordinates.
+        """
+        width = self.venn_canvas.winfo_width()
+        height = self.venn_canvas.winfo_height()
+        if width <= 1 or height <= 1:  # Not mapped yet, use the configured size
+            width, height = int(self.venn_canvas.cget("width")), int(self.venn_canvas.cget("height"))
+        return self.view_transform.visible_bbox(width, height)
+
+    def render_tasks(self):
+        """
+        Creates canvas items for the laid out tasks and badges inside the visible part of the diagram.
+        Labels outside the viewport are not materialized, panning or zooming renders them when they come into view.
+        """
+        self.venn_canvas.delete("task_text")
+        self.task_elements.clear()
+        self.label_index = SpatialGrid(cell_size=64)
+        if self.venn_layout_result is None:
+            return
+
+        layout, placements, overflow, badges, totals = self.venn_layout_result
+        transform = self.view_transform
+        view_x1, view_y1, view_x2, view_y2 = self.get_visible_bbox()
+
+        def is_visible(position, text):
+            x1, y1, x2, y2 = layout.label_bbox(position[0], position[1], layout.measure(text))
+            return x1 < view_x2 and view_x1 < x2 and y1 < view_y2 and view_y1 < y2
+
+        for task in self.tasks:
+            if task.id not in placements or not is_visible(placements[task.id], task.title):
                 continue
+            x, y = transform.to_screen(*placements[task.id])
 
-            # Create a text element for the task and map it
-            text_id = self.venn_canvas.create_text(x, y, text=task.title, tags="task_text")
+            # Create a text element for the task and map it, keeping the highlight of selected tasks
+            text_id = self.venn_canvas.create_text(x, y, text=task.title, tags="task_text",
+                                                   fill="red" if task.id in self.selected_task_ids else "black")
             self.task_elements[task.id] = text_id  # Map the task ID to its text element
 
-            # Bind drag-and-drop events to the task
-            self.venn_canvas.tag_bind(
-                text_id, "<Button-1>", lambda event, tid=task.id: self.drag_or_select_task(event, tid)
-            )
-            self.venn_canvas.tag_bind(
-                text_id, "<B1-Motion>", lambda event, tid=task.id: self.drag_drop_handler.drag_task(event, tid)
-            )
-            self.venn_canvas.tag_bind(
-                text_id, "<ButtonRelease-1>", lambda event, tid=task.id: self.drag_drop_handler.drop_task(event, tid)
-            )
+            # Pointer events find the task through the label index instead of per-item bindings
+            self.label_index.insert(("task", task.id), transform.bbox_to_screen(
+                layout.label_bbox(*placements[task.id], layout.measure(task.title))))
+
+        # Hidden tasks are summarized by a badge that expands or collapses its region when clicked
+        for region, position in badges.items():
+            text = self.get_badge_text(region, totals[region], len(overflow[region]))
+            if position is None or not is_visible(position, text):
+                continue
+            text_id = self.venn_canvas.create_text(*transform.to_screen(*position), text=text, fill="navy",
+                                                   tags=("task_text", "badge"))
+            background_id = self.venn_canvas.create_rectangle(self.venn_canvas.bbox(text_id), fill="white",
+                                                              outline="navy", tags=("task_text", "badge"))
+            self.venn_canvas.tag_lower(background_id, text_id)
+            self.label_index.insert(("badge", region), self.venn_canvas.bbox(background_id))
+
+    def zoom_venn_diagram(self, event):
+        """
+        Zooms the diagram in or out around the mouse position and lays the tasks out for the new scale.
+        """
+        zoom_in = event.num == 4 or getattr(event, "delta", 0) > 0
+        if self.view_transform.zoom(ZOOM_STEP if zoom_in else 1 / ZOOM_STEP, event.x, event.y):
+            self.draw_venn_diagram()
+            self.update_task_venn_diagram()
+
+    def reset_view(self, event=None):
+        """
+        Restores the unzoomed and unpanned diagram.
+        """
+        self.view_transform.reset()
+        self.draw_venn_diagram()
+        self.update_task_venn_diagram()
+
+    def start_pan(self, event):
+        """
+        Starts panning the diagram.
+        """
+        self.pan_start = (event.x, event.y)
+
+    def pan_venn_diagram(self, event):
+        """
+        Moves all canvas items with the mouse. Moving existing items is cheap, labels that come into view
+        are created when the mouse button is released.
+        """
+        if self.pan_start is None:
+            return
+        dx, dy = event.x - self.pan_start[0], event.y - self.pan_start[1]
+        self.view_transform.pan(dx, dy)
+        self.venn_canvas.move("all", dx, dy)
+        self.pan_start = (event.x, event.y)
+
+    def end_pan(self, event):
+        """
+        Finishes panning and materializes the labels that are now visible.
+        """
+        if self.pan_start is None:
+            return
+        self.pan_start = None
+        self.render_tasks()
+
+    def get_badge_text(self, region, total, hidden):
+        """
+        Returns the text of the badge summarizing the hidden tasks of a region.
+
+        :param region: Region code.
+        :param total: Number of tasks in the region.
+        :param hidden: Number of tasks that are not shown.
+        """
+        if region in self.collapsed_regions:
+            return f"{total} tasks [+]"
+        return f"+{hidden} more [-]"
+
+    def toggle_region(self, region):
+        """
+        Expands a collapsed region to show as many tasks as fit, or collapses an expanded one again.
+
+        :param region: Region code of the clicked badge.
+        """
+        if region in self.collapsed_regions:
+            self.expanded_regions.add(region)
+        else:
+            self.expanded_regions.discard(region)
+        self.update_task_venn_diagram()
+
+    def get_task_region(self, task):
+        """
+        Determines the Venn region a task belongs to based on its priorities. Subtasks and blocking tasks
+        are shown with the importance and urgency they inherit from the open tasks depending on them.
+
+        :param task: Task object.
+        :return: One of "HHH", "HH", "HF", "UF", "I", "U", "F" or "LOW".
+        """
+        effective = self.dependency_graph.effective(task.id)
+        importance, urgency = effective[:2] if effective else (task.importance, task.urgency)
+        return REGIONS[(importance == Priority.HIGH, urgency == Priority.HIGH, task.fitness == Priority.HIGH)]
+
+    def get_due_date(self, task):
+        """
+        :return: The due date of a task, or the earlier due date of an open task depending on it.
+        """
+        effective = self.dependency_graph.effective(task.id)
+        return effective[2] if effective else task.due_date
+
+    @property
+    def current_user(self):
+        """
+        Name of the logged-in user, None before login.
+        """
+        return self.session.username if self.session else None
+
+    @property
+    def current_user_id(self):
+        """
+        ID of the logged-in user, None before login.
+        """
+        return self.session.user_id if self.session else None
 
+    def start_session(self, user):
+        """
+        Starts the session of a user who logged in and shows their tasks.
+
+        :param user: The logged-in User.
+        """
+        self.session = Session(user, self.settings_manager, self.task_cache)
+        self.change_feed.start()  # Changes from now on are applied, the tasks loaded below contain the others
+        self.dependency_graph.load(self.session.get_tasks(), self.task_repository.get_dependencies(user.id))
+        self.load_tasks()
 
     def load_tasks(self, filters=None):
         """
-        Loads tasks from the database based on the given filters.
-        """
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        self.tasks.clear()
-
-        # Base query
-        query = '''
-            SELECT id, title, description, due_date, importance, urgency, fitness, status 
-            FROM tasks 
-            WHERE user_id = ?
-        '''
-        params = [self.current_user_id]
-
-        # Apply filters if any
-        if filters:
-            if 'importance' in filters:
-                query += ' AND UPPER(importance) = ?'
-                params.append(filters['importance'].upper())
-            if 'urgency' in filters:
-                query += ' AND UPPER(urgency) = ?'
-                params.append(filters['urgency'].upper())
-            if 'fitness' in filters:
-                query += ' AND UPPER(fitness) = ?'
-                params.append(filters['fitness'].upper())
-            if 'search' in filters:
-                query += ' AND title LIKE ?'
-                params.append(f"%{filters['search']}%")
-            if 'status' in filters:
-                query += ' AND UPPER(status) = ?'
-                params.append(filters['status'].upper())
-            if 'due_date' in filters:
-                query += ' AND due_date <= ?'
-                params.append(filters['due_date'].strftime("%Y-%m-%d"))
-
-        cursor.execute(query, params)
-        rows = cursor.fetchall()
-
-        for row in rows:
-            task_id, title, description, due_date_str, importance_str, urgency_str, fitness_str, status_str = row
-            due_date = datetime.strptime(due_date_str, '%Y-%m-%d').date() if due_date_str else None
-
-            # Convert database values to Priority Enum
-            importance = Priority[importance_str.upper()]
-            urgency = Priority[urgency_str.upper()]
-            fitness = Priority[fitness_str.upper()]
-
-            # Default to OPEN if status is None
-            status = Status[status_str.upper()] if status_str else Status.OPEN
-
-            task = Task(
-                title=title,
-                description=description,
-                due_date=due_date,
-                importance=importance,
-                urgency=urgency,
-                fitness=fitness,
-                status=status,
-                task_id=task_id
-            )
+        Loads tasks based on the given filters.
+        The user's tasks are read from the database only once, afterwards they are served from the task cache.
+        """
+        self.task_filters = filters
+        self.tasks[:] = self.session.get_tasks(filters)
+        self.update_task_venn_diagram()
+
+    def on_task_changed(self, event, user_id, task):
+        """
+        Applies a single change reported by the task cache to the displayed task list.
+
+        :param event: TaskCache.ADDED, TaskCache.UPDATED or TaskCache.REMOVED.
+        :param user_id: The ID of the user owning the task.
+        :param task: The changed Task object.
+        """
+        if user_id != self.current_user_id:
+            return
+
+        visible = event != TaskCache.REMOVED and task_matches_filters(task, self.task_filters)
+        if visible and task not in self.tasks:
             self.tasks.append(task)
+        elif not visible and task in self.tasks:
+            self.tasks.remove(task)
+            self.selected_task_ids.discard(task.id)
 
-        conn.close()
-        self.update_task_venn_diagram()
+        # Only the prerequisites whose inherited priorities or due dates change are reported
+        if event == TaskCache.REMOVED:
+            changed = self.dependency_graph.remove_task(task.id)
+        else:
+            changed = self.dependency_graph.set_task(task)
+
+        if not self.deferred_refresh:
+            self.refresh_task(task)
+            self.refresh_tasks(task_id for task_id in changed if task_id != task.id)
+
+    def refresh_tasks(self, task_ids):
+        """
+        Updates the display of the tasks whose inherited priorities changed.
+
+        :param task_ids: IDs of the changed tasks.
+        """
+        for task_id in task_ids:
+            task = self.session.get_task(task_id)
+            if task is not None:
+                self.refresh_task(task)
+
+    def refresh_task(self, task):
+        """
+        Updates the display of a single task without redrawing the other tasks.
+        Only if the task moved to another Venn region or its label changed is the diagram laid out again.
+
+        :param task: The changed Task object.
+        """
+        old_region = self.task_regions.get(task.id)
+        new_region = self.get_task_region(task) if task in self.tasks else None
+
+        if old_region is None and new_region is None:
+            return  # Task is not displayed before or after the change
+
+        if {old_region, new_region} <= {"LOW", None}:
+            # Only the LOW listbox is affected
+            if new_region is None:
+                self.task_regions.pop(task.id, None)
+            else:
+                self.task_regions[task.id] = new_region
+            self.fill_low_listbox()
+        elif old_region in self.collapsed_regions or new_region in self.collapsed_regions:
+            self.update_task_venn_diagram()  # The badge count and the most urgent tasks may change
+        elif old_region == new_region and task.id in self.task_elements and \
+                self.venn_canvas.itemcget(self.task_elements[task.id], "text") == task.title:
+            return  # The label keeps its text and therefore its place in the layout
+        elif new_region is None and task.id in self.task_elements:
+            # Task removed from the diagram, the remaining tasks keep their positions
+            self.venn_canvas.delete(self.task_elements.pop(task.id))
+            self.label_index.remove(("task", task.id))
+            self.task_regions.pop(task.id, None)
+        elif old_region != new_region and "LOW" not in (old_region, new_region) and None not in (old_region, new_region) \
+                and self.move_label(task, old_region, new_region):
+            return  # Only the dropped label moved
+        else:
+            self.update_task_venn_diagram()
+
+    def move_label(self, task, old_region, new_region):
+        """
+        Moves the label of a task that changed its Venn region to a free spot in the new region,
+        leaving all other labels where they are.
+
+        :return: False if the diagram has to be laid out again instead, e.g. because the new region is full.
+        """
+        if self.venn_layout_result is None:
+            return False
+        layout, placements, overflow, badges, totals = self.venn_layout_result
+        if task.id not in placements or badges or \
+                totals.get(new_region, 0) + 1 > CLUSTER_THRESHOLD * self.view_transform.scale ** 2:
+            return False  # Badges and collapsing depend on the number of tasks per region
+
+        position = layout.place(new_region, task.id, task.title)
+        if position is None:
+            return False
+        placements[task.id] = position
+        totals[old_region] -= 1
+        totals[new_region] = totals.get(new_region, 0) + 1
+        self.task_regions[task.id] = new_region
+
+        text_id = self.task_elements.get(task.id)
+        if text_id is None:
+            self.render_tasks()  # The label was outside the viewport and may have moved into it
+            return True
+        transform = self.view_transform
+        self.venn_canvas.coords(text_id, *transform.to_screen(*position))
+        self.label_index.remove(("task", task.id))
+        self.label_index.insert(("task", task.id), transform.bbox_to_screen(
+            layout.label_bbox(position[0], position[1], layout.measure(task.title))))
+        return True
+
+    def on_write_failed(self, changes, error):
+        """
+        Rolls back priority changes the write-behind buffer could not persist.
+
+        :param changes: Maps task IDs to (user_id, previous priorities, new priorities).
+        :param error: The sqlite3 error raised by the write.
+        """
+        for task_id, (user_id, previous, current) in changes.items():
+            task = self.task_cache.get_task(user_id, task_id)
+            if task is not None:
+                task.importance, task.urgency, task.fitness = previous
+                self.session.put_task(task)
+        messagebox.showerror("Database Error", f"Failed to save the new priorities: {error}")
+
+    def check_write_journal(self):
+        """
+        Reports edits the write journal could not apply and checks again a second later.
+        The edits were already shown, so once no other edits are pending the tasks are read from the database
+        again, which rolls the rejected edits back on the screen. Reports of a busy database are skipped, the
+        journal keeps its edits and applies them once the database is free.
+        """
+        errors = []
+        while not self.write_journal.errors.empty():
+            errors.append(self.write_journal.errors.get())
+        rejected = [error for statements, error in errors if statements is not None]
+        if rejected:
+            self.journal_rejected = True
+            messagebox.showerror("Database Error", f"{len(rejected)} edits could not be saved: {rejected[-1]}")
+
+        if self.journal_rejected and self.session is not None and not self.write_buffer.pending \
+                and not self.write_journal.has_pending():
+            try:
+                self.task_cache.refresh(self.current_user_id)
+                self.journal_rejected = False
+            except sqlite3.Error as e:
+                messagebox.showerror("Database Error", f"Error reading the saved tasks: {e}")
+        self.root.after(1000, self.check_write_journal)
+
+    def on_database_changed(self):
+        """
+        Shows the changes another instance committed to the database. While edits of this instance are
+        still pending, the database does not contain them yet and they would be mistaken for changes to undo,
+        so the changes are read a moment later instead.
+        """
+        if self.session is None:
+            return
+        if self.write_buffer.pending or self.write_journal.has_pending():
+            self.root.after(self.data_version_watcher.interval_ms, self.on_database_changed)
+            return
+        try:
+            # Only the tasks that differ are reported by the cache and redrawn by on_task_changed
+            self.change_feed.poll(self.current_user_id)
+            dependencies = self.task_repository.get_dependencies(self.current_user_id)
+            self.refresh_tasks(self.dependency_graph.sync_dependencies(dependencies))
+        except sqlite3.Error as e:
+            messagebox.showerror("Database Error", f"Error reading changes of other instances: {e}")
+            return
+        self.session.reload_settings()
+
+    def on_close(self):
+        """
+        Writes pending edits before the main window is closed.
+        Journaled edits that cannot be written in time stay in the journal and are replayed on the next start.
+        """
+        try:
+            if self.data_version_watcher is not None:
+                self.data_version_watcher.cancel(self.root)
+            self.write_buffer.flush()
+            self.write_journal.close(timeout=5)
+        finally:
+            self.root.destroy()
+
+    def fill_low_listbox(self):
+        """
+        Refills the "LOW Priority Tasks" listbox from the current task list, keeping the selected entries.
+        """
+        selected_ids = {task.id for task in self.get_low_listbox_tasks()}
+        self.low_listbox.delete(0, tk.END)
+        self.low_task_ids.clear()
+        for task in self.tasks:
+            if self.get_task_region(task) == "LOW":
+                self.low_listbox.insert(tk.END, task.title)
+                self.low_task_ids.append(task.id)
+                if task.id in selected_ids:
+                    self.low_listbox.selection_set(tk.END)
 
     def select_task(self, event, task_id):
         """
         Marks the task as selected and highlights it for editing.
+        With Shift or Control held, the task is added to or removed from the current selection.
         """
-        # Deselect the previously selected task, if any
-        if self.selected_task is not None:
-            self.venn_canvas.itemconfig(self.selected_task["text_id"], fill="black")
+        additive = event is not None and bool(event.state & (SHIFT_MASK | CONTROL_MASK))
+        if not additive:
+            self.clear_selection()
+        elif task_id in self.selected_task_ids:
+            # Toggle off an already selected task
+            self.selected_task_ids.discard(task_id)
+            self.venn_canvas.itemconfig(self.task_elements[task_id], fill="black")
+            if self.selected_task and self.selected_task["task"].id == task_id:
+                self.selected_task = None
+            return
 
         # Find the task by task_id in self.tasks
         selected_task = next((task for task in self.tasks if task.id == task_id), None)
@@ -324,14 +735,128 @@ class GUIController:
             print(f"[ERROR] Task with ID {task_id} not found in self.tasks!")
             return
 
+        self.selected_task_ids.add(task_id)
         self.selected_task = {"task": selected_task, "text_id": self.task_elements[task_id]}
         self.venn_canvas.itemconfig(self.selected_task["text_id"], fill="red")  # Highlight selected task in red
 
+    def clear_selection(self, include_listbox=True):
+        """
+        Removes the selection from all tasks on the Venn diagram and, optionally, in the LOW listbox.
+        """
+        for task_id in self.selected_task_ids:
+            if task_id in self.task_elements:
+                self.venn_canvas.itemconfig(self.task_elements[task_id], fill="black")
+        self.selected_task_ids.clear()
+        self.selected_task = None
+        if include_listbox:
+            self.low_listbox.selection_clear(0, tk.END)
+
+    def hit_test(self, x, y):
+        """
+        Finds the task label or badge under a canvas point.
+
+        :return: ("task", task ID), ("badge", region code) or None for an empty part of the canvas.
+        """
+        hits = self.label_index.at(x, y)
+        return next(iter(hits)) if hits else None
+
+    def canvas_press(self, event):
+        """
+        Starts dragging or selecting the task under the mouse, toggles a clicked badge, or starts a
+        selection rectangle on an empty part of the canvas.
+        """
+        hit = self.hit_test(event.x, event.y)
+        if hit is None:
+            self.start_rubber_band(event)
+        elif hit[0] == "task":
+            self.pressed_task_id = hit[1]
+            self.drag_or_select_task(event, hit[1])
+        else:
+            self.toggle_region(hit[1])
+
+    def canvas_motion(self, event):
+        """
+        Moves the pressed task or resizes the selection rectangle.
+        """
+        if self.pressed_task_id is not None:
+            self.drag_drop_handler.drag_task(event, self.pressed_task_id)
+        else:
+            self.drag_rubber_band(event)
+
+    def canvas_release(self, event):
+        """
+        Drops the pressed task or finishes the selection rectangle.
+        """
+        if self.pressed_task_id is not None:
+            task_id, self.pressed_task_id = self.pressed_task_id, None
+            self._handle_click_or_drag(event, task_id)
+        else:
+            self.end_rubber_band(event)
+
+    def start_rubber_band(self, event):
+        """
+        Starts a selection rectangle when the mouse is pressed on an empty part of the canvas.
+        """
+        rectangle = self.venn_canvas.create_rectangle(event.x, event.y, event.x, event.y, outline="gray",
+                                                      dash=(4, 2), tags="rubber_band")
+        self.rubber_band = (event.x, event.y, rectangle)
+
+    def drag_rubber_band(self, event):
+        """
+        Resizes the selection rectangle while the mouse is moved.
+        """
+        if self.rubber_band:
+            start_x, start_y, rectangle = self.rubber_band
+            self.venn_canvas.coords(rectangle, start_x, start_y, event.x, event.y)
+
+    def end_rubber_band(self, event):
+        """
+        Selects all tasks touched by the selection rectangle.
+        A click without moving the mouse clears the selection instead.
+        """
+        if not self.rubber_band:
+            return
+
+        start_x, start_y, rectangle = self.rubber_band
+        self.rubber_band = None
+        self.venn_canvas.delete(rectangle)
+
+        additive = bool(event.state & (SHIFT_MASK | CONTROL_MASK))
+        if not additive:
+            self.clear_selection()
+        if abs(event.x - start_x) < 3 and abs(event.y - start_y) < 3:
+            return
+
+        for kind, task_id in self.label_index.query((min(start_x, event.x), min(start_y, event.y),
+                                                     max(start_x, event.x), max(start_y, event.y))):
+            if kind == "task":
+                self.selected_task_ids.add(task_id)
+                self.venn_canvas.itemconfig(self.task_elements[task_id], fill="red")
+
+        selected = self.get_selected_tasks()
+        self.selected_task = {"task": selected[0], "text_id": self.task_elements.get(selected[0].id)} \
+            if len(selected) == 1 else None
+
+    def get_low_listbox_tasks(self):
+        """
+        Returns the tasks selected in the "LOW Priority Tasks" listbox.
+        """
+        tasks_by_id = {task.id: task for task in self.tasks}
+        return [tasks_by_id[self.low_task_ids[index]] for index in self.low_listbox.curselection()
+                if index < len(self.low_task_ids) and self.low_task_ids[index] in tasks_by_id]
+
+    def get_selected_tasks(self):
+        """
+        Returns all selected tasks, from the Venn diagram and the "LOW Priority Tasks" listbox.
+        """
+        selected = [task for task in self.tasks if task.id in self.selected_task_ids]
+        return selected + [task for task in self.get_low_listbox_tasks() if task.id not in self.selected_task_ids]
 
     def edit_task_from_canvas(self, task):
         """
         Opens the TaskEditor for the specified task when clicked on the Venn diagram.
         """
+        self.write_buffer.flush()
         TaskEditor(self, "Edit Task", task=task)
 
     '''
@@ -345,46 +870,32 @@ class GUIController:
             self.selected_task_index = None
     '''
 
-    def update_task_listbox(self):
+    def low_listbox_press(self, event):
         """
-        Refreshes the Venn diagram with the current list of tasks.
+        A plain click into the LOW listbox replaces the selection on the Venn diagram.
         """
-        self.update_task_venn_diagram()
-        self.low_listbox.delete(0, tk.END)
-        for task in self.tasks:
-            if task.importance == Priority.LOW and task.urgency == Priority.LOW and task.fitness == Priority.LOW:
-                self.low_listbox.insert(tk.END, task.title)
+        if not event.state & (SHIFT_MASK | CONTROL_MASK):
+            self.clear_selection(include_listbox=False)
 
     def low_listbox_select(self, event):
         """
-        Handles the selection of a task in the LOW Priority Tasks listbox.
+        Handles the selection of tasks in the LOW Priority Tasks listbox.
         """
-        selected_index = self.low_listbox.curselection()  # Get selected item index
-        if not selected_index:
-            self.selected_task = None  # Clear selection if nothing is selected
-            return
-
-        selected_title = self.low_listbox.get(selected_index)
-        selected_task = next((task for task in self.tasks if task.title == selected_title), None)
-
-        if selected_task:
-            self.selected_task = {"task": selected_task, "text_id": None}  # No text_id for listbox items
-            self.selected_task_index = self.tasks.index(selected_task)
+        selected_tasks = self.get_low_listbox_tasks()
+        if len(selected_tasks) == 1 and not self.selected_task_ids:
+            self.selected_task = {"task": selected_tasks[0], "text_id": None}  # No text_id for listbox items
+            self.selected_task_index = self.tasks.index(selected_tasks[0])
         else:
             self.selected_task = None
             self.selected_task_index = None
 
-        # Ensure the Venn diagram is updated and visible
-        self.update_task_venn_diagram()
-
-
     def add_task(self):
         """
         Opens the TaskEditor with default priorities for adding a new task.
         """
         try:
             # Fetch user-specific default priorities from the settings table
-            conn = sqlite3.connect(self.db_path)
+            conn = connect(self.db_path)
             cursor = conn.cursor()
             cursor.execute('''
                 SELECT default_importance, default_urgency, default_fitness 
@@ -432,6 +943,7 @@ class GUIController:
             return
 
         selected_task = self.selected_task["task"]
+        self.write_buffer.flush()  # The editor writes all priorities, a pending drop must not overwrite them
         TaskEditor(self, "Edit Task", task=selected_task)
 
     def delete_task(self):
@@ -439,15 +951,12 @@ class GUIController:
         Deletes the selected task from the list and updates the diagram and listbox accordingly.
         Displays a confirmation dialog before deleting the task.
         """
-        task_to_delete = None
-
-        # Check if a task is selected in the Venn diagram or LOW priority listbox
-        if self.selected_task:
-            task_to_delete = self.selected_task["task"]
-        elif self.low_listbox.curselection():
-            selected_index = self.low_listbox.curselection()[0]
-            selected_task_title = self.low_listbox.get(selected_index)
-            task_to_delete = next((task for task in self.tasks if task.title == selected_task_title), None)
+        # Check if tasks are selected in the Venn diagram or LOW priority listbox
+        selected_tasks = self.get_selected_tasks()
+        if len(selected_tasks) > 1:
+            self.delete_tasks(selected_tasks)
+            return
+        task_to_delete = selected_tasks[0] if selected_tasks else None
 
         if not task_to_delete:
             messagebox.showwarning("No Selection", "Please select a task to delete.")
@@ -461,59 +970,41 @@ class GUIController:
 
         try:
             # Remove the task from the database
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            cursor.execute('DELETE FROM tasks WHERE id = ? AND user_id = ?',
-                           (task_to_delete.id, self.current_user_id))
-            conn.commit()
-            conn.close()
+            self.task_repository.bulk_delete([task_to_delete.id], self.current_user_id)
 
-            # Remove the task from the UI
-            self.tasks.remove(task_to_delete)
-            if self.selected_task:
-                if self.selected_task["text_id"]:
-                    self.venn_canvas.delete(self.selected_task["text_id"])  # Remove from Venn diagram
-                self.selected_task = None  # Clear selection
-            elif self.low_listbox.curselection():
-                self.low_listbox.delete(selected_index)  # Remove from "LOW" listbox
+            # Remove the task from the cache, which removes it from the Venn diagram or the "LOW" listbox
+            self.session.remove_task(task_to_delete.id)
+            self.selected_task = None  # Clear selection
 
             messagebox.showinfo("Task Deleted", f"Task '{task_to_delete.title}' has been deleted successfully.")
 
         except sqlite3.Error as e:
             messagebox.showerror("Database Error", f"Error deleting task: {e}")
 
-        # Refresh the task display
-        self.update_task_listbox()
-
     def mark_task_completed(self):
-        task_to_mark = None
-
-        if self.selected_task:
-            task_to_mark = self.selected_task["task"]
-        elif self.low_listbox.curselection():
-            selected_index = self.low_listbox.curselection()[0]
-            selected_task_title = self.low_listbox.get(selected_index)
-            task_to_mark = next((task for task in self.tasks if task.title == selected_task_title), None)
+        selected_tasks = self.get_selected_tasks()
+        if len(selected_tasks) > 1:
+            self.complete_tasks(selected_tasks)
+            return
+        task_to_mark = selected_tasks[0] if selected_tasks else None
 
         if not task_to_mark:
             messagebox.showwarning("No Selection", "Please select a task to mark as completed.")
             return
+        if task_to_mark.recurrence:
+            self.complete_tasks([task_to_mark])  # Rolls the series forward to its next occurrence
+            return
 
         task_to_mark.status = Status.COMPLETED
 
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            cursor.execute('''
-                UPDATE tasks
-                SET status = ?
-                WHERE id = ? AND user_id = ?
-            ''', (Status.COMPLETED.value, task_to_mark.id, self.current_user_id))
-            conn.commit()
-            conn.close()
+            self.task_repository.bulk_update_status([task_to_mark.id], self.current_user_id, Status.COMPLETED)
+
+            # Update the cached task, the status change does not move it in the diagram
+            self.session.put_task(task_to_mark)
 
             # Debug: Check if the user ID and auto_archive are correct
-            settings = self.settings_manager.get_settings(self.current_user_id)
+            settings = self.session.settings
             print(f"[DEBUG] User ID: {self.current_user_id}, Settings: {settings}")
 
             if settings.get("auto_archive", False):
@@ -527,21 +1018,18 @@ class GUIController:
             messagebox.showerror("Database Error", f"Error marking task as completed: {e}")
             return
 
-        self.update_task_listbox()
-
     def archive_selected_task(self, task_to_archive=None):
         """
         Archives the given task (or the selected task if none is provided) if it is completed
         and updates the diagram and listbox accordingly.
         """
         if not task_to_archive:
-            # Check if a task is selected in the Venn diagram
-            if self.selected_task:
-                task_to_archive = self.selected_task["task"]
-            elif self.low_listbox.curselection():
-                selected_index = self.low_listbox.curselection()[0]
-                selected_task_title = self.low_listbox.get(selected_index)
-                task_to_archive = next((task for task in self.tasks if task.title == selected_task_title), None)
+            # Check if tasks are selected in the Venn diagram or LOW priority listbox
+            selected_tasks = self.get_selected_tasks()
+            if len(selected_tasks) > 1:
+                self.archive_tasks(selected_tasks)
+                return
+            task_to_archive = selected_tasks[0] if selected_tasks else None
 
         if not task_to_archive:
             messagebox.showwarning("No Selection", "Please select a task to archive.")
@@ -553,58 +1041,233 @@ class GUIController:
             return
 
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-
-            # Insert the task into the archived_tasks table with the user_id
-            cursor.execute('''
-                INSERT INTO archived_tasks (title, description, due_date, importance, urgency, fitness, status, completed_date, user_id)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                task_to_archive.title,
-                task_to_archive.description,
-                task_to_archive.due_date.strftime("%Y-%m-%d") if task_to_archive.due_date else None,
-                task_to_archive.importance.value,
-                task_to_archive.urgency.value,
-                task_to_archive.fitness.value,
-                task_to_archive.status.value,
-                datetime.now().strftime("%Y-%m-%d"),
-                self.current_user_id
-            ))
-
-            # Delete the task from the main tasks table
-            cursor.execute('DELETE FROM tasks WHERE id = ? AND user_id = ?',
-                           (task_to_archive.id, self.current_user_id))
-
-            conn.commit()
-            conn.close()
+            # Insert the task into the archived_tasks table and delete it from the tasks table in one transaction
+            self.task_repository.bulk_archive([task_to_archive], self.current_user_id,
+                                              datetime.now().strftime("%Y-%m-%d"))
 
-            # Remove the task from the task list and UI
-            self.tasks.remove(task_to_archive)
-            if self.selected_task:
-                self.venn_canvas.delete(self.selected_task["text_id"])  # Remove from Venn diagram
-                self.selected_task = None  # Clear selection
-            elif self.low_listbox.curselection():
-                self.low_listbox.delete(selected_index)  # Remove from "LOW" listbox
+            # Remove the task from the cache, which removes it from the Venn diagram or the "LOW" listbox
+            self.session.remove_task(task_to_archive.id)
+            self.selected_task = None  # Clear selection
+            self.on_archive_changed()
 
             messagebox.showinfo("Success", f"Task '{task_to_archive.title}' has been archived.")
 
         except sqlite3.Error as e:
             messagebox.showerror("Database Error", f"Error archiving task: {e}")
 
-        # Refresh the task display
-        self.update_task_listbox()
+    def apply_bulk_change(self, updated=(), removed=()):
+        """
+        Reports many written tasks to the task cache and redraws the diagram once afterwards.
+
+        :param updated: Tasks that were updated in the database.
+        :param removed: Tasks that were deleted from the tasks table.
+        """
+        self.deferred_refresh = True
+        try:
+            for task in updated:
+                self.session.put_task(task)
+            for task in removed:
+                self.session.remove_task(task.id)
+        finally:
+            self.deferred_refresh = False
+        self.update_task_venn_diagram()
+
+    def delete_tasks(self, tasks):
+        """
+        Deletes several tasks in one transaction after a single confirmation.
+
+        :param tasks: Task objects to delete.
+        """
+        if not messagebox.askyesno("Confirm Delete", f"Are you sure you want to delete {len(tasks)} tasks?"):
+            return
+
+        try:
+            self.task_repository.bulk_delete([task.id for task in tasks], self.current_user_id)
+        except sqlite3.Error as e:
+            messagebox.showerror("Database Error", f"Error deleting tasks: {e}")
+            return
+
+        self.clear_selection()
+        self.apply_bulk_change(removed=tasks)
+        messagebox.showinfo("Tasks Deleted", f"{len(tasks)} tasks have been deleted successfully.")
+
+    def complete_tasks(self, tasks):
+        """
+        Marks several tasks as completed in one transaction.
+        If auto-archiving is enabled, the tasks are moved to the archive in the same transaction instead.
+        Recurring tasks move on to their next occurrence, the completed occurrence is archived.
+
+        :param tasks: Task objects to mark as completed.
+        """
+        auto_archive = self.session.settings.get("auto_archive", False)
+
+        try:
+            rolled, completed = self.task_repository.complete_tasks(
+                tasks, self.current_user_id, datetime.now().strftime("%Y-%m-%d"), archive=auto_archive)
+        except sqlite3.Error as e:
+            messagebox.showerror("Database Error", f"Error marking tasks as completed: {e}")
+            return
+
+        if auto_archive:
+            self.clear_selection()
+            self.apply_bulk_change(updated=rolled, removed=completed)
+            message = f"{len(completed)} tasks have been completed and archived."
+        else:
+            self.apply_bulk_change(updated=tasks)
+            message = f"{len(completed)} tasks have been marked as completed."
+        if rolled:
+            message += f" {len(rolled)} recurring tasks moved on to their next occurrence."
+            if len(tasks) == 1:
+                message = f"Task '{rolled[0].title}' is due again on {rolled[0].due_date}."
+        if rolled or auto_archive:
+            self.on_archive_changed()
+        messagebox.showinfo("Tasks Completed", message)
+
+    def archive_tasks(self, tasks):
+        """
+        Archives the completed tasks among several tasks in one transaction.
+
+        :param tasks: Task objects to archive, tasks that are not completed are skipped.
+        """
+        completed_tasks = [task for task in tasks if task.status == Status.COMPLETED]
+        skipped = len(tasks) - len(completed_tasks)
+        if not completed_tasks:
+            messagebox.showerror("Error", "None of the selected tasks is completed, nothing was archived.")
+            return
+
+        try:
+            self.task_repository.bulk_archive(completed_tasks, self.current_user_id,
+                                              datetime.now().strftime("%Y-%m-%d"))
+        except sqlite3.Error as e:
+            messagebox.showerror("Database Error", f"Error archiving tasks: {e}")
+            return
+
+        self.clear_selection()
+        self.apply_bulk_change(removed=completed_tasks)
+        self.on_archive_changed()
+
+        message = f"{len(completed_tasks)} tasks have been archived."
+        if skipped:
+            message += f" {skipped} tasks were skipped because they are not completed."
+        messagebox.showinfo("Success", message)
+
+    def on_archive_changed(self):
+        """
+        Makes the next archive read see the tasks just archived when archive reads use a snapshot.
+        """
+        if self.archive_snapshot is not None:
+            self.archive_snapshot.invalidate()
+
+    def reprioritize_selected_tasks(self):
+        """
+        Opens the PriorityDialog to assign new priorities to all selected tasks.
+        """
+        selected_tasks = self.get_selected_tasks()
+        if not selected_tasks:
+            messagebox.showwarning("No Selection", "Please select the tasks to re-prioritize.")
+            return
+
+        PriorityDialog(self, len(selected_tasks),
+                       lambda importance, urgency, fitness: self.reprioritize_tasks(selected_tasks, importance,
+                                                                                    urgency, fitness))
+
+    def reprioritize_tasks(self, tasks, importance, urgency, fitness):
+        """
+        Assigns the same priorities to several tasks in one transaction.
+
+        :param tasks: Task objects to update.
+        :param importance: New importance level.
+        :param urgency: New urgency level.
+        :param fitness: New fitness level.
+        """
+        self.write_buffer.flush()  # Pending drops of these tasks must not be written after the new priorities
+        try:
+            self.task_repository.bulk_update_priorities([task.id for task in tasks], self.current_user_id,
+                                                        importance, urgency, fitness)
+        except sqlite3.Error as e:
+            messagebox.showerror("Database Error", f"Error updating priorities: {e}")
+            return
+
+        for task in tasks:
+            task.importance, task.urgency, task.fitness = importance, urgency, fitness
+        self.apply_bulk_change(updated=tasks)
+
+    def link_selected_tasks(self):
+        """
+        Opens the DependencyDialog to make the selected tasks subtasks of another task, or to let them
+        block or be blocked by it.
+        """
+        selected_tasks = self.get_selected_tasks()
+        if not selected_tasks:
+            messagebox.showwarning("No Selection", "Please select the tasks to link.")
+            return
+
+        selected_ids = {task.id for task in selected_tasks}
+        candidates = [task for task in self.session.get_tasks() if task.id not in selected_ids]
+        DependencyDialog(self, selected_tasks, candidates, self.link_tasks,
+                         lambda: self.unlink_tasks(selected_tasks))
+
+    def link_tasks(self, dependencies):
+        """
+        Stores new dependencies after checking them against the dependency graph.
+
+        :param dependencies: List of (task_id, depends_on_id, kind) tuples.
+        """
+        try:
+            for task_id, depends_on_id, kind in dependencies:
+                self.dependency_graph.check_dependency(task_id, depends_on_id, kind)
+            self.task_repository.add_dependencies(dependencies, self.current_user_id)
+        except ValueError as e:
+            messagebox.showerror("Error", str(e))
+            return
+        except sqlite3.Error as e:
+            messagebox.showerror("Database Error", f"Error linking tasks: {e}")
+            return
+
+        changed = []
+        for task_id, depends_on_id, kind in dependencies:
+            changed += self.dependency_graph.add_dependency(task_id, depends_on_id, kind)
+        self.refresh_tasks(dict.fromkeys(changed))
+
+    def unlink_tasks(self, tasks):
+        """
+        Removes all subtask and blocking relationships of the given tasks.
+
+        :param tasks: Task objects to unlink.
+        """
+        graph = self.dependency_graph
+        dependencies = {(task.id, other_id) for task in tasks for other_id in graph.prerequisites(task.id)}
+        dependencies |= {(other_id, task.id) for task in tasks for other_id in graph.dependents(task.id)}
+        try:
+            self.task_repository.remove_dependencies(dependencies, self.current_user_id)
+        except sqlite3.Error as e:
+            messagebox.showerror("Database Error", f"Error unlinking tasks: {e}")
+            return
+
+        changed = []
+        for task_id, depends_on_id in dependencies:
+            changed += graph.remove_dependency(task_id, depends_on_id)
+        self.refresh_tasks(dict.fromkeys(changed))
 
     def show_archive(self):
         """
         Opens the ArchiveViewer with filtering functionality.
         """
+        self.write_journal.flush(timeout=5)  # Journaled archive operations must be visible in the viewer
         archive_viewer = ArchiveViewer(self)
         archive_viewer.load_archived_tasks()
 
     def show_settings(self):
         SettingsWindow(self)
 
+    def show_statistics(self):
+        """
+        Opens the StatsWindow with the precomputed task counts.
+        """
+        self.write_buffer.flush()
+        self.write_journal.flush(timeout=5)  # Counts are updated when the journaled edits are written
+        StatsWindow(self)
+
     def schedule_notifications(self):
         notifications = self.notification_manager.schedule_notifications(self.tasks)
         for notification in notifications:
@@ -615,12 +1278,9 @@ class GUIController:
         Delegates marking a task as open to the TaskEditor.
         """
         # Check if a task is selected
-        if self.selected_task:
-            task_to_update = self.selected_task["task"]
-        elif self.low_listbox.curselection():
-            selected_index = self.low_listbox.curselection()[0]
-            selected_task_title = self.low_listbox.get(selected_index)
-            task_to_update = next((task for task in self.tasks if task.title == selected_task_title), None)
+        selected_tasks = self.get_selected_tasks()
+        if selected_tasks:
+            task_to_update = selected_tasks[0]
         else:
             messagebox.showwarning("No Selection", "Please select a completed task to mark as open.")
             return
@@ -637,20 +1297,18 @@ class GUIController:
     def drag_or_select_task(self, event, task_id):
         """
         Handles whether a task is clicked (select) or dragged.
+        The press only starts tracking; the pointer moving beyond the drag threshold turns it into a drag.
         """
-        # Start the drag process
         self.drag_drop_handler.start_drag(event, task_id)
 
-        # Delayed check for "drag vs. click"
-        self.root.after(200, lambda: self._handle_click_or_drag(event, task_id))
-
     def _handle_click_or_drag(self, event, task_id):
         """
-        Finalizes whether it was a click or drag.
+        Finalizes whether it was a click or drag when the mouse button is released.
         """
-        if not self.drag_drop_handler.is_dragging:
-            # No dragging detected -> Select the task
-            self.select_task(event, task_id)
+        if self.drag_drop_handler.is_dragging:
+            self.drag_drop_handler.drop_task(event, task_id)
         else:
-            print("Task dragged, skipping selection.")
+            # The pointer stayed within the drag threshold -> Select the task
+            self.drag_drop_handler.cancel_drag()
+            self.select_task(event, task_id)
 
@@ -1,5 +1,6 @@
 import os
 import sys
+import sqlite3
 import tkinter as tk
 from tkinter import messagebox
 import re
@@ -10,19 +11,25 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../U
 
 from User.UserRepository.user_repository import UserRepository
 from user import User
+from password_hasher import PasswordWorker
 
 
 class LoginWindow(tk.Toplevel):
     """
     A modal window for user login at the beginning of the session.
+    Passwords are hashed and checked in a worker thread, the window shows the progress meanwhile.
     """
 
+    POLL_MS = 50  # Interval of checking whether the password worker has finished
+
     def __init__(self, controller):
         super().__init__(controller.root)
         self.controller = controller
         self.title("Login")
         self.geometry("300x200")
         self.user_repo = UserRepository(controller.db_path)
+        self.worker = None  # PasswordWorker of the running login or registration
+        self.on_worker_done = None  # Called on the Tk thread with the finished worker
 
         # Configure modal behavior
         self.transient(controller.root)  # Make this window modal relative to the main window
@@ -40,8 +47,13 @@ class LoginWindow(tk.Toplevel):
         self.password_entry = tk.Entry(self, width=30, show="*")
         self.password_entry.pack(pady=5)
 
-        tk.Button(self, text="Login", command=self.login).pack(pady=10)
-        tk.Button(self, text="Register", command=self.register).pack(pady=5)
+        self.login_button = tk.Button(self, text="Login", command=self.login)
+        self.login_button.pack(pady=10)
+        self.register_button = tk.Button(self, text="Register", command=self.register)
+        self.register_button.pack(pady=5)
+
+        self.status_label = tk.Label(self, text="")
+        self.status_label.pack()
 
     def validate_input(self, username, password):
         """
@@ -73,6 +85,53 @@ class LoginWindow(tk.Toplevel):
 
         return True
 
+    def run_worker(self, function, args, on_done, message):
+        """
+        Runs a slow password function in a PasswordWorker and disables the buttons until it has finished.
+
+        :param function: Function to run in the worker thread.
+        :param args: Arguments of the function.
+        :param on_done: Called on the Tk thread with the finished worker.
+        :param message: Progress message shown while the worker runs.
+        """
+        self.login_button.config(state=tk.DISABLED)
+        self.register_button.config(state=tk.DISABLED)
+        self.progress_message = message
+        self.on_worker_done = on_done
+        self.worker = PasswordWorker(function, *args)
+        self.worker.start()
+        self.poll_worker()
+
+    def poll_worker(self):
+        """
+        Shows the progress of the password worker and hands its result to on_worker_done once it has finished.
+        """
+        if not self.worker.is_finished():
+            dots = "." * (int(self.worker.elapsed() * 4) % 4)
+            self.status_label.config(text=f"{self.progress_message}{dots}")
+            self.after(self.POLL_MS, self.poll_worker)
+            return
+
+        worker, self.worker = self.worker, None
+        self.status_label.config(text="")
+        self.login_button.config(state=tk.NORMAL)
+        self.register_button.config(state=tk.NORMAL)
+        self.on_worker_done(worker)
+
+    @staticmethod
+    def verify_login(user, password):
+        """
+        Checks the password of a user and computes a new hash if its hash is outdated. Runs in the worker
+        thread, so it leaves the user, which is shared with the repository cache, unchanged.
+
+        :return: Tuple (password matches, new hash or None).
+        """
+        if not user.check_password(password):
+            return False, None
+        if user.needs_rehash():
+            return True, user.hash_password(password)
+        return True, None
+
     def login(self):
         username = self.username_entry.get().strip()
         password = self.password_entry.get().strip()
@@ -82,14 +141,37 @@ class LoginWindow(tk.Toplevel):
             return
 
         user = self.user_repo.get_user_by_username(username)
+        if not user:
+            messagebox.showerror("Error", "Invalid username or password.")
+            return
 
-        if user and user.check_password(password):
-            self.controller.current_user = username
-            self.controller.current_user_id = user.id  # Store the user_id in the controller
-            self.controller.load_tasks()  # Load tasks for this user
-            self.destroy()  # Close the login window
-        else:
+        self.run_worker(self.verify_login, (user, password), lambda worker: self.finish_login(user, worker),
+                        "Checking password")
+
+    def finish_login(self, user, worker):
+        """
+        Completes the login once the password has been checked.
+
+        :param user: The user logging in.
+        :param worker: The finished PasswordWorker of verify_login.
+        """
+        if worker.state == PasswordWorker.FAILED:
+            messagebox.showerror("Error", f"Error checking the password: {worker.error}")
+            return
+        valid, new_hash = worker.result
+        if not valid:
             messagebox.showerror("Error", "Invalid username or password.")
+            return
+
+        if new_hash is not None:
+            try:
+                self.user_repo.update_password_hash(user, new_hash)
+            except sqlite3.Error as e:
+                # The previous hash stays valid, the rehash is repeated on the next login
+                messagebox.showerror("Database Error", f"Error updating the password hash: {e}")
+
+        self.controller.start_session(user)  # Load tasks for this user
+        self.destroy()  # Close the login window
 
     def register(self):
         username = self.username_entry.get().strip()
@@ -103,9 +185,27 @@ class LoginWindow(tk.Toplevel):
         if self.user_repo.get_user_by_username(username):
             messagebox.showwarning("Warning", "Username already exists.")
         else:
-            user = User(username, password)
-            self.user_repo.save_user(user)
-            messagebox.showinfo("Success", "User registered successfully, please log in to continue.")
+            self.run_worker(User, (username, password), self.finish_register, "Securing password")
+
+    def finish_register(self, worker):
+        """
+        Saves a new user once its password has been hashed.
+
+        :param worker: The finished PasswordWorker that created the User.
+        """
+        if worker.state == PasswordWorker.FAILED:
+            messagebox.showerror("Error", f"Error hashing the password: {worker.error}")
+            return
+        try:
+            self.user_repo.save_user(worker.result)
+        except sqlite3.IntegrityError:
+            # Registered by another instance while the password was being hashed
+            messagebox.showwarning("Warning", "Username already exists.")
+            return
+        except sqlite3.Error as e:
+            messagebox.showerror("Database Error", f"Error saving the user: {e}")
+            return
+        messagebox.showinfo("Success", "User registered successfully, please log in to continue.")
 
     def on_close(self):
         """
@@ -0,0 +1,50 @@
+import os
+import sys
+import tkinter as tk
+from tkinter import ttk
+
+# Import paths for other modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../Task')))
+
+from task import Priority
+
+
+class PriorityDialog(tk.Toplevel):
+    """
+    A small window for assigning the same priorities to all selected tasks.
+    """
+
+    def __init__(self, controller, task_count, on_apply):
+        """
+        Initializes the dialog.
+
+        :param controller: Reference to the GUIController instance.
+        :param task_count: Number of tasks the priorities will be applied to.
+        :param on_apply: Callback receiving (importance, urgency, fitness) as Priority values.
+        """
+        super().__init__(controller.root)
+        self.controller = controller
+        self.on_apply = on_apply
+        self.title("Set Priority")
+        self.geometry("300x300")
+
+        tk.Label(self, text=f"New priorities for {task_count} task(s):").pack(pady=5)
+
+        self.combos = {}
+        for name in ["Importance", "Urgency", "Fitness"]:
+            tk.Label(self, text=f"{name}:").pack(pady=5)
+            combo = ttk.Combobox(self, values=[p.value for p in Priority], state="readonly")
+            combo.set(Priority.LOW.value)
+            combo.pack(pady=5)
+            self.combos[name] = combo
+
+        tk.Button(self, text="Apply", command=self.apply).pack(pady=10)
+
+    def apply(self):
+        """
+        Passes the chosen priorities to the callback and closes the dialog.
+        """
+        importance, urgency, fitness = (Priority(self.combos[name].get())
+                                        for name in ["Importance", "Urgency", "Fitness"])
+        self.destroy()
+        self.on_apply(importance, urgency, fitness)
@@ -4,6 +4,11 @@ import sqlite3
 import tkinter as tk
 from tkinter import messagebox, ttk
 
+# Import paths for other modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../Database')))
+
+from shared_access import connect, retry_on_busy
+
 
 class SettingsWindow(tk.Toplevel):
     """
@@ -81,7 +86,7 @@ class SettingsWindow(tk.Toplevel):
         Loads the current settings from the database for the logged-in user.
         """
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = connect(self.db_path)
             cursor = conn.cursor()
 
             # Fetch settings for the current user
@@ -139,20 +144,27 @@ class SettingsWindow(tk.Toplevel):
         default_urgency = self.default_urgency_var.get()
         default_fitness = self.default_fitness_var.get()
 
-        try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
+        def write():
+            conn = connect(self.db_path)
+            try:
+                # Update settings for the current user
+                conn.execute('''
+                    UPDATE settings
+                    SET notification_interval = ?, auto_archive = ?, auto_delete = ?, auto_delete_interval = ?,
+                        notifications_enabled = ?, default_importance = ?, default_urgency = ?, default_fitness = ?
+                    WHERE user_id = ?
+                ''', (notification_interval, int(auto_archive), int(auto_delete), auto_delete_interval,
+                      int(notifications_enabled), default_importance, default_urgency, default_fitness, self.user_id))
+                conn.commit()
+            except sqlite3.Error:
+                conn.rollback()
+                raise
+            finally:
+                conn.close()
 
-            # Update settings for the current user
-            cursor.execute('''
-                UPDATE settings
-                SET notification_interval = ?, auto_archive = ?, auto_delete = ?, auto_delete_interval = ?, 
-                    notifications_enabled = ?, default_importance = ?, default_urgency = ?, default_fitness = ?
-                WHERE user_id = ?
-            ''', (notification_interval, int(auto_archive), int(auto_delete), auto_delete_interval,
-                  int(notifications_enabled), default_importance, default_urgency, default_fitness, self.user_id))
-            conn.commit()
-            conn.close()
+        try:
+            retry_on_busy(write)
+            self.controller.session.reload_settings()
 
             messagebox.showinfo("Settings Saved", "Your settings have been saved.")
             self.destroy()
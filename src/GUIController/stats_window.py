@@ -0,0 +1,110 @@
+import os
+import sys
+import sqlite3
+import tkinter as tk
+from tkinter import messagebox
+from datetime import date, timedelta
+
+# Import paths for other modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../StatisticsManager')))
+
+from statistics_manager import StatisticsManager, REGION_ORDER
+from completion_analytics import CompletionAnalytics
+
+# Number of days up to today covered by the completion section
+COMPLETION_DAYS = 30
+
+# Captions of the Venn regions
+REGION_NAMES = {
+    "HHH": "Do Now (all high)",
+    "HH": "Important + Urgent",
+    "HF": "Important + Fitness",
+    "UF": "Urgent + Fitness",
+    "I": "Important",
+    "U": "Urgent",
+    "F": "Fitness",
+    "LOW": "Low priority",
+}
+
+
+class StatsWindow(tk.Toplevel):
+    """
+    A window showing how the user's open and archived tasks are distributed over the Venn regions,
+    their status and the coming weeks.
+    """
+
+    def __init__(self, controller):
+        super().__init__(controller.root)
+        self.controller = controller
+        self.statistics_manager = StatisticsManager(controller.db_path)
+        self.completion_analytics = CompletionAnalytics(controller.db_path, snapshot=controller.archive_snapshot)
+        self.title("Statistics")
+        self.geometry("420x600")
+
+        self.content = tk.Frame(self)
+        self.content.pack(fill="both", expand=True, padx=10, pady=10)
+        tk.Button(self, text="Refresh", command=self.load_statistics).pack(pady=5)
+        self.load_statistics()
+
+    def load_statistics(self):
+        """
+        Reads the precomputed counts and rebuilds the table.
+        """
+        user_id = self.controller.current_user_id
+        end = date.today()
+        start = end - timedelta(days=COMPLETION_DAYS)
+        try:
+            dashboard = self.statistics_manager.get_dashboard(user_id)
+            lead_times = self.completion_analytics.lead_times(user_id, start, end)["total"]
+            completion_rate = self.completion_analytics.completion_rates(user_id, start, end)["total"][2]
+        except sqlite3.Error as e:
+            messagebox.showerror("Database Error", f"Error loading statistics: {e}")
+            return
+
+        for widget in self.content.winfo_children():
+            widget.destroy()
+
+        row = 0
+        for column, caption in enumerate(("Region", "Open", "Archived", "Due this week")):
+            tk.Label(self.content, text=caption, font=("Helvetica", 10, "bold")).grid(row=row, column=column,
+                                                                                     sticky="w", padx=5)
+        for region in REGION_ORDER:
+            row += 1
+            values = (REGION_NAMES[region], dashboard["tasks"]["region"].get(region, 0),
+                      dashboard["archived"]["region"].get(region, 0), dashboard["due_this_week"].get(region, 0))
+            for column, value in enumerate(values):
+                tk.Label(self.content, text=value).grid(row=row, column=column, sticky="w", padx=5)
+
+        row += 1
+        tk.Label(self.content, text="Total", font=("Helvetica", 10, "bold")).grid(row=row, column=0, sticky="w",
+                                                                                 padx=5)
+        for column, value in enumerate((dashboard["tasks"]["total"], dashboard["archived"]["total"],
+                                        dashboard["due_this_week"]["total"]), start=1):
+            tk.Label(self.content, text=value).grid(row=row, column=column, sticky="w", padx=5)
+
+        row += 1
+        tk.Label(self.content, text="Status", font=("Helvetica", 10, "bold")).grid(row=row, column=0, sticky="w",
+                                                                                  padx=5, pady=(15, 0))
+        for status, count in sorted(dashboard["tasks"]["status"].items()):
+            row += 1
+            tk.Label(self.content, text=status).grid(row=row, column=0, sticky="w", padx=5)
+            tk.Label(self.content, text=count).grid(row=row, column=1, sticky="w", padx=5)
+
+        row += 1
+        tk.Label(self.content, text=f"Due next week: {dashboard['due_next_week']}").grid(
+            row=row, column=0, columnspan=4, sticky="w", padx=5, pady=(15, 0))
+        row += 1
+        tk.Label(self.content, text=f"Without due date: {dashboard['no_due_date']}").grid(
+            row=row, column=0, columnspan=4, sticky="w", padx=5)
+
+        row += 1
+        tk.Label(self.content, text=f"Last {COMPLETION_DAYS} days", font=("Helvetica", 10, "bold")).grid(
+            row=row, column=0, columnspan=4, sticky="w", padx=5, pady=(15, 0))
+        lines = [f"Completed: {lead_times['completed']}, on time: {lead_times['on_time']}"]
+        if lead_times["average_days"] is not None:
+            lines.append(f"Average days before due date: {lead_times['average_days']:.1f}")
+        if completion_rate is not None:
+            lines.append(f"Tasks due in this period completed: {completion_rate:.0%}")
+        for line in lines:
+            row += 1
+            tk.Label(self.content, text=line).grid(row=row, column=0, columnspan=4, sticky="w", padx=5)
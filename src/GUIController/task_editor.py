@@ -3,12 +3,12 @@ import sys
 import sqlite3
 import tkinter as tk
 from tkinter import ttk, messagebox
-from datetime import datetime
 
 # Import paths for other modules
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../Task')))
 
-from task import Task, Priority, Status
+from task import Task, Priority, Status, validate_task_data
+from recurrence import make_rule
 
 
 class TaskEditor(tk.Toplevel):
@@ -23,7 +23,7 @@ class TaskEditor(tk.Toplevel):
         self.task = task
         self.index = index
         self.title(title)
-        self.geometry("400x600")
+        self.geometry("400x650")
 
         # Fields for task details
         tk.Label(self, text="Title:").pack(pady=5)
@@ -44,6 +44,13 @@ class TaskEditor(tk.Toplevel):
         if task and task.due_date:
             self.due_date_entry.insert(0, task.due_date.strftime("%Y-%m-%d"))
 
+        # Repetition, a frequency with an optional interval ("Weekly 2") or a stored rule
+        tk.Label(self, text="Repeat:").pack(pady=5)
+        self.repeat_var = tk.StringVar(value=task.recurrence if task and task.recurrence else "None")
+        self.repeat_combo = ttk.Combobox(self, textvariable=self.repeat_var, width=47,
+                                         values=["None", "Daily", "Weekly", "Monthly", "Yearly"])
+        self.repeat_combo.pack(pady=5)
+
         # Dropdowns for priority levels
         tk.Label(self, text="Importance:").pack(pady=5)
         self.importance_var = tk.StringVar(value="Select Priority")
@@ -89,68 +96,42 @@ class TaskEditor(tk.Toplevel):
         due_date_str = self.due_date_entry.get().strip()
         user_id = self.controller.current_user_id
 
-        # Validate input
-        if not title:
-            messagebox.showerror("Error", "Title is required.")
-            return
-        if len(title) > 25:
-            messagebox.showerror("Error", "Title cannot exceed 25 characters.")
-            return
-        if len(description) > 250:
-            messagebox.showerror("Error", "Description cannot exceed 250 characters.")
-            return
-
-        if self.importance_var.get() == "Select Priority" or self.urgency_var.get() == "Select Priority" or self.fitness_var.get() == "Select Priority":
-            messagebox.showerror("Error", "All priority levels must be selected.")
-            return
-
-        # Validate due date
-        if not due_date_str:
-            messagebox.showerror("Error", "Due date is required.")
-            return
-
+        # Validate input and convert the dropdown values to Priority Enum
         try:
-            due_date = datetime.strptime(due_date_str, "%Y-%m-%d").date()
-        except ValueError:
-            messagebox.showerror("Error", "Invalid due date format. Use YYYY-MM-DD.")
-            return
-
-        # Check if the due date is in the past
-        today = datetime.today().date()
-        if due_date < today:
-            messagebox.showerror("Error", "The due date cannot be in the past.")
+            due_date, importance, urgency, fitness = validate_task_data(
+                title, description, due_date_str,
+                self.importance_var.get(), self.urgency_var.get(), self.fitness_var.get()
+            )
+            recurrence = make_rule(self.repeat_var.get(), due_date)
+        except ValueError as e:
+            messagebox.showerror("Error", str(e))
             return
 
-        # Convert dropdown values to Priority Enum
-        importance = Priority[self.importance_var.get().upper()]
-        urgency = Priority[self.urgency_var.get().upper()]
-        fitness = Priority[self.fitness_var.get().upper()]
         status = self.task.status if self.task else Status.OPEN
 
-        conn = sqlite3.connect(self.controller.db_path)
-        cursor = conn.cursor()
+        try:
+            if self.task:
+                # Update existing task, in write-behind mode the repository queues the write in the journal
+                self.controller.task_repository.update_task(self.task.id, user_id, title, description, due_date,
+                                                            importance, urgency, fitness, status, recurrence)
+            else:
+                # Insert new task, written at once because the task needs its database ID
+                saved_task = Task(title=title, due_date=due_date, importance=importance, urgency=urgency,
+                                  fitness=fitness, description=description, status=status, recurrence=recurrence)
+                self.controller.task_repository.add_tasks([saved_task], user_id)
+        except sqlite3.Error as e:
+            messagebox.showerror("Database Error", f"Failed to save the task: {e}")
+            return
 
+        # Update the cached task in place instead of reloading the whole task list
         if self.task:
-            # Update existing task
-            cursor.execute('''
-                UPDATE tasks
-                SET title = ?, description = ?, due_date = ?, importance = ?, urgency = ?, fitness = ?, status = ?
-                WHERE id = ?
-            ''', (
-                title, description, due_date, importance.value, urgency.value, fitness.value, status.value,
-                self.task.id))
-        else:
-            # Insert new task
-            cursor.execute('''
-                INSERT INTO tasks (title, description, due_date, importance, urgency, fitness, status, user_id)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (title, description, due_date, importance.value, urgency.value, fitness.value, status.value, user_id))
-
-        conn.commit()
-        conn.close()
+            self.task.edit_task(title=title, due_date=due_date, importance=importance, urgency=urgency,
+                                fitness=fitness, description=description)
+            self.task.recurrence = recurrence
+            saved_task = self.task
+        self.controller.session.put_task(saved_task)
 
         messagebox.showinfo("Success", "Task saved successfully.")
-        self.controller.load_tasks()  # Refresh the task list
         self.destroy()  # Close the editor window
 
     @staticmethod
@@ -159,21 +140,11 @@ class TaskEditor(tk.Toplevel):
         Marks the given task as open and updates the database.
         """
         try:
-            conn = sqlite3.connect(controller.db_path)
-            cursor = conn.cursor()
-
-            # Update the task's status in the database
-            cursor.execute('''
-                UPDATE tasks
-                SET status = ?
-                WHERE id = ?
-            ''', (Status.OPEN.value, task.id))
-            conn.commit()
-            conn.close()
-
-            # Update the task's status in the task list
+            controller.task_repository.bulk_update_status([task.id], controller.current_user_id, Status.OPEN)
+
+            # Update the task's status in the task list, the cache refreshes its display
             task.status = Status.OPEN
+            controller.session.put_task(task)
             messagebox.showinfo("Success", f"Task '{task.title}' marked as open.")
-            controller.load_tasks()  # Reload the task list
         except sqlite3.Error as e:
             messagebox.showerror("Database Error", f"Error marking task as open: {e}")
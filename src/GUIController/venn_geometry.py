@@ -0,0 +1,152 @@
+import os
+import sys
+
+# Import paths for other modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../Task')))
+
+from task import Priority
+
+# Region codes for each combination of (importance, urgency, fitness) being HIGH
+REGIONS = {
+    (True, True, True): "HHH",
+    (True, True, False): "HH",
+    (True, False, True): "HF",
+    (False, True, True): "UF",
+    (True, False, False): "I",
+    (False, True, False): "U",
+    (False, False, True): "F",
+    (False, False, False): "LOW",
+}
+
+# Inverse of REGIONS, the priority flags of each region
+REGION_FLAGS = {region: flags for flags, region in REGIONS.items()}
+
+
+class VennGeometry:
+    """
+    The single description of the three priority circles.
+    It is used for drawing the diagram, for laying out the tasks and for classifying drop positions,
+    so a task is always shown in and dropped into the same area.
+    """
+
+    def __init__(self, center_x=512, center_y=512, radius=275, offset=150):
+        """
+        Initializes the geometry.
+
+        :param center_x: X coordinate of the diagram center.
+        :param center_y: Y coordinate of the diagram center.
+        :param radius: Radius of each circle.
+        :param offset: Distance of each circle center from the diagram center.
+        """
+        self.center_x = center_x
+        self.center_y = center_y
+        self.radius = radius
+        self.offset = offset
+
+        # Circle centers in the order importance, urgency, fitness
+        self.importance_center = (center_x - offset, center_y)
+        self.urgency_center = (center_x, center_y + offset)
+        self.fitness_center = (center_x + offset, center_y)
+        self.centers = (self.importance_center, self.urgency_center, self.fitness_center)
+
+        # Position of the "Do Now" label inside the intersection of all circles
+        self.do_now_position = (center_x, center_y + 100)
+
+    def circle_bbox(self, center):
+        """
+        :param center: One of the circle centers.
+        :return: Bounding box (x1, y1, x2, y2) of the circle, as used by create_oval.
+        """
+        x, y = center
+        return x - self.radius, y - self.radius, x + self.radius, y + self.radius
+
+    def memberships(self, x, y):
+        """
+        :return: Tuple of booleans telling whether the point lies in the importance, urgency and fitness circles.
+        """
+        radius_squared = self.radius ** 2
+        return tuple((x - cx) ** 2 + (y - cy) ** 2 <= radius_squared for cx, cy in self.centers)
+
+    def region_at(self, x, y):
+        """
+        :return: Region code ("HHH", "HH", "HF", "UF", "I", "U", "F" or "LOW") of the point.
+        """
+        return REGIONS[self.memberships(x, y)]
+
+    def priorities_at(self, x, y):
+        """
+        Determines the priorities a task gets when it is dropped at the given point.
+
+        :return: Tuple of Priority values (importance, urgency, fitness).
+        """
+        return tuple(Priority.HIGH if inside else Priority.LOW for inside in self.memberships(x, y))
+
+    def region_bbox(self, region):
+        """
+        :param region: Region code other than "LOW".
+        :return: Bounding box of the region, the intersection of the boxes of the circles it lies in.
+        """
+        boxes = [self.circle_bbox(center) for center, inside in zip(self.centers, REGION_FLAGS[region]) if inside]
+        return (max(box[0] for box in boxes), max(box[1] for box in boxes),
+                min(box[2] for box in boxes), min(box[3] for box in boxes))
+
+
+class RegionRaster:
+    """
+    Precomputed region codes for a grid of cells covering the diagram, so a pointer position is classified
+    with one array lookup. Cells crossed by a circle edge are marked and classified analytically, which keeps
+    the lookup exact everywhere.
+    """
+
+    MIXED = 255  # Cell value of cells crossed by a circle edge
+
+    def __init__(self, geometry, cell_size=4):
+        """
+        :param geometry: The VennGeometry to rasterize.
+        :param cell_size: Edge length of a cell in diagram units.
+        """
+        self.geometry = geometry
+        self.cell_size = cell_size
+        self.codes = list(REGION_FLAGS)
+
+        # Everything outside the union of the circles' boxes is LOW
+        boxes = [geometry.circle_bbox(center) for center in geometry.centers]
+        self.x1 = min(box[0] for box in boxes)
+        self.y1 = min(box[1] for box in boxes)
+        self.columns = int((max(box[2] for box in boxes) - self.x1) / cell_size) + 1
+        self.rows = int((max(box[3] for box in boxes) - self.y1) / cell_size) + 1
+
+        half_diagonal = cell_size * 0.7072  # Slightly more than sqrt(2) / 2
+        self.cells = bytearray(self.columns * self.rows)
+        for row in range(self.rows):
+            y = self.y1 + (row + 0.5) * cell_size
+            for column in range(self.columns):
+                x = self.x1 + (column + 0.5) * cell_size
+                flags = []
+                for cx, cy in geometry.centers:
+                    distance = ((x - cx) ** 2 + (y - cy) ** 2) ** 0.5 - geometry.radius
+                    if abs(distance) <= half_diagonal:
+                        flags = None  # The circle's edge may cross this cell
+                        break
+                    flags.append(distance < 0)
+                self.cells[row * self.columns + column] = \
+                    self.MIXED if flags is None else self.codes.index(REGIONS[tuple(flags)])
+
+    def region_at(self, x, y):
+        """
+        :return: Region code of the diagram point (x, y).
+        """
+        column = int((x - self.x1) // self.cell_size)
+        row = int((y - self.y1) // self.cell_size)
+        if not (0 <= column < self.columns and 0 <= row < self.rows):
+            return "LOW"
+        value = self.cells[row * self.columns + column]
+        if value == self.MIXED:
+            return self.geometry.region_at(x, y)
+        return self.codes[value]
+
+    def priorities_at(self, x, y):
+        """
+        :return: Tuple of Priority values (importance, urgency, fitness) a task dropped at (x, y) gets.
+        """
+        return tuple(Priority.HIGH if flag else Priority.LOW for flag in REGION_FLAGS[self.region_at(x, y)])
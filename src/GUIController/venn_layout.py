@@ -0,0 +1,364 @@
+import math
+
+
+class SpatialGrid:
+    """
+    Uniform grid over rectangles, answering overlap queries by only looking at the cells a rectangle covers.
+    """
+
+    def __init__(self, cell_size=32):
+        """
+        :param cell_size: Edge length of a grid cell in canvas pixels.
+        """
+        self.cell_size = cell_size
+        self.cells = {}  # Maps (column, row) to the set of keys of rectangles touching the cell
+        self.boxes = {}  # Maps keys to their rectangles
+
+    def _cell_range(self, bbox):
+        x1, y1, x2, y2 = bbox
+        size = self.cell_size
+        for column in range(math.floor(x1 / size), math.floor(x2 / size) + 1):
+            for row in range(math.floor(y1 / size), math.floor(y2 / size) + 1):
+                yield column, row
+
+    def insert(self, key, bbox):
+        """
+        Adds a rectangle.
+
+        :param key: Identifier of the rectangle, replaces an existing rectangle with the same key.
+        :param bbox: Rectangle (x1, y1, x2, y2).
+        """
+        if key in self.boxes:
+            self.remove(key)
+        self.boxes[key] = bbox
+        for cell in self._cell_range(bbox):
+            self.cells.setdefault(cell, set()).add(key)
+
+    def remove(self, key):
+        """
+        Removes a rectangle if it exists.
+        """
+        bbox = self.boxes.pop(key, None)
+        if bbox is None:
+            return
+        for cell in self._cell_range(bbox):
+            keys = self.cells.get(cell)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self.cells[cell]
+
+    def query(self, bbox):
+        """
+        :param bbox: Rectangle (x1, y1, x2, y2).
+        :return: Set of keys of the rectangles overlapping it.
+        """
+        x1, y1, x2, y2 = bbox
+        result = set()
+        for cell in self._cell_range(bbox):
+            for key in self.cells.get(cell, ()):
+                bx1, by1, bx2, by2 = self.boxes[key]
+                if bx1 < x2 and x1 < bx2 and by1 < y2 and y1 < by2:
+                    result.add(key)
+        return result
+
+    def at(self, x, y):
+        """
+        :return: Set of keys of the rectangles containing the point.
+        """
+        size = self.cell_size
+        return {key for key in self.cells.get((math.floor(x / size), math.floor(y / size)), ())
+                if self.boxes[key][0] <= x <= self.boxes[key][2] and self.boxes[key][1] <= y <= self.boxes[key][3]}
+
+    def intersects(self, bbox):
+        """
+        :return: True if any rectangle overlaps the given one.
+        """
+        x1, y1, x2, y2 = bbox
+        for cell in self._cell_range(bbox):
+            for key in self.cells.get(cell, ()):
+                bx1, by1, bx2, by2 = self.boxes[key]
+                if bx1 < x2 and x1 < bx2 and by1 < y2 and y1 < by2:
+                    return True
+        return False
+
+
+class VennLayout:
+    """
+    Packs task labels into the true intersections of the Venn circles without overlaps.
+    Each region is sampled once into candidate positions ordered by distance from the region's center,
+    labels take the first free candidate their whole box fits at, and a SpatialGrid keeps collision
+    checks local, so a layout takes roughly linear time in the number of labels.
+    """
+
+    def __init__(self, geometry, line_height=15, measure=None, padding=3, max_attempts=None):
+        """
+        Initializes the layout engine.
+
+        :param geometry: The VennGeometry shared with drawing and drop hit-testing.
+        :param line_height: Height of a label and distance between candidate rows, in diagram units.
+        :param measure: Callable returning the width of a text in diagram units, defaults to 7 per character.
+        :param padding: Horizontal space kept free on both sides of a label.
+        :param max_attempts: Candidates tried per label before it is reported as overflow, defaults to the
+                             number of candidates covering the same diagram area at any line height.
+        """
+        self.geometry = geometry
+        self.line_height = line_height
+        self.measure = measure or (lambda text: 7 * len(text))
+        self.padding = padding
+        self.max_attempts = max_attempts or int(300 * (15 / line_height) ** 2)
+        self._candidates = {}  # Cached candidate positions per region
+        self._reaches = {}  # Cached half-width of the widest label fitting at each candidate, per region
+        self._cell_indexes = {}  # Per region the grid origin and a map from (row, column) to candidate index
+        self.grid = SpatialGrid(cell_size=2 * line_height)  # Occupied boxes of the most recent layout
+
+    def candidates(self, region):
+        """
+        :param region: Region code other than "LOW".
+        :return: Positions inside the region, nearest to the region's center first.
+        """
+        if region not in self._candidates:
+            x1, y1, x2, y2 = self.geometry.region_bbox(region)
+            step = self.line_height
+            cells = [(row, column)
+                     for row in range(int((y2 - y1) / step))
+                     for column in range(int((x2 - x1) / step))
+                     if self.geometry.region_at(x1 + (column + 0.5) * step, y1 + (row + 0.5) * step) == region]
+            points = [(x1 + (column + 0.5) * step, y1 + (row + 0.5) * step) for row, column in cells]
+            if points:
+                center_x = sum(x for x, _ in points) / len(points)
+                center_y = sum(y for _, y in points) / len(points)
+                order = sorted(range(len(points)), key=lambda i: (points[i][0] - center_x) ** 2 +
+                               (points[i][1] - center_y) ** 2)
+                points = [points[i] for i in order]
+                cells = [cells[i] for i in order]
+            self._candidates[region] = points
+            self._cell_indexes[region] = ((x1, y1), {cell: index for index, cell in enumerate(cells)})
+            self._reaches[region] = [None] * len(points)
+        return self._candidates[region]
+
+    def _cover(self, region, skip, bbox):
+        """
+        Marks the candidates whose position lies inside a box as used, no label can be centered there anymore.
+
+        :param skip: Skip list of the region, see _next_free.
+        """
+        (origin_x, origin_y), cell_indexes = self._cell_indexes[region]
+        x1, y1, x2, y2 = bbox
+        step = self.line_height
+        for row in range(math.floor((y1 - origin_y) / step - 0.5), math.ceil((y2 - origin_y) / step - 0.5) + 1):
+            y = origin_y + (row + 0.5) * step
+            if not y1 < y < y2:
+                continue
+            for column in range(math.floor((x1 - origin_x) / step - 0.5),
+                                math.ceil((x2 - origin_x) / step - 0.5) + 1):
+                index = cell_indexes.get((row, column))
+                if index is not None and x1 < origin_x + (column + 0.5) * step < x2:
+                    skip[index] = index + 1
+
+    @staticmethod
+    def _next_free(skip, index):
+        """
+        Finds the first candidate at or after index that is not covered.
+        skip[i] == i for free candidates and points further ahead for covered ones; the paths are compressed
+        on the way, so repeated searches over covered candidates take amortized constant time.
+        """
+        root = index
+        while skip[root] != root:
+            root = skip[root]
+        while skip[index] != root:
+            skip[index], index = root, skip[index]
+        return root
+
+    def reach(self, region, index, needed):
+        """
+        Returns how far a label centered at a candidate may extend to each side without leaving the region.
+        The value only depends on the geometry, so it is cached and reused by later layouts. It is only
+        probed as far as requested, so narrow labels do not pay for measuring wide gaps.
+
+        :param region: Region code.
+        :param index: Index of the candidate in candidates(region).
+        :param needed: Half-width the caller wants to place.
+        :return: The reach if it is smaller than needed, otherwise a value of at least needed.
+        """
+        reaches = self._reaches[region]
+        known = reaches[index]
+        if known is not None and (known[1] or known[0] >= needed):
+            return known[0]
+
+        x, y = self._candidates[region][index]
+        top = y - self.line_height / 2
+        bottom = y + self.line_height / 2
+        step = self.line_height / 2
+
+        def inside(dx):
+            return all(self.geometry.region_at(px, py) == region for px in (x - dx, x + dx) for py in (top, bottom))
+
+        if known is None:
+            if not inside(0):
+                reaches[index] = (-1.0, True)
+                return -1.0
+            known = (0.0, False)
+
+        reach = known[0]
+        final = False
+        while reach < needed:
+            if not inside(reach + step):
+                final = True
+                break
+            reach += step
+        reaches[index] = (reach, final)
+        return reach
+
+    def label_bbox(self, x, y, width):
+        """
+        :return: Box (x1, y1, x2, y2) occupied by a label of the given width centered at (x, y).
+        """
+        half_width = width / 2 + self.padding
+        half_height = self.line_height / 2
+        return x - half_width, y - half_height, x + half_width, y + half_height
+
+    def fits(self, region, bbox):
+        """
+        Checks that a box lies completely inside a region.
+        Corners alone are not enough, the circles cut concave edges into the regions, so points along the
+        top and bottom edges are checked as well.
+        """
+        x1, y1, x2, y2 = bbox
+        steps = max(1, math.ceil((x2 - x1) / self.line_height))
+        for i in range(steps + 1):
+            x = x1 + (x2 - x1) * i / steps
+            if self.geometry.region_at(x, y1) != region or self.geometry.region_at(x, y2) != region:
+                return False
+        return True
+
+    def layout(self, items_by_region, reserved=(), limits=None, badge_text=None):
+        """
+        Computes label positions for all regions.
+
+        :param items_by_region: Dictionary mapping region codes to lists of (key, text) in display order.
+        :param reserved: Boxes that labels must not cover, e.g. the region captions.
+        :param limits: Optional dictionary mapping region codes to the maximum number of labels placed there.
+                       The remaining items are not laid out at all, which keeps crowded regions cheap.
+        :param badge_text: Optional callable(region, hidden count) returning the text of a region's badge,
+                           defaults to "+N more".
+        :return: Tuple (placements, overflow, badges). placements maps keys to (x, y), overflow maps region
+                 codes to the keys that were not placed and badges maps those regions to the position of
+                 their badge.
+        """
+        limits = limits or {}
+        badge_text = badge_text or (lambda region, count: self.badge_text(count))
+
+        grid = self.grid = SpatialGrid(cell_size=2 * self.line_height)
+        for index, bbox in enumerate(reserved):
+            grid.insert(("reserved", index), bbox)
+
+        placements = {}
+        overflow = {}
+        badges = {}
+        for region, items in items_by_region.items():
+            candidates = self.candidates(region)
+            skip = list(range(len(candidates) + 1))  # Covered candidates point to the next possibly free one
+            for bbox in reserved:
+                self._cover(region, skip, bbox)
+            failed_width = math.inf  # Labels at least this wide have already failed to fit
+            placed = []
+            hidden = []
+
+            limit = limits.get(region, len(items))
+            widths = [self.measure(text) for _, text in items[:limit]]
+            min_width = min(widths, default=0)
+            for (key, _), width in zip(items, widths):
+                position = None
+                if width < failed_width:
+                    position = self._find_position(grid, region, skip, width, min_width, self.max_attempts)
+                if position is None:
+                    failed_width = min(failed_width, width)
+                    hidden.append(key)
+                    continue
+                bbox = self.label_bbox(position[0], position[1], width)
+                grid.insert(key, bbox)
+                self._cover(region, skip, bbox)
+                placements[key] = position
+                placed.append(key)
+
+            hidden.extend(key for key, _ in items[limit:])
+            if hidden:
+                overflow[region] = hidden
+                badges[region] = self._place_badge(grid, region, placements, placed, hidden,
+                                                   lambda count: badge_text(region, count))
+
+        return placements, overflow, badges
+
+    def place(self, region, key, text):
+        """
+        Adds a single label to the most recent layout without moving any other label.
+
+        :param region: Region code the label belongs to.
+        :param key: Key of the label, replaces an existing label with the same key.
+        :param text: Text of the label.
+        :return: Position (x, y), or None if the region has no room left.
+        """
+        self.grid.remove(key)
+        candidates = self.candidates(region)
+        width = self.measure(text)
+        position = self._find_position(self.grid, region, list(range(len(candidates) + 1)), width, width,
+                                       len(candidates))
+        if position is not None:
+            self.grid.insert(key, self.label_bbox(position[0], position[1], width))
+        return position
+
+    def _place_badge(self, grid, region, placements, placed, hidden, badge_text):
+        """
+        Finds room for the badge of a region with hidden items, giving up the last placed labels if necessary.
+
+        :return: Position of the badge, or None if the region has no room at all.
+        """
+        while True:
+            width = self.measure(badge_text(len(hidden)))
+            # Removed labels free their candidates again, so search all of them
+            candidates = self._candidates[region]
+            position = self._find_position(grid, region, list(range(len(candidates) + 1)), width, width,
+                                           len(candidates))
+            if position is not None or not placed:
+                break
+            key = placed.pop()
+            grid.remove(key)
+            del placements[key]
+            hidden.insert(0, key)
+
+        if position is not None:
+            grid.insert(("badge", region), self.label_bbox(position[0], position[1], width))
+        return position
+
+    @staticmethod
+    def badge_text(count):
+        """
+        :return: Text of the label standing in for tasks that did not fit into their region.
+        """
+        return f"+{count} more"
+
+    def _find_position(self, grid, region, skip, width, min_width, max_attempts):
+        """
+        Finds the first free candidate position a label of the given width fits at.
+        Candidates where not even the narrowest label of the region fits are covered in the skip list,
+        so later searches do not look at them again.
+
+        :param min_width: Width of the narrowest label still to be placed in the region.
+        :return: Position (x, y), or None if no candidate within max_attempts fits.
+        """
+        candidates = self._candidates[region]
+        half_width = width / 2 + self.padding
+        min_half_width = min_width / 2 + self.padding
+        index = self._next_free(skip, 0)
+        attempts = 0
+        while index < len(candidates) and attempts < max_attempts:
+            x, y = candidates[index]
+            reach = self.reach(region, index, half_width)
+            if reach >= half_width and not grid.intersects(self.label_bbox(x, y, width)):
+                return x, y
+            if reach < min_half_width or grid.intersects(self.label_bbox(x, y, min_width)):
+                skip[index] = index + 1
+            attempts += 1
+            index = self._next_free(skip, index + 1)
+        return None
@@ -0,0 +1,84 @@
+class ViewTransform:
+    """
+    Maps diagram coordinates, in which the Venn geometry and the task layout are defined, to canvas
+    coordinates and back. Rendering, selection and drop hit-testing all go through the same transform,
+    so zooming and panning never change which region a point belongs to.
+    """
+
+    MIN_SCALE = 0.5
+    MAX_SCALE = 4.0
+
+    def __init__(self, scale=1.0, offset_x=0.0, offset_y=0.0):
+        """
+        :param scale: Canvas pixels per diagram unit.
+        :param offset_x: Canvas x coordinate of the diagram origin.
+        :param offset_y: Canvas y coordinate of the diagram origin.
+        """
+        self.scale = scale
+        self.offset_x = offset_x
+        self.offset_y = offset_y
+
+    def to_screen(self, x, y):
+        """
+        :return: Canvas coordinates of a diagram point.
+        """
+        return x * self.scale + self.offset_x, y * self.scale + self.offset_y
+
+    def to_world(self, x, y):
+        """
+        :return: Diagram coordinates of a canvas point.
+        """
+        return (x - self.offset_x) / self.scale, (y - self.offset_y) / self.scale
+
+    def bbox_to_screen(self, bbox):
+        """
+        :return: Canvas box (x1, y1, x2, y2) of a diagram box.
+        """
+        return self.to_screen(bbox[0], bbox[1]) + self.to_screen(bbox[2], bbox[3])
+
+    def bbox_to_world(self, bbox):
+        """
+        :return: Diagram box (x1, y1, x2, y2) of a canvas box.
+        """
+        return self.to_world(bbox[0], bbox[1]) + self.to_world(bbox[2], bbox[3])
+
+    def visible_bbox(self, width, height):
+        """
+        :param width: Width of the canvas.
+        :param height: Height of the canvas.
+        :return: Diagram box currently shown on the canvas.
+        """
+        return self.bbox_to_world((0, 0, width, height))
+
+    def zoom(self, factor, anchor_x, anchor_y):
+        """
+        Changes the scale while the diagram point under the anchor stays in place.
+
+        :param factor: Requested scale multiplier, clamped to MIN_SCALE and MAX_SCALE.
+        :param anchor_x: Canvas x coordinate that stays fixed, usually the mouse position.
+        :param anchor_y: Canvas y coordinate that stays fixed.
+        :return: True if the scale changed.
+        """
+        scale = min(self.MAX_SCALE, max(self.MIN_SCALE, round(self.scale * factor, 4)))
+        if scale == self.scale:
+            return False
+        world_x, world_y = self.to_world(anchor_x, anchor_y)
+        self.scale = scale
+        self.offset_x = anchor_x - world_x * scale
+        self.offset_y = anchor_y - world_y * scale
+        return True
+
+    def pan(self, dx, dy):
+        """
+        Moves the diagram by the given number of canvas pixels.
+        """
+        self.offset_x += dx
+        self.offset_y += dy
+
+    def reset(self):
+        """
+        Restores the unzoomed, unpanned view.
+        """
+        self.scale = 1.0
+        self.offset_x = 0.0
+        self.offset_y = 0.0
@@ -0,0 +1,310 @@
+import os
+import sys
+import csv
+import json
+import time
+import argparse
+from datetime import datetime
+
+# Import paths for other modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../Task')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../Database')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../ArchiveManager')))
+
+from task import Status, validate_task_data
+from database_setup import initialize_database
+from shared_access import connect, retry_on_busy
+from archive_manager import ArchiveManager, unpack_text_block
+
+
+class ImportExportManager:
+    """
+    Streams tasks and archived tasks between the SQLite database and CSV or JSON Lines files.
+    Files are processed in chunks, so memory use does not grow with the file size.
+    """
+
+    TABLES = ('tasks', 'archived_tasks')
+    FORMATS = ('csv', 'jsonl')
+    COLUMNS = ['title', 'description', 'due_date', 'importance', 'urgency', 'fitness', 'status', 'completed_date']
+    MAX_REPORTED_ERRORS = 100  # Invalid rows beyond this number are only counted
+
+    def __init__(self, db_path=None, chunk_size=1000):
+        """
+        Initializes the ImportExportManager.
+
+        :param db_path: Path to the SQLite database file.
+        :param chunk_size: Number of rows written with one executemany call or fetched at once.
+        """
+        # Dynamically determine the database path if not provided
+        if db_path is None:
+            if getattr(sys, 'frozen', False):  # Running as an executable
+                self.db_path = os.path.join(os.path.dirname(sys.executable), "database.db")
+            else:  # Running as a script
+                self.db_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '../Database/database.db'))
+        else:
+            self.db_path = db_path
+
+        self.chunk_size = chunk_size
+        initialize_database(self.db_path)
+
+    @classmethod
+    def detect_format(cls, path, fmt=None):
+        """
+        Determines the file format from the explicit format or the file extension.
+
+        :param path: Path of the file.
+        :param fmt: Optional explicit format ('csv' or 'jsonl').
+        :return: 'csv' or 'jsonl'.
+        :raises ValueError: If the format is not supported.
+        """
+        fmt = (fmt or os.path.splitext(path)[1].lstrip('.')).lower()
+        if fmt == 'ndjson':
+            fmt = 'jsonl'
+        if fmt not in cls.FORMATS:
+            raise ValueError(f"Unsupported file format '{fmt}', use csv or jsonl.")
+        return fmt
+
+    @classmethod
+    def _check_table(cls, table):
+        if table not in cls.TABLES:
+            raise ValueError(f"Unsupported table '{table}', use tasks or archived_tasks.")
+
+    @staticmethod
+    def _read_records(path, fmt):
+        """
+        Lazily reads the records of a file.
+
+        :return: Generator of (line number, record dictionary or None, error message or None).
+        """
+        with open(path, newline='', encoding='utf-8') as file:
+            if fmt == 'csv':
+                reader = csv.DictReader(file)
+                for record in reader:
+                    yield reader.line_num, record, None
+            else:
+                for line_number, line in enumerate(file, start=1):
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError as e:
+                        yield line_number, None, f"Invalid JSON: {e.msg}"
+                        continue
+                    if not isinstance(record, dict):
+                        yield line_number, None, "Invalid JSON: expected an object."
+                        continue
+                    yield line_number, record, None
+
+    @staticmethod
+    def _field(record, name):
+        value = record.get(name)
+        return str(value).strip() if value is not None else ''
+
+    def _validate_record(self, record, table, allow_past_due_dates):
+        """
+        Validates a record with the TaskEditor rules and converts it into a row for the given table.
+
+        :return: Tuple of column values in the order of COLUMNS.
+        :raises ValueError: If the record is invalid.
+        """
+        title = self._field(record, 'title')
+        description = self._field(record, 'description')
+        due_date, importance, urgency, fitness = validate_task_data(
+            title, description, self._field(record, 'due_date'),
+            self._field(record, 'importance'), self._field(record, 'urgency'), self._field(record, 'fitness'),
+            allow_past_due_date=allow_past_due_dates or table == 'archived_tasks'
+        )
+
+        statuses = {status.value.upper(): status for status in Status}
+        status_str = self._field(record, 'status')
+        if not status_str:
+            status = Status.COMPLETED if table == 'archived_tasks' else Status.OPEN
+        elif status_str.upper() in statuses:
+            status = statuses[status_str.upper()]
+        else:
+            raise ValueError(f"Invalid status '{status_str}'.")
+        if table == 'archived_tasks' and status != Status.COMPLETED:
+            raise ValueError("Only completed tasks can be archived.")
+
+        completed_date_str = self._field(record, 'completed_date')
+        if completed_date_str:
+            try:
+                datetime.strptime(completed_date_str, "%Y-%m-%d")
+            except ValueError:
+                raise ValueError("Invalid completed date format. Use YYYY-MM-DD.")
+
+        return (title, description, due_date.strftime("%Y-%m-%d"), importance.value, urgency.value, fitness.value,
+                status.value, completed_date_str or None)
+
+    @staticmethod
+    def _report(rows, start, **extra):
+        seconds = time.perf_counter() - start
+        report = {"rows": rows, "seconds": seconds, "rows_per_second": rows / seconds if seconds > 0 else 0.0}
+        report.update(extra)
+        return report
+
+    @staticmethod
+    def format_report(report):
+        """
+        Formats an import or export report for display.
+
+        :param report: Dictionary returned by import_file or export_file.
+        :return: Human-readable summary including the throughput.
+        """
+        text = f"{report['rows']} rows in {report['seconds']:.2f} s ({report['rows_per_second']:.0f} rows/s)"
+        if report.get("skipped"):
+            text += f", {report['skipped']} invalid rows skipped"
+        return text
+
+    def import_file(self, path, user_id, table='tasks', fmt=None, allow_past_due_dates=False):
+        """
+        Imports tasks from a CSV or JSON Lines file in a single transaction.
+        Invalid rows are skipped and reported, all valid rows are inserted with executemany in chunks.
+
+        :param path: Path of the file to import.
+        :param user_id: The ID of the user the tasks are imported for.
+        :param table: 'tasks' or 'archived_tasks'.
+        :param fmt: Optional explicit format, otherwise detected from the file extension.
+        :param allow_past_due_dates: Accept open tasks that are already overdue.
+        :return: Dictionary with 'rows', 'skipped', 'errors' (list of (line, message)), 'seconds' and 'rows_per_second'.
+        """
+        self._check_table(table)
+        fmt = self.detect_format(path, fmt)
+        start = time.perf_counter()
+
+        sql = f'''
+            INSERT INTO {table} ({", ".join(self.COLUMNS)}, user_id)
+            VALUES ({", ".join("?" * (len(self.COLUMNS) + 1))})
+        '''
+
+        def write():
+            # The whole file is one transaction, a retry reads it again from the start
+            imported = 0
+            skipped = 0
+            errors = []
+            chunk = []
+
+            conn = connect(self.db_path)
+            cursor = conn.cursor()
+            try:
+                for line_number, record, error in self._read_records(path, fmt):
+                    if error is None:
+                        try:
+                            chunk.append(self._validate_record(record, table, allow_past_due_dates) + (user_id,))
+                        except ValueError as e:
+                            error = str(e)
+                    if error is not None:
+                        skipped += 1
+                        if len(errors) < self.MAX_REPORTED_ERRORS:
+                            errors.append((line_number, error))
+                        continue
+
+                    if len(chunk) >= self.chunk_size:
+                        cursor.executemany(sql, chunk)
+                        imported += len(chunk)
+                        chunk = []
+
+                if chunk:
+                    cursor.executemany(sql, chunk)
+                    imported += len(chunk)
+                conn.commit()
+                return imported, skipped, errors
+            except Exception:
+                conn.rollback()
+                raise
+            finally:
+                conn.close()
+
+        imported, skipped, errors = retry_on_busy(write)
+        return self._report(imported, start, skipped=skipped, errors=errors)
+
+    def export_file(self, path, user_id, table='tasks', fmt=None):
+        """
+        Exports the tasks of a user to a CSV or JSON Lines file, fetching rows in chunks.
+        Archived tasks include those moved into the yearly archive files (see ArchiveManager.partition_archive),
+        oldest year first and the main archive last.
+
+        :param path: Path of the file to write.
+        :param user_id: The ID of the user whose tasks are exported.
+        :param table: 'tasks' or 'archived_tasks'.
+        :param fmt: Optional explicit format, otherwise detected from the file extension.
+        :return: Dictionary with 'rows', 'seconds' and 'rows_per_second'.
+        """
+        self._check_table(table)
+        fmt = self.detect_format(path, fmt)
+        start = time.perf_counter()
+        exported = 0
+
+        sources = [self.db_path]
+        if table == 'archived_tasks':
+            archive_manager = ArchiveManager(self.db_path)
+            sources = [archive_manager.partition_path(year)
+                       for year in sorted(archive_manager.get_partition_years())] + sources
+
+        with open(path, 'w', newline='', encoding='utf-8') as file:
+            writer = csv.writer(file) if fmt == 'csv' else None
+            if writer:
+                writer.writerow(self.COLUMNS)
+
+            # Every partition is read on its own connection, like ArchiveManager.search_archive does
+            for source in sources:
+                conn = connect(source)
+                cursor = conn.cursor()
+                try:
+                    # Archived tasks in the cold tier have their text in compressed blocks, see ArchiveManager
+                    cold_block = 'cold_block' if table == 'archived_tasks' else 'NULL'
+                    cursor.execute(f'SELECT {", ".join(self.COLUMNS)}, id, {cold_block} FROM {table} '
+                                   f'WHERE user_id = ? ORDER BY id', (user_id,))
+                    while True:
+                        rows = cursor.fetchmany(self.chunk_size)
+                        if not rows:
+                            break
+                        rows = self._fill_cold_text(conn, rows)
+                        if writer:
+                            writer.writerows(rows)
+                        else:
+                            file.writelines(json.dumps(dict(zip(self.COLUMNS, row))) + '\n' for row in rows)
+                        exported += len(rows)
+                finally:
+                    conn.close()
+
+        return self._report(exported, start)
+
+    @staticmethod
+    def _fill_cold_text(conn, rows):
+        """
+        Replaces the title and description of compressed archived tasks by their text, reading each block of
+        the chunk once.
+
+        :param rows: Rows of COLUMNS followed by the task ID and its block ID.
+        :return: Rows of COLUMNS.
+        """
+        block_ids = {row[-1] for row in rows if row[-1] is not None}
+        texts = {}
+        for block_id in block_ids:
+            data = conn.execute('SELECT data FROM archived_text_blocks WHERE id = ?', (block_id,)).fetchone()
+            if data:
+                texts.update(unpack_text_block(data[0]))
+        return [texts[row[-2]] + row[2:-2] if row[-2] in texts else row[:-2] for row in rows]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Import or export tasks as CSV or JSON Lines.")
+    parser.add_argument("action", choices=["import", "export"])
+    parser.add_argument("path", help="File to read or write (.csv or .jsonl)")
+    parser.add_argument("--user-id", type=int, required=True)
+    parser.add_argument("--table", choices=ImportExportManager.TABLES, default="tasks")
+    parser.add_argument("--format", choices=ImportExportManager.FORMATS)
+    parser.add_argument("--db", help="Path to the database file")
+    parser.add_argument("--allow-past-due-dates", action="store_true")
+    args = parser.parse_args()
+
+    manager = ImportExportManager(args.db)
+    if args.action == "import":
+        result = manager.import_file(args.path, args.user_id, args.table, args.format, args.allow_past_due_dates)
+        for line_number, message in result["errors"]:
+            print(f"Line {line_number}: {message}")
+    else:
+        result = manager.export_file(args.path, args.user_id, args.table, args.format)
+    print(f"{args.action.capitalize()}ed {ImportExportManager.format_report(result)}")
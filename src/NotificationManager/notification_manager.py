@@ -1,5 +1,12 @@
+import os
+import sys
 from datetime import date, timedelta
 
+# Import paths for other modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../Task')))
+
+from recurrence import parse_rule
+
 
 class NotificationManager:
     """
@@ -14,7 +21,8 @@ class NotificationManager:
         Schedules notifications for tasks based on the notification interval in settings.
 
         :param tasks: List of Task objects to evaluate for notifications.
-        :return: List of tasks that have scheduled notifications.
+        :return: List of tasks that have scheduled notifications. Notifications of recurring tasks also list
+                 the later occurrences within the interval under "occurrences".
         """
         settings = self.settings_manager.get_settings()
         notifications = []
@@ -26,6 +34,12 @@ class NotificationManager:
             for task in tasks:
                 # Notify if the task is due within the interval
                 if task.due_date and (task.due_date - today).days <= interval:
-                    notifications.append({"task": task, "due_date": task.due_date})
+                    notification = {"task": task, "due_date": task.due_date}
+                    if getattr(task, "recurrence", None):
+                        # Only the next occurrence is stored, the later ones are computed for the interval
+                        rule = parse_rule(task.recurrence)
+                        notification["occurrences"] = list(rule.occurrences(task.due_date + timedelta(days=1),
+                                                                            today + timedelta(days=interval)))
+                    notifications.append(notification)
 
         return notifications
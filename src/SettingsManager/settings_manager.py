@@ -1,6 +1,14 @@
+import os
+import sys
 import sqlite3
 import json
 
+# Import paths for other modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../Database')))
+
+from database_setup import initialize_database
+from shared_access import connect, retry_on_busy
+
 
 class SettingsManager:
     """
@@ -17,26 +25,8 @@ class SettingsManager:
         else:
             self.db_path = db_path
 
-        self._initialize_settings_table()
-
-    def _initialize_settings_table(self):
-        """
-        Ensures that the settings table exists in the database.
-        """
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS settings (
-                id INTEGER PRIMARY KEY,
-                notification_interval INTEGER DEFAULT 1,
-                auto_archive BOOLEAN DEFAULT 1,
-                auto_delete BOOLEAN DEFAULT 0,
-                notifications_enabled BOOLEAN DEFAULT 1,
-                default_priorities TEXT DEFAULT '{"importance": "LOW", "urgency": "LOW", "fitness": "LOW"}'
-            )
-        ''')
-        conn.commit()
-        conn.close()
+        # Make sure the schema exists, this is a no-op once the database has been bootstrapped
+        initialize_database(self.db_path)
 
     def save_settings(self, notification_interval: int, auto_archive: bool, auto_delete: bool,
                       notifications_enabled: bool, default_priorities: dict):
@@ -49,32 +39,38 @@ class SettingsManager:
         :param notifications_enabled: Boolean indicating if notifications are enabled.
         :param default_priorities: Dictionary with default priority values for new tasks.
         """
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-
         # Convert default priorities to JSON for storage
         default_priorities_json = json.dumps(default_priorities)
 
-        # Check if settings already exist
-        cursor.execute('SELECT * FROM settings WHERE id = 1')
-        if cursor.fetchone():
-            # Update settings
-            cursor.execute('''
-                UPDATE settings
-                SET notification_interval = ?, auto_archive = ?, auto_delete = ?, notifications_enabled = ?, default_priorities = ?
-                WHERE id = 1
-            ''', (notification_interval, int(auto_archive), int(auto_delete), int(notifications_enabled),
-                  default_priorities_json))
-        else:
-            # Insert new settings
-            cursor.execute('''
-                INSERT INTO settings (id, notification_interval, auto_archive, auto_delete, notifications_enabled, default_priorities)
-                VALUES (1, ?, ?, ?, ?, ?)
-            ''', (notification_interval, int(auto_archive), int(auto_delete), int(notifications_enabled),
-                  default_priorities_json))
-
-        conn.commit()
-        conn.close()
+        def write():
+            conn = connect(self.db_path)
+            cursor = conn.cursor()
+            try:
+                # Check if settings already exist
+                cursor.execute('SELECT * FROM settings WHERE id = 1')
+                if cursor.fetchone():
+                    # Update settings
+                    cursor.execute('''
+                        UPDATE settings
+                        SET notification_interval = ?, auto_archive = ?, auto_delete = ?, notifications_enabled = ?, default_priorities = ?
+                        WHERE id = 1
+                    ''', (notification_interval, int(auto_archive), int(auto_delete), int(notifications_enabled),
+                          default_priorities_json))
+                else:
+                    # Insert new settings
+                    cursor.execute('''
+                        INSERT INTO settings (id, notification_interval, auto_archive, auto_delete, notifications_enabled, default_priorities)
+                        VALUES (1, ?, ?, ?, ?, ?)
+                    ''', (notification_interval, int(auto_archive), int(auto_delete), int(notifications_enabled),
+                          default_priorities_json))
+                conn.commit()
+            except sqlite3.Error:
+                conn.rollback()
+                raise
+            finally:
+                conn.close()
+
+        retry_on_busy(write)
 
     def get_settings(self, user_id=None):
         """
@@ -84,19 +80,21 @@ class SettingsManager:
         :param user_id: The ID of the user to fetch settings for.
         :return: A dictionary of settings.
         """
-        conn = sqlite3.connect(self.db_path)
+        conn = connect(self.db_path)
         cursor = conn.cursor()
 
         if user_id:
             # Fetch settings for the specified user
             cursor.execute('''
-                SELECT notification_interval, auto_archive, auto_delete, notifications_enabled, default_importance, default_urgency, default_fitness
+                SELECT notification_interval, auto_archive, auto_delete, notifications_enabled, default_importance, default_urgency, default_fitness,
+                       auto_delete_interval
                 FROM settings WHERE user_id = ?
             ''', (user_id,))
         else:
             # Fetch settings for a default user (or use a fallback)
             cursor.execute('''
-                SELECT notification_interval, auto_archive, auto_delete, notifications_enabled, default_importance, default_urgency, default_fitness
+                SELECT notification_interval, auto_archive, auto_delete, notifications_enabled, default_importance, default_urgency, default_fitness,
+                       auto_delete_interval
                 FROM settings WHERE user_id = 1
             ''')  # Assuming 1 is the default user ID
 
@@ -112,6 +110,7 @@ class SettingsManager:
                 "default_importance": row[4],
                 "default_urgency": row[5],
                 "default_fitness": row[6],
+                "auto_delete_interval": row[7] if row[7] is not None else 30,
             }
         else:
             # Fallback to default settings if no settings exist
@@ -123,6 +122,7 @@ class SettingsManager:
                 "default_importance": "Low",
                 "default_urgency": "Low",
                 "default_fitness": "Low",
+                "auto_delete_interval": 30,
             }
 
     def update_default_priorities(self, priorities: dict):
@@ -0,0 +1,150 @@
+import os
+import sys
+import argparse
+from datetime import date, timedelta
+
+# Import paths for other modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../Database')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../ArchiveManager')))
+
+from database_setup import get_default_db_path, initialize_database, STATS_DIMENSIONS
+from archive_manager import ArchiveManager
+
+# SQL of the period keys throughput can be grouped by, weeks are named after their Monday like the due
+# week buckets of task_stats, so a week is never split at the turn of the year
+PERIOD_KEYS = {
+    "day": "date({column})",
+    "week": "date({column}, 'weekday 0', '-6 days')",
+    "month": "strftime('%Y-%m', {column})",
+}
+
+
+class CompletionAnalytics:
+    """
+    Computes completion statistics from the archive: throughput, lead time (completion date compared to the
+    due date) and completion rates per Venn region.
+    Every statistic is a single aggregate query over a date range of a covering index (see database_setup,
+    schema version 4), so only the index entries inside the range are read and never the archived rows.
+    Ranges reaching into partitioned years also read the archive files of those years.
+    """
+
+    def __init__(self, db_path=None, snapshot=None):
+        """
+        Initializes the CompletionAnalytics.
+
+        :param db_path: Path to the SQLite database file (defaults to the application database).
+        :param snapshot: Optional ArchiveSnapshot to read instead of the live database.
+        """
+        self.db_path = db_path or get_default_db_path()
+        initialize_database(self.db_path)
+        self.archive_manager = ArchiveManager(self.db_path, snapshot=snapshot)
+
+    def _query(self, sql, params, start, end):
+        """
+        Runs a query whose {archive} placeholder is replaced by the archive partitions covering the
+        completion dates from start to end.
+        """
+        conn = self.archive_manager.connect_archive()
+        try:
+            archive = self.archive_manager.attach_archive(conn, start, end)
+            return conn.execute(sql.format(archive=archive), params).fetchall()
+        finally:
+            conn.close()
+
+    def throughput(self, user_id, start, end, period="week"):
+        """
+        Counts the tasks completed per period.
+
+        :param user_id: The ID of the user.
+        :param start: First completion date included.
+        :param end: Last completion date included.
+        :param period: "day", "week" or "month".
+        :return: List of (period, count) in chronological order, periods without completions are omitted.
+                 Periods are named YYYY-MM-DD for days, the date of the Monday for weeks and YYYY-MM for months.
+        """
+        rows = self._query(f'''
+            SELECT {PERIOD_KEYS[period].format(column="completed_date")} AS period, COUNT(*)
+            FROM {{archive}} AS archived_tasks
+            WHERE user_id = ? AND completed_date BETWEEN ? AND ?
+            GROUP BY period ORDER BY period
+        ''', (user_id, start.isoformat(), end.isoformat()), start, end)
+        return [tuple(row) for row in rows]
+
+    def lead_times(self, user_id, start, end):
+        """
+        Compares completion and due dates of the tasks completed in a date range, per Venn region.
+        The lead time is the number of days a task was completed before its due date (negative if late).
+
+        :param user_id: The ID of the user.
+        :param start: First completion date included.
+        :param end: Last completion date included.
+        :return: Dictionary mapping region codes to dictionaries with "completed", "with_due_date", "on_time",
+                 "average_days", "min_days" and "max_days". The "total" entry covers all regions.
+        """
+        region = STATS_DIMENSIONS["region"].format(row="archived_tasks")
+        rows = self._query(f'''
+            WITH completed AS (
+                SELECT {region} AS region, julianday(due_date) - julianday(completed_date) AS lead
+                FROM {{archive}} AS archived_tasks
+                WHERE user_id = ? AND completed_date BETWEEN ? AND ?
+            )
+            SELECT region, COUNT(*), COUNT(lead), SUM(lead >= 0), AVG(lead), MIN(lead), MAX(lead)
+            FROM completed GROUP BY region
+            UNION ALL
+            SELECT 'total', COUNT(*), COUNT(lead), SUM(lead >= 0), AVG(lead), MIN(lead), MAX(lead)
+            FROM completed
+        ''', (user_id, start.isoformat(), end.isoformat()), start, end)
+        return {region: {"completed": completed, "with_due_date": with_due_date, "on_time": on_time or 0,
+                         "average_days": average, "min_days": minimum, "max_days": maximum}
+                for region, completed, with_due_date, on_time, average, minimum, maximum in rows}
+
+    def completion_rates(self, user_id, start, end):
+        """
+        Determines per Venn region which share of the tasks due in a date range has been completed.
+        Archived tasks and completed tasks that are not archived yet count as completed, the remaining
+        tasks of the tasks table as not completed.
+
+        :param user_id: The ID of the user.
+        :param start: First due date included.
+        :param end: Last due date included.
+        :return: Dictionary mapping region codes and "total" to (completed, due, rate).
+        """
+        archived_region = STATS_DIMENSIONS["region"].format(row="archived_tasks")
+        task_region = STATS_DIMENSIONS["region"].format(row="tasks")
+        rows = self._query(f'''
+            WITH due AS (
+                SELECT {archived_region} AS region, 1 AS done
+                FROM {{archive}} AS archived_tasks WHERE user_id = ? AND due_date BETWEEN ? AND ?
+                UNION ALL
+                SELECT {task_region}, coalesce(status, 'Open') = 'Completed'
+                FROM tasks WHERE user_id = ? AND due_date BETWEEN ? AND ?
+            )
+            SELECT region, SUM(done), COUNT(*) FROM due GROUP BY region
+            UNION ALL
+            SELECT 'total', coalesce(SUM(done), 0), COUNT(*) FROM due
+        ''', (user_id, start.isoformat(), end.isoformat()) * 2,
+            date(start.year - 1, 1, 1), None)  # Tasks are rarely completed more than a year before they are due
+        return {region: (done, total, done / total if total else None) for region, done, total in rows}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Print completion statistics of a user's archive.")
+    parser.add_argument("user_id", type=int)
+    parser.add_argument("--db", help="Path to the database file")
+    parser.add_argument("--days", type=int, default=90, help="Number of days up to today to analyze")
+    parser.add_argument("--period", choices=sorted(PERIOD_KEYS), default="week")
+    args = parser.parse_args()
+
+    analytics = CompletionAnalytics(args.db)
+    end = date.today()
+    start = end - timedelta(days=args.days)
+    print(f"Completed tasks per {args.period}:")
+    for period, count in analytics.throughput(args.user_id, start, end, args.period):
+        print(f"  {period}: {count}")
+    print("Lead time per region (days before the due date):")
+    for region, stats in analytics.lead_times(args.user_id, start, end).items():
+        average = "-" if stats["average_days"] is None else f"{stats['average_days']:.1f}"
+        print(f"  {region}: {stats['completed']} completed, {stats['on_time']} on time, average {average}")
+    print("Completion rate per region (tasks due in the range):")
+    for region, (done, total, rate) in analytics.completion_rates(args.user_id, start, end).items():
+        print(f"  {region}: {done}/{total}" + (f" ({rate:.0%})" if rate is not None else ""))
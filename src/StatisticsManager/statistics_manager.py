@@ -0,0 +1,116 @@
+import os
+import sys
+from datetime import date, timedelta
+
+# Import paths for other modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../Database')))
+
+from database_setup import get_default_db_path, initialize_database
+from shared_access import connect
+
+# Region codes in the order they are shown, see venn_geometry.REGIONS
+REGION_ORDER = ("HHH", "HH", "HF", "UF", "I", "U", "F", "LOW")
+
+
+class StatisticsManager:
+    """
+    Reads the per-user task counts kept in the task_stats table.
+    The counts are maintained by triggers on tasks and archived_tasks, so reading a dashboard touches a
+    bounded number of rows no matter how many tasks have been created or archived.
+    """
+
+    def __init__(self, db_path=None):
+        """
+        Initializes the StatisticsManager.
+
+        :param db_path: Path to the SQLite database file (defaults to the application database).
+        """
+        self.db_path = db_path or get_default_db_path()
+        initialize_database(self.db_path)
+
+    @staticmethod
+    def week_bucket(day):
+        """
+        :param day: A date.
+        :return: Bucket of the week containing the date, in the format used by task_stats: the date of its
+                 Monday ("2024-02-12").
+        """
+        return (day - timedelta(days=day.weekday())).isoformat()
+
+    def get_counts(self, user_id, source="tasks", dimension="region"):
+        """
+        Returns all non-empty buckets of one dimension.
+
+        :param user_id: The ID of the user.
+        :param source: "tasks" or "archived".
+        :param dimension: "region", "status", "due_week" or "region_due_week".
+        :return: Dictionary mapping buckets to counts.
+        """
+        conn = connect(self.db_path)
+        try:
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT bucket, count FROM task_stats
+                WHERE user_id = ? AND source = ? AND dimension = ? AND count != 0
+            ''', (user_id, source, dimension))
+            return dict(cursor.fetchall())
+        finally:
+            conn.close()
+
+    def get_dashboard(self, user_id, today=None):
+        """
+        Collects the counts shown in the statistics window with a single indexed query.
+
+        :param user_id: The ID of the user.
+        :param today: Reference date for the weekly counts, defaults to today.
+        :return: Dictionary with "tasks" and "archived" (each with "region", "status" and "total"),
+                 "due_this_week" (counts per region and "total"), "due_next_week" and "no_due_date".
+        """
+        today = today or date.today()
+        this_week = self.week_bucket(today)
+        next_week = self.week_bucket(today + timedelta(days=7))
+        region_weeks = [f"{region} {this_week}" for region in REGION_ORDER]
+
+        conn = connect(self.db_path)
+        try:
+            cursor = conn.cursor()
+            # Each part seeks the primary key, so the weekly buckets of older weeks are never read
+            cursor.execute(f'''
+                SELECT source, dimension, bucket, count FROM task_stats
+                WHERE user_id = ? AND source IN ('tasks', 'archived') AND dimension IN ('region', 'status')
+                    AND count != 0
+                UNION ALL
+                SELECT source, dimension, bucket, count FROM task_stats
+                WHERE user_id = ? AND source = 'tasks' AND dimension = 'due_week' AND bucket IN (?, ?, 'none')
+                    AND count != 0
+                UNION ALL
+                SELECT source, dimension, bucket, count FROM task_stats
+                WHERE user_id = ? AND source = 'tasks' AND dimension = 'region_due_week'
+                    AND bucket IN ({', '.join('?' * len(region_weeks))}) AND count != 0
+            ''', [user_id, user_id, this_week, next_week, user_id] + region_weeks)
+            rows = cursor.fetchall()
+        finally:
+            conn.close()
+
+        dashboard = {
+            "tasks": {"region": {}, "status": {}, "total": 0},
+            "archived": {"region": {}, "status": {}, "total": 0},
+            "due_this_week": {"total": 0},
+            "due_next_week": 0,
+            "no_due_date": 0,
+        }
+        for source, dimension, bucket, count in rows:
+            if dimension == "region_due_week":
+                dashboard["due_this_week"][bucket.split(" ")[0]] = count
+            elif dimension == "due_week":
+                if bucket == this_week:
+                    dashboard["due_this_week"]["total"] = count
+                elif bucket == next_week:
+                    dashboard["due_next_week"] = count
+                else:
+                    dashboard["no_due_date"] = count
+            else:
+                dashboard[source][dimension][bucket] = count
+                if dimension == "region":
+                    dashboard[source]["total"] += count
+        return dashboard
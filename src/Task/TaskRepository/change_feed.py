@@ -0,0 +1,79 @@
+import sys
+import os
+
+# Import paths for other modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../Database')))
+
+from shared_access import connect
+
+
+class ChangeFeed:
+    """
+    Applies the task changes recorded in change_log (see database_setup, schema version 6) to a TaskCache.
+    Each poll reads only the entries after the last seen sequence number and reloads only the tasks they
+    name, so edits made in another window or instance appear without reloading the user's task list.
+    """
+
+    def __init__(self, task_cache, db_path=None):
+        """
+        Initializes the feed.
+
+        :param task_cache: TaskCache to apply the changes to.
+        :param db_path: Path to the SQLite database file (defaults to the database of the cache's repository).
+        """
+        self.task_cache = task_cache
+        self.repository = task_cache.repository
+        self.db_path = db_path or self.repository.db_path
+        self.last_seq = None  # Sequence number of the last applied entry, None before start()
+
+    def start(self):
+        """
+        Skips the entries written so far: changes before this call are already contained in what the cache
+        loads from the tasks table.
+        """
+        conn = connect(self.db_path)
+        try:
+            self.last_seq = conn.execute('SELECT coalesce(MAX(seq), 0) FROM change_log').fetchone()[0]
+        finally:
+            conn.close()
+
+    def poll(self, user_id):
+        """
+        Applies the changes of a user's tasks written since the previous poll.
+        If the entries after the last seen sequence number have been pruned meanwhile, the user's tasks are
+        reloaded completely instead.
+
+        :param user_id: The ID of the user whose tasks are shown.
+        :return: Number of tasks added, updated or removed in the cache.
+        """
+        if self.last_seq is None:
+            self.start()
+            return 0
+
+        conn = connect(self.db_path)
+        try:
+            first_seq, last_seq = conn.execute('SELECT MIN(seq), MAX(seq) FROM change_log').fetchone()
+            if last_seq is None or last_seq <= self.last_seq:
+                return 0
+            if first_seq > self.last_seq + 1:
+                self.last_seq = last_seq
+                return self.task_cache.refresh(user_id)
+
+            rows = conn.execute('''
+                SELECT task_id, operation FROM change_log
+                WHERE user_id = ? AND seq > ? AND seq <= ? ORDER BY seq
+            ''', (user_id, self.last_seq, last_seq)).fetchall()
+        finally:
+            conn.close()
+
+        # Only the last entry of a task matters, and tasks still existing are read in their current state
+        operations = dict(rows)
+        changed_ids = [task_id for task_id, operation in operations.items() if operation != 'delete']
+        removed_ids = [task_id for task_id, operation in operations.items() if operation == 'delete']
+        tasks = self.repository.get_tasks_by_ids(changed_ids, user_id)
+        found_ids = {task.id for task in tasks}
+        # A task updated and then deleted by a later transaction is gone when it is read
+        removed_ids += [task_id for task_id in changed_ids if task_id not in found_ids]
+
+        self.last_seq = last_seq
+        return self.task_cache.merge(user_id, tasks, removed_ids)
@@ -0,0 +1,185 @@
+import sys
+import os
+
+# Import paths for other modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../Task')))
+
+from task import Task
+
+
+def task_matches_filters(task: Task, filters: dict) -> bool:
+    """
+    Checks a task against the filters used by the search and filter bar.
+    Mirrors the WHERE clauses that were previously built for the tasks table.
+
+    :param task: Task object to check.
+    :param filters: Dictionary with optional 'importance', 'urgency', 'fitness', 'search', 'status' and 'due_date'.
+    :return: True if the task passes all filters.
+    """
+    if not filters:
+        return True
+    if 'importance' in filters and task.importance.value.upper() != filters['importance'].upper():
+        return False
+    if 'urgency' in filters and task.urgency.value.upper() != filters['urgency'].upper():
+        return False
+    if 'fitness' in filters and task.fitness.value.upper() != filters['fitness'].upper():
+        return False
+    if 'search' in filters and filters['search'].lower() not in task.title.lower():
+        return False
+    if 'status' in filters and task.status.value.upper() != filters['status'].upper():
+        return False
+    if 'due_date' in filters and (task.due_date is None or task.due_date > filters['due_date']):
+        return False
+    return True
+
+
+class TaskCache:
+    """
+    Read-through cache of decoded Task objects in front of the tasks table.
+    A user's tasks are loaded once; components that write to the tasks table report the change
+    with put() or remove(), which updates the cached entry in place and notifies the listeners.
+    """
+
+    ADDED = "added"
+    UPDATED = "updated"
+    REMOVED = "removed"
+
+    def __init__(self, repository):
+        """
+        Initializes the cache.
+
+        :param repository: TaskRepository used to load tasks on a cache miss.
+        """
+        self.repository = repository
+        self._tasks = {}  # Maps user IDs to dictionaries of task ID -> Task
+        self._listeners = []
+
+    def subscribe(self, listener):
+        """
+        Registers a listener that is called as listener(event, user_id, task) after every change.
+
+        :param listener: Callable receiving the event type (ADDED, UPDATED or REMOVED), the user ID and the task.
+        """
+        self._listeners.append(listener)
+
+    def unsubscribe(self, listener):
+        """
+        Removes a previously registered listener.
+        """
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def _notify(self, event, user_id, task):
+        for listener in list(self._listeners):
+            listener(event, user_id, task)
+
+    def _load(self, user_id):
+        tasks = self._tasks.get(user_id)
+        if tasks is None:
+            tasks = {task.id: task for task in self.repository.get_tasks_by_user(user_id)}
+            self._tasks[user_id] = tasks
+        return tasks
+
+    def get_tasks(self, user_id, filters=None) -> list:
+        """
+        Returns the cached tasks of a user, loading them from the database on the first access.
+
+        :param user_id: The ID of the user.
+        :param filters: Optional filters applied in memory (see task_matches_filters).
+        :return: List of Task objects.
+        """
+        return [task for task in self._load(user_id).values() if task_matches_filters(task, filters)]
+
+    def get_task(self, user_id, task_id):
+        """
+        Returns a single cached task or None.
+        """
+        return self._load(user_id).get(task_id)
+
+    def put(self, user_id, task) -> Task:
+        """
+        Records a task that has been inserted or updated in the database.
+        If a different object with the same ID is cached, its attributes are updated in place so
+        references held by the GUI stay valid.
+
+        :param user_id: The ID of the user owning the task.
+        :param task: The written Task, which must have its database ID set.
+        :return: The cached Task instance.
+        """
+        tasks = self._tasks.get(user_id)
+        if tasks is None:
+            return task  # Nothing cached for this user yet, the next read loads the current state
+
+        cached = tasks.get(task.id)
+        if cached is None:
+            tasks[task.id] = task
+            self._notify(self.ADDED, user_id, task)
+            return task
+
+        if cached is not task:
+            cached.__dict__.update(task.__dict__)
+        self._notify(self.UPDATED, user_id, cached)
+        return cached
+
+    def remove(self, user_id, task_id):
+        """
+        Records a task that has been deleted from the tasks table (deleted or archived).
+
+        :param user_id: The ID of the user owning the task.
+        :param task_id: The ID of the removed task.
+        """
+        tasks = self._tasks.get(user_id)
+        if tasks is None:
+            return
+        task = tasks.pop(task_id, None)
+        if task is not None:
+            self._notify(self.REMOVED, user_id, task)
+
+    def merge(self, user_id, tasks, removed_ids=()):
+        """
+        Applies tasks read from the database to the cache, reporting only the tasks that differ from the
+        cached state. Used for changes written by other instances, so the instance's own writes, which are
+        already cached, are not reported twice.
+
+        :param user_id: The ID of the user.
+        :param tasks: Current Task objects read from the database.
+        :param removed_ids: IDs of tasks that no longer exist.
+        :return: Number of added, updated and removed tasks.
+        """
+        cached_tasks = self._tasks.get(user_id)
+        if cached_tasks is None:
+            return 0  # Nothing cached, the next read loads the current state
+
+        changes = 0
+        for task_id in removed_ids:
+            if task_id in cached_tasks:
+                self.remove(user_id, task_id)
+                changes += 1
+        for task in tasks:
+            cached = cached_tasks.get(task.id)
+            if cached is None or vars(cached) != vars(task):
+                self.put(user_id, task)
+                changes += 1
+        return changes
+
+    def refresh(self, user_id):
+        """
+        Reads all tasks of a user from the database again and merges them into the cache.
+
+        :param user_id: The ID of the user.
+        :return: Number of added, updated and removed tasks.
+        """
+        if user_id not in self._tasks:
+            return 0
+        current = self.repository.get_tasks_by_user(user_id)
+        current_ids = {task.id for task in current}
+        return self.merge(user_id, current, [task_id for task_id in self._tasks[user_id] if task_id not in current_ids])
+
+    def invalidate(self, user_id=None):
+        """
+        Drops the cached tasks of a user (or of all users) so the next read goes to the database.
+        """
+        if user_id is None:
+            self._tasks.clear()
+        else:
+            self._tasks.pop(user_id, None)
@@ -0,0 +1,47 @@
+import sys
+import os
+from datetime import datetime
+
+# Import paths for other modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../Task')))
+
+from task import Task
+
+# Filters of the filter bar, see task_cache.task_matches_filters
+FILTER_NAMES = ('importance', 'urgency', 'fitness', 'search', 'status', 'due_date')
+
+
+def task_to_dict(task: Task) -> dict:
+    """
+    :return: JSON-serializable dictionary of a Task, with dates as YYYY-MM-DD and priorities and status as
+             their display values.
+    """
+    return {
+        "id": task.id,
+        "title": task.title,
+        "description": task.description,
+        "due_date": task.due_date.isoformat() if task.due_date else None,
+        "importance": task.importance.value,
+        "urgency": task.urgency.value,
+        "fitness": task.fitness.value,
+        "status": task.status.value,
+        "completed_date": task.completed_date.isoformat() if task.completed_date else None,
+        "recurrence": task.recurrence,
+    }
+
+
+def parse_filters(params: dict) -> dict:
+    """
+    Reads the filters of the filter bar from request or command-line parameters.
+
+    :param params: Dictionary of parameter names to strings; names other than FILTER_NAMES are ignored.
+    :return: Filter dictionary as used by task_matches_filters and ArchiveManager.search_archive.
+    :raises ValueError: If due_date is not a YYYY-MM-DD date.
+    """
+    filters = {name: params[name] for name in FILTER_NAMES if params.get(name)}
+    if 'due_date' in filters:
+        try:
+            filters['due_date'] = datetime.strptime(filters['due_date'], "%Y-%m-%d").date()
+        except ValueError:
+            raise ValueError("Invalid due date format. Use YYYY-MM-DD.")
+    return filters
@@ -0,0 +1,414 @@
+import sqlite3
+import sys
+import os
+from datetime import datetime
+
+# Import paths for other modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../Task')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../Database')))
+
+from task import Task, Priority, Status
+from recurrence import next_occurrence
+from shared_access import connect, retry_on_busy
+
+
+class TaskRepository:
+    """
+    TaskRepository handles database operations for tasks.
+    """
+
+    # Column list shared by all queries that decode rows with row_to_task
+    TASK_COLUMNS = 'id, title, description, due_date, importance, urgency, fitness, status, completed_date, recurrence'
+
+    def __init__(self, db_path=None, journal=None):
+        """
+        Initializes the TaskRepository.
+
+        :param db_path: Path to the SQLite database file (defaults to the application database).
+        :param journal: Optional running WriteJournal; if set, writes are queued in it instead of being
+                        committed before the call returns.
+        """
+        self.journal = journal
+        if db_path is None:
+            # Dynamically determine the database path based on the execution environment
+            if getattr(sys, 'frozen', False):  # Running as an executable
+                self.db_path = os.path.join(os.path.dirname(sys.executable), "database.db")
+            else:  # Running as a script
+                self.db_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../Database/database.db'))
+        else:
+            self.db_path = db_path
+
+    @staticmethod
+    def row_to_task(row) -> Task:
+        """
+        Converts a database row into a Task object.
+
+        :param row: Tuple with the columns listed in TASK_COLUMNS.
+        :return: The decoded Task.
+        """
+        task_id, title, description, due_date_str, importance_str, urgency_str, fitness_str, status_str, \
+            completed_date_str, recurrence = row
+
+        return Task(
+            title=title,
+            description=description,
+            due_date=datetime.strptime(due_date_str, '%Y-%m-%d').date() if due_date_str else None,
+            importance=Priority[importance_str.upper()],
+            urgency=Priority[urgency_str.upper()],
+            fitness=Priority[fitness_str.upper()],
+            # Default to OPEN if status is None
+            status=Status[status_str.upper().replace(' ', '_')] if status_str else Status.OPEN,
+            completed_date=datetime.strptime(completed_date_str, '%Y-%m-%d').date() if completed_date_str else None,
+            task_id=task_id,
+            recurrence=recurrence
+        )
+
+    def get_tasks_by_user(self, user_id: int) -> list:
+        """
+        Retrieves all tasks of a user.
+
+        :param user_id: The ID of the user.
+        :return: List of Task objects ordered by ID.
+        """
+        conn = connect(self.db_path)
+        cursor = conn.cursor()
+
+        cursor.execute(f'SELECT {self.TASK_COLUMNS} FROM tasks WHERE user_id = ? ORDER BY id', (user_id,))
+        rows = cursor.fetchall()
+        conn.close()
+
+        return [self.row_to_task(row) for row in rows]
+
+    def iter_tasks_by_user(self, user_id: int, chunk_size=1000):
+        """
+        Yields the tasks of a user in ID order, fetching chunk_size rows at a time, so callers can process
+        many tasks without holding all of them in memory.
+
+        :param user_id: The ID of the user.
+        :param chunk_size: Number of rows fetched at once.
+        """
+        conn = connect(self.db_path)
+        try:
+            cursor = conn.execute(f'SELECT {self.TASK_COLUMNS} FROM tasks WHERE user_id = ? ORDER BY id', (user_id,))
+            while True:
+                rows = cursor.fetchmany(chunk_size)
+                if not rows:
+                    break
+                for row in rows:
+                    yield self.row_to_task(row)
+        finally:
+            conn.close()
+
+    def get_task(self, task_id: int, user_id: int) -> Task:
+        """
+        Retrieves a single task of a user.
+
+        :param task_id: The ID of the task.
+        :param user_id: The ID of the user owning the task.
+        :return: The Task, or None if it does not exist.
+        """
+        conn = connect(self.db_path)
+        cursor = conn.cursor()
+
+        cursor.execute(f'SELECT {self.TASK_COLUMNS} FROM tasks WHERE id = ? AND user_id = ?', (task_id, user_id))
+        row = cursor.fetchone()
+        conn.close()
+
+        return self.row_to_task(row) if row else None
+
+    def get_tasks_by_ids(self, task_ids, user_id: int) -> list:
+        """
+        Retrieves several tasks of a user in one query.
+
+        :param task_ids: IDs of the tasks.
+        :param user_id: The ID of the user owning the tasks.
+        :return: List of the Task objects that exist, ordered by ID.
+        """
+        task_ids = list(task_ids)
+        if not task_ids:
+            return []
+        conn = connect(self.db_path)
+        cursor = conn.cursor()
+
+        cursor.execute(f'''
+            SELECT {self.TASK_COLUMNS} FROM tasks
+            WHERE user_id = ? AND id IN ({', '.join('?' * len(task_ids))}) ORDER BY id
+        ''', [user_id] + task_ids)
+        rows = cursor.fetchall()
+        conn.close()
+
+        return [self.row_to_task(row) for row in rows]
+
+    def _execute_batch(self, statements):
+        """
+        Executes several executemany statements in a single transaction.
+
+        :param statements: List of (sql, sequence of parameter tuples).
+        :raises sqlite3.Error: If a statement fails, after the transaction has been rolled back.
+        """
+        if self.journal is not None and self.journal.is_running():
+            self.journal.submit(statements)
+            return
+
+        # Another instance may hold the write lock for longer than the busy timeout, retry the transaction then
+        retry_on_busy(self._write_batch, statements)
+
+    def _write_batch(self, statements):
+        """
+        Runs one attempt of _execute_batch.
+        """
+        conn = connect(self.db_path)
+        cursor = conn.cursor()
+        try:
+            for sql, params in statements:
+                cursor.executemany(sql, params)
+            conn.commit()
+        except sqlite3.Error:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+
+    def add_tasks(self, tasks, user_id: int) -> list:
+        """
+        Inserts several new tasks in one transaction and sets their IDs.
+        The insert is written at once, also in write-behind mode, because the tasks need their database IDs.
+
+        :param tasks: Task objects without ID.
+        :param user_id: The ID of the user owning the tasks.
+        :return: The tasks, with id set.
+        """
+        tasks = list(tasks)
+
+        def insert():
+            conn = connect(self.db_path)
+            cursor = conn.cursor()
+            try:
+                ids = []
+                for task in tasks:
+                    cursor.execute('''
+                        INSERT INTO tasks (title, description, due_date, importance, urgency, fitness, status, user_id,
+                                           recurrence)
+                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    ''', (task.title, task.description, task.due_date.strftime("%Y-%m-%d") if task.due_date else None,
+                          task.importance.value, task.urgency.value, task.fitness.value, task.status.value, user_id,
+                          task.recurrence))
+                    ids.append(cursor.lastrowid)
+                conn.commit()
+                return ids
+            except sqlite3.Error:
+                conn.rollback()
+                raise
+            finally:
+                conn.close()
+
+        for task, task_id in zip(tasks, retry_on_busy(insert)):
+            task.id = task_id
+        return tasks
+
+    @staticmethod
+    def _update_statement(tasks, user_id: int):
+        """
+        :return: Statement writing the editable fields of tasks, including their repetition rules.
+        """
+        return ('''
+            UPDATE tasks
+            SET title = ?, description = ?, due_date = ?, importance = ?, urgency = ?, fitness = ?, status = ?,
+                recurrence = ?
+            WHERE id = ? AND user_id = ?
+        ''', [(task.title, task.description, task.due_date.strftime("%Y-%m-%d") if task.due_date else None,
+               task.importance.value, task.urgency.value, task.fitness.value, task.status.value, task.recurrence,
+               task.id, user_id) for task in tasks])
+
+    def update_task(self, task_id, user_id: int, title, description, due_date, importance: Priority,
+                    urgency: Priority, fitness: Priority, status: Status, recurrence=None):
+        """
+        Writes the editable fields of a task.
+
+        :param task_id: The ID of the task.
+        :param user_id: The ID of the user owning the task.
+        :param due_date: The due date as date object or None.
+        :param recurrence: Rule text (see recurrence.make_rule), or None for a one-off task.
+        """
+        task = Task(title=title, due_date=due_date, importance=importance, urgency=urgency, fitness=fitness,
+                    description=description, status=status, task_id=task_id, recurrence=recurrence)
+        self._execute_batch([self._update_statement([task], user_id)])
+
+    def bulk_update_status(self, task_ids, user_id: int, status: Status):
+        """
+        Sets the status of several tasks in one transaction.
+
+        :param task_ids: IDs of the tasks to update.
+        :param user_id: The ID of the user owning the tasks.
+        :param status: The new Status.
+        """
+        self._execute_batch([(
+            'UPDATE tasks SET status = ? WHERE id = ? AND user_id = ?',
+            [(status.value, task_id, user_id) for task_id in task_ids]
+        )])
+
+    def bulk_update_priorities(self, task_ids, user_id: int, importance: Priority, urgency: Priority,
+                               fitness: Priority):
+        """
+        Sets the priorities of several tasks in one transaction.
+
+        :param task_ids: IDs of the tasks to update.
+        :param user_id: The ID of the user owning the tasks.
+        :param importance: New importance level.
+        :param urgency: New urgency level.
+        :param fitness: New fitness level.
+        """
+        self._execute_batch([(
+            'UPDATE tasks SET importance = ?, urgency = ?, fitness = ? WHERE id = ? AND user_id = ?',
+            [(importance.value, urgency.value, fitness.value, task_id, user_id) for task_id in task_ids]
+        )])
+
+    def update_priorities_batch(self, changes):
+        """
+        Writes individual priorities for several tasks in one transaction.
+
+        :param changes: List of (task_id, user_id, importance, urgency, fitness) with Priority values.
+        """
+        self._execute_batch([(
+            'UPDATE tasks SET importance = ?, urgency = ?, fitness = ? WHERE id = ? AND user_id = ?',
+            [(importance.value, urgency.value, fitness.value, task_id, user_id)
+             for task_id, user_id, importance, urgency, fitness in changes]
+        )])
+
+    def bulk_delete(self, task_ids, user_id: int):
+        """
+        Deletes several tasks in one transaction.
+
+        :param task_ids: IDs of the tasks to delete.
+        :param user_id: The ID of the user owning the tasks.
+        """
+        self._execute_batch([(
+            'DELETE FROM tasks WHERE id = ? AND user_id = ?',
+            [(task_id, user_id) for task_id in task_ids]
+        )])
+
+    def get_dependencies(self, user_id: int) -> list:
+        """
+        Retrieves the subtask and blocking relationships between the tasks of a user.
+
+        :param user_id: The ID of the user.
+        :return: List of (task_id, depends_on_id, kind) tuples, see dependency_graph.DependencyGraph.
+        """
+        conn = connect(self.db_path)
+        cursor = conn.cursor()
+
+        cursor.execute('''
+            SELECT task_id, depends_on_id, kind FROM task_dependencies WHERE user_id = ? ORDER BY task_id, depends_on_id
+        ''', (user_id,))
+        rows = cursor.fetchall()
+        conn.close()
+
+        return rows
+
+    def add_dependencies(self, dependencies, user_id: int):
+        """
+        Stores several dependencies in one transaction, replacing the kind of existing ones.
+        The caller checks them with DependencyGraph.add_dependency first.
+
+        :param dependencies: Iterable of (task_id, depends_on_id, kind) tuples.
+        :param user_id: The ID of the user owning the tasks.
+        """
+        self._execute_batch([(
+            'INSERT INTO task_dependencies (task_id, depends_on_id, kind, user_id) VALUES (?, ?, ?, ?) '
+            'ON CONFLICT (task_id, depends_on_id) DO UPDATE SET kind = excluded.kind',
+            [(task_id, depends_on_id, kind, user_id) for task_id, depends_on_id, kind in dependencies]
+        )])
+
+    def remove_dependencies(self, dependencies, user_id: int):
+        """
+        Removes several dependencies in one transaction.
+
+        :param dependencies: Iterable of (task_id, depends_on_id) pairs.
+        :param user_id: The ID of the user owning the tasks.
+        """
+        self._execute_batch([(
+            'DELETE FROM task_dependencies WHERE task_id = ? AND depends_on_id = ? AND user_id = ?',
+            [(task_id, depends_on_id, user_id) for task_id, depends_on_id in dependencies]
+        )])
+
+    @staticmethod
+    def _archive_statement(tasks, user_id: int, completed_date: str):
+        """
+        :return: Statement inserting completed tasks into archived_tasks. Occurrences of a recurring task
+                 refer to the task of their series in series_id.
+        """
+        return ('''
+            INSERT INTO archived_tasks (title, description, due_date, importance, urgency, fitness, status, completed_date,
+                                        user_id, series_id)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', [(
+            task.title,
+            task.description,
+            task.due_date.strftime("%Y-%m-%d") if task.due_date else None,
+            task.importance.value,
+            task.urgency.value,
+            task.fitness.value,
+            Status.COMPLETED.value,
+            completed_date,
+            user_id,
+            task.id if task.recurrence else None
+        ) for task in tasks])
+
+    def bulk_archive(self, tasks, user_id: int, completed_date: str):
+        """
+        Moves several completed tasks into the archived_tasks table in one transaction.
+
+        :param tasks: Task objects to archive.
+        :param user_id: The ID of the user owning the tasks.
+        :param completed_date: Completion date stored with the archived tasks (YYYY-MM-DD).
+        """
+        self._execute_batch([
+            self._archive_statement(tasks, user_id, completed_date),
+            ('DELETE FROM tasks WHERE id = ? AND user_id = ?', [(task.id, user_id) for task in tasks]),
+        ])
+
+    def complete_tasks(self, tasks, user_id: int, completed_date: str, archive=False, edited=False):
+        """
+        Completes several tasks in one transaction.
+        A recurring task is rolled forward instead: the completed occurrence is archived and the task stays
+        open with the due date of its next occurrence. Recurring tasks whose series has ended are completed
+        like one-off tasks. The Task objects are updated after the write.
+
+        :param tasks: Task objects to complete.
+        :param user_id: The ID of the user owning the tasks.
+        :param completed_date: Completion date (YYYY-MM-DD).
+        :param archive: Whether to move the completed tasks to the archive (auto-archiving).
+        :param edited: Whether the tasks were edited before completing them; their fields are then written in
+                       the same transaction.
+        :return: Tuple (rolled forward tasks, completed tasks).
+        """
+        completed_on = datetime.strptime(completed_date, "%Y-%m-%d").date()
+        next_due_dates = {task.id: next_occurrence(task, completed_on) for task in tasks if task.recurrence}
+        rolled = [task for task in tasks if next_due_dates.get(task.id)]
+        completed = [task for task in tasks if not next_due_dates.get(task.id)]
+
+        statements = [self._update_statement(tasks, user_id)] if edited else []
+        if rolled:
+            statements += [
+                self._archive_statement(rolled, user_id, completed_date),
+                ('UPDATE tasks SET due_date = ?, status = ?, completed_date = NULL WHERE id = ? AND user_id = ?',
+                 [(next_due_dates[task.id].strftime("%Y-%m-%d"), Status.OPEN.value, task.id, user_id)
+                  for task in rolled]),
+            ]
+        if completed and archive:
+            statements += [
+                self._archive_statement(completed, user_id, completed_date),
+                ('DELETE FROM tasks WHERE id = ? AND user_id = ?', [(task.id, user_id) for task in completed]),
+            ]
+        elif completed:
+            statements.append(('UPDATE tasks SET status = ? WHERE id = ? AND user_id = ?',
+                               [(Status.COMPLETED.value, task.id, user_id) for task in completed]))
+        self._execute_batch(statements)
+
+        for task in rolled:
+            task.due_date = next_due_dates[task.id]
+            task.status = Status.OPEN
+            task.completed_date = None
+        for task in completed:
+            task.status = Status.COMPLETED
+        return rolled, completed
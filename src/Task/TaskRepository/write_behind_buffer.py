@@ -0,0 +1,64 @@
+import sqlite3
+
+
+class WriteBehindBuffer:
+    """
+    Collects priority changes made on the Venn diagram and persists them in batches.
+    The GUI applies a change immediately; the buffer writes all changes queued within delay_ms with a single
+    executemany in one transaction, so a fast re-prioritization session does not pay one commit per drop.
+    """
+
+    def __init__(self, repository, after, delay_ms=500, on_error=None):
+        """
+        Initializes the buffer.
+
+        :param repository: TaskRepository used for writing.
+        :param after: Scheduling function with the signature of Tk's after(ms, callback).
+        :param delay_ms: Time between the first queued change and the flush.
+        :param on_error: Optional callback(changes, error) called if a flush fails, with changes mapping task IDs
+                         to (user_id, previous priorities, new priorities) so the GUI can roll them back.
+        """
+        self.repository = repository
+        self.after = after
+        self.delay_ms = delay_ms
+        self.on_error = on_error
+        self.pending = {}  # Maps task IDs to (user_id, previous priorities, new priorities)
+        self.after_id = None
+
+    def queue_priorities(self, user_id, task_id, previous, current):
+        """
+        Queues a priority change. Several changes of the same task are merged into one write.
+
+        :param user_id: The ID of the user owning the task.
+        :param task_id: The ID of the task.
+        :param previous: Priorities (importance, urgency, fitness) stored in the database before the change.
+        :param current: New priorities (importance, urgency, fitness).
+        """
+        if task_id in self.pending:
+            previous = self.pending[task_id][1]  # Keep the last persisted state for a rollback
+        self.pending[task_id] = (user_id, tuple(previous), tuple(current))
+        if self.after_id is None:
+            self.after_id = self.after(self.delay_ms, self.flush)
+
+    def flush(self):
+        """
+        Writes all queued changes in one transaction.
+
+        :return: Number of tasks written.
+        :raises sqlite3.Error: If the write fails and no on_error callback is set.
+        """
+        self.after_id = None
+        changes, self.pending = self.pending, {}
+        rows = [(task_id, user_id) + current for task_id, (user_id, previous, current) in changes.items()
+                if previous != current]  # Tasks dragged back to where they started need no write
+        if not rows:
+            return 0
+
+        try:
+            self.repository.update_priorities_batch(rows)
+        except sqlite3.Error as e:
+            if self.on_error is None:
+                raise
+            self.on_error(changes, e)
+            return 0
+        return len(rows)
@@ -0,0 +1,393 @@
+import os
+import sys
+import glob
+import json
+import time
+import uuid
+import queue
+import sqlite3
+import threading
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+# Import paths for other modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../Database')))
+
+from database_setup import initialize_database
+from shared_access import connect, is_busy_error
+
+
+def _try_lock(file):
+    """
+    Takes an exclusive lock on an open file without waiting. The lock is released when the file is closed,
+    also when the process ends without closing it.
+
+    :return: True if the lock was taken, False if another process or file object holds it.
+    """
+    try:
+        if fcntl is not None:
+            fcntl.flock(file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        else:
+            msvcrt.locking(file.fileno(), msvcrt.LK_NBLCK, 1)
+        return True
+    except OSError:
+        return False
+
+
+class WriteJournal:
+    """
+    Write-behind journal for task mutations.
+    Callers submit the statements of a mutation and continue at once; the statement is appended to a local log
+    file and a background thread applies the queued mutations in grouped transactions. After a crash the
+    entries of the log that did not reach the database are replayed on the next start.
+
+    Every entry carries a sequence number, and the number of the last applied entry is stored in the
+    write_journal table in the same transaction as the entry itself, so an entry is applied exactly once.
+    Each journal has its own ID, log file and checkpoint row, so instances sharing a database (see
+    shared_access) never replay or truncate each other's entries. A journal holds a lock on its log while it
+    runs; logs that are not locked were left behind by an instance that stopped and are replayed by
+    recover_abandoned.
+    """
+
+    RETRY_DELAY = 1.0  # Seconds before a batch that failed with a locked or busy database is tried again
+    MAX_RETRY_DELAY = 30.0
+
+    def __init__(self, db_path, journal_id=None, interval=0.2, max_batch=500):
+        """
+        Initializes the journal.
+
+        :param db_path: Path to the SQLite database file.
+        :param journal_id: ID of the journal, a new unique ID by default. The empty ID is the journal of
+                           versions that had a single journal per database.
+        :param interval: Seconds the background thread waits for more entries before it writes a group.
+        :param max_batch: Maximum number of entries written in one transaction.
+        """
+        self.db_path = db_path
+        self.journal_id = uuid.uuid4().hex[:12] if journal_id is None else journal_id
+        self.log_path = self.log_path_for(db_path, self.journal_id)
+        self.interval = interval
+        self.max_batch = max_batch
+
+        self.errors = queue.Queue()  # (statements, error) of entries that could not be applied
+        self._pending = []  # (seq, statements) not yet applied, oldest first
+        self._condition = threading.Condition()
+        self._log = None
+        self._lock_file = None  # Open lock file while this object owns the log
+        self._thread = None
+        self._stopping = False
+        self._seq = 0  # Sequence number of the last submitted entry
+
+        initialize_database(self.db_path)
+
+    @staticmethod
+    def log_path_for(db_path, journal_id):
+        """
+        :return: Path of the log of a journal, "<database>-writes-<journal ID>.jsonl" next to the database.
+        """
+        base = os.path.splitext(os.path.abspath(db_path))[0] + "-writes"
+        return f"{base}-{journal_id}.jsonl" if journal_id else base + ".jsonl"
+
+    @classmethod
+    def recover_abandoned(cls, db_path):
+        """
+        Replays the logs of journals whose instance stopped before all of their entries were applied, e.g.
+        after a crash, and removes them. Logs locked by a running instance are left alone.
+
+        :param db_path: Path to the SQLite database file.
+        :return: Number of replayed entries.
+        """
+        prefix = cls.log_path_for(db_path, "")[:-len(".jsonl")]
+        replayed = 0
+        for log_path in sorted(glob.glob(glob.escape(prefix) + "*.jsonl")):
+            name = log_path[len(prefix):-len(".jsonl")]
+            if name and not name.startswith("-"):
+                continue  # Not a journal log
+            journal = cls(db_path, name[1:])
+            if not journal._acquire():
+                continue
+            try:
+                replayed += journal.recover()
+                journal._discard()
+            finally:
+                journal._release()
+        return replayed
+
+    def _acquire(self):
+        """
+        Takes the lock of the log.
+
+        :return: False if another instance owns the log.
+        """
+        lock_file = open(self.log_path + ".lock", "a")
+        if not _try_lock(lock_file):
+            lock_file.close()
+            return False
+        self._lock_file = lock_file
+        return True
+
+    def _release(self):
+        if self._lock_file is not None:
+            self._lock_file.close()
+            self._lock_file = None
+
+    def _discard(self):
+        """
+        Removes the log, its lock file and the checkpoint of a journal whose entries are all applied.
+        Must be called with the lock held.
+        """
+        conn = connect(self.db_path)
+        try:
+            conn.execute('DELETE FROM write_journal WHERE journal_id = ?', (self.journal_id,))
+            conn.commit()
+        finally:
+            conn.close()
+        for path in (self.log_path, self.log_path + ".lock"):
+            try:
+                os.remove(path)
+            except OSError:
+                pass  # Already removed, or still open on Windows
+
+    def _read_checkpoint(self, cursor):
+        cursor.execute('SELECT last_seq FROM write_journal WHERE journal_id = ?', (self.journal_id,))
+        row = cursor.fetchone()
+        return row[0] if row else 0
+
+    def _read_log(self):
+        """
+        :return: List of (seq, statements) stored in the log. A line cut off by a crash ends the log.
+        """
+        if not os.path.exists(self.log_path):
+            return []
+        entries = []
+        with open(self.log_path, encoding="utf-8") as log:
+            for line in log:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    break
+                entries.append((entry["seq"], entry["statements"]))
+        return entries
+
+    def recover(self):
+        """
+        Replays the log entries that were written but not applied before the application stopped,
+        and empties the log afterwards.
+
+        :return: Number of replayed entries, 0 if another instance owns the log.
+        """
+        locked_here = self._lock_file is None
+        if locked_here and not self._acquire():
+            return 0
+        try:
+            with self._condition:
+                conn = connect(self.db_path)
+                try:
+                    checkpoint = self._read_checkpoint(conn.cursor())
+                finally:
+                    conn.close()
+
+                entries = self._read_log()
+                self._seq = max([checkpoint] + [seq for seq, statements in entries])
+                missing = [(seq, statements) for seq, statements in entries if seq > checkpoint]
+                if missing:
+                    self._apply(missing)
+                self._truncate_log()
+                return len(missing)
+        finally:
+            if locked_here:
+                self._release()
+
+    def start(self):
+        """
+        Takes the lock of the log, replays it and starts the background writer.
+
+        :raises RuntimeError: If another instance owns the log.
+        """
+        if self._thread is not None:
+            return
+        if not self._acquire():
+            raise RuntimeError(f"The write journal {self.journal_id} is used by another instance")
+        self.recover()
+        self._stopping = False
+        self._log = open(self.log_path, "a", encoding="utf-8")
+        self._thread = threading.Thread(target=self._run, name="WriteJournal", daemon=True)
+        self._thread.start()
+
+    def is_running(self):
+        """
+        :return: True while the background writer accepts entries.
+        """
+        return self._thread is not None and not self._stopping
+
+    def has_pending(self):
+        """
+        :return: True while submitted entries are not applied or reported as failed yet.
+        """
+        with self._condition:
+            return bool(self._pending)
+
+    def submit(self, statements):
+        """
+        Queues one mutation. Its statements are applied together in one transaction.
+
+        :param statements: List of (sql, sequence of parameter tuples), as for executemany. Parameters must be
+                           JSON serializable (strings, numbers or None).
+        :return: Sequence number of the entry.
+        """
+        statements = [[sql, [list(params) for params in params_list]] for sql, params_list in statements]
+        with self._condition:
+            if not self.is_running():
+                raise RuntimeError("The write journal is not running")
+            self._seq += 1
+            # The log reaches the operating system before the caller continues, so a crash of the application
+            # does not lose the entry
+            self._log.write(json.dumps({"seq": self._seq, "statements": statements}) + "\n")
+            self._log.flush()
+            self._pending.append((self._seq, statements))
+            self._condition.notify_all()
+            return self._seq
+
+    def flush(self, timeout=None):
+        """
+        Waits until all submitted entries have been applied or reported as failed.
+
+        :param timeout: Maximum number of seconds to wait, None waits without limit.
+        :return: True if nothing is pending anymore.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._condition:
+            self._condition.notify_all()
+            while self._pending and self._thread is not None:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._condition.wait(remaining)
+            return not self._pending
+
+    def close(self, timeout=None):
+        """
+        Applies the pending entries and stops the background writer.
+        Entries that could not be applied stay in the log and are replayed by the next instance that starts;
+        otherwise the log is removed.
+
+        :param timeout: Maximum number of seconds to wait for the pending entries.
+        """
+        if self._thread is None:
+            return
+        self.flush(timeout)
+        with self._condition:
+            self._stopping = True
+            self._condition.notify_all()
+        self._thread.join(timeout)
+        self._thread = None
+        with self._condition:
+            self._log.close()
+            self._log = None
+            if not self._pending:
+                self._discard()
+            self._release()
+
+    def _run(self):
+        """
+        Background writer: collects the entries submitted within interval and applies them in one transaction.
+        """
+        retry_delay = self.RETRY_DELAY
+        while True:
+            with self._condition:
+                while not self._pending and not self._stopping:
+                    self._condition.wait()
+                if not self._pending:
+                    return
+            if not self._stopping:
+                time.sleep(self.interval)  # Let a burst of edits end up in the same transaction
+
+            with self._condition:
+                batch = self._pending[:self.max_batch]
+            try:
+                self._apply(batch)
+            except sqlite3.Error as e:
+                if not is_busy_error(e):
+                    # Not even the checkpoint can be written, retrying would block all later entries
+                    for seq, statements in batch:
+                        self.errors.put((statements, e))
+                else:
+                    # Locked or busy database, keep the entries and try again later
+                    self.errors.put((None, e))
+                    if self._stopping:
+                        return
+                    time.sleep(retry_delay)
+                    retry_delay = min(retry_delay * 2, self.MAX_RETRY_DELAY)
+                    continue
+            retry_delay = self.RETRY_DELAY
+
+            with self._condition:
+                del self._pending[:len(batch)]
+                if not self._pending:
+                    self._truncate_log()
+                self._condition.notify_all()
+
+    def _apply(self, batch):
+        """
+        Applies entries in one transaction together with the new checkpoint.
+        If an entry is rejected by the database (e.g. a constraint, or an operational error such as a missing
+        table that retrying cannot fix), the entries are applied one by one and the rejected ones are reported
+        through errors and skipped. Entries that are already applied are skipped, so retrying a batch after an
+        error never applies an entry twice.
+
+        :param batch: List of (seq, statements).
+        :raises sqlite3.OperationalError: If the database is locked or busy at the moment.
+        """
+        conn = connect(self.db_path)
+        try:
+            try:
+                self._execute(conn, batch)
+            except sqlite3.Error as e:
+                if is_busy_error(e):
+                    raise
+                for entry in batch:
+                    try:
+                        self._execute(conn, [entry])
+                    except sqlite3.Error as e:
+                        if is_busy_error(e):
+                            raise
+                        self.errors.put((entry[1], e))
+                        self._execute(conn, [(entry[0], [])])  # Advance the checkpoint past the rejected entry
+        finally:
+            conn.close()
+
+    def _execute(self, conn, batch):
+        """
+        Applies entries and the new checkpoint in one transaction. Entries at or below the checkpoint read in
+        the same transaction were already applied, e.g. by an earlier attempt that failed after committing
+        part of a batch entry by entry, and are skipped.
+        """
+        cursor = conn.cursor()
+        try:
+            cursor.execute('BEGIN IMMEDIATE')
+            checkpoint = self._read_checkpoint(cursor)
+            for seq, statements in batch:
+                if seq <= checkpoint:
+                    continue
+                for sql, params in statements:
+                    cursor.executemany(sql, params)
+            cursor.execute('''
+                INSERT INTO write_journal (journal_id, last_seq) VALUES (?, ?)
+                ON CONFLICT (journal_id) DO UPDATE SET last_seq = max(last_seq, excluded.last_seq)
+            ''', (self.journal_id, batch[-1][0]))
+            conn.commit()
+        except sqlite3.Error:
+            conn.rollback()
+            raise
+
+    def _truncate_log(self):
+        """
+        Empties the log once all of its entries are applied. Must be called with the condition held.
+        """
+        if self._log is not None:
+            self._log.truncate(0)
+        elif os.path.exists(self.log_path):
+            open(self.log_path, "w").close()
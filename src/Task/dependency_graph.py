@@ -0,0 +1,288 @@
+import os
+import sys
+
+# Import paths for other modules
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from task import Priority, Status
+
+SUBTASK = 'subtask'  # The prerequisite is a subtask of the dependent task, its parent
+BLOCKS = 'blocks'  # The prerequisite has to be completed before the dependent task can be started
+KINDS = (SUBTASK, BLOCKS)
+
+
+def _higher(first, second):
+    return Priority.HIGH if Priority.HIGH in (first, second) else first
+
+
+def _earlier(first, second):
+    if first is None:
+        return second
+    if second is None:
+        return first
+    return min(first, second)
+
+
+class DependencyGraph:
+    """
+    Subtask and blocking relationships between the tasks of a user, stored in task_dependencies, with the
+    constraints they imply. The edges form a DAG: a task depends on its subtasks and on the tasks blocking it.
+
+    Constraints flow from a task to its prerequisites: a prerequisite is at least as important and urgent
+    as the open tasks depending on it, and it is due no later than they are. The effective values are kept
+    incrementally. After a change only the prerequisites reachable from the changed task are visited, in
+    topological order, and a task is only re-evaluated if one of its dependents changed its effective values,
+    so a change deep in a large project tree stops as soon as the constraints stay the same.
+    """
+
+    def __init__(self):
+        self._depends_on = {}  # Maps task IDs to dictionaries of prerequisite ID -> kind
+        self._dependents = {}  # Maps task IDs to the set of task IDs depending on them
+        self._own = {}  # Maps task IDs to their own (importance, urgency, due_date)
+        self._open = set()  # IDs of tasks that are not completed
+        self._effective = {}  # Maps task IDs to the propagated (importance, urgency, due_date)
+
+    def __contains__(self, task_id):
+        return task_id in self._own
+
+    def load(self, tasks, dependencies):
+        """
+        Replaces the graph with the tasks and dependencies of a user and evaluates all constraints.
+        Stored dependencies that refer to unknown tasks or would close a cycle are ignored.
+
+        :param tasks: The user's Task objects.
+        :param dependencies: Iterable of (task_id, depends_on_id, kind) rows.
+        """
+        self._depends_on.clear()
+        self._dependents.clear()
+        self._own.clear()
+        self._open.clear()
+        self._effective.clear()
+        for task in tasks:
+            self._set_node(task)
+        for task_id, depends_on_id, kind in dependencies:
+            if task_id in self._own and depends_on_id in self._own and \
+                    not self.would_create_cycle(task_id, depends_on_id):
+                self._link(task_id, depends_on_id, kind)
+        self._propagate(self._own)
+
+    def _set_node(self, task):
+        self._own[task.id] = (task.importance, task.urgency, task.due_date)
+        self._depends_on.setdefault(task.id, {})
+        self._dependents.setdefault(task.id, set())
+        if task.status == Status.COMPLETED:
+            self._open.discard(task.id)
+        else:
+            self._open.add(task.id)
+
+    def _link(self, task_id, depends_on_id, kind):
+        self._depends_on[task_id][depends_on_id] = kind
+        self._dependents[depends_on_id].add(task_id)
+
+    def effective(self, task_id):
+        """
+        :return: The (importance, urgency, due_date) of a task after propagation, None for unknown tasks.
+        """
+        return self._effective.get(task_id)
+
+    def prerequisites(self, task_id, kind=None):
+        """
+        :return: IDs of the subtasks and blocking tasks of a task, or of one kind only.
+        """
+        return [depends_on_id for depends_on_id, edge_kind in self._depends_on.get(task_id, {}).items()
+                if kind is None or edge_kind == kind]
+
+    def dependents(self, task_id):
+        """
+        :return: IDs of the tasks depending on a task (its parent and the tasks it blocks).
+        """
+        return sorted(self._dependents.get(task_id, ()))
+
+    def parent(self, task_id):
+        """
+        :return: ID of the task a task is a subtask of, or None.
+        """
+        return next((dependent for dependent in self._dependents.get(task_id, ())
+                     if self._depends_on[dependent][task_id] == SUBTASK), None)
+
+    def is_blocked(self, task_id):
+        """
+        :return: Whether a task has open blocking tasks.
+        """
+        return any(depends_on_id in self._open for depends_on_id in self.prerequisites(task_id, BLOCKS))
+
+    def would_create_cycle(self, task_id, depends_on_id):
+        """
+        :return: Whether making task_id depend on depends_on_id would close a cycle, i.e. whether
+                 depends_on_id already depends on task_id directly or through other tasks.
+        """
+        stack, seen = [depends_on_id], set()
+        while stack:
+            current = stack.pop()
+            if current == task_id:
+                return True
+            if current not in seen:
+                seen.add(current)
+                stack.extend(self._depends_on.get(current, ()))
+        return False
+
+    def check_dependency(self, task_id, depends_on_id, kind):
+        """
+        Checks whether a task may depend on another one.
+
+        :param task_id: The dependent task, the parent or the blocked task.
+        :param depends_on_id: The prerequisite, the subtask or the blocking task.
+        :param kind: SUBTASK or BLOCKS.
+        :raises ValueError: With a user-facing message if the dependency is not allowed.
+        """
+        if kind not in KINDS:
+            raise ValueError(f"Dependency kind must be one of {', '.join(KINDS)}.")
+        if task_id not in self._own or depends_on_id not in self._own:
+            raise ValueError("Both tasks must exist.")
+        if self.would_create_cycle(task_id, depends_on_id):
+            raise ValueError("A task cannot depend on itself, directly or through other tasks.")
+        if kind == SUBTASK and self.parent(depends_on_id) not in (None, task_id):
+            raise ValueError("A task can only be a subtask of one task.")
+
+    def add_dependency(self, task_id, depends_on_id, kind):
+        """
+        Makes a task depend on another one, see check_dependency.
+
+        :return: IDs of the tasks whose effective values changed.
+        :raises ValueError: With a user-facing message if the dependency is not allowed.
+        """
+        self.check_dependency(task_id, depends_on_id, kind)
+        self._link(task_id, depends_on_id, kind)
+        return self._propagate([depends_on_id])
+
+    def remove_dependency(self, task_id, depends_on_id):
+        """
+        Removes the dependency of a task on another one.
+
+        :return: IDs of the tasks whose effective values changed.
+        """
+        if self._depends_on.get(task_id, {}).pop(depends_on_id, None) is None:
+            return []
+        self._dependents[depends_on_id].discard(task_id)
+        return self._propagate([depends_on_id])
+
+    def sync_dependencies(self, dependencies):
+        """
+        Applies the dependencies read from the database, e.g. after another instance changed them, adding
+        and removing only the edges that differ.
+
+        :param dependencies: All (task_id, depends_on_id, kind) rows of the user.
+        :return: IDs of the tasks whose effective values changed.
+        """
+        current = {(task_id, depends_on_id, kind) for task_id, edges in self._depends_on.items()
+                   for depends_on_id, kind in edges.items()}
+        stored = set(dependencies)
+        changed = []
+        for task_id, depends_on_id, kind in current - stored:
+            changed += self.remove_dependency(task_id, depends_on_id)
+        for task_id, depends_on_id, kind in stored - current:
+            try:
+                changed += self.add_dependency(task_id, depends_on_id, kind)
+            except ValueError:
+                pass  # Refers to a task that is not loaded yet
+        return list(dict.fromkeys(changed))
+
+    def set_task(self, task):
+        """
+        Records a new or changed task.
+
+        :param task: The Task object.
+        :return: IDs of the tasks whose effective values changed.
+        """
+        was_open = task.id in self._open
+        self._set_node(task)
+        seeds = [task.id]
+        if was_open != (task.id in self._open):
+            seeds += self._depends_on[task.id]  # Completed tasks no longer constrain their prerequisites
+        return self._propagate(seeds)
+
+    def remove_task(self, task_id):
+        """
+        Removes a deleted or archived task together with its dependencies.
+
+        :return: IDs of the remaining tasks whose effective values changed.
+        """
+        if task_id not in self._own:
+            return []
+        prerequisites = list(self._depends_on.pop(task_id))
+        for depends_on_id in prerequisites:
+            self._dependents[depends_on_id].discard(task_id)
+        for dependent in self._dependents.pop(task_id):
+            del self._depends_on[dependent][task_id]
+        del self._own[task_id]
+        del self._effective[task_id]
+        self._open.discard(task_id)
+        return self._propagate(prerequisites)
+
+    def topological_order(self, task_ids=None):
+        """
+        Orders tasks so that every task comes before its prerequisites.
+
+        :param task_ids: Tasks to order, all tasks by default. Dependencies on other tasks are ignored.
+        :return: List of task IDs.
+        """
+        task_ids = set(self._own if task_ids is None else task_ids)
+        pending = {task_id: sum(1 for dependent in self._dependents[task_id] if dependent in task_ids)
+                   for task_id in task_ids}
+        ready = [task_id for task_id, count in pending.items() if count == 0]
+        order = []
+        while ready:
+            task_id = ready.pop()
+            order.append(task_id)
+            for depends_on_id in self._depends_on[task_id]:
+                if depends_on_id in pending:
+                    pending[depends_on_id] -= 1
+                    if pending[depends_on_id] == 0:
+                        ready.append(depends_on_id)
+        return order
+
+    def inherited(self, task_id):
+        """
+        :return: The (importance, urgency, due_date) a task inherits from the open tasks depending on it,
+                 regardless of its own values; (LOW, LOW, None) if nothing depends on it.
+        """
+        importance, urgency, due_date = Priority.LOW, Priority.LOW, None
+        for dependent in self._dependents.get(task_id, ()):
+            if dependent in self._open:
+                dependent_importance, dependent_urgency, dependent_due_date = self._effective[dependent]
+                importance = _higher(importance, dependent_importance)
+                urgency = _higher(urgency, dependent_urgency)
+                due_date = _earlier(due_date, dependent_due_date)
+        return importance, urgency, due_date
+
+    def _evaluate(self, task_id):
+        importance, urgency, due_date = self._own[task_id]
+        inherited_importance, inherited_urgency, inherited_due_date = self.inherited(task_id)
+        return (_higher(importance, inherited_importance), _higher(urgency, inherited_urgency),
+                _earlier(due_date, inherited_due_date))
+
+    def _propagate(self, seeds):
+        """
+        Re-evaluates the seed tasks and, as long as effective values change, their prerequisites.
+
+        :param seeds: IDs of tasks whose inputs changed.
+        :return: IDs of the tasks whose effective values changed, in evaluation order.
+        """
+        affected, stack = set(), [task_id for task_id in seeds if task_id in self._own]
+        while stack:
+            task_id = stack.pop()
+            if task_id not in affected:
+                affected.add(task_id)
+                stack.extend(self._depends_on[task_id])
+
+        dirty = set(seeds)
+        changed = []
+        for task_id in self.topological_order(affected):
+            if task_id not in dirty:
+                continue  # None of its dependents changed
+            effective = self._evaluate(task_id)
+            if effective != self._effective.get(task_id):
+                self._effective[task_id] = effective
+                changed.append(task_id)
+                dirty.update(self._depends_on[task_id])
+        return changed
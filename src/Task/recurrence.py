@@ -0,0 +1,165 @@
+import calendar
+from datetime import date, timedelta
+from functools import lru_cache
+
+FREQUENCIES = ('DAILY', 'WEEKLY', 'MONTHLY', 'YEARLY')
+
+
+def add_months(day, months):
+    """
+    Adds calendar months to a date. Days that do not exist in the target month are moved to its last day,
+    e.g. January 31 plus one month is February 28 (or 29).
+    """
+    month_index = day.month - 1 + months
+    year, month = day.year + month_index // 12, month_index % 12 + 1
+    return date(year, month, min(day.day, calendar.monthrange(year, month)[1]))
+
+
+class RecurrenceRule:
+    """
+    A repetition of a task, stored as text in tasks.recurrence, e.g. "FREQ=MONTHLY;INTERVAL=1;DTSTART=2030-01-31".
+    Occurrence n is computed from the start date directly, not from occurrence n-1, so monthly series
+    starting on the 31st return to the 31st after shorter months.
+    Only the next occurrence of a series is stored as a task; the others are computed on demand.
+    """
+
+    def __init__(self, freq, start, interval=1, until=None, count=None):
+        """
+        Initializes a rule.
+
+        :param freq: One of FREQUENCIES.
+        :param start: Date of the first occurrence.
+        :param interval: Number of days, weeks, months or years between two occurrences.
+        :param until: Optional date of the last possible occurrence.
+        :param count: Optional total number of occurrences.
+        :raises ValueError: If a value is out of range.
+        """
+        if freq not in FREQUENCIES:
+            raise ValueError(f"Repetition must be one of {', '.join(f.lower() for f in FREQUENCIES)}.")
+        if interval < 1 or (count is not None and count < 1):
+            raise ValueError("Repetition interval and count must be positive.")
+        self.freq = freq
+        self.start = start
+        self.interval = interval
+        self.until = until
+        self.count = count
+
+    def __str__(self):
+        parts = [f"FREQ={self.freq}", f"INTERVAL={self.interval}", f"DTSTART={self.start.isoformat()}"]
+        if self.until is not None:
+            parts.append(f"UNTIL={self.until.isoformat()}")
+        if self.count is not None:
+            parts.append(f"COUNT={self.count}")
+        return ";".join(parts)
+
+    def occurrence(self, index):
+        """
+        :return: Date of occurrence number index (0 is the start), ignoring until and count.
+        """
+        if self.freq == 'DAILY':
+            return self.start + timedelta(days=index * self.interval)
+        if self.freq == 'WEEKLY':
+            return self.start + timedelta(weeks=index * self.interval)
+        return add_months(self.start, index * self.interval * (12 if self.freq == 'YEARLY' else 1))
+
+    def _in_series(self, index):
+        return (self.count is None or index < self.count) and \
+            (self.until is None or self.occurrence(index) <= self.until)
+
+    def _first_index_from(self, day):
+        """
+        :return: Index of the first occurrence on or after day.
+        """
+        if day <= self.start:
+            return 0
+        if self.freq in ('DAILY', 'WEEKLY'):
+            step = self.interval * (7 if self.freq == 'WEEKLY' else 1)
+            return -(-(day - self.start).days // step)
+        step = self.interval * (12 if self.freq == 'YEARLY' else 1)
+        index = ((day.year - self.start.year) * 12 + day.month - self.start.month) // step
+        while self.occurrence(index) < day:
+            index += 1
+        return index
+
+    def occurrences(self, start, end):
+        """
+        Yields the occurrences between two dates (both included), in order.
+        """
+        index = self._first_index_from(start)
+        while self._in_series(index):
+            day = self.occurrence(index)
+            if day > end:
+                break
+            yield day
+            index += 1
+
+    def next_after(self, day):
+        """
+        :return: The first occurrence after day, or None if the series has ended.
+        """
+        index = self._first_index_from(day + timedelta(days=1))
+        return self.occurrence(index) if self._in_series(index) else None
+
+
+@lru_cache(maxsize=256)
+def parse_rule(text):
+    """
+    Parses a rule stored in tasks.recurrence. Rules are cached, a task list holds few distinct rules.
+
+    :return: The RecurrenceRule.
+    :raises ValueError: If the text is not a valid rule.
+    """
+    try:
+        fields = {key.strip().upper(): value.strip() for key, value in (part.split("=", 1) for part in text.split(";"))}
+        return RecurrenceRule(
+            fields["FREQ"].upper(),
+            date.fromisoformat(fields["DTSTART"]),
+            int(fields.get("INTERVAL", 1)),
+            date.fromisoformat(fields["UNTIL"]) if "UNTIL" in fields else None,
+            int(fields["COUNT"]) if "COUNT" in fields else None,
+        )
+    except (KeyError, ValueError):
+        raise ValueError(f"Invalid repetition: {text}")
+
+
+def make_rule(text, start):
+    """
+    Builds the stored rule from user input: a frequency ("daily", "weekly", "monthly", "yearly"), optionally
+    followed by an interval ("weekly 2" for every other week), or a complete rule. The series starts at the
+    task's due date unless the rule names DTSTART.
+
+    :param text: The user input, empty or "none" for no repetition.
+    :param start: The due date of the task.
+    :return: The rule text for tasks.recurrence, or None.
+    :raises ValueError: With a user-facing message if the input is invalid.
+    """
+    text = (text or "").strip()
+    if not text or text.lower() == "none":
+        return None
+    if start is None:
+        raise ValueError("Repeating tasks need a due date.")
+    if "=" in text:
+        if "DTSTART=" not in text.upper():
+            text += f";DTSTART={start.isoformat()}"
+        return str(parse_rule(text))
+    words = text.split()
+    try:
+        interval = int(words[1]) if len(words) > 1 else 1
+    except ValueError:
+        raise ValueError(f"Invalid repetition: {text}")
+    return str(RecurrenceRule(words[0].upper(), start, interval))
+
+
+def next_occurrence(task, completed_on):
+    """
+    Computes the due date a recurring task rolls forward to when it is completed.
+    Occurrences missed while the task was overdue are skipped, so a late completion does not create a
+    backlog of past occurrences.
+
+    :param task: The completed Task, with recurrence set.
+    :param completed_on: Completion date.
+    :return: The next due date, or None if the series has ended.
+    """
+    rule = parse_rule(task.recurrence)
+    return rule.next_after(max(task.due_date or rule.start, completed_on))
+
@@ -1,5 +1,5 @@
 from enum import Enum
-from datetime import date
+from datetime import date, datetime
 
 class Priority(Enum):
     """
@@ -23,7 +23,7 @@ class Task:
     """
 
     def __init__(self, title, due_date, importance, urgency, fitness, description="",
-                 status=Status.OPEN, completed_date=None, task_id=None):
+                 status=Status.OPEN, completed_date=None, task_id=None, recurrence=None):
         """
         Initializes a new Task instance.
 
@@ -36,6 +36,7 @@ class Task:
         :param status: Current status of the task (default is Status.OPEN).
         :param completed_date: Date when the task was completed (default is None).
         :param task_id: Unique identifier for the task (default is None).
+        :param recurrence: Repetition rule of a recurring task (see recurrence.RecurrenceRule), None for one-off tasks.
         """
         self.id = task_id
         self.title = title
@@ -46,6 +47,7 @@ class Task:
         self.description = description
         self.status = status
         self.completed_date = completed_date
+        self.recurrence = recurrence
 
     def edit_task(self, title=None, due_date=None, importance=None,
                   urgency=None, fitness=None, description=None):
@@ -78,3 +80,43 @@ class Task:
         """
         self.status = Status.COMPLETED
         self.completed_date = date.today()
+
+
+def validate_task_data(title, description, due_date_str, importance, urgency, fitness, allow_past_due_date=False):
+    """
+    Validates task input with the rules used when saving a task in the TaskEditor.
+
+    :param title: Title of the task.
+    :param description: Description of the task.
+    :param due_date_str: Due date as a string in the format YYYY-MM-DD.
+    :param importance: Importance level as a string ('Low' or 'High').
+    :param urgency: Urgency level as a string ('Low' or 'High').
+    :param fitness: Fitness level as a string ('Low' or 'High').
+    :param allow_past_due_date: Accept due dates before today (e.g. when restoring a backup).
+    :return: Tuple (due_date, importance, urgency, fitness) with the parsed date and Priority values.
+    :raises ValueError: With a user-facing message if the input is invalid.
+    """
+    if not title:
+        raise ValueError("Title is required.")
+    if len(title) > 25:
+        raise ValueError("Title cannot exceed 25 characters.")
+    if description and len(description) > 250:
+        raise ValueError("Description cannot exceed 250 characters.")
+
+    priority_values = [p.value.upper() for p in Priority]
+    if any(not value or value.upper() not in priority_values for value in (importance, urgency, fitness)):
+        raise ValueError("All priority levels must be selected.")
+
+    # Validate due date
+    if not due_date_str:
+        raise ValueError("Due date is required.")
+    try:
+        due_date = datetime.strptime(due_date_str, "%Y-%m-%d").date()
+    except ValueError:
+        raise ValueError("Invalid due date format. Use YYYY-MM-DD.")
+
+    # Check if the due date is in the past
+    if not allow_past_due_date and due_date < date.today():
+        raise ValueError("The due date cannot be in the past.")
+
+    return due_date, Priority[importance.upper()], Priority[urgency.upper()], Priority[fitness.upper()]
@@ -1,17 +1,30 @@
 import sqlite3
 import sys
 import os
+import time
+from collections import OrderedDict
 
 # Import paths for other modules
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../User')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../Database')))
 
 from user import User
+from shared_access import connect, retry_on_busy
 
 
 class UserRepository:
     """
     UserRepository handles database operations for users.
+    Lookups by username are kept in an LRU cache for POSITIVE_TTL seconds, so users deleted or given a new
+    password hash by another instance are read again after a while. Usernames that do not exist are cached
+    as well for NEGATIVE_TTL seconds, so a registration checking its username and repeated failed logins do
+    not query the database again, while users registered by another instance are found after a short time.
     """
+
+    CACHE_SIZE = 256  # Usernames kept in the lookup cache
+    POSITIVE_TTL = 300  # Seconds a lookup of an existing user stays cached
+    NEGATIVE_TTL = 30  # Seconds a lookup of a missing username stays cached
+
     def __init__(self, db_path=None):
         if db_path is None:
             # Dynamically determine the database path based on the execution environment
@@ -21,39 +34,91 @@ class UserRepository:
                 self.db_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../Database/database.db'))
         else:
             self.db_path = db_path
+        self._cache = OrderedDict()  # username -> (User or None, time of the lookup), least recently used first
+
+    def _cache_put(self, username, user):
+        self._cache[username] = (user, time.monotonic())
+        self._cache.move_to_end(username)
+        if len(self._cache) > self.CACHE_SIZE:
+            self._cache.popitem(last=False)
+
+    def _write(self, sql, params):
+        """
+        Runs one write statement in its own transaction, retried while another instance holds the write lock.
+
+        :return: The ID of the inserted row, for inserts.
+        """
+        def write():
+            conn = connect(self.db_path)
+            cursor = conn.cursor()
+            try:
+                cursor.execute(sql, params)
+                conn.commit()
+                return cursor.lastrowid
+            except sqlite3.Error:
+                conn.rollback()
+                raise
+            finally:
+                conn.close()
+
+        return retry_on_busy(write)
 
     def save_user(self, user: User):
         """
         Saves a user to the database.
 
         :param user: User instance to save.
+        :raises sqlite3.IntegrityError: If the username is taken.
         """
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        try:
+            user.id = self._write('''
+                INSERT INTO users (username, password_hash)
+                VALUES (?, ?)
+            ''', (user.username, user.password_hash))
+        except sqlite3.IntegrityError:
+            self._cache.pop(user.username, None)  # Registered meanwhile, the cached miss is outdated
+            raise
+        self._cache_put(user.username, user)
 
-        cursor.execute('''
-            INSERT INTO users (username, password_hash)
-            VALUES (?, ?)
-        ''', (user.username, user.password_hash))
+    def get_user_by_username(self, username: str) -> User:
+        """
+        Looks up a user by username, from the cache if possible.
 
-        user.id = cursor.lastrowid
-        conn.commit()
-        conn.close()
+        :param username: The username to look up.
+        :return: The User, or None if no user has this name.
+        """
+        if username in self._cache:
+            user, looked_up = self._cache[username]
+            ttl = self.NEGATIVE_TTL if user is None else self.POSITIVE_TTL
+            if time.monotonic() - looked_up < ttl:
+                self._cache.move_to_end(username)
+                return user
 
-    def get_user_by_username(self, username: str) -> User:
-        conn = sqlite3.connect(self.db_path)
+        conn = connect(self.db_path)
         cursor = conn.cursor()
 
         cursor.execute('SELECT id, username, password_hash FROM users WHERE username = ?', (username,))
         row = cursor.fetchone()
         conn.close()
 
+        user = None
         if row:
-            user = User(username=row[1], password="")
-            user.password_hash = row[2]
+            user = User(username=row[1], password_hash=row[2])  # No password, so nothing is hashed
             user.id = row[0]  # Assign the retrieved id to the user
-            return user
-        return None
+        self._cache_put(username, user)
+        return user
+
+    def update_password_hash(self, user: User, password_hash: str):
+        """
+        Stores a new password hash of a user, e.g. after rehashing with a stronger algorithm on login.
+        The user keeps its previous hash if the update fails.
+
+        :param user: User instance to update.
+        :param password_hash: The new password hash.
+        """
+        self._write('UPDATE users SET password_hash = ? WHERE id = ?', (password_hash, user.id))
+        user.password_hash = password_hash
+        self._cache_put(user.username, user)
 
     def delete_user(self, username: str):
         """
@@ -61,9 +126,5 @@ class UserRepository:
 
         :param username: The username of the user to delete.
         """
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-
-        cursor.execute('DELETE FROM users WHERE username = ?', (username,))
-        conn.commit()
-        conn.close()
+        self._write('DELETE FROM users WHERE username = ?', (username,))
+        self._cache_put(username, None)
@@ -0,0 +1,222 @@
+import os
+import hmac
+import time
+import base64
+import hashlib
+import threading
+from abc import ABC, abstractmethod
+
+
+class PasswordHasher(ABC):
+    """
+    Base class of the password hashing algorithms.
+    Encoded hashes start with the algorithm name followed by its parameters, separated by "$", so every stored
+    hash can be verified with the algorithm and cost it was created with.
+    """
+
+    algorithm = None
+
+    @abstractmethod
+    def hash(self, password: str) -> str:
+        """
+        Hashes a password with a new random salt.
+
+        :param password: The plain-text password.
+        :return: The encoded hash.
+        """
+
+    @abstractmethod
+    def verify(self, password: str, encoded: str) -> bool:
+        """
+        Checks a password against an encoded hash of this algorithm.
+        """
+
+    def needs_rehash(self, encoded: str) -> bool:
+        """
+        :return: True if the encoded hash was created with weaker parameters than this hasher's.
+        """
+        return True
+
+    @staticmethod
+    def _b64(data):
+        return base64.b64encode(data).decode('ascii')
+
+    @staticmethod
+    def _unb64(text):
+        return base64.b64decode(text.encode('ascii'))
+
+
+class PBKDF2Hasher(PasswordHasher):
+    """
+    Salted PBKDF2-HMAC-SHA256, encoded as "pbkdf2_sha256$<iterations>$<salt>$<hash>".
+    """
+
+    algorithm = "pbkdf2_sha256"
+
+    def __init__(self, iterations=600_000, salt_size=16):
+        """
+        :param iterations: Work factor, the time to hash grows linearly with it.
+        :param salt_size: Number of random salt bytes.
+        """
+        self.iterations = iterations
+        self.salt_size = salt_size
+
+    def _derive(self, password, salt, iterations):
+        return hashlib.pbkdf2_hmac('sha256', password.encode('utf-8'), salt, iterations)
+
+    def hash(self, password: str) -> str:
+        salt = os.urandom(self.salt_size)
+        digest = self._derive(password, salt, self.iterations)
+        return f"{self.algorithm}${self.iterations}${self._b64(salt)}${self._b64(digest)}"
+
+    def verify(self, password: str, encoded: str) -> bool:
+        _, iterations, salt, digest = encoded.split("$")
+        return hmac.compare_digest(self._derive(password, self._unb64(salt), int(iterations)), self._unb64(digest))
+
+    def needs_rehash(self, encoded: str) -> bool:
+        parts = encoded.split("$")
+        return parts[0] != self.algorithm or int(parts[1]) < self.iterations
+
+
+class ScryptHasher(PasswordHasher):
+    """
+    Salted scrypt, encoded as "scrypt$<n>$<r>$<p>$<salt>$<hash>". Besides time it costs 128 * n * r bytes of
+    memory per hash, which makes guessing on graphics cards expensive.
+    """
+
+    algorithm = "scrypt"
+
+    def __init__(self, n=2 ** 15, r=8, p=1, salt_size=16):
+        """
+        :param n: CPU and memory cost, a power of two.
+        :param r: Block size.
+        :param p: Parallelization.
+        :param salt_size: Number of random salt bytes.
+        """
+        self.n, self.r, self.p = n, r, p
+        self.salt_size = salt_size
+
+    def _derive(self, password, salt, n, r, p):
+        return hashlib.scrypt(password.encode('utf-8'), salt=salt, n=n, r=r, p=p, maxmem=256 * n * r + 1024 * 1024)
+
+    def hash(self, password: str) -> str:
+        salt = os.urandom(self.salt_size)
+        digest = self._derive(password, salt, self.n, self.r, self.p)
+        return f"{self.algorithm}${self.n}${self.r}${self.p}${self._b64(salt)}${self._b64(digest)}"
+
+    def verify(self, password: str, encoded: str) -> bool:
+        _, n, r, p, salt, digest = encoded.split("$")
+        derived = self._derive(password, self._unb64(salt), int(n), int(r), int(p))
+        return hmac.compare_digest(derived, self._unb64(digest))
+
+    def needs_rehash(self, encoded: str) -> bool:
+        parts = encoded.split("$")
+        return parts[0] != self.algorithm or (int(parts[1]), int(parts[2]), int(parts[3])) < (self.n, self.r, self.p)
+
+
+class LegacySHA256Hasher(PasswordHasher):
+    """
+    Unsalted SHA-256 as hex digest, the format of accounts registered before salted hashing. Only used to verify
+    such hashes, they are replaced by the default algorithm on the next successful login.
+    """
+
+    algorithm = "sha256"
+
+    def hash(self, password: str) -> str:
+        return hashlib.sha256(password.encode()).hexdigest()
+
+    def verify(self, password: str, encoded: str) -> bool:
+        return hmac.compare_digest(self.hash(password), encoded)
+
+
+HASHERS = {hasher.algorithm: hasher for hasher in (PBKDF2Hasher(), ScryptHasher(), LegacySHA256Hasher())}
+
+# Algorithm and cost of new hashes, may be replaced to raise the work factor
+default_hasher = HASHERS[PBKDF2Hasher.algorithm]
+
+
+def identify_hasher(encoded: str) -> PasswordHasher:
+    """
+    Determines the algorithm of an encoded hash.
+
+    :raises ValueError: If the format is unknown.
+    """
+    if "$" not in encoded:
+        if len(encoded) == 64:
+            return HASHERS[LegacySHA256Hasher.algorithm]
+        raise ValueError("Unknown password hash format.")
+    algorithm = encoded.split("$", 1)[0]
+    if algorithm not in HASHERS:
+        raise ValueError(f"Unknown password hash algorithm '{algorithm}'.")
+    return HASHERS[algorithm]
+
+
+def hash_password(password: str, hasher=None) -> str:
+    """
+    Hashes a password with the given or the default hasher.
+    """
+    return (hasher or default_hasher).hash(password)
+
+
+def verify_password(password: str, encoded: str) -> bool:
+    """
+    Checks a password against an encoded hash of any known algorithm. Malformed hashes never match.
+    """
+    try:
+        return identify_hasher(encoded).verify(password, encoded)
+    except (ValueError, TypeError):
+        return False
+
+
+def needs_rehash(encoded: str, hasher=None) -> bool:
+    """
+    :return: True if the hash should be replaced by one of the given or the default hasher.
+    """
+    try:
+        return (hasher or default_hasher).needs_rehash(encoded)
+    except (ValueError, IndexError):
+        return True
+
+
+class PasswordWorker(threading.Thread):
+    """
+    Runs a slow password function in a background thread, so the Tk thread stays responsive.
+    The Tk thread polls state until it is DONE or FAILED and then reads result or error.
+    """
+
+    PENDING, RUNNING, DONE, FAILED = "pending", "running", "done", "failed"
+
+    def __init__(self, function, *args):
+        """
+        :param function: Function to call, e.g. a password check.
+        :param args: Arguments of the function.
+        """
+        super().__init__(daemon=True)
+        self.function = function
+        self.args = args
+        self.state = self.PENDING
+        self.result = None
+        self.error = None
+        self.started_at = None
+
+    def run(self):
+        self.started_at = time.monotonic()
+        self.state = self.RUNNING
+        try:
+            self.result = self.function(*self.args)
+            self.state = self.DONE
+        except Exception as e:
+            self.error = e
+            self.state = self.FAILED
+
+    def is_finished(self):
+        """
+        :return: True once the function has returned or raised.
+        """
+        return self.state in (self.DONE, self.FAILED)
+
+    def elapsed(self):
+        """
+        :return: Seconds the function has been running, 0 before it started.
+        """
+        return 0 if self.started_at is None else time.monotonic() - self.started_at
@@ -0,0 +1,68 @@
+class Session:
+    """
+    The session of the logged-in user: the user, their settings and their tasks.
+    Settings are read once and kept until they are changed, and the task methods are bound to the user,
+    so per-user code does not pass the user ID around or query the database for data it already has.
+    """
+
+    def __init__(self, user, settings_manager, task_cache):
+        """
+        Initializes a new session.
+
+        :param user: The logged-in User, with id.
+        :param settings_manager: SettingsManager to read the user's settings from.
+        :param task_cache: TaskCache serving the user's tasks.
+        """
+        self.user = user
+        self.settings_manager = settings_manager
+        self.task_cache = task_cache
+        self._settings = None
+
+    @property
+    def user_id(self):
+        return self.user.id
+
+    @property
+    def username(self):
+        return self.user.username
+
+    @property
+    def settings(self):
+        """
+        :return: Dictionary of the user's settings, read from the database on first use.
+        """
+        if self._settings is None:
+            self._settings = self.settings_manager.get_settings(self.user_id)
+        return self._settings
+
+    def reload_settings(self):
+        """
+        Drops the cached settings, e.g. after they have been saved, so the next access reads them again.
+        """
+        self._settings = None
+
+    def get_tasks(self, filters=None):
+        """
+        :return: The user's tasks matching the filters, see TaskCache.get_tasks.
+        """
+        return self.task_cache.get_tasks(self.user_id, filters)
+
+    def get_task(self, task_id):
+        """
+        :return: The user's task with the given ID, or None.
+        """
+        return self.task_cache.get_task(self.user_id, task_id)
+
+    def put_task(self, task):
+        """
+        Reports an added or updated task of the user to the task cache.
+
+        :return: The cached Task object.
+        """
+        return self.task_cache.put(self.user_id, task)
+
+    def remove_task(self, task_id):
+        """
+        Reports a task of the user that was deleted or archived to the task cache.
+        """
+        self.task_cache.remove(self.user_id, task_id)
@@ -1,28 +1,32 @@
-import hashlib
+import password_hasher
+
 
 class User:
     """
     The User class represents a user in the application with basic authentication functionality.
+    Passwords are hashed with the pluggable algorithms of password_hasher, which are slow on purpose: call
+    hash_password and check_password from a worker thread (see password_hasher.PasswordWorker) in the GUI.
     """
 
-    def __init__(self, username: str, password: str):
+    def __init__(self, username: str, password: str = None, password_hash: str = None):
         """
         Initializes a new user instance.
 
         :param username: The username of the user.
         :param password: The password of the user (will be hashed).
+        :param password_hash: The stored hash of a user loaded from the database, instead of a password.
         """
         self.username = username
-        self.password_hash = self.hash_password(password)
+        self.password_hash = self.hash_password(password) if password is not None else password_hash
 
     def hash_password(self, password: str) -> str:
         """
-        Hashes the password using SHA-256 for secure storage.
+        Hashes the password with a random salt and the default algorithm for secure storage.
 
         :param password: The plain-text password to hash.
-        :return: The hashed password as a hex string.
+        :return: The encoded hash, including algorithm, cost and salt.
         """
-        return hashlib.sha256(password.encode()).hexdigest()
+        return password_hasher.hash_password(password)
 
     def check_password(self, password: str) -> bool:
         """
@@ -31,4 +35,10 @@ class User:
         :param password: The plain-text password to check.
         :return: True if the password matches, False otherwise.
         """
-        return self.password_hash == self.hash_password(password)
+        return password_hasher.verify_password(password, self.password_hash or "")
+
+    def needs_rehash(self) -> bool:
+        """
+        :return: True if the stored hash uses an outdated algorithm or a lower cost than the default.
+        """
+        return password_hasher.needs_rehash(self.password_hash or "")
@@ -0,0 +1,393 @@
+import os
+import sys
+import json
+import sqlite3
+import argparse
+from datetime import date, timedelta
+
+# Import paths for other modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), 'Task')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), 'Task/TaskRepository')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), 'Database')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), 'ArchiveManager')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), 'SettingsManager')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), 'StatisticsManager')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), 'ImportExportManager')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), 'User')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), 'User/UserRepository')))
+
+from task import Task, Status, validate_task_data
+from recurrence import make_rule
+from dependency_graph import DependencyGraph, SUBTASK, BLOCKS
+from task_repository import TaskRepository
+from task_cache import task_matches_filters
+from task_format import task_to_dict, parse_filters, FILTER_NAMES
+from database_setup import get_default_db_path, initialize_database
+from archive_manager import ArchiveManager
+from settings_manager import SettingsManager
+from statistics_manager import StatisticsManager
+from import_export_manager import ImportExportManager
+from user_repository import UserRepository
+
+BATCH_SIZE = 1000  # Tasks written per transaction, keeps the write lock short for a running GUI
+
+
+def batches(items, size=BATCH_SIZE):
+    """
+    Splits a list into consecutive chunks of at most size items.
+    """
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def resolve_user(db_path, username=None, user_id=None):
+    """
+    :return: The user ID given directly or looked up by username.
+    :raises ValueError: If the username does not exist.
+    """
+    if user_id is not None:
+        return user_id
+    user = UserRepository(db_path).get_user_by_username(username)
+    if user is None:
+        raise ValueError(f"User '{username}' does not exist.")
+    return user.id
+
+
+def format_task(task, fmt):
+    """
+    :return: One output line for a task: a JSON object for "jsonl", tab-separated columns for "table".
+    """
+    if fmt == "jsonl":
+        return json.dumps(task_to_dict(task))
+    priorities = "/".join(priority.value for priority in (task.importance, task.urgency, task.fitness))
+    return "\t".join([str(task.id), task.status.value, task.due_date.isoformat() if task.due_date else "-",
+                      priorities, task.title])
+
+
+def select_tasks(repository, user_id, args):
+    """
+    Collects the tasks a write command applies to: the tasks with the given IDs and/or matching the filters.
+    The selection is read completely before writing, so no read cursor holds the database while the batches
+    are committed.
+
+    :return: List of Task objects in ID order.
+    """
+    filters = parse_filters(vars(args))
+    ids = set(args.ids)
+    return [task for task in repository.iter_tasks_by_user(user_id)
+            if (not ids or task.id in ids) and task_matches_filters(task, filters)]
+
+
+def has_selection(args):
+    return bool(args.ids or args.all or any(getattr(args, name) for name in FILTER_NAMES))
+
+
+def cmd_list(args, user_id, out):
+    """
+    Streams the matching tasks, one line per task, while they are read from the database.
+    """
+    filters = parse_filters(vars(args))
+    count = 0
+    for task in TaskRepository(args.db).iter_tasks_by_user(user_id):
+        if task_matches_filters(task, filters):
+            print(format_task(task, args.format), file=out)
+            count += 1
+    return count
+
+
+def parse_new_task(record, settings, allow_past_due_date=False):
+    """
+    Validates the fields of a task to add with the rules of the TaskEditor.
+
+    :param record: Dictionary with "title", "due_date" and optional "description", "importance", "urgency",
+                   "fitness" and "recurrence"; missing priorities default to the user's default priorities.
+    :param settings: The user's settings.
+    :return: The new Task, without ID.
+    :raises ValueError: With a user-facing message if the fields are invalid.
+    """
+    if not isinstance(record, dict):
+        raise ValueError("Each line must be a JSON object.")
+    for name in ("title", "due_date", "description", "importance", "urgency", "fitness", "recurrence"):
+        if not isinstance(record.get(name), (str, type(None))):
+            raise ValueError(f"{name} must be a string or null.")
+    description = record.get("description") or ""
+    due_date, importance, urgency, fitness = validate_task_data(
+        record.get("title"), description, record.get("due_date"),
+        record.get("importance") or settings["default_importance"],
+        record.get("urgency") or settings["default_urgency"],
+        record.get("fitness") or settings["default_fitness"],
+        allow_past_due_date=allow_past_due_date)
+    return Task(title=record["title"], due_date=due_date, importance=importance, urgency=urgency,
+                fitness=fitness, description=description, recurrence=make_rule(record.get("recurrence"), due_date))
+
+
+def cmd_add(args, user_id, out):
+    """
+    Adds the task given by the options, or one task per JSON line of --file ("-" reads standard input).
+    Invalid lines are reported and skipped, the valid tasks are inserted in batches.
+    """
+    repository = TaskRepository(args.db)
+    settings = SettingsManager(args.db).get_settings(user_id)
+    if args.file is None:
+        task = parse_new_task({"title": args.title, "due_date": args.due_date, "description": args.description,
+                               "importance": args.importance, "urgency": args.urgency, "fitness": args.fitness,
+                               "recurrence": args.repeat},
+                              settings, args.allow_past_due_dates)
+        repository.add_tasks([task], user_id)
+        print(f"Added task {task.id}", file=out)
+        return 1
+
+    added = skipped = 0
+    batch = []
+    stream = sys.stdin if args.file == "-" else open(args.file, encoding="utf-8")
+    try:
+        for line_number, line in enumerate(stream, start=1):
+            if not line.strip():
+                continue
+            try:
+                batch.append(parse_new_task(json.loads(line), settings, args.allow_past_due_dates))
+            except ValueError as e:
+                print(f"Line {line_number}: {e}", file=sys.stderr)
+                skipped += 1
+                continue
+            if len(batch) == BATCH_SIZE:
+                added += len(repository.add_tasks(batch, user_id))
+                batch = []
+        added += len(repository.add_tasks(batch, user_id))
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+    print(f"Added {added} tasks, skipped {skipped}", file=out)
+    return added
+
+
+def archive_tasks(repository, user_id, tasks):
+    """
+    Moves completed tasks to the archive in batches.
+
+    :return: Number of archived tasks.
+    """
+    today = date.today().strftime("%Y-%m-%d")
+    for batch in batches(tasks):
+        repository.bulk_archive(batch, user_id, today)
+    return len(tasks)
+
+
+def cmd_complete(args, user_id, out):
+    """
+    Marks the selected tasks as completed. Like in the main window, they are archived right away if the
+    user has enabled auto-archiving, and recurring tasks move on to their next occurrence.
+    """
+    repository = TaskRepository(args.db)
+    tasks = [task for task in select_tasks(repository, user_id, args) if task.status != Status.COMPLETED]
+    auto_archive = SettingsManager(args.db).get_settings(user_id).get("auto_archive", False)
+    completed_date = date.today().strftime("%Y-%m-%d")
+    rolled = 0
+    for batch in batches(tasks):
+        rolled += len(repository.complete_tasks(batch, user_id, completed_date, archive=auto_archive)[0])
+
+    summary = f"Completed and archived {len(tasks) - rolled} tasks" if auto_archive \
+        else f"Completed {len(tasks) - rolled} tasks"
+    if rolled:
+        summary += f", moved {rolled} recurring tasks to their next occurrence"
+    print(summary, file=out)
+    return len(tasks)
+
+
+def cmd_archive(args, user_id, out):
+    """
+    Moves the completed tasks among the selected ones to the archive.
+    """
+    repository = TaskRepository(args.db)
+    tasks = select_tasks(repository, user_id, args)
+    completed = [task for task in tasks if task.status == Status.COMPLETED]
+    archive_tasks(repository, user_id, completed)
+    print(f"Archived {len(completed)} tasks, skipped {len(tasks) - len(completed)} that are not completed", file=out)
+    return len(completed)
+
+
+def cmd_sweep(args, user_id, out):
+    """
+    Applies the user's auto-archive and auto-delete settings at once: archives all completed tasks and
+    deletes archived tasks completed more than auto_delete_interval days ago. The options override the
+    settings.
+    """
+    settings = SettingsManager(args.db).get_settings(user_id)
+    archived = deleted = 0
+    if args.archive or settings.get("auto_archive", False):
+        repository = TaskRepository(args.db)
+        completed = [task for task in repository.iter_tasks_by_user(user_id) if task.status == Status.COMPLETED]
+        archived = archive_tasks(repository, user_id, completed)
+    if args.delete or settings.get("auto_delete", False):
+        days = args.delete_after if args.delete_after is not None else settings.get("auto_delete_interval", 30)
+        cutoff = (date.today() - timedelta(days=days)).isoformat()
+        deleted = ArchiveManager(args.db).delete_archived_before(user_id, cutoff)
+    print(f"Archived {archived} completed tasks, deleted {deleted} archived tasks", file=out)
+    return archived + deleted
+
+
+def load_dependency_graph(repository, user_id):
+    graph = DependencyGraph()
+    graph.load(repository.get_tasks_by_user(user_id), repository.get_dependencies(user_id))
+    return graph
+
+
+def cmd_link(args, user_id, out):
+    """
+    Makes a task a subtask of another task and/or lets other tasks block it. The new dependencies are
+    checked against the stored ones, so they cannot close a cycle.
+    """
+    repository = TaskRepository(args.db)
+    graph = load_dependency_graph(repository, user_id)
+    dependencies = [(args.subtask_of, args.task_id, SUBTASK)] if args.subtask_of is not None else []
+    dependencies += [(args.task_id, blocker_id, BLOCKS) for blocker_id in args.blocked_by]
+    changed = set()
+    for task_id, depends_on_id, kind in dependencies:
+        changed.update(graph.add_dependency(task_id, depends_on_id, kind))
+    repository.add_dependencies(dependencies, user_id)
+    print(f"Added {len(dependencies)} dependencies, {len(changed)} tasks inherit new priorities or due dates",
+          file=out)
+    return len(dependencies)
+
+
+def cmd_unlink(args, user_id, out):
+    """
+    Removes the subtask and blocking relationships of a task, in both directions.
+    """
+    repository = TaskRepository(args.db)
+    graph = load_dependency_graph(repository, user_id)
+    dependencies = [(args.task_id, other_id) for other_id in graph.prerequisites(args.task_id)]
+    dependencies += [(other_id, args.task_id) for other_id in graph.dependents(args.task_id)]
+    repository.remove_dependencies(dependencies, user_id)
+    print(f"Removed {len(dependencies)} dependencies", file=out)
+    return len(dependencies)
+
+
+def cmd_import(args, user_id, out):
+    report = ImportExportManager(args.db).import_file(args.path, user_id, args.table, args.file_format,
+                                                       args.allow_past_due_dates)
+    for line_number, message in report["errors"]:
+        print(f"Line {line_number}: {message}", file=sys.stderr)
+    print(f"Imported {ImportExportManager.format_report(report)}", file=out)
+    return report["rows"]
+
+
+def cmd_export(args, user_id, out):
+    report = ImportExportManager(args.db).export_file(args.path, user_id, args.table, args.file_format)
+    print(f"Exported {ImportExportManager.format_report(report)}", file=out)
+    return report["rows"]
+
+
+def cmd_stats(args, user_id, out):
+    dashboard = StatisticsManager(args.db).get_dashboard(user_id)
+    print(json.dumps(dashboard, indent=2), file=out)
+    return dashboard["tasks"]["total"]
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Batch operations on the tasks of a user.")
+    parser.add_argument("--db", help="Path to the database file")
+    user = parser.add_mutually_exclusive_group(required=True)
+    user.add_argument("--user", help="Username whose tasks are used")
+    user.add_argument("--user-id", type=int, help="ID of the user whose tasks are used")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    filters = argparse.ArgumentParser(add_help=False)
+    for name in ("importance", "urgency", "fitness"):
+        filters.add_argument(f"--{name}", choices=["Low", "High"], type=str.capitalize)
+    filters.add_argument("--search", help="Text contained in the title")
+    filters.add_argument("--status", choices=[status.value for status in Status])
+    filters.add_argument("--due-date", help="Tasks due on or before this date (YYYY-MM-DD)")
+
+    selection = argparse.ArgumentParser(add_help=False, parents=[filters])
+    selection.add_argument("ids", nargs="*", type=int, help="IDs of the tasks (default: all matching tasks)")
+    selection.add_argument("--all", action="store_true", help="Apply to all tasks matching the filters")
+
+    listing = commands.add_parser("list", aliases=["filter"], parents=[filters], help="Print tasks")
+    listing.add_argument("--format", choices=["table", "jsonl"], default="table")
+    listing.set_defaults(handler=cmd_list)
+
+    add = commands.add_parser("add", help="Add a task, or one task per JSON line of a file")
+    add.add_argument("title", nargs="?")
+    add.add_argument("--due-date")
+    add.add_argument("--description", default="")
+    add.add_argument("--repeat", help="daily, weekly, monthly or yearly, optionally followed by an interval")
+    for name in ("importance", "urgency", "fitness"):
+        add.add_argument(f"--{name}", help="Low or High (default: the user's default priority)")
+    add.add_argument("--file", help="JSON Lines file with one task per line, - reads standard input")
+    add.add_argument("--allow-past-due-dates", action="store_true")
+    add.set_defaults(handler=cmd_add)
+
+    complete = commands.add_parser("complete", parents=[selection], help="Mark tasks as completed")
+    complete.set_defaults(handler=cmd_complete)
+
+    archive = commands.add_parser("archive", parents=[selection], help="Archive completed tasks")
+    archive.set_defaults(handler=cmd_archive)
+
+    sweep = commands.add_parser("sweep", help="Apply the auto-archive and auto-delete settings now")
+    sweep.add_argument("--archive", action="store_true", help="Archive completed tasks even if auto-archive is off")
+    sweep.add_argument("--delete", action="store_true", help="Delete old archived tasks even if auto-delete is off")
+    sweep.add_argument("--delete-after", type=int, help="Days after completion (default: the user's setting)")
+    sweep.set_defaults(handler=cmd_sweep)
+
+    link = commands.add_parser("link", help="Make a task a subtask of another task or blocked by other tasks")
+    link.add_argument("task_id", type=int)
+    link.add_argument("--subtask-of", type=int, metavar="PARENT_ID", help="ID of the parent task")
+    link.add_argument("--blocked-by", type=int, nargs="+", default=[], metavar="TASK_ID",
+                      help="IDs of tasks that have to be completed first")
+    link.set_defaults(handler=cmd_link)
+
+    unlink = commands.add_parser("unlink", help="Remove the subtask and blocking relationships of a task")
+    unlink.add_argument("task_id", type=int)
+    unlink.set_defaults(handler=cmd_unlink)
+
+    for name, handler in (("import", cmd_import), ("export", cmd_export)):
+        transfer = commands.add_parser(name, help=f"{name.capitalize()} tasks as CSV or JSON Lines")
+        transfer.add_argument("path", help="File to read or write (.csv or .jsonl)")
+        transfer.add_argument("--table", choices=ImportExportManager.TABLES, default="tasks")
+        transfer.add_argument("--format", dest="file_format", choices=ImportExportManager.FORMATS)
+        transfer.add_argument("--allow-past-due-dates", action="store_true")
+        transfer.set_defaults(handler=handler)
+
+    stats = commands.add_parser("stats", help="Print the counts of the statistics window as JSON")
+    stats.set_defaults(handler=cmd_stats)
+    return parser
+
+
+def main(argv=None, out=sys.stdout):
+    """
+    Runs one command.
+
+    :param argv: Command-line arguments, defaults to sys.argv[1:].
+    :param out: Stream receiving the output.
+    :return: Exit status, 0 on success.
+    """
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.command in ("complete", "archive") and not has_selection(args):
+        parser.error(f"{args.command} needs task IDs, filters or --all")
+    if args.command == "add" and not (args.title or args.file):
+        parser.error("add needs a title or --file")
+    if args.command == "link" and args.subtask_of is None and not args.blocked_by:
+        parser.error("link needs --subtask-of or --blocked-by")
+
+    args.db = args.db or get_default_db_path()
+    initialize_database(args.db)
+    try:
+        user_id = resolve_user(args.db, args.user, args.user_id)
+        args.handler(args, user_id, out)
+    except BrokenPipeError:
+        # The output was piped into a command that stopped reading early, e.g. head
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 0
+    except (ValueError, OSError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    except sqlite3.Error as e:
+        print(f"Database error: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,5 +1,6 @@
 import os
 import sys
+import argparse
 import tkinter as tk
 
 # Validate and add the path for GUIController
@@ -11,10 +12,21 @@ sys.path.insert(0, gui_path)
 from gui_controller import GUIController
 
 def main():
+    parser = argparse.ArgumentParser(description="Sung Task Manager")
+    parser.add_argument("--write-behind", action="store_true",
+                        help="Queue task edits in a journal and write them in the background")
+    parser.add_argument("--archive-snapshot", action="store_true",
+                        help="Browse the archive and statistics on a read-only snapshot of the database")
+    parser.add_argument("--shared", action="store_true",
+                        help="Let several instances use the database at the same time (write-ahead logging)")
+    args = parser.parse_args()
+
     root = tk.Tk()
     try:
         # Attempt to initialize the GUIController
-        app = GUIController(root)  # GUIController will handle showing the login and main window
+        # GUIController will handle showing the login and main window
+        app = GUIController(root, write_behind=args.write_behind, archive_snapshot=args.archive_snapshot,
+                            shared=args.shared)
         root.mainloop()
     except Exception as e:
         print(f"Failed to initialize GUIController: {e}")
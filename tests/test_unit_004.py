@@ -72,6 +72,7 @@ def test_login_success(login_window):
     # Mock the UserRepository's get_user_by_username method
     mock_user = MagicMock()
     mock_user.check_password.return_value = True
+    mock_user.needs_rehash.return_value = False
     mock_user.id = 1
     login_window.user_repo.get_user_by_username.return_value = mock_user
 
@@ -79,13 +80,13 @@ def test_login_success(login_window):
     login_window.username_entry.get = MagicMock(return_value="ValidUser123")
     login_window.password_entry.get = MagicMock(return_value="password123")
 
-    # Action
+    # Action: the password is checked in a worker thread, wait for it and process its result
     login_window.login()
+    login_window.worker.join()
+    login_window.poll_worker()
 
     # Assertions
-    assert login_window.controller.current_user == "ValidUser123"
-    assert login_window.controller.current_user_id == 1
-    login_window.controller.load_tasks.assert_called_once()
+    login_window.controller.start_session.assert_called_once_with(mock_user)
 
 
 def test_login_failure(login_window):
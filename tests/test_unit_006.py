@@ -45,19 +45,16 @@ def test_save_task_valid_input(task_editor):
     task_editor.urgency_combo.set(MockPriority.LOW)
     task_editor.fitness_combo.set(MockPriority.HIGH)
 
-    with patch("task_editor.sqlite3.connect") as mock_connect:
-        mock_conn = MagicMock()
-        mock_cursor = MagicMock()
-        mock_connect.return_value = mock_conn
-        mock_conn.cursor.return_value = mock_cursor
+    repository = task_editor.controller.task_repository
 
-        # Call save_task
-        task_editor.save_task()
+    # Call save_task
+    task_editor.save_task()
 
-        # Verify database interaction
-        mock_cursor.execute.assert_called_once()
-        mock_conn.commit.assert_called_once()
-        mock_conn.close.assert_called_once()
+    # Verify the new task is inserted through the repository and cached
+    repository.add_tasks.assert_called_once()
+    (task,), user_id = repository.add_tasks.call_args.args
+    assert task.title == "Valid Task Title" and user_id == 1
+    task_editor.controller.session.put_task.assert_called_once_with(task)
 
 def test_mark_task_open():
     """Tests marking a task as open."""
@@ -13,14 +13,14 @@ def test_user_initialization():
 
     assert user.username == "test_user"
     assert isinstance(user.password_hash, str), "Password hash should be a string"
-    assert len(user.password_hash) == 64, "SHA-256 hash should have a length of 64 characters"
+    assert user.password_hash.startswith("pbkdf2_sha256$"), "Password hash should name its algorithm"
 
 def test_hash_password():
     """Tests the hash_password method."""
     user = User(username="test_user", password="securepassword")
 
-    expected_hash = user.hash_password("securepassword")
-    assert user.password_hash == expected_hash, "Password hash does not match expected value"
+    other_hash = user.hash_password("securepassword")
+    assert user.password_hash != other_hash, "Hashes of the same password should differ by their salt"
 
 def test_check_password():
     """Tests the check_password method."""
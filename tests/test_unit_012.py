@@ -0,0 +1,74 @@
+import os
+import sys
+import sqlite3
+import pytest
+
+# Import paths for other modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src/Database')))
+
+from database_setup import initialize_database, SCHEMA_VERSION
+
+
+@pytest.fixture
+def temp_database(tmp_path):
+    """Fixture for a path to a fresh database file."""
+    return str(tmp_path / "bootstrap.db")
+
+
+def get_tables(db_path):
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+    cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
+    tables = {row[0] for row in cursor.fetchall()}
+    conn.close()
+    return tables
+
+
+def test_initialize_creates_schema(temp_database):
+    """Tests that all tables are created and the schema version is recorded."""
+    assert initialize_database(temp_database) is True
+
+    assert {"tasks", "users", "archived_tasks", "settings"} <= get_tables(temp_database)
+    conn = sqlite3.connect(temp_database)
+    version = conn.execute("PRAGMA user_version").fetchone()[0]
+    conn.close()
+    assert version == SCHEMA_VERSION
+
+
+def test_initialize_is_idempotent(temp_database):
+    """Tests that a second bootstrap of a current database skips the DDL."""
+    initialize_database(temp_database)
+    assert initialize_database(temp_database) is False
+
+
+def test_initialize_recreated_file(temp_database):
+    """Tests that a database file removed after bootstrapping is created again."""
+    initialize_database(temp_database)
+    os.remove(temp_database)
+
+    assert initialize_database(temp_database) is True
+    assert "tasks" in get_tables(temp_database)
+
+
+def test_initialize_upgrades_legacy_tables(temp_database):
+    """Tests that tables created by older versions receive the missing columns."""
+    conn = sqlite3.connect(temp_database)
+    conn.execute('''
+        CREATE TABLE archived_tasks (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            title TEXT NOT NULL,
+            completed_date TEXT
+        )
+    ''')
+    conn.execute("INSERT INTO archived_tasks (title, completed_date) VALUES ('Old Task', '2024-01-01')")
+    conn.commit()
+    conn.close()
+
+    initialize_database(temp_database)
+
+    conn = sqlite3.connect(temp_database)
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(archived_tasks)")}
+    row = conn.execute("SELECT title, user_id FROM archived_tasks").fetchone()
+    conn.close()
+    assert "user_id" in columns
+    assert row == ("Old Task", None)
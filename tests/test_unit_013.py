@@ -0,0 +1,141 @@
+import os
+import sys
+import sqlite3
+import pytest
+from datetime import date, timedelta
+from unittest.mock import MagicMock
+
+# Import paths for other modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src/Task')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src/Task/TaskRepository')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src/Database')))
+
+from task import Task, Priority, Status
+from task_repository import TaskRepository
+from task_cache import TaskCache
+from database_setup import initialize_database
+
+
+@pytest.fixture
+def temp_database(tmp_path):
+    """Fixture for a bootstrapped database containing two tasks of user 1 and one of user 2."""
+    db_path = str(tmp_path / "tasks.db")
+    initialize_database(db_path)
+    conn = sqlite3.connect(db_path)
+    conn.executemany('''
+        INSERT INTO tasks (title, description, due_date, importance, urgency, fitness, status, user_id)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    ''', [
+        ("Task 1", "", "2030-01-01", "High", "Low", "High", "Open", 1),
+        ("Task 2", "", "2030-02-01", "Low", "Low", "Low", "In Progress", 1),
+        ("Other", "", "2030-01-01", "High", "High", "High", "Open", 2),
+    ])
+    conn.commit()
+    conn.close()
+    return db_path
+
+
+@pytest.fixture
+def task_cache(temp_database):
+    """Fixture for a TaskCache whose repository calls can be counted."""
+    repository = TaskRepository(temp_database)
+    repository.get_tasks_by_user = MagicMock(wraps=repository.get_tasks_by_user)
+    return TaskCache(repository)
+
+
+def test_repository_decodes_tasks(temp_database):
+    """Tests that rows are decoded into Task objects."""
+    tasks = TaskRepository(temp_database).get_tasks_by_user(1)
+
+    assert [task.title for task in tasks] == ["Task 1", "Task 2"]
+    assert tasks[0].due_date == date(2030, 1, 1)
+    assert tasks[0].importance == Priority.HIGH
+    assert tasks[1].status == Status.IN_PROGRESS
+
+
+def test_get_tasks_reads_database_once(task_cache):
+    """Tests that repeated and filtered reads are served from the cache."""
+    assert len(task_cache.get_tasks(1)) == 2
+    assert [task.title for task in task_cache.get_tasks(1, {"importance": "High"})] == ["Task 1"]
+    assert [task.title for task in task_cache.get_tasks(1, {"search": "task 2"})] == ["Task 2"]
+    assert task_cache.get_tasks(1, {"due_date": date(2030, 1, 15)})[0].title == "Task 1"
+
+    task_cache.repository.get_tasks_by_user.assert_called_once_with(1)
+
+
+def test_put_updates_cached_task_in_place(task_cache):
+    """Tests that a written task updates the cached instance and notifies listeners."""
+    listener = MagicMock()
+    task_cache.subscribe(listener)
+    cached = task_cache.get_tasks(1)[0]
+
+    edited = Task(title="Renamed", due_date=date.today() + timedelta(days=1), importance=Priority.LOW,
+                  urgency=Priority.LOW, fitness=Priority.LOW, task_id=cached.id)
+    result = task_cache.put(1, edited)
+
+    assert result is cached
+    assert cached.title == "Renamed"
+    listener.assert_called_once_with(TaskCache.UPDATED, 1, cached)
+
+
+def test_put_and_remove_new_task(task_cache):
+    """Tests adding and removing a task through the cache."""
+    listener = MagicMock()
+    task_cache.get_tasks(1)
+    task_cache.subscribe(listener)
+
+    new_task = Task(title="New", due_date=None, importance=Priority.LOW, urgency=Priority.LOW,
+                    fitness=Priority.LOW, task_id=99)
+    task_cache.put(1, new_task)
+    assert new_task in task_cache.get_tasks(1)
+
+    task_cache.remove(1, 99)
+    assert new_task not in task_cache.get_tasks(1)
+    assert [call.args[0] for call in listener.call_args_list] == [TaskCache.ADDED, TaskCache.REMOVED]
+
+
+def fetch_rows(db_path, query, params=()):
+    conn = sqlite3.connect(db_path)
+    rows = conn.execute(query, params).fetchall()
+    conn.close()
+    return rows
+
+
+def test_bulk_update_status_and_priorities(temp_database):
+    """Tests that bulk updates only touch the given tasks of the user."""
+    repository = TaskRepository(temp_database)
+    task_ids = [task.id for task in repository.get_tasks_by_user(1)]
+
+    repository.bulk_update_status(task_ids, 1, Status.COMPLETED)
+    repository.bulk_update_priorities(task_ids, 1, Priority.HIGH, Priority.HIGH, Priority.LOW)
+
+    rows = fetch_rows(temp_database, "SELECT status, importance, urgency, fitness FROM tasks WHERE user_id = 1")
+    assert rows == [("Completed", "High", "High", "Low")] * 2
+    assert fetch_rows(temp_database, "SELECT status FROM tasks WHERE user_id = 2") == [("Open",)]
+
+
+def test_bulk_archive_and_delete(temp_database):
+    """Tests moving tasks to the archive and deleting tasks in bulk."""
+    repository = TaskRepository(temp_database)
+    first, second = repository.get_tasks_by_user(1)
+    first.status = Status.COMPLETED
+
+    repository.bulk_archive([first], 1, "2030-01-02")
+    repository.bulk_delete([second.id], 1)
+
+    assert fetch_rows(temp_database, "SELECT COUNT(*) FROM tasks WHERE user_id = 1") == [(0,)]
+    assert fetch_rows(temp_database, "SELECT title, status, completed_date FROM archived_tasks") == \
+        [("Task 1", "Completed", "2030-01-02")]
+
+
+def test_bulk_operation_rolls_back_on_error(temp_database):
+    """Tests that a failing statement leaves the whole batch unapplied."""
+    repository = TaskRepository(temp_database)
+    first, second = repository.get_tasks_by_user(1)
+    second.title = None  # Violates NOT NULL in archived_tasks
+
+    with pytest.raises(sqlite3.Error):
+        repository.bulk_archive([first, second], 1, "2030-01-02")
+
+    assert fetch_rows(temp_database, "SELECT COUNT(*) FROM tasks WHERE user_id = 1") == [(2,)]
+    assert fetch_rows(temp_database, "SELECT COUNT(*) FROM archived_tasks") == [(0,)]
@@ -0,0 +1,90 @@
+import os
+import sys
+import json
+import sqlite3
+import pytest
+
+# Import paths for other modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src/ImportExportManager')))
+
+from import_export_manager import ImportExportManager
+
+HEADER = "title,description,due_date,importance,urgency,fitness,status,completed_date\n"
+
+
+@pytest.fixture
+def manager(tmp_path):
+    """Fixture for an ImportExportManager on a fresh database with a small chunk size."""
+    return ImportExportManager(str(tmp_path / "tasks.db"), chunk_size=2)
+
+
+def fetch_rows(db_path, query):
+    conn = sqlite3.connect(db_path)
+    rows = conn.execute(query).fetchall()
+    conn.close()
+    return rows
+
+
+def test_csv_import_skips_invalid_rows(manager, tmp_path):
+    """Tests that valid rows are imported in chunks and invalid rows are reported by line."""
+    path = tmp_path / "tasks.csv"
+    path.write_text(HEADER +
+                    "Task 1,,2099-01-01,High,Low,High,,\n"
+                    "Task 2,desc,2099-01-02,low,low,low,in progress,\n"
+                    ",,2099-01-01,High,Low,High,,\n"
+                    "Task 4,,2099/01/01,High,Low,High,,\n"
+                    "Task 5,,2099-01-03,Medium,Low,High,,\n"
+                    "Task 6,,2099-01-04,Low,Low,Low,Open,\n")
+
+    report = manager.import_file(str(path), 1)
+
+    assert report["rows"] == 3
+    assert report["skipped"] == 3
+    assert report["errors"] == [(4, "Title is required."),
+                                (5, "Invalid due date format. Use YYYY-MM-DD."),
+                                (6, "All priority levels must be selected.")]
+    assert fetch_rows(manager.db_path, "SELECT title, importance, status, user_id FROM tasks") == [
+        ("Task 1", "High", "Open", 1), ("Task 2", "Low", "In Progress", 1), ("Task 6", "Low", "Open", 1)]
+
+
+def test_past_due_dates(manager, tmp_path):
+    """Tests that overdue tasks are only accepted for the archive or when explicitly allowed."""
+    path = tmp_path / "tasks.jsonl"
+    path.write_text(json.dumps({"title": "Old", "due_date": "2000-01-01", "importance": "Low",
+                                "urgency": "Low", "fitness": "Low", "status": "Completed",
+                                "completed_date": "2000-01-02"}) + "\n")
+
+    assert manager.import_file(str(path), 1)["errors"] == [(1, "The due date cannot be in the past.")]
+    assert manager.import_file(str(path), 1, allow_past_due_dates=True)["rows"] == 1
+    assert manager.import_file(str(path), 1, table="archived_tasks")["rows"] == 1
+
+
+def test_round_trip_both_formats(manager, tmp_path):
+    """Tests that exported files import back into identical rows."""
+    source = tmp_path / "source.jsonl"
+    source.write_text("\n".join(json.dumps({
+        "title": f"Task {i}", "description": "d", "due_date": "2099-05-01", "importance": "High",
+        "urgency": "Low", "fitness": "Low", "status": "Completed", "completed_date": "2020-01-01"
+    }) for i in range(5)) + "\nnot json\n")
+
+    report = manager.import_file(str(source), 1, table="archived_tasks")
+    assert (report["rows"], report["skipped"]) == (5, 1)
+    assert report["errors"][0][0] == 6
+
+    for fmt in ImportExportManager.FORMATS:
+        exported = tmp_path / f"export.{fmt}"
+        assert manager.export_file(str(exported), 1, table="archived_tasks")["rows"] == 5
+        target = ImportExportManager(str(tmp_path / f"{fmt}.db"))
+        target.import_file(str(exported), 2, table="archived_tasks")
+
+        columns = ", ".join(ImportExportManager.COLUMNS)
+        assert fetch_rows(target.db_path, f"SELECT {columns} FROM archived_tasks") == \
+            fetch_rows(manager.db_path, f"SELECT {columns} FROM archived_tasks")
+
+
+def test_rejects_unknown_table_and_format(manager, tmp_path):
+    """Tests that table names and formats are checked before any SQL is built."""
+    with pytest.raises(ValueError):
+        manager.export_file(str(tmp_path / "x.csv"), 1, table="users")
+    with pytest.raises(ValueError):
+        manager.export_file(str(tmp_path / "x.xml"), 1)
@@ -0,0 +1,83 @@
+import os
+import sys
+import sqlite3
+import pytest
+from unittest.mock import MagicMock
+
+# Import paths for other modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src/Database')))
+
+from database_maintenance import DatabaseMaintenance
+
+
+@pytest.fixture
+def maintenance(tmp_path):
+    """Fixture for a DatabaseMaintenance on a database that has just lost most of its rows."""
+    db_path = str(tmp_path / "tasks.db")
+    maintenance = DatabaseMaintenance(db_path)
+    conn = sqlite3.connect(db_path)
+    conn.executemany("INSERT INTO tasks (title, description, user_id) VALUES (?, ?, 1)",
+                     [(f"Task {i}", "x" * 500) for i in range(2000)])
+    conn.execute("DELETE FROM tasks WHERE id > 10")
+    conn.commit()
+    conn.close()
+    return maintenance
+
+
+def count_tasks(db_path):
+    conn = sqlite3.connect(db_path)
+    count = conn.execute("SELECT COUNT(*) FROM tasks").fetchone()[0]
+    conn.close()
+    return count
+
+
+def test_backup_copies_database_and_prunes_old_backups(maintenance):
+    """Tests that backups are complete copies and only the newest ones are kept."""
+    maintenance.KEEP_BACKUPS = 2
+    os.makedirs(maintenance.backup_dir)
+    paths = [maintenance.backup(os.path.join(maintenance.backup_dir, f"database-{i}.db")) for i in range(3)]
+
+    assert count_tasks(paths[-1]) == 10
+    assert maintenance.list_backups() == paths[1:]
+    assert not maintenance.is_due(60)
+
+
+def test_compact_switches_to_incremental_vacuum(maintenance):
+    """Tests that compaction frees pages and leaves the database in incremental auto_vacuum mode."""
+    size_before = os.path.getsize(maintenance.db_path)
+
+    assert maintenance.compact() > 0
+    assert os.path.getsize(maintenance.db_path) < size_before
+    conn = sqlite3.connect(maintenance.db_path)
+    assert conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2
+    conn.execute("DELETE FROM tasks")
+    conn.commit()
+    conn.close()
+
+    assert maintenance.compact() > 0
+    assert count_tasks(maintenance.db_path) == 0
+
+
+def test_run_in_background_reports_all_steps(maintenance):
+    """Tests a complete background run."""
+    maintenance.run_in_background().join()
+
+    report = maintenance.last_report
+    assert report["errors"] == {}
+    assert os.path.exists(report["backup"])
+    assert report["freed_pages"] > 0
+
+
+def test_schedule_only_runs_when_due(maintenance):
+    """Tests that the Tk callback starts a run only when the newest backup is too old."""
+    root = MagicMock()
+    maintenance.run_in_background = MagicMock()
+    maintenance.schedule(root, interval_ms=1000)
+    check = root.after.call_args.args[1]
+
+    check()
+    maintenance.backup()
+    check()
+
+    maintenance.run_in_background.assert_called_once_with()
+    assert root.after.call_count == 3
@@ -0,0 +1,132 @@
+import os
+import sys
+import time
+import pytest
+
+# Import paths for other modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src/GUIController')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src/Task')))
+
+from task import Priority
+from venn_geometry import VennGeometry, RegionRaster, REGION_FLAGS
+from venn_layout import VennLayout, SpatialGrid
+from view_transform import ViewTransform
+
+
+@pytest.fixture
+def geometry():
+    """Fixture for the geometry the diagram is drawn with."""
+    return VennGeometry()
+
+
+def test_drop_classification_matches_drawn_circles(geometry):
+    """Tests that hit-testing uses the drawn circles (radius 275, centers 150 px from the middle)."""
+    assert geometry.circle_bbox(geometry.importance_center) == (362 - 275, 512 - 275, 362 + 275, 512 + 275)
+    assert geometry.region_at(*geometry.do_now_position) == "HHH"
+    assert geometry.priorities_at(100, 512) == (Priority.HIGH, Priority.LOW, Priority.LOW)
+    assert geometry.priorities_at(512, 900) == (Priority.LOW, Priority.HIGH, Priority.LOW)
+    assert geometry.priorities_at(10, 10) == (Priority.LOW, Priority.LOW, Priority.LOW)
+
+
+def test_spatial_grid_queries():
+    """Tests overlap queries and removal."""
+    grid = SpatialGrid(cell_size=10)
+    grid.insert("a", (0, 0, 20, 10))
+    grid.insert("b", (50, 50, 60, 60))
+
+    assert grid.query((15, 5, 55, 55)) == {"a", "b"}
+    assert not grid.intersects((20, 0, 30, 10))  # Touching edges do not overlap
+    grid.remove("a")
+    assert grid.query((0, 0, 20, 10)) == set()
+
+
+def test_layout_is_collision_free_and_inside_regions(geometry):
+    """Tests that every label lies completely inside its region and no two labels overlap."""
+    layout = VennLayout(geometry)
+    items = {region: [((region, i), f"Task {region} {i}") for i in range(40)]
+             for region in REGION_FLAGS if region != "LOW"}
+
+    placements, overflow, badges = layout.layout(items)
+
+    grid = SpatialGrid()
+    for (region, i), (x, y) in placements.items():
+        bbox = layout.label_bbox(x, y, layout.measure(f"Task {region} {i}"))
+        assert layout.fits(region, bbox)
+        assert not grid.intersects(bbox)
+        grid.insert((region, i), bbox)
+    for region, keys in overflow.items():
+        assert len(keys) + sum(1 for key in placements if key[0] == region) == 40
+        assert badges[region] is not None
+
+
+def test_layout_reports_overflow_in_linear_time(geometry):
+    """Tests that a region with far more tasks than room stays fast and reports the remainder."""
+    layout = VennLayout(geometry)
+    items = {"HHH": [(i, f"Do now task number {i}") for i in range(5000)]}
+
+    start = time.perf_counter()
+    placements, overflow, badges = layout.layout(items)
+
+    assert time.perf_counter() - start < 2
+    assert len(placements) + len(overflow["HHH"]) == 5000
+    assert len(placements) > 10
+    assert badges["HHH"] is not None
+
+
+def test_layout_limits_collapse_crowded_regions(geometry):
+    """Tests that a limited region places only its first items and labels the badge with the hidden count."""
+    layout = VennLayout(geometry)
+    items = {"I": [(i, f"Task {i}") for i in range(500)], "F": [(1000, "Alone")]}
+
+    placements, overflow, badges = layout.layout(items, limits={"I": 5},
+                                                 badge_text=lambda region, count: f"{count} hidden")
+
+    assert sorted(placements) == [0, 1, 2, 3, 4, 1000]
+    assert overflow == {"I": list(range(5, 500))}
+    assert set(badges) == {"I"}
+
+
+def test_view_transform_round_trip_and_zoom_anchor():
+    """Tests that zooming keeps the point under the mouse fixed and screen/world mapping is consistent."""
+    transform = ViewTransform()
+    world_point = transform.to_world(300, 200)
+
+    assert transform.zoom(2, 300, 200)
+    assert transform.to_screen(*world_point) == pytest.approx((300, 200))
+    transform.pan(50, -20)
+    assert transform.to_world(*transform.to_screen(123, 456)) == pytest.approx((123, 456))
+    assert transform.visible_bbox(1024, 1024) == pytest.approx(
+        transform.to_world(0, 0) + transform.to_world(1024, 1024))
+
+    assert not transform.zoom(100, 0, 0) or transform.scale == ViewTransform.MAX_SCALE
+    assert not transform.zoom(2, 0, 0)
+
+
+def test_zoomed_layout_fits_more_labels(geometry):
+    """Tests that labels laid out for a zoomed view use less diagram space, so more of them fit."""
+    items = {"I": [(i, f"Task {i}") for i in range(300)]}
+    unzoomed, _, _ = VennLayout(geometry).layout(items)
+    zoomed, _, _ = VennLayout(geometry, line_height=15 / 2, measure=lambda text: 7 * len(text) / 2,
+                              padding=1.5).layout(items)
+
+    assert len(zoomed) > 2 * len(unzoomed)
+
+
+def test_region_raster_matches_analytic_classification(geometry):
+    """Tests that the precomputed raster classifies points exactly like the circle geometry."""
+    raster = RegionRaster(geometry)
+    points = [(x + 0.37, y + 0.61) for x in range(-50, 1100, 7) for y in range(-50, 1100, 7)]
+
+    assert all(raster.region_at(x, y) == geometry.region_at(x, y) for x, y in points)
+    assert raster.priorities_at(*geometry.do_now_position) == (Priority.HIGH,) * 3
+
+
+def test_spatial_grid_point_lookup():
+    """Tests resolving a pointer position to the label under it."""
+    grid = SpatialGrid(cell_size=64)
+    for i in range(1000):
+        grid.insert(("task", i), (i % 40 * 25, i // 40 * 15, i % 40 * 25 + 20, i // 40 * 15 + 12))
+
+    assert grid.at(10, 5) == {("task", 0)}
+    assert grid.at(22, 5) == set()
+    assert grid.at(25 * 3 + 1, 15 * 2 + 1) == {("task", 83)}
@@ -0,0 +1,62 @@
+import os
+import sys
+import pytest
+from unittest.mock import MagicMock
+
+# Import paths for other modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src/GUIController')))
+
+from drag_drop import DragDropHandler
+
+
+class Event:
+    def __init__(self, x, y):
+        self.x = x
+        self.y = y
+
+
+@pytest.fixture
+def handler():
+    """Fixture for a DragDropHandler on a mocked canvas with one task label at (100, 100)."""
+    canvas = MagicMock()
+    canvas.coords.return_value = [100.0, 100.0]
+    canvas.itemcget.side_effect = lambda item, option: {"fill": "black", "text": "Task"}[option]
+    canvas.create_text.return_value = 99
+    canvas.after.return_value = "after#1"
+    handler = DragDropHandler(canvas, {1: 10}, MagicMock())
+    handler.start_drag(Event(100, 100), 1)
+    return handler
+
+
+def test_small_movement_stays_a_click(handler):
+    """Tests that moving less than the drag threshold neither starts a drag nor touches the canvas."""
+    handler.drag_task(Event(110, 105), 1)
+
+    assert not handler.is_dragging
+    handler.canvas.create_text.assert_not_called()
+    handler.canvas.after.assert_not_called()
+
+
+def test_motion_is_coalesced_into_one_frame(handler):
+    """Tests that many motion events move the proxy once, to the latest position."""
+    for x in range(160, 200, 2):
+        handler.drag_task(Event(x, 100), 1)
+
+    assert handler.is_dragging
+    handler.canvas.create_text.assert_called_once()
+    handler.canvas.after.assert_called_once_with(handler.frame_interval, handler.apply_motion)
+    handler.canvas.move.assert_not_called()
+
+    handler.apply_motion()
+    handler.canvas.coords.assert_called_with(99, 198.0, 100.0)
+
+
+def test_cancel_restores_the_label(handler):
+    """Tests that ending a drag removes the proxy and the pending frame."""
+    handler.drag_task(Event(200, 200), 1)
+    handler.cancel_drag()
+
+    handler.canvas.after_cancel.assert_called_once_with("after#1")
+    handler.canvas.delete.assert_called_once_with(99)
+    handler.canvas.itemconfig.assert_called_with(10, fill="black")
+    assert handler.dragging_task_id is None and not handler.is_dragging
@@ -0,0 +1,148 @@
+import os
+import sys
+import sqlite3
+import pytest
+from unittest.mock import MagicMock
+
+# Import paths for other modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src/Task')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src/Task/TaskRepository')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src/Database')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src/GUIController')))
+
+from task import Task, Priority
+from task_repository import TaskRepository
+from write_behind_buffer import WriteBehindBuffer
+from database_setup import initialize_database
+from drag_drop import DragDropHandler
+from dependency_graph import DependencyGraph
+from venn_geometry import VennGeometry
+from venn_layout import VennLayout
+
+HIGH, LOW = Priority.HIGH, Priority.LOW
+
+
+class FakeAfter:
+    """Records scheduled callbacks instead of running a Tk event loop."""
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, ms, callback):
+        self.calls.append((ms, callback))
+        return f"after#{len(self.calls)}"
+
+
+@pytest.fixture
+def temp_database(tmp_path):
+    """Fixture for a bootstrapped database containing two LOW priority tasks of user 1."""
+    db_path = str(tmp_path / "tasks.db")
+    initialize_database(db_path)
+    conn = sqlite3.connect(db_path)
+    conn.executemany('''
+        INSERT INTO tasks (title, description, due_date, importance, urgency, fitness, status, user_id)
+        VALUES (?, '', '2030-01-01', 'Low', 'Low', 'Low', 'Open', 1)
+    ''', [("Task 1",), ("Task 2",)])
+    conn.commit()
+    conn.close()
+    return db_path
+
+
+def read_priorities(db_path):
+    conn = sqlite3.connect(db_path)
+    rows = conn.execute('SELECT id, importance, urgency, fitness FROM tasks ORDER BY id').fetchall()
+    conn.close()
+    return {row[0]: row[1:] for row in rows}
+
+
+def test_changes_are_coalesced_into_one_write(temp_database):
+    """Tests that several drops are written by a single scheduled flush."""
+    repository = TaskRepository(temp_database)
+    repository.update_priorities_batch = MagicMock(wraps=repository.update_priorities_batch)
+    after = FakeAfter()
+    buffer = WriteBehindBuffer(repository, after, delay_ms=200)
+
+    buffer.queue_priorities(1, 1, (LOW, LOW, LOW), (HIGH, LOW, LOW))
+    buffer.queue_priorities(1, 1, (HIGH, LOW, LOW), (HIGH, HIGH, LOW))
+    buffer.queue_priorities(1, 2, (LOW, LOW, LOW), (LOW, LOW, HIGH))
+
+    assert len(after.calls) == 1 and after.calls[0][0] == 200
+    assert buffer.pending[1] == (1, (LOW, LOW, LOW), (HIGH, HIGH, LOW))
+
+    assert after.calls[0][1]() == 2
+    repository.update_priorities_batch.assert_called_once()
+    assert read_priorities(temp_database) == {1: ("High", "High", "Low"), 2: ("Low", "Low", "High")}
+    assert buffer.pending == {} and buffer.after_id is None
+
+
+def test_change_back_is_not_written(temp_database):
+    """Tests that a task dropped back into its original region causes no write."""
+    repository = MagicMock()
+    buffer = WriteBehindBuffer(repository, FakeAfter())
+
+    buffer.queue_priorities(1, 1, (LOW, LOW, LOW), (HIGH, LOW, LOW))
+    buffer.queue_priorities(1, 1, (HIGH, LOW, LOW), (LOW, LOW, LOW))
+
+    assert buffer.flush() == 0
+    repository.update_priorities_batch.assert_not_called()
+
+
+def test_failed_write_reports_changes_for_rollback():
+    """Tests that a failing batch hands the previous priorities to the error callback."""
+    repository = MagicMock()
+    repository.update_priorities_batch.side_effect = sqlite3.OperationalError("database is locked")
+    on_error = MagicMock()
+    buffer = WriteBehindBuffer(repository, FakeAfter(), on_error=on_error)
+
+    buffer.queue_priorities(1, 1, (LOW, LOW, LOW), (HIGH, LOW, LOW))
+    assert buffer.flush() == 0
+
+    changes, error = on_error.call_args[0]
+    assert changes == {1: (1, (LOW, LOW, LOW), (HIGH, LOW, LOW))}
+    assert isinstance(error, sqlite3.OperationalError)
+
+
+def test_failed_write_without_handler_raises():
+    """Tests that errors are not swallowed when nobody rolls back."""
+    repository = MagicMock()
+    repository.update_priorities_batch.side_effect = sqlite3.OperationalError("disk I/O error")
+    buffer = WriteBehindBuffer(repository, FakeAfter())
+
+    buffer.queue_priorities(1, 1, (LOW, LOW, LOW), (HIGH, LOW, LOW))
+    with pytest.raises(sqlite3.OperationalError):
+        buffer.flush()
+
+
+def test_drop_updates_task_and_queues_write():
+    """Tests that a drop updates the task at once and leaves the database write to the buffer."""
+    task = Task("Task", "2030-01-01", LOW, LOW, LOW, task_id=1)
+    controller = MagicMock()
+    controller.tasks = [task]
+    controller.dependency_graph = DependencyGraph()
+    controller.session.user_id = 7
+    controller.view_transform.to_world.side_effect = lambda x, y: (x, y)
+    controller.region_raster.priorities_at.return_value = (HIGH, HIGH, HIGH)
+    handler = DragDropHandler(MagicMock(), {1: 10}, controller)
+
+    event = MagicMock(x=512, y=612)
+    handler.start_drag(event, 1)
+    handler.drop_task(event, 1)
+
+    assert (task.importance, task.urgency, task.fitness) == (HIGH, HIGH, HIGH)
+    controller.session.put_task.assert_called_once_with(task)
+    controller.write_buffer.queue_priorities.assert_called_once_with(7, 1, (LOW, LOW, LOW), (HIGH, HIGH, HIGH))
+    controller.update_task_venn_diagram.assert_not_called()
+
+
+def test_place_keeps_existing_labels():
+    """Tests that a label added to a finished layout does not overlap the labels already placed."""
+    layout = VennLayout(VennGeometry(), measure=lambda text: 7 * len(text))
+    placements, overflow, badges = layout.layout({"HHH": [(i, f"Task {i}") for i in range(5)]})
+
+    position = layout.place("HHH", 99, "Task 99")
+
+    assert position is not None
+    new_bbox = layout.label_bbox(*position, 7 * len("Task 99"))
+    for key, (x, y) in placements.items():
+        x1, y1, x2, y2 = layout.label_bbox(x, y, 7 * len(f"Task {key}"))
+        assert new_bbox[2] <= x1 or x2 <= new_bbox[0] or new_bbox[3] <= y1 or y2 <= new_bbox[1]
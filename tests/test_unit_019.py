@@ -0,0 +1,157 @@
+import os
+import sys
+import json
+import sqlite3
+import pytest
+
+# Import paths for other modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src/Task')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src/Task/TaskRepository')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src/Database')))
+
+from task import Status
+from task_repository import TaskRepository
+from write_journal import WriteJournal
+from database_setup import initialize_database
+
+UPDATE_STATUS = 'UPDATE tasks SET status = ? WHERE id = ?'
+INSERT_ARCHIVED = 'INSERT INTO archived_tasks (title, user_id) VALUES (?, ?)'
+
+
+@pytest.fixture
+def temp_database(tmp_path):
+    """Fixture for a bootstrapped database containing three open tasks of user 1."""
+    db_path = str(tmp_path / "tasks.db")
+    initialize_database(db_path)
+    conn = sqlite3.connect(db_path)
+    conn.executemany('''
+        INSERT INTO tasks (title, description, due_date, importance, urgency, fitness, status, user_id)
+        VALUES (?, '', '2030-01-01', 'Low', 'Low', 'Low', 'Open', 1)
+    ''', [("Task 1",), ("Task 2",), ("Task 3",)])
+    conn.commit()
+    conn.close()
+    return db_path
+
+
+@pytest.fixture
+def journal(temp_database):
+    """Fixture for a running journal that groups entries for a short time."""
+    journal = WriteJournal(temp_database, interval=0.05)
+    journal.start()
+    yield journal
+    journal.close(timeout=5)
+
+
+def query(db_path, sql):
+    conn = sqlite3.connect(db_path)
+    rows = conn.execute(sql).fetchall()
+    conn.close()
+    return rows
+
+
+def test_submitted_entries_are_written_in_the_background(journal, temp_database):
+    """Tests that entries are logged at once and applied by the writer thread."""
+    for task_id in (1, 2, 3):
+        journal.submit([(UPDATE_STATUS, [("Completed", task_id)])])
+
+    with open(journal.log_path) as log:
+        assert [json.loads(line)["seq"] for line in log] == [1, 2, 3]
+
+    assert journal.flush(timeout=5)
+    assert not journal.has_pending()
+    assert query(temp_database, 'SELECT status FROM tasks') == [("Completed",)] * 3
+    assert query(temp_database, f"SELECT last_seq FROM write_journal WHERE journal_id = '{journal.journal_id}'") \
+        == [(3,)]
+    assert os.path.getsize(journal.log_path) == 0
+
+
+def test_repository_writes_go_through_the_journal(journal, temp_database):
+    """Tests that a repository with a running journal queues its writes instead of committing them."""
+    repository = TaskRepository(temp_database, journal=journal)
+    repository.bulk_update_status([1, 2], 1, Status.IN_PROGRESS)
+
+    assert journal.flush(timeout=5)
+    assert query(temp_database, 'SELECT id FROM tasks WHERE status = "In Progress"') == [(1,), (2,)]
+
+
+def test_recover_replays_unapplied_entries_once(temp_database, tmp_path):
+    """Tests that the entries left in the log by a crash are applied exactly once on the next start."""
+    log_path = WriteJournal.log_path_for(temp_database, "a1")
+    with open(log_path, "w") as log:
+        log.write(json.dumps({"seq": 1, "statements": [[INSERT_ARCHIVED, [["Archived", 1]]]]}) + "\n")
+        log.write(json.dumps({"seq": 2, "statements": [[UPDATE_STATUS, [["Completed", 2]]]]}) + "\n")
+        log.write('{"seq": 3, "statem')  # Cut off by the crash
+
+    conn = sqlite3.connect(temp_database)
+    conn.execute(INSERT_ARCHIVED, ("Archived", 1))
+    conn.execute("INSERT INTO write_journal VALUES ('a1', 1)")  # Entry 1 was applied before the crash
+    conn.commit()
+    conn.close()
+
+    journal = WriteJournal(temp_database, "a1")
+    assert journal.recover() == 1
+    assert query(temp_database, 'SELECT COUNT(*) FROM archived_tasks') == [(1,)]
+    assert query(temp_database, 'SELECT status FROM tasks WHERE id = 2') == [("Completed",)]
+
+    assert WriteJournal(temp_database, "a1").recover() == 0
+
+
+def test_only_abandoned_logs_are_recovered(journal, temp_database):
+    """Tests that the log of a running journal is left to it and that stopped journals are cleaned up."""
+    abandoned = WriteJournal.log_path_for(temp_database, "b2")
+    with open(abandoned, "w") as log:
+        log.write(json.dumps({"seq": 1, "statements": [[UPDATE_STATUS, [["Completed", 3]]]]}) + "\n")
+    with open(journal.log_path, "a") as log:  # An entry the running journal has not applied yet
+        log.write(json.dumps({"seq": 1, "statements": [[UPDATE_STATUS, [["Completed", 1]]]]}) + "\n")
+
+    assert WriteJournal.recover_abandoned(temp_database) == 1
+    assert query(temp_database, 'SELECT id FROM tasks WHERE status = "Completed"') == [(3,)]
+    assert not os.path.exists(abandoned)
+    assert os.path.getsize(journal.log_path) > 0
+    assert WriteJournal(temp_database, journal.journal_id).recover() == 0
+
+    journal.close(timeout=5)
+    assert not os.path.exists(journal.log_path)
+    assert query(temp_database, "SELECT journal_id FROM write_journal") == [("",)]
+
+
+def test_rejected_entry_is_reported_and_skipped(journal, temp_database):
+    """Tests that an entry the database rejects does not block the entries around it."""
+    journal.submit([(UPDATE_STATUS, [("Completed", 1)])])
+    journal.submit([('INSERT INTO tasks (id, title) VALUES (?, ?)', [(1, "Duplicate")])])
+    journal.submit([(UPDATE_STATUS, [("Completed", 3)])])
+
+    assert journal.flush(timeout=5)
+    statements, error = journal.errors.get_nowait()
+    assert isinstance(error, sqlite3.IntegrityError)
+    assert query(temp_database, 'SELECT id FROM tasks WHERE status = "Completed"') == [(1,), (3,)]
+    assert query(temp_database, f"SELECT last_seq FROM write_journal WHERE journal_id = '{journal.journal_id}'") \
+        == [(3,)]
+
+
+def test_permanent_operational_error_is_reported_and_skipped(journal, temp_database):
+    """Tests that a statement that can never succeed does not stall the entries queued after it."""
+    journal.submit([('UPDATE no_such_table SET status = ?', [("Completed",)])])
+    journal.submit([(UPDATE_STATUS, [("Completed", 2)])])
+
+    assert journal.flush(timeout=5)
+    statements, error = journal.errors.get_nowait()
+    assert isinstance(error, sqlite3.OperationalError) and statements is not None
+    assert journal.errors.empty()
+    assert query(temp_database, 'SELECT id FROM tasks WHERE status = "Completed"') == [(2,)]
+
+
+def test_applied_entries_are_skipped_on_retry(temp_database):
+    """Tests that retrying a batch whose first entries were committed before an error applies them only once."""
+    journal = WriteJournal(temp_database, "c3")
+    batch = [(1, [[INSERT_ARCHIVED, [["First", 1]]]]), (2, [[INSERT_ARCHIVED, [["Second", 1]]]])]
+    journal._apply(batch[:1])  # Entry 1 was committed on its own, then the database was busy
+    journal._apply(batch)
+    assert query(temp_database, 'SELECT title FROM archived_tasks') == [("First",), ("Second",)]
+    assert query(temp_database, "SELECT last_seq FROM write_journal WHERE journal_id = 'c3'") == [(2,)]
+
+
+def test_submit_requires_running_journal(temp_database):
+    """Tests that a stopped journal refuses entries instead of losing them."""
+    with pytest.raises(RuntimeError):
+        WriteJournal(temp_database).submit([(UPDATE_STATUS, [("Completed", 1)])])
@@ -0,0 +1,131 @@
+import os
+import sys
+import sqlite3
+import pytest
+from datetime import date
+
+# Import paths for other modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src/Database')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src/StatisticsManager')))
+
+import database_setup
+from database_setup import initialize_database
+from statistics_manager import StatisticsManager
+
+TODAY = date(2030, 1, 9)  # Wednesday of the week starting on Monday 2030-01-07
+
+INSERT_TASK = '''
+    INSERT INTO tasks (title, due_date, importance, urgency, fitness, status, user_id)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+'''
+
+
+@pytest.fixture
+def temp_database(tmp_path):
+    """Fixture for a bootstrapped database with tasks of two users."""
+    db_path = str(tmp_path / "tasks.db")
+    initialize_database(db_path)
+    conn = sqlite3.connect(db_path)
+    conn.executemany(INSERT_TASK, [
+        ("Do now", "2030-01-10", "High", "High", "High", "Open", 1),
+        ("Also now", "2030-01-07", "High", "High", "High", "In Progress", 1),
+        ("Next week", "2030-01-15", "High", "Low", "Low", "Open", 1),
+        ("Someday", None, "Low", "Low", "Low", "Open", 1),
+        ("Other user", "2030-01-10", "High", "High", "High", "Open", 2),
+    ])
+    conn.commit()
+    conn.close()
+    return db_path
+
+
+def execute(db_path, sql, params=()):
+    conn = sqlite3.connect(db_path)
+    conn.execute(sql, params)
+    conn.commit()
+    conn.close()
+
+
+def test_dashboard_counts(temp_database):
+    """Tests the counts per region, status and week of a user."""
+    dashboard = StatisticsManager(temp_database).get_dashboard(1, today=TODAY)
+
+    assert dashboard["tasks"]["region"] == {"HHH": 2, "I": 1, "LOW": 1}
+    assert dashboard["tasks"]["status"] == {"Open": 3, "In Progress": 1}
+    assert dashboard["tasks"]["total"] == 4
+    assert dashboard["due_this_week"] == {"total": 2, "HHH": 2}
+    assert dashboard["due_next_week"] == 1
+    assert dashboard["no_due_date"] == 1
+    assert dashboard["archived"]["total"] == 0
+
+
+def test_triggers_follow_updates_and_archiving(temp_database):
+    """Tests that reprioritizing, completing and archiving move the counts between buckets."""
+    manager = StatisticsManager(temp_database)
+    execute(temp_database, "UPDATE tasks SET importance = 'Low', urgency = 'Low' WHERE title = 'Do now'")
+    execute(temp_database, "UPDATE tasks SET status = 'Completed' WHERE title = 'Also now'")
+    execute(temp_database, '''
+        INSERT INTO archived_tasks (title, due_date, importance, urgency, fitness, status, completed_date, user_id)
+        SELECT title, due_date, importance, urgency, fitness, status, '2030-01-09', user_id FROM tasks
+        WHERE title = 'Also now'
+    ''')
+    execute(temp_database, "DELETE FROM tasks WHERE title = 'Also now'")
+
+    dashboard = manager.get_dashboard(1, today=TODAY)
+    assert dashboard["tasks"]["region"] == {"F": 1, "I": 1, "LOW": 1}
+    assert dashboard["tasks"]["status"] == {"Open": 3}
+    assert dashboard["due_this_week"] == {"total": 1, "F": 1}
+    assert dashboard["archived"]["region"] == {"HHH": 1}
+    assert dashboard["archived"]["status"] == {"Completed": 1}
+    assert manager.get_counts(2) == {"HHH": 1}
+
+
+def test_migration_counts_existing_rows(tmp_path):
+    """Tests that upgrading a database counts the tasks it already contains."""
+    db_path = str(tmp_path / "old.db")
+    conn = sqlite3.connect(db_path)
+    conn.execute('''
+        CREATE TABLE tasks (id INTEGER PRIMARY KEY AUTOINCREMENT, title TEXT NOT NULL, description TEXT,
+                            due_date TEXT, importance TEXT, urgency TEXT, fitness TEXT, status TEXT, user_id INTEGER)
+    ''')
+    conn.executemany(INSERT_TASK, [("Old", "2030-01-10", "HIGH", "HIGH", "LOW", "Open", 1)] * 3)
+    conn.commit()
+    conn.close()
+
+    initialize_database(db_path)
+
+    manager = StatisticsManager(db_path)
+    assert manager.get_counts(1) == {"HH": 3}
+    assert manager.get_counts(1, dimension="region_due_week") == {"HH 2030-01-07": 3}
+
+
+def test_week_spanning_the_new_year_is_one_bucket(temp_database):
+    """Tests that the days of a week in two years are counted in the bucket of its Monday."""
+    execute(temp_database, "DELETE FROM tasks")
+    for due_date in ("2025-12-29", "2026-01-01", "2026-01-04", "2026-01-05"):
+        execute(temp_database, INSERT_TASK, ("Task", due_date, "Low", "Low", "Low", "Open", 1))
+
+    manager = StatisticsManager(temp_database)
+    assert manager.week_bucket(date(2026, 1, 1)) == "2025-12-29"
+    assert manager.get_counts(1, dimension="due_week") == {"2025-12-29": 3, "2026-01-05": 1}
+    dashboard = manager.get_dashboard(1, today=date(2025, 12, 31))
+    assert dashboard["due_this_week"] == {"total": 3, "LOW": 3}
+    assert dashboard["due_next_week"] == 1
+
+
+def test_migration_converts_week_buckets(temp_database):
+    """Tests that the buckets of the "%Y-W%W" format are merged into the buckets of their Mondays."""
+    conn = sqlite3.connect(temp_database)
+    conn.executemany("INSERT INTO task_stats VALUES (1, 'archived', ?, ?, ?)", [
+        ("due_week", "2025-W52", 1), ("due_week", "2026-W00", 2), ("due_week", "2024-W01", 4),
+        ("region_due_week", "HH 2025-W52", 1), ("region_due_week", "HH 2026-W00", 2),
+    ])
+    conn.execute('PRAGMA user_version = 9')
+    conn.commit()
+    conn.close()
+    database_setup._initialized_paths.clear()
+
+    initialize_database(temp_database)
+    manager = StatisticsManager(temp_database)
+    assert manager.get_counts(1, "archived", "due_week") == {"2025-12-29": 3, "2024-01-01": 4}
+    assert manager.get_counts(1, "archived", "region_due_week") == {"HH 2025-12-29": 3}
+    assert manager.get_counts(1, dimension="due_week") == {"2030-01-07": 2, "2030-01-14": 1, "none": 1}
@@ -0,0 +1,78 @@
+import os
+import sys
+import sqlite3
+import pytest
+from datetime import date
+
+# Import paths for other modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src/Database')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src/StatisticsManager')))
+
+from database_setup import initialize_database
+from completion_analytics import CompletionAnalytics
+
+START, END = date(2030, 1, 1), date(2030, 1, 31)
+
+
+@pytest.fixture
+def analytics(tmp_path):
+    """Fixture for CompletionAnalytics on a database with archived and open tasks of two users."""
+    db_path = str(tmp_path / "tasks.db")
+    initialize_database(db_path)
+    conn = sqlite3.connect(db_path)
+    conn.executemany('''
+        INSERT INTO archived_tasks (title, due_date, importance, urgency, fitness, status, completed_date, user_id)
+        VALUES (?, ?, ?, ?, ?, 'Completed', ?, ?)
+    ''', [
+        ("Early", "2030-01-10", "High", "High", "High", "2030-01-05", 1),
+        ("Late", "2030-01-10", "High", "High", "High", "2030-01-12", 1),
+        ("No due date", None, "Low", "Low", "Low", "2030-01-20", 1),
+        ("Before range", "2029-12-20", "Low", "Low", "Low", "2029-12-24", 1),
+        ("Other user", "2030-01-10", "High", "High", "High", "2030-01-10", 2),
+    ])
+    conn.executemany('''
+        INSERT INTO tasks (title, due_date, importance, urgency, fitness, status, user_id)
+        VALUES (?, ?, ?, ?, ?, ?, 1)
+    ''', [
+        ("Open", "2030-01-15", "High", "High", "High", "Open"),
+        ("Done, not archived", "2030-01-16", "Low", "Low", "High", "Completed"),
+        ("Due later", "2030-03-01", "High", "High", "High", "Open"),
+    ])
+    conn.commit()
+    conn.close()
+    return CompletionAnalytics(db_path)
+
+
+def test_throughput_per_period(analytics):
+    """Tests that completions are counted per week and month inside the range."""
+    assert analytics.throughput(1, START, END, "week") == [("2029-12-31", 1), ("2030-01-07", 1), ("2030-01-14", 1)]
+    assert analytics.throughput(1, START, END, "month") == [("2030-01", 3)]
+
+
+def test_lead_times_per_region(analytics):
+    """Tests the days between completion and due date per region and in total."""
+    lead_times = analytics.lead_times(1, START, END)
+
+    assert lead_times["HHH"] == {"completed": 2, "with_due_date": 2, "on_time": 1, "average_days": 1.5,
+                                 "min_days": -2.0, "max_days": 5.0}
+    assert lead_times["LOW"]["with_due_date"] == 0 and lead_times["LOW"]["average_days"] is None
+    assert lead_times["total"]["completed"] == 3
+
+
+def test_completion_rates_include_open_tasks(analytics):
+    """Tests that open tasks due in the range lower the completion rate of their region."""
+    rates = analytics.completion_rates(1, START, END)
+
+    assert rates["HHH"] == (2, 3, 2 / 3)
+    assert rates["F"] == (1, 1, 1.0)
+    assert rates["total"] == (3, 4, 0.75)
+
+
+def test_empty_range(analytics):
+    """Tests that a range without data yields empty totals instead of errors."""
+    empty = date(2040, 1, 1)
+    assert analytics.throughput(1, empty, empty) == []
+    assert analytics.lead_times(1, empty, empty) == {"total": {"completed": 0, "with_due_date": 0, "on_time": 0,
+                                                               "average_days": None, "min_days": None,
+                                                               "max_days": None}}
+    assert analytics.completion_rates(1, empty, empty) == {"total": (0, 0, None)}
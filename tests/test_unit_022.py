@@ -0,0 +1,113 @@
+import os
+import sys
+import sqlite3
+import pytest
+from datetime import date
+
+# Import paths for other modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src/Database')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src/ArchiveManager')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src/StatisticsManager')))
+
+from database_setup import initialize_database
+import archive_manager
+from archive_manager import ArchiveManager
+from statistics_manager import StatisticsManager
+from completion_analytics import CompletionAnalytics
+
+TODAY = date(2030, 6, 1)
+
+
+@pytest.fixture
+def manager(tmp_path):
+    """Fixture for an ArchiveManager whose archive spans three completion years."""
+    db_path = str(tmp_path / "tasks.db")
+    initialize_database(db_path)
+    conn = sqlite3.connect(db_path)
+    conn.executemany('''
+        INSERT INTO archived_tasks (title, due_date, importance, urgency, fitness, status, completed_date, user_id)
+        VALUES (?, ?, 'High', 'High', 'High', 'Completed', ?, ?)
+    ''', [
+        ("2028 task", "2028-03-01", "2028-03-02", 1),
+        ("2029 task", "2029-05-01", "2029-05-01", 1),
+        ("2029 other user", "2029-05-01", "2029-05-01", 2),
+        ("2030 task", "2030-02-01", "2030-01-30", 1),
+        ("Never completed", None, None, 1),
+    ])
+    conn.commit()
+    conn.close()
+    return ArchiveManager(db_path, partition_dir=str(tmp_path / "archive"))
+
+
+def titles(rows):
+    return sorted(row[2] for row in rows)
+
+
+def test_partition_moves_old_years(manager):
+    """Tests that completed years before the hot years move into yearly files."""
+    assert manager.partition_archive(keep_years=1, today=TODAY) == {2028: 1, 2029: 2}
+    assert manager.get_partition_years() == [2029, 2028]
+
+    assert titles(manager.search_archive(1)) == ["2030 task", "Never completed"]
+    all_rows = manager.search_archive(1, include_partitions=True)
+    assert titles(all_rows) == ["2028 task", "2029 task", "2030 task", "Never completed"]
+    assert {row[0] for row in all_rows} == {None, 2029, 2028}
+
+    # Nothing left to move
+    assert manager.partition_archive(keep_years=1, today=TODAY) == {}
+
+
+def test_statistics_and_analytics_include_partitions(manager):
+    """Tests that moved tasks stay counted and are found by date range queries."""
+    manager.partition_archive(keep_years=1, today=TODAY)
+
+    assert StatisticsManager(manager.db_path).get_counts(1, source="archived") == {"HHH": 4}
+    analytics = CompletionAnalytics(manager.db_path)
+    analytics.archive_manager = manager
+    assert analytics.throughput(1, date(2028, 1, 1), date(2030, 12, 31), "month") == [
+        ("2028-03", 1), ("2029-05", 1), ("2030-01", 1)]
+
+
+def test_reactivate_from_partition(manager):
+    """Tests that a task is moved back from its yearly file into the tasks table."""
+    manager.partition_archive(keep_years=1, today=TODAY)
+    year, archived_id = next(row[:2] for row in manager.search_archive(1, include_partitions=True)
+                             if row[2] == "2029 task")
+
+    task_id = manager.reactivate_archived_task(archived_id, 1, year)
+
+    conn = sqlite3.connect(manager.db_path)
+    assert conn.execute('SELECT title, status FROM tasks WHERE id = ?', (task_id,)).fetchone() == \
+        ("2029 task", "Open")
+    conn.close()
+    assert "2029 task" not in titles(manager.search_archive(1, include_partitions=True))
+    assert StatisticsManager(manager.db_path).get_counts(1, source="archived") == {"HHH": 3}
+    assert manager.reactivate_archived_task(archived_id, 1, year) is None
+
+
+def test_detach_partition(manager, tmp_path):
+    """Tests that a detached year is no longer read or counted."""
+    manager.partition_archive(keep_years=1, today=TODAY)
+    manager.compact_partition(2028)
+    manager.detach_partition(2028, str(tmp_path / "offline-2028.db"))
+
+    assert manager.get_partition_years() == [2029]
+    assert os.path.exists(tmp_path / "offline-2028.db")
+    assert "2028 task" not in titles(manager.search_archive(1, include_partitions=True))
+    assert StatisticsManager(manager.db_path).get_counts(1, source="archived") == {"HHH": 3}
+
+
+def test_failed_detach_keeps_the_partition(manager, tmp_path, monkeypatch):
+    """Tests that the file is moved back and the counts stay if the statistics cannot be updated."""
+    manager.partition_archive(keep_years=1, today=TODAY)
+    counts = StatisticsManager(manager.db_path).get_counts(1, source="archived")
+
+    def fail(*args, **kwargs):
+        raise sqlite3.OperationalError("database is locked")
+    monkeypatch.setattr(archive_manager, "count_stats_rows", fail)
+    with pytest.raises(sqlite3.OperationalError):
+        manager.detach_partition(2028, str(tmp_path / "offline-2028.db"))
+
+    assert manager.get_partition_years() == [2029, 2028]
+    assert not os.path.exists(tmp_path / "offline-2028.db")
+    assert StatisticsManager(manager.db_path).get_counts(1, source="archived") == counts
@@ -0,0 +1,100 @@
+import os
+import sys
+import sqlite3
+import pytest
+from datetime import date
+
+# Import paths for other modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src/Database')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src/ArchiveManager')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src/StatisticsManager')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src/ImportExportManager')))
+
+from database_setup import initialize_database
+from archive_manager import ArchiveManager
+from statistics_manager import StatisticsManager
+from import_export_manager import ImportExportManager
+
+TODAY = date(2030, 6, 1)
+
+
+@pytest.fixture
+def manager(tmp_path):
+    """Fixture for an ArchiveManager with old and recent archived tasks."""
+    db_path = str(tmp_path / "tasks.db")
+    initialize_database(db_path)
+    conn = sqlite3.connect(db_path)
+    conn.executemany('''
+        INSERT INTO archived_tasks (title, description, due_date, importance, urgency, fitness, status,
+                                    completed_date, user_id)
+        VALUES (?, ?, ?, 'High', 'High', 'High', 'Completed', ?, 1)
+    ''', [
+        ("Old report", "Quarterly numbers", "2028-03-01", "2028-03-02"),
+        ("Old letter", None, "2029-05-01", "2029-05-01"),
+        ("Old invoice", "Pay it", "2029-06-01", "2029-05-31"),
+        ("Recent task", "Still hot", "2030-05-01", "2030-05-20"),
+    ])
+    conn.commit()
+    conn.close()
+    return ArchiveManager(db_path, partition_dir=str(tmp_path / "archive"))
+
+
+def query(db_path, sql):
+    conn = sqlite3.connect(db_path)
+    rows = conn.execute(sql).fetchall()
+    conn.close()
+    return rows
+
+
+def test_compress_moves_old_text_into_blocks(manager):
+    """Tests that the text of old tasks is packed into one block per completion year."""
+    assert manager.compress_archive(older_than_days=365, today=TODAY, block_size=2) == 3
+
+    assert query(manager.db_path, 'SELECT title, cold_block FROM archived_tasks ORDER BY id') == [
+        ("", 1), ("", 2), ("", 2), ("Recent task", None)]
+    assert query(manager.db_path, 'SELECT id FROM archived_text_blocks') == [(1,), (2,)]
+    assert manager.compress_archive(older_than_days=365, today=TODAY) == 0
+    assert StatisticsManager(manager.db_path).get_counts(1, source="archived") == {"HHH": 4}
+
+
+def test_search_decompresses_transparently(manager):
+    """Tests that archive searches return and match the text of compressed tasks."""
+    manager.compress_archive(older_than_days=365, today=TODAY)
+
+    rows = manager.search_archive(1)
+    assert [(row[2], row[3]) for row in rows] == [
+        ("Old report", "Quarterly numbers"), ("Old letter", None), ("Old invoice", "Pay it"),
+        ("Recent task", "Still hot")]
+    assert [row[2] for row in manager.search_archive(1, {"search": "INVOICE"})] == ["Old invoice"]
+    assert [row[2] for row in manager.search_archive(1, {"search": "task"})] == ["Recent task"]
+
+
+def test_reactivate_compressed_task(manager):
+    """Tests that a reactivated task gets its text back and its block is dropped with its last task."""
+    manager.compress_archive(older_than_days=365, today=TODAY)
+
+    task_id = manager.reactivate_archived_task(1, 1)
+
+    assert query(manager.db_path, f'SELECT title, description FROM tasks WHERE id = {task_id}') == [
+        ("Old report", "Quarterly numbers")]
+    assert query(manager.db_path, 'SELECT id FROM archived_text_blocks') == [(2,)]
+
+
+def test_partition_and_export_keep_compressed_text(manager, tmp_path):
+    """Tests that blocks move into the yearly archive files with their tasks, and exports include their text."""
+    manager.compress_archive(older_than_days=365, today=TODAY)
+    manager.partition_archive(keep_years=2, today=TODAY)
+
+    assert query(manager.db_path, 'SELECT id FROM archived_text_blocks') == [(2,)]
+    assert query(manager.partition_path(2028), 'SELECT id FROM archived_text_blocks') == [(1,)]
+    assert [row[2] for row in manager.search_archive(1, {"search": "report"}, include_partitions=True)] == \
+        ["Old report"]
+
+    path = str(tmp_path / "archive.csv")
+    ImportExportManager(manager.db_path).export_file(path, 1, table="archived_tasks")
+    with open(path, encoding="utf-8") as file:
+        content = file.read()
+    # The tasks moved into the yearly archive files are exported as well, the oldest year first
+    assert [line.split(",")[0] for line in content.splitlines()[1:]] == \
+        ["Old report", "Old letter", "Old invoice", "Recent task"]
+    assert "Old report,Quarterly numbers" in content and "Old invoice,Pay it" in content
@@ -0,0 +1,86 @@
+import os
+import sys
+import sqlite3
+import pytest
+from datetime import date
+
+# Import paths for other modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src/Database')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src/ArchiveManager')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src/StatisticsManager')))
+
+from database_setup import initialize_database
+from archive_manager import ArchiveManager
+from archive_snapshot import ArchiveSnapshot
+from completion_analytics import CompletionAnalytics
+
+INSERT_ARCHIVED = '''
+    INSERT INTO archived_tasks (title, due_date, importance, urgency, fitness, status, completed_date, user_id)
+    VALUES (?, '2030-01-10', 'High', 'High', 'High', 'Completed', '2030-01-05', 1)
+'''
+
+
+@pytest.fixture
+def temp_database(tmp_path):
+    """Fixture for a bootstrapped database with one archived task."""
+    db_path = str(tmp_path / "tasks.db")
+    initialize_database(db_path)
+    execute(db_path, INSERT_ARCHIVED, ("First",))
+    return db_path
+
+
+def execute(db_path, sql, params=()):
+    conn = sqlite3.connect(db_path)
+    conn.execute(sql, params)
+    conn.commit()
+    conn.close()
+
+
+def titles(manager):
+    return [row[2] for row in manager.search_archive(1)]
+
+
+def test_snapshot_is_read_only_and_memory_mapped(temp_database):
+    """Tests that snapshot connections map the copy into memory and cannot write to it."""
+    snapshot = ArchiveSnapshot(temp_database, mmap_size=1024 * 1024)
+    conn = snapshot.connect()
+    try:
+        assert conn.execute('PRAGMA mmap_size').fetchone() == (1024 * 1024,)
+        assert conn.execute('SELECT title FROM archived_tasks').fetchall() == [("First",)]
+        with pytest.raises(sqlite3.OperationalError):
+            conn.execute("DELETE FROM archived_tasks")
+    finally:
+        conn.close()
+    assert os.path.exists(snapshot.snapshot_path)
+
+
+def test_snapshot_lags_until_refreshed(temp_database):
+    """Tests that archive reads see later writes only after the snapshot is invalidated or too old."""
+    snapshot = ArchiveSnapshot(temp_database)
+    manager = ArchiveManager(temp_database, snapshot=snapshot)
+    assert titles(manager) == ["First"]
+
+    execute(temp_database, INSERT_ARCHIVED, ("Second",))
+    assert titles(manager) == ["First"]
+
+    snapshot.invalidate()
+    assert titles(manager) == ["First", "Second"]
+
+    execute(temp_database, INSERT_ARCHIVED, ("Third",))
+    snapshot.max_age = 0
+    assert titles(manager) == ["First", "Second", "Third"]
+
+
+def test_reactivate_invalidates_snapshot(temp_database):
+    """Tests that a reactivated task disappears from the snapshot reads at once."""
+    manager = ArchiveManager(temp_database, snapshot=ArchiveSnapshot(temp_database))
+    archived_id = manager.search_archive(1)[0][1]
+
+    assert manager.reactivate_archived_task(archived_id, 1) is not None
+    assert titles(manager) == []
+
+
+def test_analytics_read_snapshot(temp_database):
+    """Tests that completion analytics run on the snapshot."""
+    analytics = CompletionAnalytics(temp_database, snapshot=ArchiveSnapshot(temp_database))
+    assert analytics.throughput(1, date(2030, 1, 1), date(2030, 1, 31), "month") == [("2030-01", 1)]
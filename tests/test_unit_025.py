@@ -0,0 +1,81 @@
+import os
+import sys
+import hashlib
+import pytest
+
+# Import paths for other modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src/User')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src/User/UserRepository')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src/Database')))
+
+import password_hasher
+from password_hasher import PBKDF2Hasher, ScryptHasher, PasswordWorker
+from user import User
+from user_repository import UserRepository
+from database_setup import initialize_database
+
+
+@pytest.fixture
+def cheap_hasher(monkeypatch):
+    """Fixture replacing the default hasher by a cheap one to keep the tests fast."""
+    hasher = PBKDF2Hasher(iterations=1000)
+    monkeypatch.setattr(password_hasher, "default_hasher", hasher)
+    return hasher
+
+
+def test_hashers_verify_their_hashes():
+    """Tests that every algorithm verifies its own salted hashes and rejects wrong passwords."""
+    for hasher in (PBKDF2Hasher(iterations=1000), ScryptHasher(n=2 ** 10)):
+        encoded = hasher.hash("secret")
+        assert encoded.startswith(hasher.algorithm + "$")
+        assert password_hasher.verify_password("secret", encoded)
+        assert not password_hasher.verify_password("Secret", encoded)
+
+
+def test_malformed_hashes_never_match():
+    """Tests that unknown or truncated hashes are rejected instead of raising."""
+    assert not password_hasher.verify_password("secret", "")
+    assert not password_hasher.verify_password("secret", "md5$abc")
+    assert not password_hasher.verify_password("secret", "pbkdf2_sha256$1000$abc")
+
+
+def test_outdated_hashes_need_rehash(cheap_hasher):
+    """Tests that legacy SHA-256 hashes and hashes of a lower cost are marked for rehashing."""
+    legacy = hashlib.sha256(b"secret").hexdigest()
+    assert password_hasher.verify_password("secret", legacy)
+    assert password_hasher.needs_rehash(legacy)
+    assert password_hasher.needs_rehash(PBKDF2Hasher(iterations=500).hash("secret"))
+    assert password_hasher.needs_rehash(ScryptHasher(n=2 ** 10).hash("secret"))
+    assert not password_hasher.needs_rehash(cheap_hasher.hash("secret"))
+
+
+def test_legacy_user_is_rehashed_and_stored(cheap_hasher, tmp_path):
+    """Tests that a user with a legacy hash can log in and is upgraded to the default algorithm."""
+    db_path = str(tmp_path / "users.db")
+    initialize_database(db_path)
+    repo = UserRepository(db_path)
+    legacy = User("legacy", password_hash=hashlib.sha256(b"secret").hexdigest())
+    repo.save_user(legacy)
+
+    user = repo.get_user_by_username("legacy")
+    assert user.check_password("secret") and user.needs_rehash()
+    repo.update_password_hash(user, user.hash_password("secret"))
+
+    stored = repo.get_user_by_username("legacy")
+    assert stored.password_hash.startswith("pbkdf2_sha256$1000$")
+    assert stored.check_password("secret") and not stored.needs_rehash()
+
+
+def test_password_worker_reports_state(cheap_hasher):
+    """Tests that the worker runs the function in a thread and reports its result or error."""
+    worker = PasswordWorker(User, "someone", "secret")
+    assert worker.state == PasswordWorker.PENDING
+    worker.start()
+    worker.join()
+    assert worker.is_finished() and worker.state == PasswordWorker.DONE
+    assert worker.result.check_password("secret")
+
+    failing = PasswordWorker(int, "not a number")
+    failing.start()
+    failing.join()
+    assert failing.state == PasswordWorker.FAILED and isinstance(failing.error, ValueError)
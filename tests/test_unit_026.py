@@ -0,0 +1,97 @@
+import os
+import sys
+import sqlite3
+import pytest
+from unittest.mock import MagicMock
+
+# Import paths for other modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src/User')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src/User/UserRepository')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src/Database')))
+
+from user import User
+from session import Session
+from user_repository import UserRepository
+from database_setup import initialize_database
+
+
+@pytest.fixture
+def repo(tmp_path):
+    """Fixture for a UserRepository on a bootstrapped database."""
+    db_path = str(tmp_path / "users.db")
+    initialize_database(db_path)
+    return UserRepository(db_path)
+
+
+def count_connections(monkeypatch):
+    connections = []
+    connect = sqlite3.connect
+    monkeypatch.setattr("user_repository.sqlite3.connect",
+                        lambda *args, **kwargs: connections.append(args) or connect(*args, **kwargs))
+    return connections
+
+
+def test_registration_and_login_lookups_are_cached(repo, monkeypatch):
+    """Tests that checking a new username, saving it and logging in query the database only once."""
+    connections = count_connections(monkeypatch)
+
+    assert repo.get_user_by_username("newuser") is None
+    assert repo.get_user_by_username("newuser") is None
+    user = User("newuser", password_hash="hash")
+    repo.save_user(user)
+    assert repo.get_user_by_username("newuser") is user
+
+    assert len(connections) == 2  # One lookup and one insert
+
+
+def test_negative_entries_expire(repo, monkeypatch):
+    """Tests that a missing username is looked up again once its cache entry is too old."""
+    assert repo.get_user_by_username("other") is None
+    other = UserRepository(repo.db_path)
+    other.save_user(User("other", password_hash="hash"))  # Registered by another instance
+
+    assert repo.get_user_by_username("other") is None
+    monkeypatch.setattr(UserRepository, "NEGATIVE_TTL", 0)
+    assert repo.get_user_by_username("other").id == 1
+
+
+def test_positive_entries_expire(repo, monkeypatch):
+    """Tests that a cached user is read again once its entry is too old, e.g. after another instance deleted it."""
+    repo.save_user(User("gone", password_hash="hash"))
+    UserRepository(repo.db_path).delete_user("gone")  # Deleted by another instance
+
+    assert repo.get_user_by_username("gone") is not None
+    monkeypatch.setattr(UserRepository, "POSITIVE_TTL", 0)
+    assert repo.get_user_by_username("gone") is None
+
+
+def test_cache_is_bounded_and_follows_deletes(repo, monkeypatch):
+    """Tests that the least recently used usernames are dropped and deleted users are not returned."""
+    monkeypatch.setattr(UserRepository, "CACHE_SIZE", 2)
+    for name in ("user1", "user2", "user3"):
+        repo.save_user(User(name, password_hash="hash"))
+    assert list(repo._cache) == ["user2", "user3"]
+
+    repo.delete_user("user3")
+    assert repo.get_user_by_username("user3") is None
+
+
+def test_session_caches_settings_and_binds_tasks():
+    """Tests that the session reads settings once and passes its user ID to the task cache."""
+    user = User("someone", password_hash="hash")
+    user.id = 5
+    settings_manager = MagicMock()
+    settings_manager.get_settings.return_value = {"auto_archive": True}
+    task_cache = MagicMock()
+    session = Session(user, settings_manager, task_cache)
+
+    assert session.settings["auto_archive"] and session.settings["auto_archive"]
+    settings_manager.get_settings.assert_called_once_with(5)
+    session.reload_settings()
+    session.settings
+    assert settings_manager.get_settings.call_count == 2
+
+    session.get_tasks({"search": "x"})
+    session.remove_task(3)
+    task_cache.get_tasks.assert_called_once_with(5, {"search": "x"})
+    task_cache.remove.assert_called_once_with(5, 3)
@@ -0,0 +1,124 @@
+import os
+import sys
+import sqlite3
+import pytest
+from unittest.mock import MagicMock
+
+# Import paths for other modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src/Database')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src/Task')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src/Task/TaskRepository')))
+
+import shared_access
+from shared_access import enable_shared_mode, retry_on_busy, DataVersionWatcher
+from database_setup import initialize_database
+from task_repository import TaskRepository
+from task_cache import TaskCache
+from task import Status
+
+
+@pytest.fixture
+def shared_database(tmp_path):
+    """Fixture for a bootstrapped database in WAL mode with two tasks of user 1."""
+    db_path = str(tmp_path / "tasks.db")
+    initialize_database(db_path)
+    assert enable_shared_mode(db_path) == "wal"
+    execute(db_path, '''
+        INSERT INTO tasks (title, description, due_date, importance, urgency, fitness, status, user_id)
+        VALUES ('Task 1', '', '2030-01-01', 'Low', 'Low', 'Low', 'Open', 1),
+               ('Task 2', '', '2030-01-01', 'Low', 'Low', 'Low', 'Open', 1)
+    ''')
+    return db_path
+
+
+def execute(db_path, sql):
+    """Writes from a separate connection, like another instance of the application."""
+    conn = sqlite3.connect(db_path)
+    conn.execute(sql)
+    conn.commit()
+    conn.close()
+
+
+def test_readers_do_not_block_the_writer(shared_database):
+    """Tests that an open read transaction of another instance does not lock writes out."""
+    reader = sqlite3.connect(shared_database, isolation_level=None)
+    reader.execute('BEGIN')
+    reader.execute('SELECT COUNT(*) FROM tasks').fetchone()
+
+    TaskRepository(shared_database).bulk_delete([1], 1)
+
+    assert reader.execute('SELECT COUNT(*) FROM tasks').fetchone() == (2,)  # Still its own snapshot
+    reader.execute('COMMIT')
+    assert reader.execute('SELECT COUNT(*) FROM tasks').fetchone() == (1,)
+    reader.close()
+
+
+def test_retry_on_busy_backs_off_until_the_lock_is_released(monkeypatch):
+    """Tests that locked errors are retried with backoff and other errors are raised at once."""
+    sleeps = []
+    monkeypatch.setattr(shared_access.time, "sleep", sleeps.append)
+    attempts = MagicMock(side_effect=[sqlite3.OperationalError("database is locked")] * 2 + ["done"])
+
+    assert retry_on_busy(attempts) == "done"
+    assert attempts.call_count == 3 and len(sleeps) == 2 and sleeps[1] > sleeps[0] / 2
+
+    with pytest.raises(sqlite3.OperationalError):
+        retry_on_busy(MagicMock(side_effect=sqlite3.OperationalError("no such table: x")))
+    assert len(sleeps) == 2
+
+    with pytest.raises(sqlite3.OperationalError):
+        retry_on_busy(MagicMock(side_effect=sqlite3.OperationalError("database is locked")), attempts=3)
+
+
+def test_watcher_reports_commits_of_other_connections(shared_database):
+    """Tests that PRAGMA data_version polling detects commits and nothing else."""
+    on_change = MagicMock()
+    watcher = DataVersionWatcher(shared_database, on_change)
+
+    assert not watcher.check()
+    assert not watcher.check()
+    execute(shared_database, "UPDATE tasks SET status = 'Completed' WHERE id = 1")
+    assert watcher.check()
+    on_change.assert_called_once_with()
+    watcher.cancel(MagicMock())
+
+
+def test_watcher_ignores_commits_of_this_instance(shared_database):
+    """Tests that commits through connect() are not reported unless they keep hiding other changes."""
+    on_change = MagicMock()
+    watcher = DataVersionWatcher(shared_database, on_change)
+    repository = TaskRepository(shared_database)
+
+    watcher.check()
+    repository.bulk_delete([1], 1)
+    assert not watcher.check()
+    assert not watcher.check()
+
+    for task_id in range(watcher.UNCONFIRMED_LIMIT):
+        execute(shared_database, "UPDATE tasks SET status = 'Completed' WHERE id = 2")
+        repository.bulk_update_status([2], 1, Status.IN_PROGRESS)
+        assert watcher.check() == (task_id == watcher.UNCONFIRMED_LIMIT - 1)
+    on_change.assert_called_once_with()
+    watcher.cancel(MagicMock())
+
+
+def test_cache_refresh_applies_only_the_differences(shared_database):
+    """Tests that refreshing reports the tasks changed by another instance and keeps the other objects."""
+    cache = TaskCache(TaskRepository(shared_database))
+    listener = MagicMock()
+    cache.subscribe(listener)
+    unchanged = cache.get_task(1, 2)
+
+    execute(shared_database, "UPDATE tasks SET importance = 'High' WHERE id = 1")
+    execute(shared_database, '''
+        INSERT INTO tasks (title, due_date, importance, urgency, fitness, status, user_id)
+        VALUES ('Task 3', '2030-01-01', 'Low', 'Low', 'Low', 'Open', 1)
+    ''')
+
+    assert cache.refresh(1) == 2
+    assert [(event, task.id) for event, _, task in (call.args for call in listener.call_args_list)] == [
+        (TaskCache.UPDATED, 1), (TaskCache.ADDED, 3)]
+    assert cache.get_task(1, 2) is unchanged
+
+    execute(shared_database, "DELETE FROM tasks WHERE id = 3")
+    assert cache.refresh(1) == 1 and cache.get_task(1, 3) is None
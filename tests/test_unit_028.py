@@ -0,0 +1,115 @@
+import os
+import sys
+import sqlite3
+import pytest
+from unittest.mock import MagicMock
+
+# Import paths for other modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src/Database')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src/Task')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src/Task/TaskRepository')))
+
+from database_setup import initialize_database
+from database_maintenance import DatabaseMaintenance
+from task_repository import TaskRepository
+from task_cache import TaskCache
+from change_feed import ChangeFeed
+
+
+@pytest.fixture
+def feed(tmp_path):
+    """Fixture for a started ChangeFeed on a database with two tasks of user 1 and one of user 2."""
+    db_path = str(tmp_path / "tasks.db")
+    initialize_database(db_path)
+    execute(db_path, '''
+        INSERT INTO tasks (title, description, due_date, importance, urgency, fitness, status, user_id)
+        VALUES ('Task 1', '', '2030-01-01', 'Low', 'Low', 'Low', 'Open', 1),
+               ('Task 2', '', '2030-01-01', 'Low', 'Low', 'Low', 'Open', 1),
+               ('Task 3', '', '2030-01-01', 'Low', 'Low', 'Low', 'Open', 2)
+    ''')
+    cache = TaskCache(TaskRepository(db_path))
+    feed = ChangeFeed(cache)
+    feed.start()
+    cache.get_tasks(1)
+    return feed
+
+
+def execute(db_path, sql):
+    """Writes from a separate connection, like another instance of the application."""
+    conn = sqlite3.connect(db_path)
+    conn.execute(sql)
+    conn.commit()
+    conn.close()
+
+
+def log_entries(db_path):
+    conn = sqlite3.connect(db_path)
+    rows = conn.execute('SELECT task_id, user_id, operation FROM change_log ORDER BY seq').fetchall()
+    conn.close()
+    return rows
+
+
+def events(listener):
+    return [(event, task.id) for event, _, task in (call.args for call in listener.call_args_list)]
+
+
+def test_triggers_log_every_task_mutation(feed):
+    """Tests that inserts, updates, deletes and owner changes are recorded in order."""
+    db_path = feed.db_path
+    execute(db_path, "UPDATE tasks SET status = 'Completed' WHERE id = 1")
+    execute(db_path, "UPDATE tasks SET user_id = 2 WHERE id = 2")
+    execute(db_path, "DELETE FROM tasks WHERE id = 3")
+
+    assert log_entries(db_path)[3:] == [(1, 1, 'update'), (2, 1, 'delete'), (2, 2, 'update'), (3, 2, 'delete')]
+
+
+def test_poll_applies_only_the_changes_since_the_last_poll(feed):
+    """Tests that changes of other connections are applied to the cache and nothing else is reloaded."""
+    listener = MagicMock()
+    feed.task_cache.subscribe(listener)
+    unchanged = feed.task_cache.get_task(1, 2)
+
+    assert feed.poll(1) == 0
+    execute(feed.db_path, "UPDATE tasks SET importance = 'High' WHERE id = 1")
+    execute(feed.db_path, "UPDATE tasks SET importance = 'High' WHERE id = 3")  # Another user's task
+    execute(feed.db_path, '''
+        INSERT INTO tasks (title, due_date, importance, urgency, fitness, status, user_id)
+        VALUES ('Task 4', '2030-01-01', 'Low', 'Low', 'Low', 'Open', 1)
+    ''')
+    feed.task_cache.repository.get_tasks_by_ids = MagicMock(wraps=feed.task_cache.repository.get_tasks_by_ids)
+
+    assert feed.poll(1) == 2
+    feed.task_cache.repository.get_tasks_by_ids.assert_called_once_with([1, 4], 1)
+    assert events(listener) == [(TaskCache.UPDATED, 1), (TaskCache.ADDED, 4)]
+    assert feed.task_cache.get_task(1, 1).importance.value == 'High'
+    assert feed.task_cache.get_task(1, 2) is unchanged
+    assert feed.poll(1) == 0
+
+
+def test_poll_removes_deleted_and_reassigned_tasks(feed):
+    """Tests that tasks deleted or moved to another user disappear, also when updated before."""
+    execute(feed.db_path, "UPDATE tasks SET importance = 'High' WHERE id = 1")
+    execute(feed.db_path, "DELETE FROM tasks WHERE id = 1")
+    execute(feed.db_path, "UPDATE tasks SET user_id = 2 WHERE id = 2")
+
+    listener = MagicMock()
+    feed.task_cache.subscribe(listener)
+
+    assert feed.poll(1) == 2
+    assert events(listener) == [(TaskCache.REMOVED, 1), (TaskCache.REMOVED, 2)]
+    assert feed.task_cache.get_tasks(1) == []
+
+
+def test_pruned_entries_fall_back_to_a_full_reload(feed, monkeypatch):
+    """Tests that a gap left by pruning the change log reloads the user's tasks completely."""
+    execute(feed.db_path, "UPDATE tasks SET importance = 'High' WHERE id = 2")
+    execute(feed.db_path, "UPDATE change_log SET changed_at = datetime('now', '-30 days')")
+    execute(feed.db_path, "UPDATE tasks SET importance = 'High' WHERE id = 1")
+
+    assert DatabaseMaintenance(feed.db_path).prune_change_log() == 4
+    refresh = MagicMock(wraps=feed.task_cache.refresh)
+    monkeypatch.setattr(feed.task_cache, "refresh", refresh)
+
+    assert feed.poll(1) == 2
+    refresh.assert_called_once_with(1)
+    assert [task.importance.value for task in feed.task_cache.get_tasks(1)] == ['High', 'High']
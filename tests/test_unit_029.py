@@ -0,0 +1,130 @@
+import os
+import sys
+import json
+import sqlite3
+import asyncio
+import pytest
+
+# Import paths for other modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src/ApiServer')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src/User')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src/User/UserRepository')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src/Database')))
+
+import api_server
+from api_server import ApiServer
+from user import User
+from user_repository import UserRepository
+from database_setup import initialize_database
+
+
+@pytest.fixture
+def server(tmp_path):
+    """Fixture for an ApiServer on a free port, serving user 1 with five open tasks."""
+    db_path = str(tmp_path / "tasks.db")
+    initialize_database(db_path)
+    user = User("someone", password_hash="hash")
+    UserRepository(db_path).save_user(user)
+    conn = sqlite3.connect(db_path)
+    conn.executemany('''
+        INSERT INTO tasks (title, description, due_date, importance, urgency, fitness, status, user_id)
+        VALUES (?, '', '2030-01-01', ?, 'Low', 'Low', 'Open', 1)
+    ''', [(f"Task {i}", "High" if i % 2 else "Low") for i in range(1, 6)])
+    conn.commit()
+    conn.close()
+    return ApiServer(user, db_path, port=0)
+
+
+async def request(port, method, path, body=None):
+    """Sends one request on a new connection and returns (status, decoded JSON body or None)."""
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    data = json.dumps(body).encode() if body is not None else b""
+    writer.write(f"{method} {path} HTTP/1.1\r\nContent-Length: {len(data)}\r\nConnection: close\r\n\r\n".encode()
+                 + data)
+    response = await reader.read()
+    writer.close()
+    head, _, payload = response.partition(b"\r\n\r\n")
+    return int(head.split()[1]), json.loads(payload) if payload else None
+
+
+def run(server, scenario):
+    async def main():
+        await server.start()
+        try:
+            return await scenario(server.port)
+        finally:
+            await server.close()
+    return asyncio.run(main())
+
+
+def test_tasks_are_filtered_and_paginated(server):
+    """Tests that a filtered list is cut into pages that link to the next one."""
+    async def scenario(port):
+        first = await request(port, "GET", "/tasks?importance=high&limit=2")
+        last = await request(port, "GET", f"/tasks?importance=high&limit=2&offset={first[1]['next_offset']}")
+        return first, last
+
+    (status, first), (_, last) = run(server, scenario)
+    assert status == 200
+    assert [task["title"] for task in first["items"]] == ["Task 1", "Task 3"]
+    assert (first["total"], first["next_offset"]) == (3, 2)
+    assert [task["title"] for task in last["items"]] == ["Task 5"] and last["next_offset"] is None
+
+
+def test_writes_are_validated_and_visible_to_concurrent_readers(server):
+    """Tests adding, changing and deleting tasks while several requests run at the same time."""
+    async def scenario(port):
+        invalid = await request(port, "POST", "/tasks", {"title": "", "due_date": "2030-01-01"})
+        created = await request(port, "POST", "/tasks", {"title": "New", "due_date": "2030-02-01",
+                                                         "importance": "High", "urgency": "Low", "fitness": "Low"})
+        task_id = created[1]["id"]
+        changed = await request(port, "PATCH", f"/tasks/{task_id}", {"status": "Completed"})
+        pages = await asyncio.gather(*(request(port, "GET", "/tasks?status=completed") for _ in range(10)))
+        deleted = await request(port, "DELETE", "/tasks/1")
+        missing = await request(port, "GET", "/tasks/1")
+        return invalid, created, changed, pages, deleted, missing
+
+    invalid, created, changed, pages, deleted, missing = run(server, scenario)
+    assert invalid == (400, {"error": "Title is required."})
+    assert created[0] == 201 and created[1]["id"] == 6
+    assert changed[1]["status"] == "Completed"
+    assert all(page == (200, pages[0][1]) and page[1]["total"] == 1 for page in pages)
+    assert deleted == (204, None) and missing[0] == 404
+
+
+def test_changes_of_other_instances_are_served(server):
+    """Tests that the change feed brings writes of the GUI into the served task list."""
+    async def scenario(port):
+        await request(port, "GET", "/tasks")
+        conn = sqlite3.connect(server.db_path)
+        conn.execute("UPDATE tasks SET title = 'Renamed' WHERE id = 2")
+        conn.commit()
+        conn.close()
+        return await request(port, "GET", "/tasks/2")
+
+    assert run(server, scenario)[1]["title"] == "Renamed"
+
+
+def test_unknown_routes_and_methods(server, monkeypatch):
+    """Tests the error statuses of requests that do not match a route."""
+    monkeypatch.setattr(api_server, "MAX_BODY_SIZE", 10)
+
+    async def scenario(port):
+        return [await request(port, "GET", "/nothing"), await request(port, "PUT", "/tasks/1"),
+                await request(port, "GET", "/tasks?limit=x"),
+                await request(port, "POST", "/tasks", {"title": "Too long for the limit"})]
+
+    assert [status for status, _ in run(server, scenario)] == [404, 405, 400, 413]
+
+
+def test_bad_field_types_are_answered(server, monkeypatch):
+    """Tests that fields of the wrong type and unexpected handler errors are answered with JSON errors."""
+    async def scenario(port):
+        responses = [await request(port, "POST", "/tasks", {"title": "New", "importance": 1}),
+                     await request(port, "PATCH", "/tasks/1", {"title": 5})]
+        monkeypatch.setattr(server, "_task", lambda task_id: None)  # get_task then fails with an AttributeError
+        return responses + [await request(port, "GET", "/tasks/1")]
+
+    responses = run(server, scenario)
+    assert [status for status, _ in responses] == [400, 400, 500]
+    assert responses[0][1] == {"error": "importance must be a string or null."}
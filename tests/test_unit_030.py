@@ -0,0 +1,97 @@
+import io
+import os
+import sys
+import json
+import sqlite3
+import pytest
+
+# Import paths for other modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src/User')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src/User/UserRepository')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src/Database')))
+
+import cli
+from user import User
+from user_repository import UserRepository
+from database_setup import initialize_database
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    """Fixture for a bootstrapped database with the user "someone" (ID 1) and no tasks."""
+    path = str(tmp_path / "tasks.db")
+    initialize_database(path)
+    UserRepository(path).save_user(User("someone", password_hash="hash"))
+    return path
+
+
+def run(db_path, *argv):
+    out = io.StringIO()
+    status = cli.main(["--db", db_path, "--user", "someone", *argv], out=out)
+    return status, out.getvalue()
+
+
+def add_tasks(db_path, tmp_path, count):
+    path = tmp_path / "new.jsonl"
+    path.write_text("".join(json.dumps({"title": f"Task {i}", "due_date": "2030-01-01",
+                                        "importance": "High" if i % 2 else "Low"}) + "\n" for i in range(count)))
+    return run(db_path, "add", "--file", str(path))
+
+
+def test_add_from_file_in_batches(db_path, tmp_path, monkeypatch, capsys):
+    """Tests that thousands of lines are added in batched transactions and invalid lines are skipped."""
+    monkeypatch.setattr(cli, "BATCH_SIZE", 1000)
+    path = tmp_path / "new.jsonl"
+    lines = [json.dumps({"title": f"Task {i}", "due_date": "2030-01-01"}) for i in range(2500)]
+    bad_types = ['{"title": 5, "due_date": "2030-01-01"}', '{"title": "Task", "due_date": "2030-01-01", "urgency": 1}']
+    path.write_text("\n".join(lines[:10] + ['{"title": ""}', "[]"] + bad_types + lines[10:]) + "\n")
+    commits = []
+    add = cli.TaskRepository.add_tasks
+
+    def counting_add(self, tasks, user_id):
+        commits.append(len(tasks))
+        return add(self, tasks, user_id)
+    monkeypatch.setattr(cli.TaskRepository, "add_tasks", counting_add)
+
+    assert run(db_path, "add", "--file", str(path)) == (0, "Added 2500 tasks, skipped 4\n")
+    assert commits == [1000, 1000, 500]
+    errors = capsys.readouterr().err
+    assert "Line 11: Title is required." in errors
+    assert "Line 13: title must be a string or null." in errors and "Line 14: urgency must be" in errors
+
+
+def test_list_streams_filtered_tasks(db_path, tmp_path):
+    """Tests the table and JSON Lines output of the filtered list."""
+    add_tasks(db_path, tmp_path, 4)
+
+    status, output = run(db_path, "filter", "--importance", "high")
+    assert status == 0
+    assert output.splitlines() == ["2\tOpen\t2030-01-01\tHigh/Low/Low\tTask 1",
+                                   "4\tOpen\t2030-01-01\tHigh/Low/Low\tTask 3"]
+    _, output = run(db_path, "list", "--search", "task 2", "--format", "jsonl")
+    assert [json.loads(line)["id"] for line in output.splitlines()] == [3]
+
+
+def test_complete_archive_and_sweep(db_path, tmp_path):
+    """Tests completing by ID and filter, archiving only completed tasks and sweeping old archived tasks."""
+    add_tasks(db_path, tmp_path, 6)
+
+    assert run(db_path, "complete", "1", "2")[1] == "Completed 2 tasks\n"
+    assert run(db_path, "complete", "--importance", "High")[1] == "Completed 2 tasks\n"  # Task 2 already is
+    assert run(db_path, "archive", "--all")[1] == "Archived 4 tasks, skipped 2 that are not completed\n"
+
+    conn = sqlite3.connect(db_path)
+    conn.execute("UPDATE archived_tasks SET completed_date = '2020-01-01' WHERE id <= 3")
+    conn.commit()
+    conn.close()
+    assert run(db_path, "sweep", "--delete", "--delete-after", "30")[1] == \
+        "Archived 0 completed tasks, deleted 3 archived tasks\n"
+
+
+def test_errors_and_missing_selection(db_path, capsys):
+    """Tests that unknown users fail with status 1 and write commands refuse to run without a selection."""
+    assert cli.main(["--db", db_path, "--user", "nobody", "list"]) == 1
+    assert "User 'nobody' does not exist." in capsys.readouterr().err
+    with pytest.raises(SystemExit):
+        run(db_path, "complete")
@@ -0,0 +1,119 @@
+import os
+import sys
+import sqlite3
+import pytest
+from datetime import date, timedelta
+from unittest.mock import MagicMock
+
+# Import paths for other modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src/Task')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src/Task/TaskRepository')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src/Database')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src/ArchiveManager')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src/NotificationManager')))
+
+from task import Task, Priority, Status
+from recurrence import RecurrenceRule, make_rule, parse_rule
+from task_repository import TaskRepository
+from archive_manager import ArchiveManager
+from notification_manager import NotificationManager
+from database_setup import initialize_database
+
+
+@pytest.fixture
+def repository(tmp_path):
+    """Fixture for a TaskRepository on a new database."""
+    db_path = str(tmp_path / "tasks.db")
+    initialize_database(db_path)
+    return TaskRepository(db_path)
+
+
+def new_task(title, due_date, recurrence=None):
+    return Task(title=title, due_date=due_date, importance=Priority.HIGH, urgency=Priority.LOW,
+                fitness=Priority.LOW, recurrence=recurrence)
+
+
+def test_rule_occurrences():
+    """Tests monthly series on the 31st, intervals and the end of a series by date or count."""
+    monthly = RecurrenceRule('MONTHLY', date(2030, 1, 31))
+    assert list(monthly.occurrences(date(2030, 2, 1), date(2030, 5, 31))) == \
+        [date(2030, 2, 28), date(2030, 3, 31), date(2030, 4, 30), date(2030, 5, 31)]
+    assert monthly.next_after(date(2030, 2, 28)) == date(2030, 3, 31)
+
+    every_other_week = parse_rule("FREQ=WEEKLY;INTERVAL=2;DTSTART=2030-01-07;UNTIL=2030-02-04")
+    assert every_other_week.next_after(date(2030, 1, 8)) == date(2030, 1, 21)
+    assert every_other_week.next_after(date(2030, 2, 4)) is None
+    assert parse_rule("FREQ=DAILY;DTSTART=2030-01-01;COUNT=3").next_after(date(2030, 1, 2)) == date(2030, 1, 3)
+    assert parse_rule("FREQ=DAILY;DTSTART=2030-01-01;COUNT=3").next_after(date(2030, 1, 3)) is None
+
+
+def test_make_rule():
+    """Tests the rules built from user input."""
+    assert make_rule("Weekly 2", date(2030, 1, 7)) == "FREQ=WEEKLY;INTERVAL=2;DTSTART=2030-01-07"
+    assert make_rule("freq=yearly;count=5", date(2030, 1, 7)) == "FREQ=YEARLY;INTERVAL=1;DTSTART=2030-01-07;COUNT=5"
+    assert make_rule("None", date(2030, 1, 7)) is None
+    with pytest.raises(ValueError, match="need a due date"):
+        make_rule("daily", None)
+    with pytest.raises(ValueError):
+        make_rule("hourly", date(2030, 1, 7))
+
+
+def test_complete_rolls_series_forward(repository):
+    """Tests that completing a recurring task archives the occurrence and keeps one row for the series."""
+    rule = make_rule("weekly", date(2030, 1, 7))
+    series, one_off = repository.add_tasks([new_task("Review", date(2030, 1, 7), rule),
+                                            new_task("Once", date(2030, 1, 7))], 1)
+
+    rolled, completed = repository.complete_tasks([series, one_off], 1, "2030-01-23")
+    assert (rolled, completed) == ([series], [one_off])
+    assert series.due_date == date(2030, 1, 28)  # The missed occurrence of January 14 and 21 is skipped
+    assert series.status == Status.OPEN and one_off.status == Status.COMPLETED
+
+    tasks = {task.title: task for task in repository.get_tasks_by_user(1)}
+    assert len(tasks) == 2
+    assert tasks["Review"].due_date == date(2030, 1, 28) and tasks["Review"].recurrence == rule
+    archived = ArchiveManager(repository.db_path).search_archive(1, {"series_id": series.id})
+    assert [(row[2], row[4], row[8]) for row in archived] == [("Review", "2030-01-07", "Completed")]
+
+
+def test_complete_last_occurrence(repository):
+    """Tests that a series that has ended is completed and auto-archived like a one-off task."""
+    task, = repository.add_tasks([new_task("Last", date(2030, 1, 2), "FREQ=DAILY;DTSTART=2030-01-01;COUNT=2")], 1)
+
+    assert repository.complete_tasks([task], 1, "2030-01-02", archive=True) == ([], [task])
+    assert repository.get_tasks_by_user(1) == []
+    conn = sqlite3.connect(repository.db_path)
+    assert conn.execute("SELECT title, series_id FROM archived_tasks").fetchall() == [("Last", task.id)]
+    conn.close()
+
+
+def test_edit_and_roll_forward_in_one_write(repository, monkeypatch):
+    """Tests that the edited fields, the rule and the roll forward of a series are written in one batch."""
+    task, = repository.add_tasks([new_task("Water plants", date(2030, 1, 7))], 1)
+    batches = []
+    execute_batch = repository._execute_batch
+    monkeypatch.setattr(repository, "_execute_batch", lambda statements: batches.append(statements) or
+                        execute_batch(statements))
+
+    rule = make_rule("daily", date(2030, 1, 7))
+    repository.update_task(task.id, 1, "Water the plants", "", date(2030, 1, 7), Priority.HIGH, Priority.LOW,
+                           Priority.LOW, Status.OPEN, rule)
+    assert repository.get_task(task.id, 1).recurrence == rule
+
+    task.title, task.recurrence = "Water all plants", make_rule("weekly", date(2030, 1, 7))
+    assert repository.complete_tasks([task], 1, "2030-01-07", edited=True) == ([task], [])
+    assert len(batches) == 2
+    stored = repository.get_task(task.id, 1)
+    assert (stored.title, stored.due_date, stored.recurrence) == ("Water all plants", date(2030, 1, 14),
+                                                                  task.recurrence)
+
+
+def test_notification_lists_later_occurrences():
+    """Tests that notifications of recurring tasks include the computed occurrences within the interval."""
+    settings_manager = MagicMock()
+    settings_manager.get_settings.return_value = {"notifications_enabled": True, "notification_interval": 3}
+    today = date.today()
+    task = new_task("Stretch", today, make_rule("daily", today))
+
+    notification, = NotificationManager(settings_manager).schedule_notifications([task])
+    assert notification["occurrences"] == [today + timedelta(days=day) for day in (1, 2, 3)]
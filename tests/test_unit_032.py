@@ -0,0 +1,140 @@
+import io
+import os
+import sys
+import sqlite3
+import pytest
+from datetime import date
+from unittest.mock import MagicMock, patch
+
+# Import paths for other modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src/Task')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src/Task/TaskRepository')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src/Database')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src/User')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src/User/UserRepository')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src/GUIController')))
+
+import cli
+from drag_drop import DragDropHandler
+from task import Task, Priority, Status
+from dependency_graph import DependencyGraph, SUBTASK, BLOCKS
+from task_repository import TaskRepository
+from database_setup import initialize_database
+from user import User
+from user_repository import UserRepository
+
+
+def new_task(task_id, importance=Priority.LOW, urgency=Priority.LOW, due_date=None):
+    return Task(title=f"Task {task_id}", due_date=due_date, importance=importance, urgency=urgency,
+                fitness=Priority.LOW, task_id=task_id)
+
+
+@pytest.fixture
+def graph():
+    """Fixture for a project tree: 1 has the subtasks 2 and 3, 3 has the subtask 4, 5 blocks 4."""
+    tasks = [new_task(1, due_date=date(2030, 3, 1)), new_task(2), new_task(3), new_task(4),
+             new_task(5, due_date=date(2030, 1, 1))]
+    graph = DependencyGraph()
+    graph.load(tasks, [(1, 2, SUBTASK), (1, 3, SUBTASK), (3, 4, SUBTASK), (4, 5, BLOCKS)])
+    return graph, {task.id: task for task in tasks}
+
+
+def test_constraints_propagate_to_prerequisites(graph):
+    """Tests that priorities and due dates of a task are inherited by all tasks it depends on."""
+    graph, tasks = graph
+    order = graph.topological_order()
+    assert order.index(1) < order.index(3) < order.index(4) < order.index(5)
+    assert graph.effective(4) == (Priority.LOW, Priority.LOW, date(2030, 3, 1))
+    assert graph.effective(5)[2] == date(2030, 1, 1)  # Its own due date is earlier
+
+    tasks[1].importance = Priority.HIGH
+    assert sorted(graph.set_task(tasks[1])) == [1, 2, 3, 4, 5]
+    assert all(graph.effective(task_id)[0] == Priority.HIGH for task_id in range(1, 6))
+
+    tasks[3].urgency = Priority.HIGH
+    assert graph.set_task(tasks[3]) == [3, 4, 5]  # The parent and the sibling are not re-evaluated
+    assert graph.effective(2)[1] == Priority.LOW
+
+    tasks[1].status = Status.COMPLETED  # Completed tasks no longer constrain their subtasks
+    assert set(graph.set_task(tasks[1])) == {2, 3, 4, 5}
+    assert graph.effective(2) == (Priority.LOW, Priority.LOW, None)
+    assert graph.effective(4) == (Priority.LOW, Priority.HIGH, None)  # Still urgent through 3
+
+
+def test_propagation_stops_when_constraints_stay(graph):
+    """Tests that prerequisites are only re-evaluated while the effective values change."""
+    graph, tasks = graph
+    evaluated = []
+    evaluate = graph._evaluate
+    graph._evaluate = lambda task_id: evaluated.append(task_id) or evaluate(task_id)
+
+    tasks[3].due_date = date(2030, 6, 1)  # Later than the due date inherited from 1
+    assert graph.set_task(tasks[3]) == []
+    assert evaluated == [3]
+
+
+def test_cycles_and_parents_are_rejected(graph):
+    """Tests cycle detection and that a subtask has only one parent."""
+    graph, tasks = graph
+    assert graph.would_create_cycle(5, 1)
+    with pytest.raises(ValueError, match="cannot depend on itself"):
+        graph.add_dependency(5, 1, BLOCKS)
+    with pytest.raises(ValueError, match="only be a subtask of one task"):
+        graph.add_dependency(2, 4, SUBTASK)
+    assert graph.add_dependency(2, 5, BLOCKS) == []
+    assert graph.is_blocked(2)
+
+    assert graph.remove_task(3) == [4]  # 4 loses the due date inherited through its parent
+    assert graph.parent(4) is None and graph.effective(4)[2] is None
+    assert graph.dependents(5) == [2, 4]
+
+
+def test_dependencies_are_stored_and_removed_with_tasks(tmp_path):
+    """Tests the link and unlink commands and that deleting a task drops its dependencies."""
+    db_path = str(tmp_path / "tasks.db")
+    initialize_database(db_path)
+    UserRepository(db_path).save_user(User("someone", password_hash="hash"))
+    repository = TaskRepository(db_path)
+    repository.add_tasks([new_task(None, due_date=date(2030, 1, 1)) for _ in range(4)], 1)
+
+    def run(*argv):
+        out = io.StringIO()
+        return cli.main(["--db", db_path, "--user", "someone", *argv], out=out), out.getvalue()
+
+    assert run("link", "2", "--subtask-of", "1", "--blocked-by", "3", "4")[0] == 0
+    assert repository.get_dependencies(1) == [(1, 2, SUBTASK), (2, 3, BLOCKS), (2, 4, BLOCKS)]
+    assert run("link", "3", "--blocked-by", "1")[0] == 1  # Would close a cycle
+    with pytest.raises(sqlite3.IntegrityError):
+        repository.add_dependencies([(3, 2, SUBTASK)], 1)  # A second parent
+
+    repository.bulk_delete([4], 1)
+    assert repository.get_dependencies(1) == [(1, 2, SUBTASK), (2, 3, BLOCKS)]
+    assert run("unlink", "2") == (0, "Removed 2 dependencies\n")
+    assert repository.get_dependencies(1) == []
+
+
+def test_drops_respect_inherited_priorities(graph):
+    """Tests that a drop is compared with the shown region and cannot undercut inherited priorities."""
+    graph, tasks = graph
+    tasks[1].importance = Priority.HIGH
+    graph.set_task(tasks[1])
+    controller = MagicMock(tasks=list(tasks.values()), dependency_graph=graph)
+    controller.view_transform.to_world.side_effect = lambda x, y: (x, y)
+    handler = DragDropHandler(MagicMock(), {4: 10}, controller)
+    event = MagicMock(x=0, y=0)
+
+    def drop(priorities):
+        controller.region_raster.priorities_at.return_value = priorities
+        handler.start_drag(event, 4)
+        handler.drop_task(event, 4)
+
+    drop((Priority.HIGH, Priority.LOW, Priority.LOW))  # The region it is shown in
+    drop((Priority.HIGH, Priority.LOW, Priority.HIGH))
+    controller.write_buffer.queue_priorities.assert_called_once_with(
+        controller.session.user_id, 4, (Priority.LOW,) * 3, (Priority.LOW, Priority.LOW, Priority.HIGH))
+
+    with patch("drag_drop.messagebox") as messagebox:
+        drop((Priority.LOW, Priority.HIGH, Priority.HIGH))
+    messagebox.showinfo.assert_called_once()
+    assert (tasks[4].importance, tasks[4].urgency) == (Priority.LOW, Priority.LOW)